@@ -5,6 +5,12 @@ citeflex/app.py
 Flask application for CiteFlex Unified.
 
 Version History:
+    2026-10-18: Each request runs inside a soc2_logging audit context
+    2026-10-18: Resolution events are queued per document session and
+                written on download/export
+    2026-10-18: Requests are bound to a scheduler class (interactive, or
+                document for /api/process and /api/process-author-date,
+                which are deferred or refused with 503 under load)
     2025-12-12: Added document topic extraction for AI context.
                 Extracts keywords from document body to help AI disambiguate
                 between authors with same name in different fields.
@@ -45,12 +51,18 @@ import pickle
 from pathlib import Path
 from datetime import datetime, timedelta
 from functools import wraps
+from typing import Optional
 
-from flask import Flask, request, jsonify, render_template, send_file
+from flask import Flask, request, jsonify, render_template, send_file, g
 from werkzeug.utils import secure_filename
+from werkzeug.middleware.proxy_fix import ProxyFix
 
+import http_client
+import scheduler
+import soc2_logging
+from tracing import submit_traced
 from unified_router import get_citation, get_multiple_citations, get_parenthetical_options, get_parenthetical_components
-from formatters.base import get_formatter
+from formatters.cache import get_cached_formatter
 from document_processor import process_document
 from processors.topic_extractor import get_document_context
 from processors.document_components import export_cache_to_csv
@@ -68,6 +80,19 @@ from flask_login import current_user
 # =============================================================================
 
 app = Flask(__name__)
+
+# Reverse proxies in front of the app whose X-Forwarded-For entries are
+# trusted for request.remote_addr (0 = connect directly). Railway puts one
+# edge proxy in front of every service, so it is trusted there by default.
+TRUSTED_PROXY_HOPS = int(os.environ.get(
+    'TRUSTED_PROXY_HOPS', '1' if os.environ.get('RAILWAY_ENVIRONMENT') else '0'
+))
+if TRUSTED_PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_HOPS)
+
+# Process-wide DNS cache for outbound calls; no-op unless HTTP_DNS_CACHE_TTL > 0
+http_client.install_dns_cache()
+
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max upload
 app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-key-change-in-prod')
 
@@ -369,6 +394,60 @@ class SessionManager:
         if expired:
             print(f"[SessionManager] Cleaned up {len(expired)} expired sessions")
     
+    def _live_session(self, session_id: str) -> Optional[dict]:
+        """
+        Session record (recovered from disk if needed), or None if missing
+        or expired. Caller holds the lock.
+        """
+        session = self._sessions.get(session_id)
+        
+        if not session and self._persistence_available:
+            session_file = self._get_session_file(session_id)
+            if session_file.exists():
+                try:
+                    with open(session_file, 'rb') as f:
+                        session = pickle.load(f)
+                    self._sessions[session_id] = session
+                except Exception as e:
+                    print(f"[SessionManager] Failed to recover session {session_id[:8]}: {e}")
+        
+        if not session:
+            return None
+        
+        if datetime.now() > session['expires_at']:
+            del self._sessions[session_id]
+            self._delete_session_file(session_id)
+            return None
+        
+        return session
+    
+    def append_items(self, session_id: str, key: str, items: list) -> Optional[int]:
+        """
+        Atomically extend the list stored under ``key``.
+        
+        Returns:
+            New list length, or None if the session is missing or expired
+        """
+        with self._lock:
+            session = self._live_session(session_id)
+            if session is None:
+                return None
+            stored = session['data'].setdefault(key, [])
+            stored.extend(items)
+            self._save_session(session_id)
+            return len(stored)
+    
+    def pop_items(self, session_id: str, key: str) -> list:
+        """Atomically take (and clear) the list stored under ``key``."""
+        with self._lock:
+            session = self._live_session(session_id)
+            if session is None:
+                return []
+            items = session['data'].pop(key, None) or []
+            if items:
+                self._save_session(session_id)
+            return items
+    
     def atomic_update_document(self, session_id: str, note_id: int, formatted: str) -> dict:
         """
         Atomically update a document note within the session lock.
@@ -453,6 +532,116 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+# =============================================================================
+# WORKLOAD SCHEDULING
+# =============================================================================
+
+# Endpoints whose outbound engine/AI calls run as bulk document work; every
+# other endpoint is interactive and is served first (see scheduler.py)
+DOCUMENT_ENDPOINTS = {'process_doc', 'process_author_date'}
+
+
+def _workload_user() -> str:
+    """
+    Fair-queuing key: the account, or the client address for previews.
+    
+    The address is request.remote_addr, never the raw X-Forwarded-For
+    header (callers could rotate it to dodge the per-user caps); behind a
+    proxy, set TRUSTED_PROXY_HOPS so ProxyFix resolves it from trusted hops.
+    Without trusted hops every preview arrives from the proxy's address, so
+    anonymous work gets the shared '' key instead of one bogus 'ip:' user.
+    """
+    if current_user.is_authenticated:
+        return f"user:{current_user.id}"
+    if not TRUSTED_PROXY_HOPS:
+        return ''
+    return f"ip:{request.remote_addr or ''}"
+
+
+@app.before_request
+def bind_audit_context():
+    """Enter the request's soc2_logging audit context (identities hashed once)."""
+    audit_context = soc2_logging.context(
+        user_id=str(current_user.id) if current_user.is_authenticated else None,
+        ip_address=request.remote_addr,
+        user_agent=request.user_agent.string or None
+    )
+    g.audit_context = audit_context.__enter__()
+
+
+@app.teardown_request
+def exit_audit_context(exc):
+    audit_context = g.pop('audit_context', None)
+    if audit_context is not None:
+        audit_context.__exit__(None, None, None)
+
+
+@app.before_request
+def bind_workload():
+    """Bind the request's scheduling class; defer or refuse document runs under load."""
+    if request.endpoint is None:
+        return None
+    user = _workload_user()
+    if request.endpoint in DOCUMENT_ENDPOINTS:
+        bound = scheduler.job(scheduler.Priority.DOCUMENT, user)
+        try:
+            bound.__enter__()
+        except scheduler.Overloaded as e:
+            response = jsonify({
+                'success': False,
+                'error': str(e),
+                'code': 'SERVER_BUSY',
+            })
+            response.headers['Retry-After'] = str(int(e.retry_after) or 1)
+            return response, 503
+    else:
+        bound = scheduler.workload(scheduler.Priority.INTERACTIVE, user)
+        bound.__enter__()
+    g.scheduler_workload = bound
+    return None
+
+
+@app.teardown_request
+def release_workload(exc):
+    bound = g.pop('scheduler_workload', None)
+    if bound is not None:
+        bound.__exit__(None, None, None)
+
+
+# Resolution events are queued in the document session and written with
+# one INSERT when the document is downloaded or exported (or once this many
+# are pending), instead of one INSERT per accepted citation
+RESOLUTION_FLUSH_SIZE = 50
+PENDING_RESOLUTIONS = 'pending_resolutions'
+
+
+def _queue_resolution(session_id: str, **resolution) -> str:
+    """Classify one resolution and queue it on the document session."""
+    from resolution_tracker import ResolutionBatch
+    
+    batch = ResolutionBatch(session_id)
+    resolution_type = batch.add(**resolution)
+    pending = sessions.append_items(session_id, PENDING_RESOLUTIONS, batch.rows)
+    if pending is None:
+        # No session to hold it
+        batch.flush(update_stats=False)
+    elif pending >= RESOLUTION_FLUSH_SIZE:
+        _flush_resolutions(session_id, update_stats=False)
+    return resolution_type
+
+
+def _flush_resolutions(session_id: str, update_stats: bool = True) -> None:
+    """Write the document's queued resolution events (one INSERT)."""
+    rows = sessions.pop_items(session_id, PENDING_RESOLUTIONS)
+    if not rows:
+        return
+    try:
+        from resolution_tracker import ResolutionBatch
+        ResolutionBatch(session_id, rows=rows).flush(update_stats=update_stats)
+    except Exception as e:
+        print(f"[API] Warning: Failed to log {len(rows)} resolutions: {e}")
+
+
 # =============================================================================
 # ROUTES
 # =============================================================================
@@ -786,7 +975,7 @@ def format_citation():
         )
         
         # Get formatter and format
-        formatter = get_formatter(style)
+        formatter = get_cached_formatter(style)
         formatted = formatter.format(metadata)
         
         return jsonify({
@@ -1044,6 +1233,8 @@ def download(session_id: str):
             sessions.set(session_id, 'downloaded_by', current_user.id)
             print(f"[API] Credit spent for user {current_user.id}, session {session_id[:8]}")
         
+        _flush_resolutions(session_id)
+        
         from io import BytesIO
         buffer = BytesIO(processed_doc)
         buffer.seek(0)
@@ -1089,6 +1280,8 @@ def export_metadata(session_id: str):
         
         print(f"[API] Session keys: {list(session_data.keys())}")
         
+        _flush_resolutions(session_id)
+        
         # Check mode - handle author-date differently
         mode = session_data.get('mode', 'footnote')
         print(f"[API] Session mode: {mode}")
@@ -1394,9 +1587,7 @@ def update_note():
         # Log resolution event if tracking data provided
         if resolution_data:
             try:
-                from resolution_tracker import log_resolution
-                
-                log_resolution(
+                _queue_resolution(
                     session_id=session_id,
                     citation_id=note_id,
                     original_text=resolution_data.get('original_text', ''),
@@ -1596,8 +1787,7 @@ def process_author_date():
                 formatted_recommendation = None
                 if len(options) > 1 and len(metadata_list) > 0:
                     try:
-                        from formatters.base import get_formatter
-                        formatter = get_formatter(style)
+                        formatter = get_cached_formatter(style)
                         formatted_recommendation = formatter.format(metadata_list[0])
                     except Exception as fmt_err:
                         print(f"[API] Error pre-formatting recommendation: {fmt_err}")
@@ -1644,7 +1834,7 @@ def process_author_date():
         citations = [None] * len(unique_citations)
         with ThreadPoolExecutor(max_workers=5) as executor:
             futures = {
-                executor.submit(process_single_citation, idx, cite): idx 
+                submit_traced(executor, process_single_citation, idx, cite): idx 
                 for idx, cite in enumerate(unique_citations)
             }
             for future in as_completed(futures):
@@ -1851,7 +2041,7 @@ def process_author_date():
         if unique_urls:
             with ThreadPoolExecutor(max_workers=5) as executor:
                 url_futures = {
-                    executor.submit(process_single_url, idx, url_info): idx 
+                    submit_traced(executor, process_single_url, idx, url_info): idx 
                     for idx, url_info in enumerate(unique_urls)
                 }
                 for future in as_completed(url_futures):
@@ -2049,7 +2239,7 @@ def accept_reference():
                         court=option.get('court', ''),
                     )
                     
-                    formatter = get_formatter(style)
+                    formatter = get_cached_formatter(style)
                     formatted = formatter.format(metadata)
                     reference_id = citation_id
                 
@@ -2141,7 +2331,7 @@ def accept_reference():
                     )
                     
                     # Format using specified style
-                    formatter = get_formatter(style)
+                    formatter = get_cached_formatter(style)
                     formatted = formatter.format(metadata)
                     reference_id = citation_id
                 
@@ -2368,9 +2558,7 @@ def accept_reference():
         resolution_data = data.get('resolution')
         if resolution_data:
             try:
-                from resolution_tracker import log_resolution
-                
-                log_resolution(
+                _queue_resolution(
                     session_id=session_id,
                     citation_id=reference_id,
                     original_text=resolution_data.get('original_text', ''),
@@ -2674,11 +2862,9 @@ def confirm_verified():
         resolution_data = data.get('resolution')
         if resolution_data:
             try:
-                from resolution_tracker import log_resolution
-                
                 # If user kept original (selected_option == 'original'), it's user_provided
                 # If user selected from search results, it's accepted_alternative
-                log_resolution(
+                _queue_resolution(
                     session_id=session_id,
                     citation_id=citation_id,
                     original_text=resolution_data.get('original_text', original_text),
@@ -2927,6 +3113,7 @@ def finalize_author_date():
             
             # Save to session for download
             sessions.set(session_id, 'processed_doc', processed_bytes)
+            _flush_resolutions(session_id)
             
             print(f"[API] Finalized author-date document with {len(references)} references")
             
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Audit-event benchmark for Citate Genie
+Measures the per-event cost of PII hashing in soc2_logging.AuditLogger:
+the original hash-every-identity-on-every-event path against the LRU cache
+and a per-request AuditContext, and checks that all three produce the same
+hashes (also after a salt rotation).
+
+Each simulated request has one actor (user id, session id, IP, user agent)
+and logs --events events; --actors distinct actors are cycled through.
+
+Usage:
+    python audit_benchmark.py
+    python audit_benchmark.py --events 50 --requests 2000 --repeat 5
+
+Exit codes: 0 ok, 1 a cached hash differed from the reference hash.
+"""
+
+import argparse
+import hashlib
+import logging
+import random
+import sys
+import time
+from typing import Callable, List, Tuple
+
+from soc2_logging import ActionCategory, AuditLogger, Outcome
+
+DEFAULT_EVENTS = 20
+DEFAULT_REQUESTS = 1000
+DEFAULT_ACTORS = 200
+DEFAULT_REPEAT = 3
+SEED = 20261018
+
+Actor = Tuple[str, str, str, str]
+
+
+def build_actors(count: int) -> List[Actor]:
+    rng = random.Random(SEED)
+    return [
+        (
+            f"user_{rng.randrange(10 ** 9)}",
+            f"{rng.getrandbits(128):032x}",
+            f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}",
+            f"Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_{rng.randrange(8)}) "
+            f"AppleWebKit/537.36 Chrome/{rng.randrange(100, 130)}.0",
+        )
+        for _ in range(count)
+    ]
+
+
+def _legacy_hash_pii(salt: str, value: str) -> str:
+    # The uncached hash, as computed for every identity of every event
+    return hashlib.sha256(f"{salt}:{value}".encode()).hexdigest()[:16]
+
+
+def _quiet_logger(mode: str = 'sync') -> AuditLogger:
+    logger = AuditLogger(service_name='audit-benchmark', mode=mode)
+    # Measure hashing and event building, not the log handler
+    logger._logger.handlers[:] = [logging.NullHandler()]
+    logger._logger.propagate = False
+    return logger
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+def _hash_cases(actors: List[Actor], requests: int, events: int):
+    logger = _quiet_logger()
+    salt = logger._pii_salt
+    schedule = [actors[i % len(actors)] for i in range(requests)]
+
+    def legacy():
+        out = []
+        for actor in schedule:
+            for _ in range(events):
+                out.append(tuple(_legacy_hash_pii(salt, v) for v in actor))
+        return out
+
+    def cached():
+        out = []
+        for actor in schedule:
+            for _ in range(events):
+                out.append(tuple(logger._hash_pii(v) for v in actor))
+        return out
+
+    def context():
+        out = []
+        for actor in schedule:
+            ctx = logger.context(*actor)
+            for _ in range(events):
+                out.append(tuple(ctx.hash_pii(v) for v in actor))
+        return out
+
+    return logger, {'legacy': legacy, 'lru': cached, 'context': context}
+
+
+def _event_cases(actors: List[Actor], requests: int, events: int):
+    logger = _quiet_logger()
+    schedule = [actors[i % len(actors)] for i in range(requests)]
+
+    def per_event():
+        for user_id, session_id, ip, agent in schedule:
+            for _ in range(events):
+                logger.log_event(ActionCategory.CITATION_LOOKUP, Outcome.SUCCESS,
+                                 user_id=user_id, session_id=session_id,
+                                 ip_address=ip, user_agent=agent)
+
+    def with_context():
+        for actor in schedule:
+            with logger.context(*actor):
+                for _ in range(events):
+                    logger.log_event(ActionCategory.CITATION_LOOKUP, Outcome.SUCCESS)
+
+    def uncached():
+        # Cache disabled by rotating (to the same salt) before every event
+        salt = logger._pii_salt
+        for user_id, session_id, ip, agent in schedule:
+            for _ in range(events):
+                logger.rotate_pii_salt(salt)
+                logger.log_event(ActionCategory.CITATION_LOOKUP, Outcome.SUCCESS,
+                                 user_id=user_id, session_id=session_id,
+                                 ip_address=ip, user_agent=agent)
+
+    return {'log_event uncached': uncached, 'log_event lru': per_event,
+            'log_event context': with_context}
+
+
+def _check(actors: List[Actor], requests: int, events: int) -> bool:
+    logger, cases = _hash_cases(actors, min(requests, 200), min(events, 5))
+    reference = cases['legacy']()
+    ok = all(fn() == reference for fn in cases.values())
+
+    # A rotation must invalidate the LRU and open contexts
+    actor = actors[0]
+    ctx = logger.context(*actor)
+    ctx.hash_pii(actor[0])
+    logger.rotate_pii_salt('rotated-salt')
+    expected = _legacy_hash_pii('rotated-salt', actor[0])
+    ok = ok and logger._hash_pii(actor[0]) == expected and ctx.hash_pii(actor[0]) == expected
+    return ok
+
+
+def _best_time(fn: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=DEFAULT_EVENTS, help='events per request')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS)
+    parser.add_argument('--actors', type=int, default=DEFAULT_ACTORS)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    args = parser.parse_args(argv)
+
+    actors = build_actors(args.actors)
+    if not _check(actors, args.requests, args.events):
+        print("MISMATCH: cached PII hashes differ from the reference hash")
+        return 1
+
+    total = args.requests * args.events
+    print(f"{args.requests} requests x {args.events} events, {args.actors} actors, best of {args.repeat}")
+    print(f"  {'case':<20} {'total ms':>10} {'us/event':>9}")
+
+    _, hash_cases = _hash_cases(actors, args.requests, args.events)
+    cases = list(hash_cases.items()) + list(_event_cases(actors, args.requests, args.events).items())
+    for name, fn in cases:
+        seconds = _best_time(fn, args.repeat)
+        label = f"hash {name}" if name in hash_cases else name
+        print(f"  {label:<20} {seconds * 1000:>10.1f} {seconds / total * 1e6:>9.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -17,6 +17,12 @@ SOC 2 Compliance Notes:
 - Retains: who, what, when, where
 - NEVER logs document content, only metadata
 - Logs should be retained for 1 year minimum
+- Entries are hash-chained (prev_hash -> hash); verify() detects edits
+
+Writes go through audit_pipeline.AuditPipeline. AUDIT_LOG_MODE selects the
+durability mode: 'async' (default; batched on a writer thread, flushed at
+exit), 'group' (caller waits for its batch's fsync) or 'sync' (one write +
+fsync per event on the calling thread).
 
 Usage:
     from audit_log import audit
@@ -36,17 +42,24 @@ Usage:
 
 Version History:
     2025-12-14: Initial implementation for SOC 2 compliance
+    2026-10-18: Batched background writes via AuditPipeline, hash chaining,
+                flush() / stats() / verify()
+    2026-10-18: Request context (IP, user agent, path) read once per request
 """
 
 import os
 import json
-import fcntl
-import threading
+import uuid
 from enum import Enum
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any
 
+from audit_pipeline import AuditPipeline, FileSink, verify_chain
+
+# flask.g attribute holding the request context captured for this request
+_REQUEST_CONTEXT_ATTR = '_audit_request_context'
+
 
 class AuditEvent(Enum):
     """
@@ -97,6 +110,8 @@ class AuditLogger:
     """
     Thread-safe audit logger with append-only file output.
     
+    Entries are written by a background AuditPipeline (AUDIT_LOG_MODE).
+    
     Log file format: JSON Lines (one JSON object per line)
     Location: /data/audit/audit.log (or AUDIT_LOG_PATH env var)
     
@@ -108,13 +123,13 @@ class AuditLogger:
         "ip_address": "192.168.1.1",
         "user_agent": "Mozilla/5.0...",
         "details": {...},  # event-specific metadata
-        "request_id": "uuid"  # for correlating related events
+        "request_id": "uuid",  # for correlating related events
+        "prev_hash": "...",  # hash of the previous entry
+        "hash": "..."  # sha256 over prev_hash + this entry
     }
     """
     
-    def __init__(self, log_path: Optional[Path] = None):
-        self._lock = threading.Lock()
-        
+    def __init__(self, log_path: Optional[Path] = None, mode: Optional[str] = None):
         # Determine log path
         if log_path:
             self._log_path = log_path
@@ -123,6 +138,14 @@ class AuditLogger:
             self._log_path = log_dir / 'audit.log'
         
         self._enabled = self._init_log_file()
+        
+        self._pipeline = None
+        if self._enabled:
+            self._pipeline = AuditPipeline(
+                FileSink(self._log_path),
+                mode=mode or os.environ.get('AUDIT_LOG_MODE', 'async'),
+                name='audit_log',
+            )
     
     def _init_log_file(self) -> bool:
         """Initialize log directory and file."""
@@ -145,23 +168,32 @@ class AuditLogger:
         """
         Extract IP and user agent from Flask request context.
         
+        Headers are read once per request; later events in the same request
+        reuse the captured dict (kept on flask.g).
+        
         Returns empty dict if not in request context.
         """
         try:
-            from flask import request, has_request_context
+            from flask import request, has_request_context, g
             
             if has_request_context():
+                context = g.get(_REQUEST_CONTEXT_ATTR)
+                if context is not None:
+                    return context
+                
                 # Get real IP (handle proxies)
                 ip = request.headers.get('X-Forwarded-For', request.remote_addr)
                 if ip and ',' in ip:
                     ip = ip.split(',')[0].strip()  # First IP in chain
                 
-                return {
+                context = {
                     'ip_address': ip or 'unknown',
                     'user_agent': request.headers.get('User-Agent', 'unknown')[:200],  # Truncate
                     'request_path': request.path,
                     'request_method': request.method,
                 }
+                setattr(g, _REQUEST_CONTEXT_ATTR, context)
+                return context
             
         except ImportError:
             pass
@@ -234,8 +266,6 @@ class AuditLogger:
             ip_address: Client IP (optional, auto-detected in request context)
             user_agent: Client user agent (optional, auto-detected)
         """
-        import uuid
-        
         # Build log entry
         entry = {
             'timestamp': datetime.now(timezone.utc).isoformat(),
@@ -277,26 +307,41 @@ class AuditLogger:
     
     def _write_entry(self, entry: Dict[str, Any]) -> None:
         """
-        Write log entry to file (thread-safe, append-only).
+        Hand log entry to the pipeline (thread-safe, append-only).
         """
-        log_line = json.dumps(entry, default=str) + '\n'
-        
         # Always print to stdout for Railway logs
         print(f"[AUDIT] {entry['event']} session={entry.get('session_id', 'none')}")
         
         if not self._enabled:
             return
         
-        with self._lock:
-            try:
-                with open(self._log_path, 'a', encoding='utf-8') as f:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                    f.write(log_line)
-                    f.flush()
-                    os.fsync(f.fileno())
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-            except Exception as e:
-                print(f"[AuditLog] ERROR writing to log: {e}")
+        self._pipeline.submit(entry)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event logged so far is on disk."""
+        if not self._enabled:
+            return True
+        return self._pipeline.flush(timeout)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Writer pipeline metrics (queue depth, drops, batch size, latency)."""
+        if not self._enabled:
+            return {'enabled': False}
+        return {'enabled': True, **self._pipeline.stats()}
+    
+    def verify(self) -> Dict[str, Any]:
+        """
+        Check the hash chain of the whole log file.
+        
+        Returns:
+            verify_chain() result ('ok', 'records', 'first_error', ...)
+        """
+        if not self._enabled or not self._log_path.exists():
+            return {'ok': True, 'records': 0, 'unchained': 0, 'chains': 0, 'first_error': None}
+        
+        self.flush()
+        with open(self._log_path, 'r', encoding='utf-8') as f:
+            return verify_chain(f)
     
     def get_recent_events(
         self,
@@ -318,6 +363,7 @@ class AuditLogger:
         if not self._enabled or not self._log_path.exists():
             return []
         
+        self.flush(timeout=5.0)
         events = []
         
         try:
@@ -0,0 +1,490 @@
+"""
+citeflex/audit_pipeline.py
+
+Background, batched, hash-chained writer for audit events.
+
+Both audit loggers (audit_log.AuditLogger: append-only file,
+soc2_logging.AuditLogger: structured log stream) used to serialize and write
+every event on the request thread; the file logger also took a process lock
+and flock and fsync'ed once per event. AuditPipeline moves that work to one
+writer thread per process:
+
+    request threads --submit()--> bounded queue --> writer thread
+                                                      | batch (group commit)
+                                                      v
+                                                    sink.write_batch()
+
+Modes (AUDIT_LOG_MODE / SOC2_AUDIT_MODE):
+
+    sync    Written (and fsync'ed, for files) on the calling thread before
+            submit() returns; one write per event. Same guarantees and cost
+            as before.
+    group   submit() blocks until the batch containing the event is durable.
+            Concurrent callers share one write + fsync (group commit), so
+            durability matches sync without serializing callers on fsync.
+    async   submit() only enqueues (default). Events are durable within
+            linger_ms plus one write + fsync; events still queued when the
+            process is killed (SIGKILL, OOM) are lost. Clean exits flush via
+            atexit; call flush() where a point of durability is needed.
+
+Ordering: in every mode events are written in the order they entered the
+queue (one writer thread), so each thread's own events stay in order.
+
+Back-pressure: the queue is bounded (max_queue). A full queue blocks
+submit() for up to put_timeout seconds, then the event is dropped and
+counted in stats()['dropped'].
+
+Tamper evidence: sinks link every record into a SHA-256 hash chain
+(``prev_hash`` -> ``hash``). FileSink continues the chain from the last
+chained line of the file under flock, so the whole file is one chain even
+with several processes appending; LogSink keeps one chain per process,
+tagged with ``chain_id``. verify_chain() checks a log.
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: LogSink starts a new chain in each forked process
+"""
+
+import atexit
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+
+MODES = ('sync', 'group', 'async')
+
+GENESIS_HASH = '0' * 64
+
+
+# =============================================================================
+# HASH CHAIN
+# =============================================================================
+
+def _canonical(record: Dict[str, Any]) -> str:
+    return json.dumps(record, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def chain_hash(prev_hash: str, record: Dict[str, Any]) -> str:
+    """Hash of ``record`` (including its prev_hash) linked to ``prev_hash``."""
+    return hashlib.sha256(f"{prev_hash}\n{_canonical(record)}".encode('utf-8')).hexdigest()
+
+
+class HashChain:
+    """
+    Links records into a hash chain and renders them as JSON lines.
+
+    Each record gets ``prev_hash`` (the previous record's hash) and
+    ``hash`` = sha256(prev_hash + canonical JSON of the record without
+    ``hash``); ``chain_id`` is added when set.
+    """
+
+    def __init__(self, prev_hash: str = GENESIS_HASH, chain_id: Optional[str] = None):
+        self.prev_hash = prev_hash
+        self.chain_id = chain_id
+
+    def link(self, record: Dict[str, Any]) -> str:
+        """Add chain fields to ``record`` and return it as a JSON line."""
+        record = dict(record)
+        if self.chain_id:
+            record['chain_id'] = self.chain_id
+        record['prev_hash'] = self.prev_hash
+        record['hash'] = chain_hash(self.prev_hash, record)
+        self.prev_hash = record['hash']
+        return json.dumps(record, default=str) + '\n'
+
+
+def verify_chain(lines: Iterable[str]) -> Dict[str, Any]:
+    """
+    Verify hash-chained JSON lines (e.g. an audit log file).
+
+    Lines without a ``hash`` (written before chaining existed) are skipped.
+    Records are grouped by ``chain_id``; each chain must start at the
+    genesis hash and every record must link to the one before it.
+
+    Returns:
+        {'ok': bool, 'records': int, 'unchained': int, 'chains': int,
+         'first_error': None or {'line': n, 'reason': str}}
+    """
+    heads: Dict[Optional[str], str] = {}
+    result = {'ok': True, 'records': 0, 'unchained': 0, 'chains': 0, 'first_error': None}
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            result['unchained'] += 1
+            continue
+        if not isinstance(record, dict) or 'hash' not in record:
+            result['unchained'] += 1
+            continue
+
+        stored = record.pop('hash')
+        chain_id = record.get('chain_id')
+        expected_prev = heads.get(chain_id, GENESIS_HASH)
+
+        reason = None
+        if record.get('prev_hash') != expected_prev:
+            reason = 'prev_hash does not match the previous record'
+        elif chain_hash(expected_prev, record) != stored:
+            reason = 'hash does not match record contents'
+
+        if reason:
+            result['ok'] = False
+            result['first_error'] = {'line': number, 'reason': reason}
+            return result
+
+        if chain_id not in heads:
+            result['chains'] += 1
+        heads[chain_id] = stored
+        result['records'] += 1
+
+    return result
+
+
+# =============================================================================
+# SINKS
+# =============================================================================
+
+class FileSink:
+    """
+    Appends batches to a JSON-lines file: one flock, one write and one
+    fsync per batch. The chain continues from the file's last chained line,
+    read under the same flock, so concurrent processes extend one chain.
+    """
+
+    # How far back to look for the last chained line
+    TAIL_SCAN_BYTES = 1024 * 1024
+
+    def __init__(self, path, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+
+    def _last_hash(self, f) -> str:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        scanned = 0
+        block = 8192
+        tail = b''
+        while end > 0 and scanned < self.TAIL_SCAN_BYTES:
+            size = min(block, end)
+            end -= size
+            scanned += size
+            f.seek(end)
+            tail = f.read(size) + tail
+            lines = tail.split(b'\n')
+            # The first piece may be a partial line unless we reached the start
+            candidates = lines if end == 0 else lines[1:]
+            for raw in reversed(candidates):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue  # e.g. a torn final line
+                if isinstance(record, dict) and record.get('hash'):
+                    return record['hash']
+            block *= 2
+        return GENESIS_HASH
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        with open(self.path, 'a+b') as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                chain = HashChain(self._last_hash(f))
+                data = ''.join(chain.link(record) for record in records).encode('utf-8')
+                f.seek(0, os.SEEK_END)
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class LogSink:
+    """
+    Emits each record as one JSON line through a ``logging.Logger``
+    (stdout / CloudWatch), chained per process under a random chain_id.
+    """
+
+    def __init__(self, logger, level: int = logging.INFO):
+        self.logger = logger
+        self.level = level
+        self._new_chain()
+
+    def _new_chain(self) -> None:
+        self.chain = HashChain(chain_id=uuid.uuid4().hex[:12])
+        self._pid = os.getpid()
+
+    def write_batch(self, records: List[Dict[str, Any]]) -> None:
+        # A sink built before a fork (gunicorn --preload) would give every
+        # worker the same chain_id and genesis; each process starts its own
+        if self._pid != os.getpid():
+            self._new_chain()
+        for record in records:
+            self.logger.log(self.level, self.chain.link(record).rstrip('\n'))
+
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+class _Item:
+    __slots__ = ('record', 'enqueued', 'done', 'ok')
+
+    def __init__(self, record, done=None):
+        self.record = record  # None marks a flush request
+        self.enqueued = time.monotonic()
+        self.done = done
+        self.ok = True
+
+
+class AuditPipeline:
+    """
+    Bounded queue + writer thread feeding a sink in batches.
+
+    Args:
+        sink: Object with write_batch(records)
+        mode: 'sync', 'group' or 'async' (see module docstring)
+        max_queue: Queue capacity (events)
+        batch_size: Max events per write
+        linger_ms: How long the writer waits for more events before writing
+            a partial batch (async mode; group mode never lingers)
+        put_timeout: Seconds submit() waits on a full queue before dropping
+        name: Label for log messages
+    """
+
+    def __init__(
+        self,
+        sink,
+        mode: str = 'async',
+        max_queue: int = 10000,
+        batch_size: int = 500,
+        linger_ms: int = 50,
+        put_timeout: float = 1.0,
+        name: str = 'audit'
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Unknown audit pipeline mode: {mode}")
+        self.sink = sink
+        self.mode = mode
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000.0 if mode == 'async' else 0.0
+        self.put_timeout = put_timeout
+        self.name = name
+
+        self._sync_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'submitted': 0,
+            'written': 0,
+            'dropped': 0,
+            'failed': 0,
+            'batches': 0,
+            'latency_ms_total': 0.0,
+            'latency_ms_max': 0.0,
+            'last_error': None,
+        }
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._closed = False
+        atexit.register(self.close)
+
+    # -------------------------------------------------------------------------
+    # Submission
+    # -------------------------------------------------------------------------
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """
+        Hand a record to the pipeline.
+
+        Returns:
+            True if accepted (written, for sync/group), False if dropped
+            or (sync/group) the write failed
+        """
+        with self._stats_lock:
+            self._stats['submitted'] += 1
+
+        if self.mode == 'sync' or self._closed:
+            item = _Item(record)
+            with self._sync_lock:
+                return self._write([item])
+
+        self._ensure_worker()
+        done = threading.Event() if self.mode == 'group' else None
+        item = _Item(record, done)
+        try:
+            self._queue.put(item, timeout=self.put_timeout)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats['dropped'] += 1
+                dropped = self._stats['dropped']
+            if dropped == 1 or dropped % 100 == 0:
+                print(f"[AuditPipeline] WARNING: {self.name} queue full, {dropped} events dropped")
+            return False
+
+        if done is not None:
+            done.wait()
+            return item.ok
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every event submitted before this call is written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        if self.mode == 'sync' or self._queue is None or self._pid != os.getpid():
+            return True
+        marker = _Item(None, threading.Event())
+        try:
+            self._queue.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Flush and stop the writer (registered with atexit). Events
+        submitted afterwards are written synchronously.
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._queue is None or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+        # Anything that raced past the closed check
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                leftovers.append(item)
+        records = [item for item in leftovers if item.record is not None]
+        if records:
+            with self._sync_lock:
+                self._write(records)
+        for item in leftovers:
+            if item.record is None:
+                item.done.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pipeline metrics: submitted / written / dropped / failed events,
+        batches, queue depth, mean batch size and enqueue-to-durable
+        latency (avg and max, ms).
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        written = stats.pop('written')
+        batches = stats['batches']
+        latency_total = stats.pop('latency_ms_total')
+        stats.update({
+            'mode': self.mode,
+            'written': written,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'avg_batch_size': round(written / batches, 1) if batches else 0,
+            'latency_ms_avg': round(latency_total / written, 2) if written else 0,
+            'latency_ms_max': round(stats['latency_ms_max'], 2),
+        })
+        return stats
+
+    # -------------------------------------------------------------------------
+    # Writer
+    # -------------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork (gunicorn --preload): start one per process
+        if self._pid == os.getpid():
+            return
+        with self._sync_lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=self.max_queue)
+            self._thread = threading.Thread(
+                target=self._run, name=f'{self.name}-writer', daemon=True
+            )
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def _run(self) -> None:
+        q = self._queue
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self.linger
+            stop = False
+            while len(batch) < self.batch_size and batch[-1].record is not None:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+
+            records = [i for i in batch if i.record is not None]
+            if records:
+                self._write(records)
+            for i in batch:
+                if i.record is None:
+                    i.done.set()
+            if stop:
+                return
+
+    def _write(self, items: List[_Item]) -> bool:
+        ok = True
+        e = None
+        try:
+            self.sink.write_batch([item.record for item in items])
+        except Exception as error:
+            ok = False
+            e = error
+            print(f"[AuditPipeline] ERROR writing {len(items)} {self.name} events: {error}")
+
+        now = time.monotonic()
+        with self._stats_lock:
+            if ok:
+                self._stats['written'] += len(items)
+                self._stats['batches'] += 1
+                for item in items:
+                    latency = (now - item.enqueued) * 1000
+                    self._stats['latency_ms_total'] += latency
+                    if latency > self._stats['latency_ms_max']:
+                        self._stats['latency_ms_max'] = latency
+            else:
+                self._stats['failed'] += len(items)
+                self._stats['last_error'] = f"{time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())} {e}"
+
+        for item in items:
+            item.ok = ok
+            if item.done is not None:
+                item.done.set()
+        return ok
@@ -139,6 +139,12 @@ class AuthorDateTransformer:
         self.endnotes_xml = None
         self.footnotes_xml = None
         self.references: List[NoteReference] = []
+        self._loaded = False
+        
+        # Built once after parsing (see _find_note_references)
+        self._parent_map: Dict[ET.Element, ET.Element] = {}
+        self._reference_runs: List[Tuple[ET.Element, ET.Element]] = []  # (para, run) per reference
+        self._replaced_runs: Dict[ET.Element, ET.Element] = {}  # removed run -> its replacement
     
     def transform(
         self,
@@ -157,11 +163,9 @@ class AuthorDateTransformer:
             Bytes of the transformed .docx file
         """
         try:
-            # Step 1: Extract the docx
-            self._extract_docx()
-            
-            # Step 2: Parse XML files
-            self._parse_xml_files()
+            # Steps 1-2: Extract the docx and parse XML files (no-op if
+            # already loaded for extraction)
+            self.load()
             
             # Step 3: Find all note references in body
             self._find_note_references()
@@ -182,18 +186,36 @@ class AuthorDateTransformer:
         finally:
             self.cleanup()
     
-    def extract_note_texts(self) -> Dict[str, str]:
+    def load(self):
+        """
+        Extract the docx and parse its XML parts, once.
+        
+        extract_note_texts(), get_body_text() and transform() all share the
+        parsed trees, so a caller that needs all three (e.g. the Lambda
+        processor) unzips and parses the document a single time.
+        """
+        if self._loaded:
+            return
+        self._extract_docx()
+        self._parse_xml_files()
+        self._loaded = True
+    
+    def extract_note_texts(self, keep_loaded: bool = False) -> Dict[str, str]:
         """
         Extract the text content of all notes without transforming.
         
         Used for the lookup phase before transformation.
         
+        Args:
+            keep_loaded: Keep the extracted package and parsed trees for a
+                         later get_body_text()/transform() call. The caller
+                         is then responsible for cleanup().
+        
         Returns:
             Dict mapping note_id to note text content
         """
         try:
-            self._extract_docx()
-            self._parse_xml_files()
+            self.load()
             
             note_texts = {}
             
@@ -218,7 +240,30 @@ class AuthorDateTransformer:
             return note_texts
             
         finally:
-            self.cleanup()
+            if not keep_loaded:
+                self.cleanup()
+    
+    def get_body_text(self, max_chars: int = 2000) -> str:
+        """
+        Plain text of the document body, for gist generation.
+        
+        Same output as WordDocumentProcessor.get_body_text(), but read from
+        the already-parsed document tree. Call before transform(), which
+        rewrites the body.
+        
+        Args:
+            max_chars: Maximum characters to return
+        
+        Returns:
+            Whitespace-normalized body text, truncated with "..."
+        """
+        self.load()
+        root = self.document_xml.getroot()
+        full_text = ' '.join(t.text for t in root.iter(f'{{{NAMESPACES["w"]}}}t') if t.text)
+        full_text = ' '.join(full_text.split())
+        if len(full_text) > max_chars:
+            full_text = full_text[:max_chars] + "..."
+        return full_text
     
     # =========================================================================
     # EXTRACTION METHODS
@@ -226,6 +271,7 @@ class AuthorDateTransformer:
     
     def _extract_docx(self):
         """Extract the docx zip archive to temp directory."""
+        os.makedirs(self.temp_dir, exist_ok=True)
         with zipfile.ZipFile(BytesIO(self.docx_bytes), 'r') as zf:
             zf.extractall(self.temp_dir)
     
@@ -247,23 +293,57 @@ class AuthorDateTransformer:
             self.footnotes_xml = ET.parse(footnotes_path)
     
     def _find_note_references(self):
-        """Find all endnote and footnote references in the document body."""
+        """
+        Find all endnote and footnote references in the document body.
+        
+        Also builds the child -> parent map and records the (paragraph, run)
+        elements of every reference, so later edits never have to search
+        the tree again.
+        """
         root = self.document_xml.getroot()
+        self._parent_map = {child: parent for parent in root.iter() for child in parent}
+        
         body = root.find('.//w:body', NAMESPACES)
         
         if body is None:
             return
         
+        w = NAMESPACES['w']
+        run_tag = f'{{{w}}}r'
+        endnote_tag = f'{{{w}}}endnoteReference'
+        footnote_tag = f'{{{w}}}footnoteReference'
+        id_attr = f'{{{w}}}id'
+        
+        # Note-reference index: run -> {tag: first reference inside it}.
+        # Every enclosing run is indexed (runs can hold text boxes), which
+        # matches run.find('.//w:endnoteReference') on each run.
+        run_refs: Dict[ET.Element, Dict[str, ET.Element]] = {}
+        for elem in body.iter():
+            if elem.tag != endnote_tag and elem.tag != footnote_tag:
+                continue
+            ancestor = self._parent_map.get(elem)
+            while ancestor is not None and ancestor is not body:
+                if ancestor.tag == run_tag:
+                    run_refs.setdefault(ancestor, {}).setdefault(elem.tag, elem)
+                ancestor = self._parent_map.get(ancestor)
+        
+        if not run_refs:
+            return
+        
         paragraphs = body.findall('.//w:p', NAMESPACES)
         
         for para_idx, para in enumerate(paragraphs):
             runs = para.findall('.//w:r', NAMESPACES)
             
             for run_idx, run in enumerate(runs):
+                refs = run_refs.get(run)
+                if refs is None:
+                    continue
+                
                 # Check for endnote reference
-                endnote_ref = run.find('.//w:endnoteReference', NAMESPACES)
+                endnote_ref = refs.get(endnote_tag)
                 if endnote_ref is not None:
-                    note_id = endnote_ref.get(f'{{{NAMESPACES["w"]}}}id')
+                    note_id = endnote_ref.get(id_attr)
                     if note_id and note_id not in ['0', '-1']:
                         self.references.append(NoteReference(
                             note_id=note_id,
@@ -271,11 +351,12 @@ class AuthorDateTransformer:
                             paragraph_index=para_idx,
                             run_index=run_idx
                         ))
+                        self._reference_runs.append((para, run))
                 
                 # Check for footnote reference
-                footnote_ref = run.find('.//w:footnoteReference', NAMESPACES)
+                footnote_ref = refs.get(footnote_tag)
                 if footnote_ref is not None:
-                    note_id = footnote_ref.get(f'{{{NAMESPACES["w"]}}}id')
+                    note_id = footnote_ref.get(id_attr)
                     if note_id and note_id not in ['0', '-1']:
                         self.references.append(NoteReference(
                             note_id=note_id,
@@ -283,6 +364,7 @@ class AuthorDateTransformer:
                             paragraph_index=para_idx,
                             run_index=run_idx
                         ))
+                        self._reference_runs.append((para, run))
     
     def _extract_note_content(self, note_elem: ET.Element) -> str:
         """Extract text content from a note element."""
@@ -312,21 +394,14 @@ class AuthorDateTransformer:
         """
         Transform document body: remove superscripts, insert parentheticals.
         
-        Process in reverse order to maintain paragraph/run indices.
+        Uses the (paragraph, run) index recorded by _find_note_references
+        instead of re-searching each paragraph. Processed in reverse order
+        so that inserted runs never precede a reference still to be handled.
         """
-        root = self.document_xml.getroot()
-        body = root.find('.//w:body', NAMESPACES)
-        paragraphs = body.findall('.//w:p', NAMESPACES)
-        
-        # Process in reverse order to maintain indices
-        for ref in reversed(self.references):
-            para = paragraphs[ref.paragraph_index]
-            runs = para.findall('.//w:r', NAMESPACES)
-            
-            if ref.run_index >= len(runs):
-                continue
-            
-            run = runs[ref.run_index]
+        for ref, (para, run) in zip(reversed(self.references), reversed(self._reference_runs)):
+            # A run holding two references may already have been swapped
+            # for a parenthetical run by the later reference
+            run = self._replaced_runs.get(run, run)
             
             # Get the resolved note
             note_key = f"{ref.note_type}_{ref.note_id}"
@@ -376,6 +451,7 @@ class AuthorDateTransformer:
             new_run = self._create_text_run(parenthetical)
             para.remove(run)
             para.insert(run_index, new_run)
+            self._replaced_runs[run] = new_run
         else:
             # Run still has text, insert parenthetical after it
             new_run = self._create_text_run(parenthetical)
@@ -389,7 +465,7 @@ class AuthorDateTransformer:
             ref_tag = 'footnoteReference'
         
         for elem in run.findall(f'.//w:{ref_tag}', NAMESPACES):
-            parent = self._find_parent(run, elem)
+            parent = self._parent_map.get(elem)
             if parent is not None:
                 parent.remove(elem)
     
@@ -404,14 +480,6 @@ class AuthorDateTransformer:
         
         return run
     
-    def _find_parent(self, root: ET.Element, target: ET.Element) -> Optional[ET.Element]:
-        """Find the parent of a target element."""
-        for parent in root.iter():
-            for child in parent:
-                if child == target:
-                    return parent
-        return None
-    
     # =========================================================================
     # NOTES CLEARING
     # =========================================================================
@@ -613,6 +681,7 @@ class AuthorDateTransformer:
     
     def cleanup(self):
         """Remove temporary files."""
+        self._loaded = False
         if os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
 
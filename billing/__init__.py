@@ -47,7 +47,7 @@ from billing.config import (
     PRODUCTS, get_product, get_purchasable_products,
     CREDITS_PER_DOCUMENT, SIGNUP_BONUS_CREDITS
 )
-from billing.admin_models import DocumentSession, APICall, DailyStats
+from billing.admin_models import DocumentSession, APICall, DailyStats, DailyRollup
 
 
 def init_billing(app):
@@ -114,4 +114,5 @@ __all__ = [
     'DocumentSession',
     'APICall',
     'DailyStats',
+    'DailyRollup',
 ]
@@ -6,6 +6,9 @@ SQLAlchemy models for admin analytics and cost tracking.
 Tables:
     - api_calls: Individual API call records with cost and metadata
     - document_sessions: Document processing session records
+    - daily_stats: Per-day summary row, written when a day is rolled up
+    - daily_rollups: Per-day aggregates by provider / source_type /
+      citation_type, incremented as calls are logged (see billing/rollups.py)
 
 These tables enable:
     - Per-document and per-citation cost tracking
@@ -15,6 +18,7 @@ These tables enable:
     - Trend analysis over time
 
 Version History:
+    2026-10-18: Added DailyRollup
     2025-12-20: Initial implementation
 """
 
@@ -22,8 +26,8 @@ from datetime import datetime
 from typing import Optional
 
 from sqlalchemy import (
-    Column, String, Integer, Boolean, DateTime, Text, Float,
-    ForeignKey, Index, Enum as SQLEnum
+    Column, String, Integer, Boolean, Date, DateTime, Text, Float,
+    ForeignKey, Index, UniqueConstraint, Enum as SQLEnum
 )
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
@@ -289,6 +293,57 @@ class DailyStats(Base):
         return f'<DailyStats {self.date.strftime("%Y-%m-%d")}>'
 
 
+# =============================================================================
+# DAILY ROLLUP MODEL (Incremental per-dimension aggregates)
+# =============================================================================
+
+class DailyRollup(Base):
+    """
+    Per-day aggregate for one value of one dimension.
+    
+    Dimensions:
+        - provider / source_type / citation_type: API call counters
+          (calls, successes, cost, tokens) keyed by that column's value
+        - documents: document counters keyed by 'preview' or 'paid'
+    
+    Rows are incremented with an upsert as calls and documents are logged,
+    and rebuilt from raw rows by billing.rollups.rollup_day() (run on the
+    first event of each UTC day, lazily by readers, and by backfill).
+    """
+    __tablename__ = 'daily_rollups'
+    __table_args__ = (
+        UniqueConstraint('date', 'dimension', 'key', name='uq_daily_rollups_date_dim_key'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    
+    # UTC day and what is being counted
+    date = Column(Date, nullable=False)
+    dimension = Column(String(20), nullable=False)  # provider, source_type, citation_type, documents
+    key = Column(String(100), nullable=False)  # e.g. 'openai', 'doi', 'journal', 'paid'
+    
+    # API call counters
+    calls = Column(Integer, default=0, nullable=False)
+    successes = Column(Integer, default=0, nullable=False)
+    cost_usd = Column(Float, default=0.0, nullable=False)
+    input_tokens = Column(Integer, default=0, nullable=False)
+    output_tokens = Column(Integer, default=0, nullable=False)
+    
+    # Document counters (dimension = 'documents')
+    documents = Column(Integer, default=0, nullable=False)
+    citations_found = Column(Integer, default=0, nullable=False)
+    citations_resolved = Column(Integer, default=0, nullable=False)
+    citations_failed = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f'<DailyRollup {self.date} {self.dimension}={self.key}>'
+
+
+Index('idx_daily_rollups_dim_date', DailyRollup.dimension, DailyRollup.date)
+
+
 # =============================================================================
 # ACCEPTED CITATION MODEL
 # =============================================================================
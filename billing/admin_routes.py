@@ -13,13 +13,21 @@ Endpoints (all require ?key=ADMIN_SECRET):
     GET  /admin/api/citation-types - Citation type distribution
     GET  /admin/api/trends         - Cost trends over time
     GET  /admin/api/export/csv     - Export all data as CSV
-    POST /admin/api/refresh-stats  - Recalculate daily stats
+    POST /admin/api/refresh-stats  - Rebuild daily rollups from raw rows
+
+Aggregates (stats, costs, success rates, citation types, trends) are read
+from daily_rollups for full days; only partial days (e.g. today) touch the
+raw api_calls / document_sessions rows. See billing/rollups.py.
 
 Authentication:
     All routes require ?key=ADMIN_SECRET query parameter.
     This is simple token-based auth for admin-only access.
 
 Version History:
+    2026-10-18: Added scheduler endpoint (queue depth and wait time per class)
+    2026-10-18: Added http-pool endpoint (outbound connection pool metrics)
+    2026-10-18: URL stats grouped in SQL; CSV exports streamed in chunks
+    2026-10-18: Aggregates read from daily rollups; added refresh-stats
     2025-12-20: Initial implementation
 """
 
@@ -29,10 +37,11 @@ from io import StringIO
 from datetime import datetime, timedelta
 from functools import wraps
 
-from flask import Blueprint, request, jsonify, render_template_string, Response
+from flask import Blueprint, request, jsonify, render_template_string, Response, stream_with_context
 from sqlalchemy import func, desc, case
 
 from billing.db import get_db
+from billing import rollups
 
 
 # =============================================================================
@@ -119,6 +128,34 @@ def get_date_range(period: str = '30d') -> tuple:
     return (now - timedelta(days=30), now)
 
 
+# Rows fetched per round trip (server-side cursor) and written per CSV chunk
+CSV_CHUNK_ROWS = 1000
+
+
+def stream_csv(header: list, rows):
+    """
+    Streamed CSV response body for ``rows`` (an iterable of lists).
+    
+    Rows are written in chunks of CSV_CHUNK_ROWS, so memory use does not
+    grow with the export size. Pass a query using yield_per() to also keep
+    the database side constant.
+    """
+    def generate():
+        buffer = StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        for count, row in enumerate(rows, 1):
+            writer.writerow(row)
+            if count % CSV_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+        yield buffer.getvalue()
+    
+    # Keep the request (and its scoped DB session) alive while streaming
+    return stream_with_context(generate())
+
+
 # =============================================================================
 # DASHBOARD HTML
 # =============================================================================
@@ -723,7 +760,7 @@ def api_stats():
     Query params:
         - period: '7d', '30d', '90d', or date range
     """
-    from billing.admin_models import APICall, DocumentSession
+    from billing.admin_models import DocumentSession
     
     period = request.args.get('period', '30d')
     start_date, end_date = get_date_range(period)
@@ -731,36 +768,21 @@ def api_stats():
     db = get_db()
     
     # Total cost and calls
-    cost_stats = db.query(
-        func.sum(APICall.cost_usd),
-        func.count(APICall.id),
-        func.count(case((APICall.success == True, 1)))
-    ).filter(
-        APICall.timestamp >= start_date,
-        APICall.timestamp < end_date
-    ).first()
+    cost_stats = rollups.api_totals(start_date, end_date)
     
-    total_cost = cost_stats[0] or 0.0
-    call_count = cost_stats[1] or 0
-    successful_calls = cost_stats[2] or 0
+    total_cost = cost_stats['cost']
+    call_count = cost_stats['calls']
+    successful_calls = cost_stats['successes']
     
     # Document stats
-    doc_stats = db.query(
-        func.count(DocumentSession.id),
-        func.count(case((DocumentSession.is_preview == False, 1))),
-        func.sum(DocumentSession.citations_resolved),
-        func.sum(DocumentSession.citations_failed)
-    ).filter(
-        DocumentSession.started_at >= start_date,
-        DocumentSession.started_at < end_date
-    ).first()
+    doc_stats = rollups.document_totals(start_date, end_date)
     
-    document_count = doc_stats[0] or 0
-    paid_documents = doc_stats[1] or 0
-    citations_resolved = doc_stats[2] or 0
-    citations_failed = doc_stats[3] or 0
+    document_count = doc_stats['documents']
+    paid_documents = doc_stats['paid_documents']
+    citations_resolved = doc_stats['citations_resolved']
+    citations_failed = doc_stats['citations_failed']
     
-    # Median and mode cost per document
+    # Median and mode cost per document (not additive, so read raw)
     doc_costs = db.query(DocumentSession.total_cost_usd).filter(
         DocumentSession.started_at >= start_date,
         DocumentSession.started_at < end_date,
@@ -834,27 +856,14 @@ def api_stats():
 @requires_admin_key
 def api_costs():
     """Get cost breakdown by provider."""
-    from billing.admin_models import APICall
-    
     period = request.args.get('period', '30d')
     start_date, end_date = get_date_range(period)
     
-    db = get_db()
-    
-    provider_stats = db.query(
-        APICall.provider,
-        func.sum(APICall.cost_usd),
-        func.count(APICall.id)
-    ).filter(
-        APICall.timestamp >= start_date,
-        APICall.timestamp < end_date
-    ).group_by(APICall.provider).all()
-    
     by_provider = {}
-    for provider, cost, count in provider_stats:
+    for provider, stats in rollups.api_breakdown('provider', start_date, end_date).items():
         by_provider[provider] = {
-            'cost': cost or 0.0,
-            'calls': count or 0
+            'cost': stats['cost'],
+            'calls': stats['calls']
         }
     
     return jsonify({
@@ -873,21 +882,41 @@ def api_url_stats():
     by domain and resolution method.
     """
     from billing.admin_models import APICall
-    import json
     
     period = request.args.get('period', '30d')
     start_date, end_date = get_date_range(period)
     
     db = get_db()
     
-    # Get all URL fetch records
-    url_calls = db.query(APICall).filter(
+    # Group in SQL on the JSONB fields written by cost_tracker.log_url_fetch;
+    # only one row per (method, domain, success, reason) comes back
+    meta = APICall.metadata_json
+    succeeded = func.coalesce(APICall.success, False)
+    method_expr = func.coalesce(func.nullif(APICall.endpoint, ''), 'unknown')
+    domain_expr = func.coalesce(meta['domain'].astext, 'unknown')
+    reason_expr = case(
+        (succeeded == True, None),
+        else_=func.coalesce(
+            func.nullif(meta['failure_reason'].astext, ''),
+            func.nullif(APICall.error_message, ''),
+            'unknown'
+        )
+    )
+    
+    groups = db.query(
+        method_expr,
+        domain_expr,
+        succeeded,
+        reason_expr,
+        func.count(APICall.id),
+        func.count(case((meta['used_ai_fallback'].astext == 'true', 1)))
+    ).filter(
         APICall.timestamp >= start_date,
         APICall.timestamp < end_date,
         APICall.provider == 'url_fetch'
-    ).all()
+    ).group_by(method_expr, domain_expr, succeeded, reason_expr).all()
     
-    if not url_calls:
+    if not groups:
         return jsonify({
             'total_urls': 0,
             'success_rate': 0,
@@ -898,49 +927,34 @@ def api_url_stats():
             'period': period
         })
     
-    total = len(url_calls)
-    successful = sum(1 for c in url_calls if c.success)
+    total = 0
+    successful = 0
     ai_fallbacks = 0
     by_method = {}
     by_domain = {}
     failures = {}
     
-    for call in url_calls:
+    for method, domain, success, reason, count, ai_count in groups:
+        total += count
+        ai_fallbacks += ai_count
+        
         # Count by method (stored in endpoint field)
-        method = call.endpoint or 'unknown'
         if method not in by_method:
             by_method[method] = {'total': 0, 'success': 0}
-        by_method[method]['total'] += 1
-        if call.success:
-            by_method[method]['success'] += 1
-        
-        # Parse metadata
-        meta = call.metadata_json or {}
-        if isinstance(meta, str):
-            try:
-                meta = json.loads(meta)
-            except:
-                meta = {}
+        by_method[method]['total'] += count
         
         # Count by domain
-        domain = meta.get('domain', 'unknown')
         if domain not in by_domain:
             by_domain[domain] = {'total': 0, 'success': 0, 'failures': {}}
-        by_domain[domain]['total'] += 1
-        if call.success:
-            by_domain[domain]['success'] += 1
-        else:
-            reason = meta.get('failure_reason') or call.error_message or 'unknown'
-            by_domain[domain]['failures'][reason] = by_domain[domain]['failures'].get(reason, 0) + 1
-        
-        # Count AI fallbacks
-        if meta.get('used_ai_fallback'):
-            ai_fallbacks += 1
+        by_domain[domain]['total'] += count
         
-        # Count overall failure reasons
-        if not call.success:
-            reason = meta.get('failure_reason') or call.error_message or 'unknown'
-            failures[reason] = failures.get(reason, 0) + 1
+        if success:
+            successful += count
+            by_method[method]['success'] += count
+            by_domain[domain]['success'] += count
+        else:
+            by_domain[domain]['failures'][reason] = by_domain[domain]['failures'].get(reason, 0) + count
+            failures[reason] = failures.get(reason, 0) + count
     
     # Calculate success rates for methods
     for method in by_method:
@@ -1048,73 +1062,41 @@ def api_calls():
 @requires_admin_key
 def api_success_rates():
     """Get success rates by source type."""
-    from billing.admin_models import APICall
-    
     period = request.args.get('period', '30d')
     start_date, end_date = get_date_range(period)
     
-    db = get_db()
+    rates = rollups.api_breakdown('source_type', start_date, end_date)
     
-    rates = db.query(
-        APICall.source_type,
-        (func.count(case((APICall.success == True, 1))) * 100.0 / 
-         func.nullif(func.count(APICall.id), 0)).label('success_rate')
-    ).filter(
-        APICall.timestamp >= start_date,
-        APICall.timestamp < end_date,
-        APICall.source_type.isnot(None)
-    ).group_by(APICall.source_type).all()
-    
-    return jsonify({row[0]: round(row[1] or 0, 1) for row in rates})
+    return jsonify({
+        source_type: round(stats['successes'] * 100.0 / stats['calls'], 1) if stats['calls'] else 0
+        for source_type, stats in rates.items()
+    })
 
 
 @admin_bp.route('/api/citation-types')
 @requires_admin_key
 def api_citation_types():
     """Get citation type distribution."""
-    from billing.admin_models import APICall
-    
     period = request.args.get('period', '30d')
     start_date, end_date = get_date_range(period)
     
-    db = get_db()
-    
-    dist = db.query(
-        APICall.citation_type,
-        func.count(APICall.id)
-    ).filter(
-        APICall.timestamp >= start_date,
-        APICall.timestamp < end_date,
-        APICall.citation_type.isnot(None)
-    ).group_by(APICall.citation_type).all()
+    dist = rollups.api_breakdown('citation_type', start_date, end_date)
     
-    return jsonify({row[0]: row[1] for row in dist})
+    return jsonify({citation_type: stats['calls'] for citation_type, stats in dist.items()})
 
 
 @admin_bp.route('/api/trends')
 @requires_admin_key
 def api_trends():
     """Get daily cost trends."""
-    from billing.admin_models import APICall
-    
     days = int(request.args.get('days', 14))
     
-    db = get_db()
-    
     # Get daily costs for last N days
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    daily = db.query(
-        func.date(APICall.timestamp).label('date'),
-        func.sum(APICall.cost_usd).label('cost')
-    ).filter(
-        APICall.timestamp >= start_date,
-        APICall.timestamp < end_date
-    ).group_by(func.date(APICall.timestamp)).order_by('date').all()
-    
     # Fill in missing days
-    date_costs = {row[0]: row[1] for row in daily}
+    date_costs = rollups.daily_costs(start_date, end_date)
     dates = []
     costs = []
     
@@ -1145,49 +1127,45 @@ def api_export_csv():
     
     db = get_db()
     
-    calls = db.query(APICall).filter(
+    # Only the exported columns, fetched CSV_CHUNK_ROWS at a time
+    calls = db.query(
+        APICall.timestamp,
+        APICall.provider,
+        APICall.endpoint,
+        APICall.input_tokens,
+        APICall.output_tokens,
+        APICall.cost_usd,
+        APICall.source_type,
+        APICall.citation_type,
+        APICall.success,
+        APICall.confidence,
+        APICall.latency_ms,
+        func.substr(APICall.raw_query, 1, 200)
+    ).filter(
         APICall.timestamp >= start_date,
         APICall.timestamp < end_date
-    ).order_by(desc(APICall.timestamp)).all()
+    ).order_by(desc(APICall.timestamp)).yield_per(CSV_CHUNK_ROWS)
     
-    # Build CSV
-    output = StringIO()
-    writer = csv.writer(output)
-    
-    # Header
-    writer.writerow([
+    header = [
         'timestamp_est', 'provider', 'endpoint', 'input_tokens', 'output_tokens',
         'cost_usd', 'source_type', 'citation_type', 'success', 'confidence',
         'latency_ms', 'query'
-    ])
-    
-    # Data
-    for c in calls:
-        # Convert UTC timestamp to EST
-        if c.timestamp:
-            ts_est = c.timestamp.astimezone(est)
-            ts_str = ts_est.strftime('%Y-%m-%d %H:%M:%S EST')
-        else:
-            ts_str = ''
-        
-        writer.writerow([
-            ts_str,
-            c.provider,
-            c.endpoint,
-            c.input_tokens,
-            c.output_tokens,
-            c.cost_usd,
-            c.source_type,
-            c.citation_type,
-            c.success,
-            c.confidence,
-            c.latency_ms,
-            c.raw_query[:200] if c.raw_query else ''
-        ])
+    ]
+    
+    def rows():
+        for timestamp, *columns, query in calls:
+            # Convert UTC timestamp to EST
+            if timestamp:
+                ts_est = timestamp.astimezone(est)
+                ts_str = ts_est.strftime('%Y-%m-%d %H:%M:%S EST')
+            else:
+                ts_str = ''
+            
+            yield [ts_str, *columns, query or '']
     
     # Return as downloadable CSV
     return Response(
-        output.getvalue(),
+        stream_csv(header, rows()),
         mimetype='text/csv',
         headers={
             'Content-Disposition': f'attachment; filename=citategenie_api_calls_{period}.csv'
@@ -1195,6 +1173,75 @@ def api_export_csv():
     )
 
 
+# =============================================================================
+# REFRESH STATS ENDPOINT
+# =============================================================================
+
+@admin_bp.route('/api/refresh-stats', methods=['POST'])
+@requires_admin_key
+def api_refresh_stats():
+    """
+    Rebuild daily rollups (and daily_stats) from raw rows.
+    
+    POST /admin/api/refresh-stats?key=ADMIN_SECRET&days=2
+    
+    Query params:
+        - days: Number of UTC days to rebuild, ending today (default 2, max 366)
+    
+    Optional: closed days are finalized automatically (on the first call
+    of each UTC day, and lazily by the analytics reads). Use this to
+    backfill a long history at once or to repair drifted counters.
+    """
+    days = min(max(int(request.args.get('days', 2)), 1), 366)
+    
+    try:
+        count = rollups.backfill(days)
+        return jsonify({
+            'success': True,
+            'days': count,
+            'refreshed_at': datetime.utcnow().isoformat()
+        })
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+# =============================================================================
+# HTTP POOL ENDPOINT
+# =============================================================================
+
+@admin_bp.route('/api/http-pool')
+@requires_admin_key
+def api_http_pool():
+    """
+    Outbound HTTP connection pool utilization for this worker process.
+    
+    GET /admin/api/http-pool?key=ADMIN_SECRET
+    
+    Per host: requests / errors sent, connections opened, in use and idle.
+    """
+    import http_client
+    return jsonify(http_client.pool_stats())
+
+
+@admin_bp.route('/api/scheduler')
+@requires_admin_key
+def api_scheduler():
+    """
+    Outbound-call scheduler state for this worker process.
+    
+    GET /admin/api/scheduler?key=ADMIN_SECRET
+    
+    Per class (interactive / document / background): queue depth, calls in
+    flight, admitted / shed counts and wait time (avg, p50, p95, max ms);
+    plus running, waiting and refused document runs.
+    """
+    import scheduler
+    return jsonify(scheduler.stats())
+
+
 # =============================================================================
 # CLEAR LOGS ENDPOINT
 # =============================================================================
@@ -1210,12 +1257,12 @@ def api_clear_logs():
     Optional JSON body:
     {
         "confirm": true,           # Required confirmation
-        "tables": ["api_calls", "document_sessions", "daily_stats"]  # Optional: specific tables
+        "tables": ["api_calls", "document_sessions", "daily_stats", "daily_rollups"]  # Optional: specific tables
     }
     
     Returns counts of deleted records.
     """
-    from billing.admin_models import APICall, DocumentSession, DailyStats
+    from billing.admin_models import APICall, DocumentSession, DailyStats, DailyRollup
     
     data = request.get_json() or {}
     
@@ -1227,7 +1274,7 @@ def api_clear_logs():
         }), 400
     
     # Which tables to clear (default: all)
-    tables_to_clear = data.get('tables', ['api_calls', 'document_sessions', 'daily_stats'])
+    tables_to_clear = data.get('tables', ['api_calls', 'document_sessions', 'daily_stats', 'daily_rollups'])
     
     db = get_db()
     deleted_counts = {}
@@ -1247,6 +1294,10 @@ def api_clear_logs():
             count = db.query(DailyStats).delete()
             deleted_counts['daily_stats'] = count
         
+        if 'daily_rollups' in tables_to_clear:
+            count = db.query(DailyRollup).delete()
+            deleted_counts['daily_rollups'] = count
+        
         db.commit()
         
         total_deleted = sum(deleted_counts.values())
@@ -1296,14 +1347,10 @@ def api_export_citations_csv():
     citations = db.query(AcceptedCitation).filter(
         AcceptedCitation.accepted_at >= start_date,
         AcceptedCitation.accepted_at < end_date
-    ).order_by(AcceptedCitation.accepted_at.desc()).all()
-    
-    # Build CSV
-    output = StringIO()
-    writer = csv.writer(output)
+    ).order_by(AcceptedCitation.accepted_at.desc()).yield_per(CSV_CHUNK_ROWS)
     
     # Header - comprehensive SourceComponents columns
-    writer.writerow([
+    header = [
         'accepted_at_est', 'session_id', 'note_id', 'original_text', 'formatted_citation',
         'citation_style', 'citation_type', 'source_engine', 'confidence',
         'title', 'year', 'doi', 'url',
@@ -1313,95 +1360,100 @@ def api_export_citations_csv():
         'publisher', 'place', 'edition', 'isbn',
         'case_name', 'legal_citation', 'court', 'jurisdiction',
         'newspaper', 'access_date'
-    ])
-    
-    # Data
-    for c in citations:
-        # Convert timestamp
-        if c.accepted_at:
-            ts_est = c.accepted_at.astimezone(est)
-            ts_str = ts_est.strftime('%Y-%m-%d %H:%M:%S EST')
-        else:
-            ts_str = ''
-        
-        # Parse authors (stored as JSON array - may be dicts or strings)
-        authors = c.authors or []
-        author_cols = [''] * 8  # 4 authors x 2 (last, first)
-        for i, author in enumerate(authors[:4]):
-            if isinstance(author, dict):
-                # Structured format: {"family": "Caplan", "given": "Eric"}
-                author_cols[i*2] = author.get('family', author.get('last', ''))
-                author_cols[i*2 + 1] = author.get('given', author.get('first', ''))
-            elif isinstance(author, str):
-                # String format - need to parse carefully
-                # Check for "Last, First" format
-                if ',' in author:
-                    parts = author.split(',', 1)
-                    author_cols[i*2] = parts[0].strip()
-                    author_cols[i*2 + 1] = parts[1].strip() if len(parts) > 1 else ''
-                else:
-                    parts = author.split()
-                    if len(parts) == 2:
-                        # Check for PubMed format: "LASTNAME INITIALS" (all caps last name + short initials)
-                        # e.g., "Caplan EM", "JAMES TG"
-                        is_pubmed_format = (
-                            (parts[0].isupper() or parts[0][0].isupper()) and 
-                            len(parts[1]) <= 4 and 
-                            parts[1].isupper()
-                        )
-                        if is_pubmed_format:
-                            # PubMed: "LastName Initials" → Last=parts[0], First=parts[1]
-                            author_cols[i*2] = parts[0].title() if parts[0].isupper() else parts[0]
-                            author_cols[i*2 + 1] = parts[1]
-                        else:
-                            # Standard "First Last" format
-                            author_cols[i*2] = parts[1]  # Last
-                            author_cols[i*2 + 1] = parts[0]  # First
-                    elif len(parts) > 2:
-                        # "First Middle Last" or "First Last Jr."
-                        author_cols[i*2] = parts[-1]  # Last word as last name
-                        author_cols[i*2 + 1] = ' '.join(parts[:-1])  # Rest as first
-                    else:
-                        # Single word - just use as last name
-                        author_cols[i*2] = author
-        
-        writer.writerow([
-            ts_str,
-            c.session_id[:12] if c.session_id else '',
-            c.note_id,
-            (c.original_text or '')[:200],
-            (c.formatted_citation or '')[:500],
-            c.citation_style,
-            c.citation_type,
-            c.source_engine,
-            c.confidence,
-            c.title,
-            c.year,
-            c.doi,
-            c.url,
-            *author_cols,
-            c.journal,
-            c.volume,
-            c.issue,
-            c.pages,
-            c.pmid,
-            c.publisher,
-            c.place,
-            c.edition,
-            c.isbn,
-            c.case_name,
-            c.legal_citation,
-            c.court,
-            c.jurisdiction,
-            c.newspaper,
-            c.access_date
-        ])
+    ]
+    
+    def rows():
+        for c in citations:
+            yield _citation_csv_row(c, est)
     
     return Response(
-        output.getvalue(),
+        stream_csv(header, rows()),
         mimetype='text/csv',
         headers={
             'Content-Disposition': f'attachment; filename=citategenie_citations_{period}.csv'
         }
     )
 
+
+def _citation_csv_row(c, est) -> list:
+    """One AcceptedCitation as a citations-csv row."""
+    # Convert timestamp
+    if c.accepted_at:
+        ts_est = c.accepted_at.astimezone(est)
+        ts_str = ts_est.strftime('%Y-%m-%d %H:%M:%S EST')
+    else:
+        ts_str = ''
+    
+    # Parse authors (stored as JSON array - may be dicts or strings)
+    authors = c.authors or []
+    author_cols = [''] * 8  # 4 authors x 2 (last, first)
+    for i, author in enumerate(authors[:4]):
+        if isinstance(author, dict):
+            # Structured format: {"family": "Caplan", "given": "Eric"}
+            author_cols[i*2] = author.get('family', author.get('last', ''))
+            author_cols[i*2 + 1] = author.get('given', author.get('first', ''))
+        elif isinstance(author, str):
+            # String format - need to parse carefully
+            # Check for "Last, First" format
+            if ',' in author:
+                parts = author.split(',', 1)
+                author_cols[i*2] = parts[0].strip()
+                author_cols[i*2 + 1] = parts[1].strip() if len(parts) > 1 else ''
+            else:
+                parts = author.split()
+                if len(parts) == 2:
+                    # Check for PubMed format: "LASTNAME INITIALS" (all caps last name + short initials)
+                    # e.g., "Caplan EM", "JAMES TG"
+                    is_pubmed_format = (
+                        (parts[0].isupper() or parts[0][0].isupper()) and 
+                        len(parts[1]) <= 4 and 
+                        parts[1].isupper()
+                    )
+                    if is_pubmed_format:
+                        # PubMed: "LastName Initials" → Last=parts[0], First=parts[1]
+                        author_cols[i*2] = parts[0].title() if parts[0].isupper() else parts[0]
+                        author_cols[i*2 + 1] = parts[1]
+                    else:
+                        # Standard "First Last" format
+                        author_cols[i*2] = parts[1]  # Last
+                        author_cols[i*2 + 1] = parts[0]  # First
+                elif len(parts) > 2:
+                    # "First Middle Last" or "First Last Jr."
+                    author_cols[i*2] = parts[-1]  # Last word as last name
+                    author_cols[i*2 + 1] = ' '.join(parts[:-1])  # Rest as first
+                else:
+                    # Single word - just use as last name
+                    author_cols[i*2] = author
+    
+    return [
+        ts_str,
+        c.session_id[:12] if c.session_id else '',
+        c.note_id,
+        (c.original_text or '')[:200],
+        (c.formatted_citation or '')[:500],
+        c.citation_style,
+        c.citation_type,
+        c.source_engine,
+        c.confidence,
+        c.title,
+        c.year,
+        c.doi,
+        c.url,
+        *author_cols,
+        c.journal,
+        c.volume,
+        c.issue,
+        c.pages,
+        c.pmid,
+        c.publisher,
+        c.place,
+        c.edition,
+        c.isbn,
+        c.case_name,
+        c.legal_citation,
+        c.court,
+        c.jurisdiction,
+        c.newspaper,
+        c.access_date
+    ]
+
@@ -41,7 +41,7 @@ from flask import current_app
 from flask_login import LoginManager, login_user, logout_user, current_user
 
 from billing.db import get_db
-from billing.models import User, CreditLedger, CreditReason
+from billing.models import User, CreditLedger, CreditBalance, CreditReason
 from billing.config import SIGNUP_BONUS_CREDITS, SIGNUP_BONUS_REASON
 
 
@@ -190,6 +190,9 @@ def register_user(
         db.add(user)
         db.flush()  # Get user.id before creating ledger entry
         
+        # Balance row (kept in sync with the ledger by billing.ledger)
+        db.add(CreditBalance(user_id=user.id, balance=max(SIGNUP_BONUS_CREDITS, 0)))
+        
         # Grant signup bonus
         if SIGNUP_BONUS_CREDITS > 0:
             bonus = CreditLedger(
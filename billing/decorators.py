@@ -48,6 +48,17 @@ def requires_auth(f):
     return decorated_function
 
 
+def _insufficient_credits(amount: int):
+    """402 response for a user without enough credits."""
+    return jsonify({
+        'success': False,
+        'error': f'Insufficient credits. You need {amount} credit(s) to perform this action.',
+        'code': 'INSUFFICIENT_CREDITS',
+        'required': amount,
+        'buy_url': '/billing/products'
+    }), 402  # Payment Required
+
+
 def requires_credits(amount: int = CREDITS_PER_DOCUMENT, auto_spend: bool = False):
     """
     Decorator that requires user to have sufficient credits.
@@ -85,19 +96,17 @@ def requires_credits(amount: int = CREDITS_PER_DOCUMENT, auto_spend: bool = Fals
                     'code': 'AUTH_REQUIRED'
                 }), 401
             
-            # Check credits
+            # Check credits (O(1) read of the balance row)
             if not has_credits(current_user.id, amount):
-                return jsonify({
-                    'success': False,
-                    'error': f'Insufficient credits. You need {amount} credit(s) to perform this action.',
-                    'code': 'INSUFFICIENT_CREDITS',
-                    'required': amount,
-                    'buy_url': '/billing/products'
-                }), 402  # Payment Required
+                return _insufficient_credits(amount)
             
             # Auto-spend if configured
             if auto_spend:
                 if not spend_credit(current_user.id, amount):
+                    # spend_credit re-checks atomically; a concurrent spend
+                    # may have used the credits since the check above
+                    if not has_credits(current_user.id, amount):
+                        return _insufficient_credits(amount)
                     return jsonify({
                         'success': False,
                         'error': 'Failed to process payment',
@@ -13,26 +13,92 @@ Operations:
     - grant_credits(user_id, amount, reason, ...) -> CreditLedger
     - spend_credit(user_id) -> bool
     - refund_credits(user_id, order_id) -> CreditLedger
+    - reconcile_balances(fix=False) -> list
 
 Design principles:
     1. Never update credits directly - always use ledger entries
     2. Every entry records balance_after for fast reads
     3. All admin actions record who did it
+    4. The balance is materialized in credit_balances and changed by one
+       conditional UPDATE ... RETURNING in the same transaction as the
+       ledger insert, so reads are O(1) and concurrent spends cannot
+       overdraw (the row lock serializes them)
 
 Version History:
+    2026-10-18: _apply_delta updates first and seeds the row only if missing
+    2026-10-18: Materialized balance row; atomic spend; reconciliation
     2025-12-17: Initial implementation
 """
 
-from typing import Optional
+from typing import Optional, List, Dict
 from datetime import datetime
 
-from sqlalchemy import func
+from sqlalchemy import func, update, or_, exists
+from sqlalchemy.dialects.postgresql import insert
 
 from billing.db import get_db
-from billing.models import User, CreditLedger, CreditReason, Order, OrderStatus
+from billing.models import User, CreditLedger, CreditBalance, CreditReason, Order, OrderStatus
 from billing.config import CREDITS_PER_DOCUMENT, MAX_CREDITS_BALANCE
 
 
+# =============================================================================
+# BALANCE ROW
+# =============================================================================
+
+def _ensure_balance_row(db, user_id: int) -> None:
+    """
+    Create the user's credit_balances row if missing, seeded from the ledger.
+    
+    Concurrent callers are safe: ON CONFLICT DO NOTHING waits for a racing
+    insert to commit and then leaves its row alone.
+    """
+    ledger_sum = db.query(
+        func.coalesce(func.sum(CreditLedger.delta), 0)
+    ).filter(CreditLedger.user_id == user_id).scalar_subquery()
+    
+    db.execute(
+        insert(CreditBalance)
+        .values(user_id=user_id, balance=ledger_sum)
+        .on_conflict_do_nothing(index_elements=['user_id'])
+    )
+
+
+def _apply_delta(db, user_id: int, delta: int, *conditions) -> Optional[int]:
+    """
+    Add ``delta`` to the user's balance if ``conditions`` hold, atomically.
+    
+    Runs in the caller's transaction (which must insert the matching ledger
+    entry and commit). The row stays locked until then, so concurrent
+    changes for the same user are serialized. The balance row is seeded
+    from the ledger only when the UPDATE finds no row for the user.
+    
+    Returns:
+        New balance, or None if the conditions did not hold
+    """
+    stmt = update(CreditBalance).where(
+        CreditBalance.user_id == user_id,
+        *conditions
+    ).values(
+        balance=CreditBalance.balance + delta,
+        updated_at=func.now()
+    ).returning(CreditBalance.balance).execution_options(synchronize_session=False)
+    
+    new_balance = db.execute(stmt).scalar()
+    if new_balance is not None:
+        return new_balance
+    
+    # No row updated: either the conditions failed or the user has no
+    # balance row yet. Only the latter pays for seeding from the ledger.
+    has_row = db.query(
+        exists().where(CreditBalance.user_id == user_id)
+    ).scalar()
+    if has_row:
+        return None
+    
+    _ensure_balance_row(db, user_id)
+    return db.execute(stmt).scalar()
+
+
 # =============================================================================
 # BALANCE QUERIES
 # =============================================================================
@@ -41,6 +107,10 @@ def get_balance(user_id: int) -> int:
     """
     Get current credit balance for a user.
     
+    Reads the materialized balance row (O(1)). Users without a row yet
+    (no credit activity since the row was introduced) fall back to the
+    ledger sum.
+    
     Args:
         user_id: User's ID
     
@@ -49,19 +119,21 @@ def get_balance(user_id: int) -> int:
     """
     db = get_db()
     
-    # Sum all deltas for this user
-    result = db.query(func.sum(CreditLedger.delta)).filter(
-        CreditLedger.user_id == user_id
+    balance = db.query(CreditBalance.balance).filter(
+        CreditBalance.user_id == user_id
     ).scalar()
     
-    return result or 0
+    if balance is not None:
+        return balance
+    
+    return get_ledger_balance(user_id)
 
 
 def get_balance_fast(user_id: int) -> int:
     """
-    Get balance from most recent ledger entry (faster for display).
+    Get balance for display.
     
-    Falls back to full calculation if no entries exist.
+    Same as get_balance(), which is now constant-time; kept for callers.
     
     Args:
         user_id: User's ID
@@ -69,24 +141,35 @@ def get_balance_fast(user_id: int) -> int:
     Returns:
         Current balance
     """
+    return get_balance(user_id)
+
+
+def get_ledger_balance(user_id: int) -> int:
+    """
+    Get balance as SUM(delta) over the user's full ledger (source of truth).
+    
+    Args:
+        user_id: User's ID
+    
+    Returns:
+        Ledger balance (0 if no entries)
+    """
     db = get_db()
     
-    # Get most recent entry
-    entry = db.query(CreditLedger).filter(
+    # Sum all deltas for this user
+    result = db.query(func.sum(CreditLedger.delta)).filter(
         CreditLedger.user_id == user_id
-    ).order_by(CreditLedger.created_at.desc()).first()
-    
-    if entry and entry.balance_after is not None:
-        return entry.balance_after
+    ).scalar()
     
-    # Fallback to full calculation
-    return get_balance(user_id)
+    return result or 0
 
 
 def has_credits(user_id: int, required: int = CREDITS_PER_DOCUMENT) -> bool:
     """
     Check if user has enough credits.
     
+    This is a pre-check only; spend_credit() re-checks atomically.
+    
     Args:
         user_id: User's ID
         required: Credits needed (default: 1 document)
@@ -94,7 +177,7 @@ def has_credits(user_id: int, required: int = CREDITS_PER_DOCUMENT) -> bool:
     Returns:
         True if balance >= required
     """
-    return get_balance_fast(user_id) >= required
+    return get_balance(user_id) >= required
 
 
 # =============================================================================
@@ -130,13 +213,15 @@ def grant_credits(
     db = get_db()
     
     try:
-        # Get current balance
-        current_balance = get_balance(user_id)
-        new_balance = current_balance + amount
+        # Add to balance unless it would exceed the max (prevent abuse)
+        new_balance = _apply_delta(
+            db, user_id, amount,
+            CreditBalance.balance + amount <= MAX_CREDITS_BALANCE
+        )
         
-        # Check max balance (prevent abuse)
-        if new_balance > MAX_CREDITS_BALANCE:
-            print(f"[Ledger] Max balance exceeded for user {user_id}: {new_balance}")
+        if new_balance is None:
+            db.rollback()
+            print(f"[Ledger] Max balance exceeded for user {user_id}")
             return None
         
         # Create ledger entry
@@ -170,6 +255,9 @@ def spend_credit(
     """
     Spend credits for document processing.
     
+    The balance check and deduction are one conditional UPDATE, so
+    concurrent spends for the same user cannot overdraw.
+    
     Args:
         user_id: User spending credits
         amount: Credits to spend (default: 1)
@@ -184,15 +272,17 @@ def spend_credit(
     db = get_db()
     
     try:
-        # Check balance
-        current_balance = get_balance(user_id)
+        # Check and deduct in one statement
+        new_balance = _apply_delta(
+            db, user_id, -amount,
+            CreditBalance.balance >= amount
+        )
         
-        if current_balance < amount:
-            print(f"[Ledger] Insufficient balance for user {user_id}: {current_balance} < {amount}")
+        if new_balance is None:
+            db.rollback()
+            print(f"[Ledger] Insufficient balance for user {user_id}: < {amount}")
             return False
         
-        new_balance = current_balance - amount
-        
         # Create ledger entry
         entry = CreditLedger(
             user_id=user_id,
@@ -205,9 +295,11 @@ def spend_credit(
         db.add(entry)
         
         # Update user's document count
-        user = db.query(User).get(user_id)
-        if user:
-            user.total_documents = (user.total_documents or 0) + 1
+        db.execute(
+            update(User).where(User.id == user_id).values(
+                total_documents=func.coalesce(User.total_documents, 0) + 1
+            ).execution_options(synchronize_session=False)
+        )
         
         db.commit()
         
@@ -252,6 +344,13 @@ def refund_credits(
             print(f"[Ledger] No purchase found for order {order_id}")
             return None
         
+        # Calculate refund amount (negative of original grant)
+        refund_amount = -original.delta  # This will be negative
+        
+        # Lock the balance row before checking for an existing refund, so
+        # two concurrent refunds of the same order cannot both pass
+        new_balance = _apply_delta(db, user_id, refund_amount)
+        
         # Check if already refunded
         existing_refund = db.query(CreditLedger).filter(
             CreditLedger.user_id == user_id,
@@ -260,15 +359,10 @@ def refund_credits(
         ).first()
         
         if existing_refund:
+            db.rollback()
             print(f"[Ledger] Order {order_id} already refunded")
             return existing_refund
         
-        # Calculate refund amount (negative of original grant)
-        refund_amount = -original.delta  # This will be negative
-        
-        current_balance = get_balance(user_id)
-        new_balance = current_balance + refund_amount  # Subtracting credits
-        
         # Create refund entry
         entry = CreditLedger(
             user_id=user_id,
@@ -344,14 +438,23 @@ def admin_revoke(
     db = get_db()
     
     try:
-        current_balance = get_balance(user_id)
+        _ensure_balance_row(db, user_id)
+        
+        # Lock the row: the revoke amount depends on the current balance
+        current_balance = db.query(CreditBalance.balance).filter(
+            CreditBalance.user_id == user_id
+        ).with_for_update().scalar() or 0
+        
         new_balance = max(0, current_balance - amount)  # Don't go negative
         actual_revoke = current_balance - new_balance
         
         if actual_revoke <= 0:
+            db.rollback()
             print(f"[Ledger] No credits to revoke for user {user_id}")
             return None
         
+        _apply_delta(db, user_id, -actual_revoke)
+        
         entry = CreditLedger(
             user_id=user_id,
             delta=-actual_revoke,
@@ -373,6 +476,87 @@ def admin_revoke(
         return None
 
 
+# =============================================================================
+# RECONCILIATION
+# =============================================================================
+
+def reconcile_balances(fix: bool = False) -> List[Dict[str, int]]:
+    """
+    Compare every materialized balance with its ledger sum.
+    
+    Run periodically (python -m billing.ledger reconcile [--fix]). A
+    mismatch means a balance was changed outside this module, e.g. a
+    ledger row inserted by hand.
+    
+    Args:
+        fix: Reset mismatched (or missing) balance rows to the ledger sum
+    
+    Returns:
+        List of {'user_id', 'balance', 'ledger_balance'} mismatches
+        (balance is None when the user has no balance row)
+    """
+    db = get_db()
+    
+    ledger_sums = db.query(
+        CreditLedger.user_id.label('user_id'),
+        func.sum(CreditLedger.delta).label('total')
+    ).group_by(CreditLedger.user_id).subquery()
+    
+    mismatches = [
+        {'user_id': user_id, 'balance': balance, 'ledger_balance': total}
+        for user_id, total, balance in db.query(
+            ledger_sums.c.user_id,
+            ledger_sums.c.total,
+            CreditBalance.balance
+        ).outerjoin(
+            CreditBalance, CreditBalance.user_id == ledger_sums.c.user_id
+        ).filter(
+            or_(CreditBalance.balance.is_(None), CreditBalance.balance != ledger_sums.c.total)
+        )
+    ]
+    
+    # Balance rows for users with no ledger entries at all
+    mismatches.extend(
+        {'user_id': user_id, 'balance': balance, 'ledger_balance': 0}
+        for user_id, balance in db.query(
+            CreditBalance.user_id, CreditBalance.balance
+        ).filter(
+            CreditBalance.balance != 0,
+            ~exists().where(CreditLedger.user_id == CreditBalance.user_id)
+        )
+    )
+    
+    for mismatch in mismatches:
+        print(f"[Ledger] Balance mismatch for user {mismatch['user_id']}: "
+              f"{mismatch['balance']} != ledger {mismatch['ledger_balance']}")
+    
+    if fix:
+        for mismatch in mismatches:
+            user_id = mismatch['user_id']
+            try:
+                _ensure_balance_row(db, user_id)
+                # Lock first so the sum includes every committed change
+                db.query(CreditBalance).filter(
+                    CreditBalance.user_id == user_id
+                ).with_for_update().one()
+                db.execute(
+                    update(CreditBalance).where(
+                        CreditBalance.user_id == user_id
+                    ).values(
+                        balance=get_ledger_balance(user_id),
+                        updated_at=func.now()
+                    ).execution_options(synchronize_session=False)
+                )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"[Ledger] Failed to fix balance for user {user_id}: {e}")
+        if mismatches:
+            print(f"[Ledger] Reset {len(mismatches)} balances to their ledger sums")
+    
+    return mismatches
+
+
 # =============================================================================
 # LEDGER QUERIES (for admin dashboard)
 # =============================================================================
@@ -452,12 +636,12 @@ def get_stats() -> dict:
     refunded = abs(refunded_result)
     
     # Active balance (sum of all user balances)
-    active = db.query(func.sum(CreditLedger.delta)).scalar() or 0
+    active = db.query(func.sum(CreditBalance.balance)).scalar() or 0
     
     # Users with positive balance
-    users_with_credits = db.query(CreditLedger.user_id).group_by(
-        CreditLedger.user_id
-    ).having(func.sum(CreditLedger.delta) > 0).count()
+    users_with_credits = db.query(CreditBalance.user_id).filter(
+        CreditBalance.balance > 0
+    ).count()
     
     return {
         'total_credits_granted': granted,
@@ -466,3 +650,19 @@ def get_stats() -> dict:
         'active_balance': active,
         'users_with_credits': users_with_credits
     }
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'reconcile':
+        print("Usage: python -m billing.ledger reconcile [--fix]")
+        sys.exit(1)
+
+    found = reconcile_balances(fix='--fix' in sys.argv[2:])
+    print(f"[Ledger] {len(found)} mismatched balances")
+    sys.exit(1 if found and '--fix' not in sys.argv[2:] else 0)
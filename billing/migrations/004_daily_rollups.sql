@@ -0,0 +1,56 @@
+-- =============================================================================
+-- CITATEGENIE DAILY ROLLUPS SCHEMA
+-- =============================================================================
+-- Incremental per-day aggregates backing the admin analytics API
+-- Run this after 003_resolution_tracking.sql
+--
+-- Tables:
+--   - daily_rollups: Per-day counters by provider, source_type,
+--                    citation_type and document kind (preview/paid)
+--
+-- Rows are incremented (upsert) as API calls and documents are logged.
+-- A day is read from this table once billing.rollups.rollup_day() has
+-- finalized it (daily_stats row); that happens on the first logged event of
+-- each UTC day and lazily on reads. To backfill a long history at once:
+--   python -m billing.rollups backfill 90
+--
+-- Version: 2026-10-18
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    id                      SERIAL PRIMARY KEY,
+
+    -- UTC day and what is being counted
+    date                    DATE NOT NULL,
+    dimension               VARCHAR(20) NOT NULL,
+    key                     VARCHAR(100) NOT NULL,
+
+    -- API call counters
+    calls                   INTEGER NOT NULL DEFAULT 0,
+    successes               INTEGER NOT NULL DEFAULT 0,
+    cost_usd                REAL NOT NULL DEFAULT 0.0,
+    input_tokens            INTEGER NOT NULL DEFAULT 0,
+    output_tokens           INTEGER NOT NULL DEFAULT 0,
+
+    -- Document counters (dimension = 'documents')
+    documents               INTEGER NOT NULL DEFAULT 0,
+    citations_found         INTEGER NOT NULL DEFAULT 0,
+    citations_resolved      INTEGER NOT NULL DEFAULT 0,
+    citations_failed        INTEGER NOT NULL DEFAULT 0,
+
+    updated_at              TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+
+    CONSTRAINT uq_daily_rollups_date_dim_key UNIQUE (date, dimension, key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_rollups_dim_date ON daily_rollups(dimension, date);
+
+-- =============================================================================
+-- SAMPLE QUERIES
+-- =============================================================================
+
+-- Cost by provider for the last 30 full days:
+-- SELECT key AS provider, SUM(cost_usd), SUM(calls)
+-- FROM daily_rollups
+-- WHERE dimension = 'provider' AND date >= CURRENT_DATE - 30 AND date < CURRENT_DATE
+-- GROUP BY key ORDER BY 2 DESC;
@@ -0,0 +1,40 @@
+-- =============================================================================
+-- CITATEGENIE MATERIALIZED CREDIT BALANCES
+-- =============================================================================
+-- One balance row per user, kept equal to SUM(credit_ledger.delta) by
+-- billing/ledger.py (conditional UPDATE ... RETURNING in the same
+-- transaction as each ledger insert).
+-- Run this after 004_daily_rollups.sql
+--
+-- Tables:
+--   - credit_balances: Current credit balance per user
+--
+-- Check against the ledger at any time:
+--   python -m billing.ledger reconcile [--fix]
+--
+-- Version: 2026-10-18
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS credit_balances (
+    user_id         INTEGER PRIMARY KEY REFERENCES users(id),
+    balance         INTEGER NOT NULL DEFAULT 0,
+    updated_at      TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Backfill from the ledger (rows created since deploy are left alone)
+INSERT INTO credit_balances (user_id, balance)
+SELECT user_id, SUM(delta)
+FROM credit_ledger
+GROUP BY user_id
+ON CONFLICT (user_id) DO NOTHING;
+
+-- =============================================================================
+-- SAMPLE QUERIES
+-- =============================================================================
+
+-- Balances that disagree with the ledger (should return no rows):
+-- SELECT b.user_id, b.balance, l.total
+-- FROM credit_balances b
+-- JOIN (SELECT user_id, SUM(delta) AS total FROM credit_ledger GROUP BY user_id) l
+--   ON l.user_id = b.user_id
+-- WHERE b.balance <> l.total;
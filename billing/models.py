@@ -8,6 +8,7 @@ Tables:
     - orders: Purchase records (provider-agnostic)
     - payment_events: Webhook event log for idempotency
     - credit_ledger: Credit transactions (+purchase, -usage, etc.)
+    - credit_balances: Materialized per-user balance (SUM of the ledger)
     - sessions: Database-backed sessions for Fargate compatibility
     - provider_price_map: Maps our products to provider-specific IDs
 
@@ -18,6 +19,7 @@ Design principles:
     4. UUID order IDs: We control IDs, not Stripe
 
 Version History:
+    2026-10-18: Added CreditBalance
     2025-12-17: Initial implementation
 """
 
@@ -282,6 +284,29 @@ class CreditLedger(Base):
 Index('idx_credit_ledger_user_created', CreditLedger.user_id, CreditLedger.created_at)
 
 
+class CreditBalance(Base):
+    """
+    Materialized credit balance, one row per user.
+    
+    Always equal to SUM(credit_ledger.delta) for the user: billing.ledger
+    changes it with a single conditional UPDATE ... RETURNING in the same
+    transaction as the ledger insert, e.g. for a spend:
+        UPDATE credit_balances SET balance = balance - :n
+        WHERE user_id = :u AND balance >= :n RETURNING balance
+    
+    The ledger stays the source of truth; ledger.reconcile_balances()
+    checks (and can repair) this table against it.
+    """
+    __tablename__ = 'credit_balances'
+    
+    user_id = Column(Integer, ForeignKey('users.id'), primary_key=True)
+    balance = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f'<CreditBalance user={self.user_id} {self.balance}>'
+
+
 # =============================================================================
 # SESSION MODEL (Database-backed sessions for Fargate)
 # =============================================================================
@@ -0,0 +1,581 @@
+"""
+billing/rollups.py
+
+Incremental daily rollups for the admin analytics API.
+
+The admin endpoints used to aggregate raw api_calls / document_sessions rows
+over 30-90 day windows on every request. Aggregates are now kept per UTC day
+in daily_rollups (see DailyRollup):
+
+    - cost_tracker.log_api_call() increments the provider, source_type and
+      citation_type rows for today (one upsert)
+    - start/finish_document_tracking() increment the documents row
+    - rollup_day() rebuilds a day from raw rows and writes its DailyStats
+      summary; backfill() does that for a range of days
+
+A day's rollups are trusted once rollup_day() has run for it (it has a
+DailyStats row). Days are finalized automatically:
+
+    - the first event logged on a new UTC day rebuilds that day from raw
+      rows (a handful so far), after which the incremental upserts keep it
+      current, and finalizes the previous day if it was never opened (e.g.
+      the deploy day)
+    - readers finalize up to FINALIZE_PER_READ closed days that are still
+      missing (days with no traffic, history before this table existed)
+
+Readers split a window into full days, answered from daily_rollups, and the
+partial days at either end (including today) plus any full day not yet
+finalized, answered from raw rows.
+
+Usage:
+    from billing import rollups
+
+    by_provider = rollups.api_breakdown('provider', start_date, end_date)
+    rollups.backfill(days=90)
+
+    # Or from the command line:
+    python -m billing.rollups backfill 90
+
+Version History:
+    2026-10-18: Initial implementation
+    2026-10-18: Only days finalized by rollup_day() count as rolled up
+    2026-10-18: Days are finalized automatically (first event of a day, and
+                lazily by readers)
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, case, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+
+from billing.db import get_db
+from billing.admin_models import APICall, DocumentSession, DailyStats, DailyRollup
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+# API call dimensions and the APICall column each one groups by
+API_DIMENSIONS = {
+    'provider': APICall.provider,
+    'source_type': APICall.source_type,
+    'citation_type': APICall.citation_type,
+}
+
+DOCUMENTS = 'documents'
+
+# Closed days a read may finalize (rollup_day) before answering; the rest
+# of a long uncovered window is read raw and finalized on later reads
+FINALIZE_PER_READ = 7
+
+API_COUNTERS = ('calls', 'successes', 'cost_usd', 'input_tokens', 'output_tokens')
+DOCUMENT_COUNTERS = ('documents', 'citations_found', 'citations_resolved', 'citations_failed')
+
+
+def _document_key(is_preview: Optional[bool]) -> str:
+    # Like the raw queries, only is_preview == False counts as paid
+    return 'paid' if is_preview is False else 'preview'
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time())
+
+
+def _is_finalized(db, day: date) -> bool:
+    return db.query(DailyStats.id).filter(DailyStats.date == _day_start(day)).first() is not None
+
+
+# =============================================================================
+# INCREMENTAL UPDATES (called from cost_tracker)
+# =============================================================================
+
+def _increment(rows: List[dict], counters: Tuple[str, ...]) -> None:
+    """Add ``rows`` to daily_rollups in one upsert and commit."""
+    db = get_db()
+    stmt = insert(DailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['date', 'dimension', 'key'],
+        set_={
+            **{name: getattr(DailyRollup, name) + getattr(stmt.excluded, name) for name in counters},
+            'updated_at': func.now(),
+        }
+    )
+    try:
+        db.execute(stmt)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+# The UTC day this process has already opened (see _open_day)
+_opened_day: Optional[date] = None
+
+
+def _open_day(day: date) -> None:
+    """
+    Finalize ``day`` on this process's first event of it, if needed.
+
+    Called after the event's raw row and increment are committed, so the
+    rebuild counts the event exactly once. Only today is opened; an event
+    for an earlier day (a document finishing after midnight) just
+    increments that day's rows.
+    """
+    global _opened_day
+    if day == _opened_day or day != datetime.utcnow().date():
+        return
+    db = get_db()
+    for candidate in (day - timedelta(days=1), day):
+        if not _is_finalized(db, candidate):
+            rollup_day(candidate)
+    _opened_day = day
+
+
+def record_api_call(
+    provider: str,
+    source_type: Optional[str] = None,
+    citation_type: Optional[str] = None,
+    success: bool = True,
+    cost_usd: float = 0.0,
+    input_tokens: int = 0,
+    output_tokens: int = 0,
+    timestamp: Optional[datetime] = None
+) -> None:
+    """
+    Count one API call in today's provider / source_type / citation_type rows.
+
+    Dimensions whose value is None are skipped, matching the raw queries
+    (which filter out NULL source_type / citation_type).
+    """
+    day = (timestamp or datetime.utcnow()).date()
+    counters = {
+        'calls': 1,
+        'successes': 1 if success else 0,
+        'cost_usd': cost_usd or 0.0,
+        'input_tokens': input_tokens or 0,
+        'output_tokens': output_tokens or 0,
+    }
+    rows = [
+        {'date': day, 'dimension': dimension, 'key': key, **counters}
+        for dimension, key in (
+            ('provider', provider),
+            ('source_type', source_type),
+            ('citation_type', citation_type),
+        )
+        if key is not None
+    ]
+    _increment(rows, API_COUNTERS)
+    _open_day(day)
+
+
+def record_document(
+    started_at: datetime,
+    is_preview: bool = False,
+    documents: int = 0,
+    citations_found: int = 0,
+    citations_resolved: int = 0,
+    citations_failed: int = 0
+) -> None:
+    """
+    Add to the documents row for the day a document started.
+
+    Called with documents=1 when tracking starts and with the citation
+    counts when it finishes, so in-progress documents are counted like the
+    raw query counts them.
+    """
+    day = started_at.date()
+    _increment([{
+        'date': day,
+        'dimension': DOCUMENTS,
+        'key': _document_key(is_preview),
+        'documents': documents,
+        'citations_found': citations_found or 0,
+        'citations_resolved': citations_resolved or 0,
+        'citations_failed': citations_failed or 0,
+    }], DOCUMENT_COUNTERS)
+    _open_day(day)
+
+
+# =============================================================================
+# WINDOW PLANNING
+# =============================================================================
+
+def _plan(db, start: datetime, end: datetime) -> Tuple[List[date], List[Tuple[datetime, datetime]]]:
+    """
+    Split [start, end) into rolled-up full days and raw ranges.
+
+    A full day counts as rolled up only if rollup_day() has finalized it;
+    up to FINALIZE_PER_READ missing days are finalized here first.
+
+    Returns:
+        (days, raw_ranges) - days are the finalized dates for the
+        daily_rollups query (possibly empty); raw_ranges are [start, end)
+        datetime ranges to aggregate from raw rows
+    """
+    first = start.date() if start.time() == time() else start.date() + timedelta(days=1)
+    # Today is never complete
+    last = min(end.date(), datetime.utcnow().date())
+
+    if first >= last:
+        return [], [(start, end)]
+
+    # rollup_day() writes DailyStats after rebuilding the day's rollups from
+    # raw rows; a day with only incremental rows may be missing calls made
+    # before counting started, so it is not trusted
+    covered = set()
+    for (stats_date,) in db.query(DailyStats.date).filter(
+        DailyStats.date >= _day_start(first),
+        DailyStats.date < _day_start(last)
+    ):
+        covered.add(stats_date.date() if isinstance(stats_date, datetime) else stats_date)
+
+    # Every day before ``last`` is closed: finalize the most recent missing
+    # ones now so later reads (and this one) use the rollups
+    missing = [first + timedelta(days=i) for i in range((last - first).days)]
+    missing = [day for day in missing if day not in covered]
+    for day in sorted(missing, reverse=True)[:FINALIZE_PER_READ]:
+        try:
+            rollup_day(day)
+            covered.add(day)
+        except Exception as e:
+            print(f"[Rollups] Could not finalize {day}: {e}")
+
+    ranges = []
+
+    def add_range(range_start: datetime, range_end: datetime):
+        if range_start >= range_end:
+            return
+        if ranges and ranges[-1][1] == range_start:
+            ranges[-1] = (ranges[-1][0], range_end)
+        else:
+            ranges.append((range_start, range_end))
+
+    add_range(start, _day_start(first))
+    day = first
+    while day < last:
+        if day not in covered:
+            add_range(_day_start(day), _day_start(day + timedelta(days=1)))
+        day += timedelta(days=1)
+    add_range(_day_start(last), end)
+
+    return sorted(covered), ranges
+
+
+def _in_ranges(column, ranges: List[Tuple[datetime, datetime]]):
+    return or_(*[and_(column >= range_start, column < range_end) for range_start, range_end in ranges])
+
+
+# =============================================================================
+# READ API
+# =============================================================================
+
+def api_breakdown(dimension: str, start: datetime, end: datetime) -> Dict[str, Dict[str, float]]:
+    """
+    API call counters per value of ``dimension`` for [start, end).
+
+    Args:
+        dimension: 'provider', 'source_type' or 'citation_type'
+
+    Returns:
+        {value: {'calls': int, 'successes': int, 'cost': float}}
+    """
+    column = API_DIMENSIONS[dimension]
+    db = get_db()
+    days, ranges = _plan(db, start, end)
+
+    breakdown = {}
+
+    def add(key, calls, successes, cost):
+        entry = breakdown.setdefault(key, {'calls': 0, 'successes': 0, 'cost': 0.0})
+        entry['calls'] += calls or 0
+        entry['successes'] += successes or 0
+        entry['cost'] += cost or 0.0
+
+    if days:
+        for row in db.query(
+            DailyRollup.key,
+            func.sum(DailyRollup.calls),
+            func.sum(DailyRollup.successes),
+            func.sum(DailyRollup.cost_usd)
+        ).filter(
+            DailyRollup.dimension == dimension,
+            DailyRollup.date.in_(days)
+        ).group_by(DailyRollup.key):
+            add(*row)
+
+    if ranges:
+        for row in db.query(
+            column,
+            func.count(APICall.id),
+            func.count(case((APICall.success == True, 1))),
+            func.sum(APICall.cost_usd)
+        ).filter(
+            _in_ranges(APICall.timestamp, ranges),
+            column.isnot(None)
+        ).group_by(column):
+            add(*row)
+
+    return breakdown
+
+
+def api_totals(start: datetime, end: datetime) -> Dict[str, float]:
+    """
+    Totals over all API calls in [start, end).
+
+    Returns:
+        {'calls': int, 'successes': int, 'cost': float}
+    """
+    totals = {'calls': 0, 'successes': 0, 'cost': 0.0}
+    # Every call has a provider, so the provider rows add up to the total
+    for entry in api_breakdown('provider', start, end).values():
+        for name in totals:
+            totals[name] += entry[name]
+    return totals
+
+
+def daily_costs(start: datetime, end: datetime) -> Dict[date, float]:
+    """API cost per UTC day for [start, end)."""
+    db = get_db()
+    days, ranges = _plan(db, start, end)
+
+    costs = {}
+    if days:
+        for day, cost in db.query(
+            DailyRollup.date,
+            func.sum(DailyRollup.cost_usd)
+        ).filter(
+            DailyRollup.dimension == 'provider',
+            DailyRollup.date.in_(days)
+        ).group_by(DailyRollup.date):
+            costs[day] = costs.get(day, 0.0) + (cost or 0.0)
+
+    if ranges:
+        for day, cost in db.query(
+            func.date(APICall.timestamp),
+            func.sum(APICall.cost_usd)
+        ).filter(
+            _in_ranges(APICall.timestamp, ranges)
+        ).group_by(func.date(APICall.timestamp)):
+            costs[day] = costs.get(day, 0.0) + (cost or 0.0)
+
+    return costs
+
+
+def document_totals(start: datetime, end: datetime) -> Dict[str, int]:
+    """
+    Document counters for documents started in [start, end).
+
+    Returns:
+        {'documents', 'paid_documents', 'citations_found',
+         'citations_resolved', 'citations_failed'}
+    """
+    db = get_db()
+    days, ranges = _plan(db, start, end)
+
+    totals = {name: 0 for name in ('documents', 'paid_documents') + DOCUMENT_COUNTERS[1:]}
+
+    def add(is_paid, documents, found, resolved, failed):
+        totals['documents'] += documents or 0
+        if is_paid:
+            totals['paid_documents'] += documents or 0
+        totals['citations_found'] += found or 0
+        totals['citations_resolved'] += resolved or 0
+        totals['citations_failed'] += failed or 0
+
+    if days:
+        for key, *counts in db.query(
+            DailyRollup.key,
+            func.sum(DailyRollup.documents),
+            func.sum(DailyRollup.citations_found),
+            func.sum(DailyRollup.citations_resolved),
+            func.sum(DailyRollup.citations_failed)
+        ).filter(
+            DailyRollup.dimension == DOCUMENTS,
+            DailyRollup.date.in_(days)
+        ).group_by(DailyRollup.key):
+            add(key == 'paid', *counts)
+
+    if ranges:
+        for is_preview, *counts in db.query(
+            DocumentSession.is_preview,
+            func.count(DocumentSession.id),
+            func.sum(DocumentSession.total_citations_found),
+            func.sum(DocumentSession.citations_resolved),
+            func.sum(DocumentSession.citations_failed)
+        ).filter(
+            _in_ranges(DocumentSession.started_at, ranges)
+        ).group_by(DocumentSession.is_preview):
+            add(is_preview == False, *counts)
+
+    return totals
+
+
+# =============================================================================
+# ROLLUP / BACKFILL
+# =============================================================================
+
+def rollup_day(day: date) -> DailyStats:
+    """
+    Rebuild daily_rollups for one UTC day from raw rows and write its
+    DailyStats summary. Idempotent; also repairs drifted counters.
+    """
+    db = get_db()
+    day_start = _day_start(day)
+    day_end = day_start + timedelta(days=1)
+
+    try:
+        db.query(DailyRollup).filter(DailyRollup.date == day).delete(synchronize_session=False)
+
+        rollup = {}
+        for dimension, column in API_DIMENSIONS.items():
+            rollup[dimension] = {}
+            for key, calls, successes, cost, input_tokens, output_tokens in db.query(
+                column,
+                func.count(APICall.id),
+                func.count(case((APICall.success == True, 1))),
+                func.sum(APICall.cost_usd),
+                func.sum(APICall.input_tokens),
+                func.sum(APICall.output_tokens)
+            ).filter(
+                APICall.timestamp >= day_start,
+                APICall.timestamp < day_end,
+                column.isnot(None)
+            ).group_by(column):
+                rollup[dimension][key] = DailyRollup(
+                    date=day, dimension=dimension, key=key,
+                    calls=calls or 0,
+                    successes=successes or 0,
+                    cost_usd=cost or 0.0,
+                    input_tokens=input_tokens or 0,
+                    output_tokens=output_tokens or 0,
+                )
+
+        documents = {}
+        for is_preview, count, found, resolved, failed in db.query(
+            DocumentSession.is_preview,
+            func.count(DocumentSession.id),
+            func.sum(DocumentSession.total_citations_found),
+            func.sum(DocumentSession.citations_resolved),
+            func.sum(DocumentSession.citations_failed)
+        ).filter(
+            DocumentSession.started_at >= day_start,
+            DocumentSession.started_at < day_end
+        ).group_by(DocumentSession.is_preview):
+            key = _document_key(is_preview)
+            documents[key] = DailyRollup(
+                date=day, dimension=DOCUMENTS, key=key,
+                documents=count or 0,
+                citations_found=found or 0,
+                citations_resolved=resolved or 0,
+                citations_failed=failed or 0,
+            )
+
+        for rows in list(rollup.values()) + [documents]:
+            db.add_all(rows.values())
+
+        stats = db.query(DailyStats).filter(DailyStats.date == day_start).first()
+        if stats is None:
+            stats = DailyStats(date=day_start)
+            db.add(stats)
+        _fill_daily_stats(stats, rollup, documents)
+
+        db.commit()
+        return stats
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _fill_daily_stats(stats: DailyStats, rollup: Dict[str, Dict[str, DailyRollup]], documents: Dict[str, DailyRollup]) -> None:
+    """Copy one day's rollup rows into the fixed DailyStats columns."""
+    providers = rollup['provider']
+    source_types = rollup['source_type']
+    citation_types = rollup['citation_type']
+
+    def cost(provider):
+        return providers[provider].cost_usd if provider in providers else 0.0
+
+    def calls(provider):
+        return providers[provider].calls if provider in providers else 0
+
+    def rate(rows):
+        total = sum(row.calls for row in rows)
+        return round(sum(row.successes for row in rows) * 100.0 / total, 1) if total else None
+
+    def type_count(citation_type):
+        return citation_types[citation_type].calls if citation_type in citation_types else 0
+
+    preview = documents.get('preview')
+    paid = documents.get('paid')
+    stats.documents_preview = preview.documents if preview else 0
+    stats.documents_paid = paid.documents if paid else 0
+    stats.documents_processed = stats.documents_preview + stats.documents_paid
+    stats.citations_found = sum(row.citations_found for row in documents.values())
+    stats.citations_resolved = sum(row.citations_resolved for row in documents.values())
+    stats.citations_failed = sum(row.citations_failed for row in documents.values())
+
+    stats.cost_total_usd = sum(row.cost_usd for row in providers.values())
+    stats.cost_openai_usd = cost('openai')
+    stats.cost_claude_usd = cost('claude')
+    stats.cost_gemini_usd = cost('gemini')
+    stats.cost_serpapi_usd = cost('serpapi')
+    stats.cost_other_usd = stats.cost_total_usd - (
+        stats.cost_openai_usd + stats.cost_claude_usd + stats.cost_gemini_usd + stats.cost_serpapi_usd
+    )
+
+    stats.calls_total = sum(row.calls for row in providers.values())
+    stats.calls_openai = calls('openai')
+    stats.calls_claude = calls('claude')
+    stats.calls_gemini = calls('gemini')
+    stats.calls_crossref = calls('crossref')
+    stats.calls_pubmed = calls('pubmed')
+    stats.calls_serpapi = calls('serpapi')
+
+    stats.success_rate_overall = rate(providers.values())
+    stats.success_rate_url = rate([source_types['url']] if 'url' in source_types else [])
+    stats.success_rate_doi = rate([source_types['doi']] if 'doi' in source_types else [])
+    stats.success_rate_parenthetical = rate(
+        [source_types['parenthetical']] if 'parenthetical' in source_types else []
+    )
+
+    stats.type_journal = type_count('journal')
+    stats.type_book = type_count('book')
+    stats.type_legal = type_count('legal')
+    stats.type_newspaper = type_count('newspaper')
+    stats.type_other = sum(row.calls for row in citation_types.values()) - (
+        stats.type_journal + stats.type_book + stats.type_legal + stats.type_newspaper
+    )
+
+
+def backfill(days: int = 90, end: Optional[date] = None) -> int:
+    """
+    Roll up the last ``days`` UTC days, up to and including ``end``
+    (default: today, so today's incremental counters are repaired too).
+
+    Returns:
+        Number of days rolled up
+    """
+    end = end or datetime.utcnow().date()
+    first = end - timedelta(days=days - 1)
+    day = first
+    while day <= end:
+        rollup_day(day)
+        day += timedelta(days=1)
+    print(f"[Rollups] Rolled up {days} days ({first} to {end})")
+    return days
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'backfill':
+        print("Usage: python -m billing.rollups backfill [DAYS]")
+        sys.exit(1)
+
+    backfill(int(sys.argv[2]) if len(sys.argv) > 2 else 90)
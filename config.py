@@ -12,6 +12,9 @@ Version History:
 
 import os
 from typing import Dict
+from tracing import get_logger
+
+logger = get_logger('config')
 
 # =============================================================================
 # API KEYS (from environment)
@@ -25,11 +28,11 @@ ANTHROPIC_API_KEY = _raw_anthropic.strip().lstrip('=')
 
 # Debug: Log if we stripped anything
 if _raw_openai.startswith('='):
-    print(f"[Config] WARNING: Stripped '=' from OPENAI_API_KEY. Raw started with: {_raw_openai[:10]}...")
+    logger.warning(f"[Config] WARNING: Stripped '=' from OPENAI_API_KEY. Raw started with: {_raw_openai[:10]}...")
 if _raw_openai and not _raw_openai.startswith('='):
-    print(f"[Config] OPENAI_API_KEY loaded OK (no '=' prefix). Starts with: {OPENAI_API_KEY[:10]}...")
+    logger.debug(f"[Config] OPENAI_API_KEY loaded OK (no '=' prefix). Starts with: {OPENAI_API_KEY[:10]}...")
 if not _raw_openai:
-    print("[Config] WARNING: OPENAI_API_KEY not set in environment")
+    logger.warning("[Config] WARNING: OPENAI_API_KEY not set in environment")
 
 # Other API Keys
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
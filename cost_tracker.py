@@ -21,6 +21,7 @@ Usage:
     summary = finish_document_tracking(citations_resolved=5, citations_failed=1)
 
 Version History:
+    2026-10-18 V2.1: Feed daily rollups (billing/rollups.py); analytics read rollups
     2025-12-20 V2.0: Database-backed tracking (replaces CSV)
     2025-12-14 V1.1: Added EMAIL_AFTER_EVERY_CALL for test mode auto-emails
     2025-12-13 V1.0: Initial implementation - CSV logging with cost calculation
@@ -35,6 +36,9 @@ import threading
 # Thread-local storage for per-document tracking
 _thread_local = threading.local()
 
+# Process-wide callbacks invoked for every logged API call (see add_call_observer)
+_call_observers = []
+
 
 # =============================================================================
 # PRICING (per 1M tokens, updated Dec 2024)
@@ -175,6 +179,7 @@ def start_document_tracking(
         
         tracking['db_session_id'] = doc_session.id
         print(f"[CostTracker] Started tracking: {filename or session_id[:8]} (db_id={doc_session.id})")
+        _record_rollup('document start', documents=1)
         return doc_session.id
         
     except Exception as e:
@@ -257,6 +262,11 @@ def finish_document_tracking(
                 doc_session.error_message = error_message
                 db.commit()
                 
+                _record_rollup('document finish',
+                               citations_found=citations_found,
+                               citations_resolved=citations_resolved,
+                               citations_failed=citations_failed)
+                
         except Exception as e:
             print(f"[CostTracker] Warning: Could not update DB session: {e}")
     
@@ -275,10 +285,40 @@ def finish_document_tracking(
     return summary
 
 
+def _record_rollup(event: str, **counts) -> None:
+    """Add to the current document's daily documents rollup (best effort)."""
+    tracking = _get_current_tracking()
+    try:
+        from billing.rollups import record_document
+        record_document(tracking['started_at'], is_preview=tracking['is_preview'], **counts)
+    except Exception as e:
+        print(f"[CostTracker] Warning: Could not update daily rollup ({event}): {e}")
+
+
 # =============================================================================
 # API CALL LOGGING
 # =============================================================================
 
+def add_call_observer(callback) -> None:
+    """
+    Register a callback for every log_api_call() in this process.
+    
+    Unlike per-document tracking (thread-local), observers also see calls
+    made from worker threads, e.g. the router's parallel engine lookups.
+    Used by the stress test benchmark to attribute cost to each test.
+    
+    Args:
+        callback: fn(provider, input_tokens, output_tokens, cost_usd)
+    """
+    _call_observers.append(callback)
+
+
+def remove_call_observer(callback) -> None:
+    """Unregister a callback added with add_call_observer()."""
+    if callback in _call_observers:
+        _call_observers.remove(callback)
+
+
 def log_api_call(
     provider: str,
     input_tokens: int = 0,
@@ -332,6 +372,12 @@ def log_api_call(
         tracking['cost'] += cost
         tracking['calls'] += 1
     
+    for observer in list(_call_observers):
+        try:
+            observer(provider.lower(), input_tokens, output_tokens, cost)
+        except Exception as e:
+            print(f"[CostTracker] Warning: call observer failed: {e}")
+    
     # Write to database
     try:
         from billing.db import get_db
@@ -360,6 +406,22 @@ def log_api_call(
         
     except Exception as e:
         print(f"[CostTracker] Warning: Could not write to DB: {e}")
+        return cost
+    
+    # Keep today's daily rollup current (rollup_day() repairs any misses)
+    try:
+        from billing.rollups import record_api_call
+        record_api_call(
+            provider.lower(),
+            source_type=source_type,
+            citation_type=citation_type,
+            success=success,
+            cost_usd=cost,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens
+        )
+    except Exception as e:
+        print(f"[CostTracker] Warning: Could not update daily rollup: {e}")
     
     return cost
 
@@ -379,42 +441,20 @@ def get_total_cost(days: int = 30) -> Dict[str, Any]:
         Dict with total_cost, by_provider breakdown, and call_count
     """
     try:
-        from billing.db import get_db
-        from billing.admin_models import APICall
-        from sqlalchemy import func
+        from billing import rollups
         from datetime import timedelta
         
-        db = get_db()
-        since = datetime.utcnow() - timedelta(days=days)
-        
-        # Total cost and calls
-        totals = db.query(
-            func.sum(APICall.cost_usd),
-            func.count(APICall.id)
-        ).filter(APICall.timestamp >= since).first()
-        
-        total_cost = totals[0] or 0.0
-        call_count = totals[1] or 0
+        end = datetime.utcnow()
+        since = end - timedelta(days=days)
         
-        # By provider
-        by_provider = {}
-        provider_stats = db.query(
-            APICall.provider,
-            func.sum(APICall.cost_usd),
-            func.count(APICall.id)
-        ).filter(
-            APICall.timestamp >= since
-        ).group_by(APICall.provider).all()
-        
-        for provider, cost, count in provider_stats:
-            by_provider[provider] = {
-                'cost': cost or 0.0,
-                'calls': count or 0
-            }
+        by_provider = {
+            provider: {'cost': stats['cost'], 'calls': stats['calls']}
+            for provider, stats in rollups.api_breakdown('provider', since, end).items()
+        }
         
         return {
-            'total_cost': total_cost,
-            'call_count': call_count,
+            'total_cost': sum(p['cost'] for p in by_provider.values()),
+            'call_count': sum(p['calls'] for p in by_provider.values()),
             'by_provider': by_provider,
             'days': days
         }
@@ -440,24 +480,16 @@ def get_success_rates(days: int = 30) -> Dict[str, float]:
         Dict mapping source_type to success rate (0-100)
     """
     try:
-        from billing.db import get_db
-        from billing.admin_models import APICall
-        from sqlalchemy import func, case
+        from billing import rollups
         from datetime import timedelta
         
-        db = get_db()
-        since = datetime.utcnow() - timedelta(days=days)
+        end = datetime.utcnow()
+        since = end - timedelta(days=days)
         
-        rates = db.query(
-            APICall.source_type,
-            (func.count(case((APICall.success == True, 1))) * 100.0 / 
-             func.nullif(func.count(APICall.id), 0)).label('success_rate')
-        ).filter(
-            APICall.timestamp >= since,
-            APICall.source_type.isnot(None)
-        ).group_by(APICall.source_type).all()
-        
-        return {row[0]: round(row[1] or 0, 1) for row in rates}
+        return {
+            source_type: round(stats['successes'] * 100.0 / stats['calls'], 1) if stats['calls'] else 0
+            for source_type, stats in rollups.api_breakdown('source_type', since, end).items()
+        }
         
     except Exception as e:
         print(f"[CostTracker] Error getting success rates: {e}")
@@ -475,23 +507,16 @@ def get_citation_type_distribution(days: int = 30) -> Dict[str, int]:
         Dict mapping citation_type to count
     """
     try:
-        from billing.db import get_db
-        from billing.admin_models import APICall
-        from sqlalchemy import func
+        from billing import rollups
         from datetime import timedelta
         
-        db = get_db()
-        since = datetime.utcnow() - timedelta(days=days)
-        
-        dist = db.query(
-            APICall.citation_type,
-            func.count(APICall.id)
-        ).filter(
-            APICall.timestamp >= since,
-            APICall.citation_type.isnot(None)
-        ).group_by(APICall.citation_type).all()
+        end = datetime.utcnow()
+        since = end - timedelta(days=days)
         
-        return {row[0]: row[1] for row in dist}
+        return {
+            citation_type: stats['calls']
+            for citation_type, stats in rollups.api_breakdown('citation_type', since, end).items()
+        }
         
     except Exception as e:
         print(f"[CostTracker] Error getting citation distribution: {e}")
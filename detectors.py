@@ -9,6 +9,7 @@ Version History:
 """
 
 import re
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from models import CitationType, DetectionResult
 
@@ -903,13 +904,27 @@ for name in ALL_NEWSPAPER_NAMES:
         seen.add(name.lower())
         UNIQUE_NEWSPAPER_NAMES.append(name)
 
-# Pre-compile newspaper name pattern for efficiency
-# Sort by length (longest first) to match "The New York Times" before "Times"
-SORTED_NAMES = sorted(UNIQUE_NEWSPAPER_NAMES, key=len, reverse=True)
-NEWSPAPER_NAME_PATTERN = re.compile(
-    r'\b(' + '|'.join(re.escape(name) for name in SORTED_NAMES) + r')\b',
-    re.IGNORECASE
-)
+# Newspaper name pattern: a ~700-way alternation that takes tens of
+# milliseconds to compile, so it is built on first use rather than on
+# import (which every Lambda cold start would pay).
+@lru_cache(maxsize=1)
+def get_newspaper_name_pattern() -> 're.Pattern':
+    """Compiled newspaper/magazine name pattern (built once, on first call)."""
+    # Sort by length (longest first) to match "The New York Times" before "Times"
+    sorted_names = sorted(UNIQUE_NEWSPAPER_NAMES, key=len, reverse=True)
+    return re.compile(
+        r'\b(' + '|'.join(re.escape(name) for name in sorted_names) + r')\b',
+        re.IGNORECASE
+    )
+
+
+def __getattr__(name):
+    # Backward-compatible module attributes, now built lazily
+    if name == 'NEWSPAPER_NAME_PATTERN':
+        return get_newspaper_name_pattern()
+    if name == 'SORTED_NAMES':
+        return sorted(UNIQUE_NEWSPAPER_NAMES, key=len, reverse=True)
+    raise AttributeError(f"module 'detectors' has no attribute '{name}'")
 
 
 def is_url(text: str) -> bool:
@@ -962,7 +977,7 @@ def detect_type(query: str) -> DetectionResult:
             return DetectionResult(CitationType.INTERVIEW, 0.9, cleaned, hints)
     
     # Check for newspaper/magazine names in text (before book check)
-    newspaper_match = NEWSPAPER_NAME_PATTERN.search(query)
+    newspaper_match = get_newspaper_name_pattern().search(query)
     if newspaper_match:
         hints['newspaper'] = newspaper_match.group(1)
         return DetectionResult(CitationType.NEWSPAPER, 0.85, cleaned, hints)
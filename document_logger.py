@@ -12,6 +12,9 @@ Creates detailed CSV logs for each processed document showing:
 - Total document cost
 
 Log files saved to: logs/documents/YYYYMMDD_HHMMSS_sessionid.csv
+
+Rows are kept in memory and written once by save(); nothing is written per
+citation.
 """
 
 import os
@@ -48,6 +51,23 @@ API_COSTS = {
     'gemini': 0.00015,  # Gemini Flash
 }
 
+# SourceComponents.source_engine -> API_COSTS key
+SOURCE_ENGINE_APIS = {
+    'Crossref': 'crossref',
+    'OpenAlex': 'openalex',
+    'PubMed': 'pubmed',
+    'Semantic Scholar': 'semantic_scholar',
+    'Google Books': 'google_books',
+    'Open Library': 'open_library',
+    'Library of Congress': 'loc',
+    'Legal Cache/CourtListener': 'courtlistener',
+    'Famous Papers Cache': 'famous_papers_cache',
+    'Generic URL': 'generic_url',
+    'ChatGPT': 'openai',
+    'Claude': 'anthropic',
+    'Gemini': 'gemini',
+}
+
 
 class DocumentLogger:
     """
@@ -308,24 +328,7 @@ def log_from_source_components(
     # Determine source
     api_source = source or components.source_engine or 'unknown'
     
-    # Map source_engine to API name
-    source_mapping = {
-        'Crossref': 'crossref',
-        'OpenAlex': 'openalex',
-        'PubMed': 'pubmed',
-        'Semantic Scholar': 'semantic_scholar',
-        'Google Books': 'google_books',
-        'Open Library': 'open_library',
-        'Library of Congress': 'loc',
-        'Legal Cache/CourtListener': 'courtlistener',
-        'Famous Papers Cache': 'famous_papers_cache',
-        'Generic URL': 'generic_url',
-        'ChatGPT': 'openai',
-        'Claude': 'anthropic',
-        'Gemini': 'gemini',
-    }
-    
-    api_source = source_mapping.get(api_source, api_source.lower().replace(' ', '_'))
+    api_source = SOURCE_ENGINE_APIS.get(api_source, api_source.lower().replace(' ', '_'))
     
     # Extract components
     logger.log_citation(
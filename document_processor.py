@@ -15,6 +15,11 @@ Version History:
     2025-12-05 12:53: Enhanced IBID_PATTERN to recognize "Id." (Bluebook) and "pp." prefixes
                       Switched from router to unified_router import
     2025-12-05 13:15: Verified ibid detection passes 13/13 tests including Id. at X patterns
+    2026-10-18: Single output stage - note edits stay in memory and
+                save_to_buffer() applies link activation and cache
+                embedding to the parts before zipping once
+    2026-10-18: Document gist goes through engines.ai_lookup._call_openai
+                (shared HTTP pool) instead of a per-document OpenAI client
 """
 
 import os
@@ -29,13 +34,15 @@ from dataclasses import dataclass, field
 from io import BytesIO
 
 from models import normalize_doi
+from tracing import submit_traced
 
 # Embedded metadata cache (added 2025-12-14)
 from processors.document_components import (
     SourceComponentsCache,
     load_cache_from_docx,
-    save_cache_to_docx,
+    embed_cache_parts,
 )
+from processors.docx_package import read_docx_parts, read_extracted_parts, write_docx_parts
 
 
 # =============================================================================
@@ -369,6 +376,8 @@ class WordDocumentProcessor:
         """
         self.temp_dir = tempfile.mkdtemp()
         self.original_path = None
+        self._owns_temp_dir = True
+        self._init_parts()
         
         # Handle both file paths and file-like objects
         if hasattr(file_path_or_buffer, 'read'):
@@ -381,6 +390,58 @@ class WordDocumentProcessor:
             with zipfile.ZipFile(file_path_or_buffer, 'r') as z:
                 z.extractall(self.temp_dir)
     
+    @classmethod
+    def from_extracted(cls, temp_dir: str) -> 'WordDocumentProcessor':
+        """
+        Wrap a package that has already been extracted to ``temp_dir``.
+        
+        Avoids a second unzip when another component (e.g. the author-date
+        transformer) has extracted the same upload. The directory stays
+        owned by the caller: cleanup() on this processor leaves it alone.
+        """
+        processor = cls.__new__(cls)
+        processor.temp_dir = temp_dir
+        processor.original_path = None
+        processor._owns_temp_dir = False
+        processor._init_parts()
+        return processor
+    
+    def _init_parts(self) -> None:
+        # Notes parts parsed once and edited in memory; written back by
+        # flush() / save_to_buffer() instead of after every note
+        self._trees: Dict[str, ET.ElementTree] = {}
+        self._dirty = set()
+    
+    def _note_tree(self, part: str) -> Optional[ET.ElementTree]:
+        """Parsed tree for a notes part (e.g. 'word/endnotes.xml'), or None if absent."""
+        tree = self._trees.get(part)
+        if tree is None:
+            path = os.path.join(self.temp_dir, *part.split('/'))
+            if not os.path.exists(path):
+                return None
+            tree = ET.parse(path)
+            self._trees[part] = tree
+        return tree
+    
+    def flush(self) -> Dict[str, bytes]:
+        """
+        Serialize notes parts edited in memory and write them back to the
+        extracted package.
+        
+        Returns:
+            Part name -> serialized bytes for the parts that were written
+        """
+        written = {}
+        for part in sorted(self._dirty):
+            buffer = BytesIO()
+            self._trees[part].write(buffer, encoding='UTF-8', xml_declaration=True)
+            data = buffer.getvalue()
+            with open(os.path.join(self.temp_dir, *part.split('/')), 'wb') as f:
+                f.write(data)
+            written[part] = data
+        self._dirty.clear()
+        return written
+    
     def get_endnotes(self) -> List[Dict[str, str]]:
         """
         Extract all endnotes from the document.
@@ -388,12 +449,10 @@ class WordDocumentProcessor:
         Returns:
             List of dicts: [{'id': '1', 'text': 'citation text'}, ...]
         """
-        endnotes_path = os.path.join(self.temp_dir, 'word', 'endnotes.xml')
-        if not os.path.exists(endnotes_path):
-            return []
-        
         try:
-            tree = ET.parse(endnotes_path)
+            tree = self._note_tree('word/endnotes.xml')
+            if tree is None:
+                return []
             root = tree.getroot()
             notes = []
             
@@ -430,12 +489,10 @@ class WordDocumentProcessor:
         Returns:
             List of dicts: [{'id': '1', 'text': 'citation text'}, ...]
         """
-        footnotes_path = os.path.join(self.temp_dir, 'word', 'footnotes.xml')
-        if not os.path.exists(footnotes_path):
-            return []
-        
         try:
-            tree = ET.parse(footnotes_path)
+            tree = self._note_tree('word/footnotes.xml')
+            if tree is None:
+                return []
             root = tree.getroot()
             notes = []
             
@@ -711,16 +768,14 @@ class WordDocumentProcessor:
         Returns:
             bool: True if successful
         """
-        endnotes_path = os.path.join(self.temp_dir, 'word', 'endnotes.xml')
-        if not os.path.exists(endnotes_path):
-            return False
-        
         try:
             # Register namespace to preserve it
             ET.register_namespace('w', self.NS['w'])
             ET.register_namespace('xml', self.NS['xml'])
             
-            tree = ET.parse(endnotes_path)
+            tree = self._note_tree('word/endnotes.xml')
+            if tree is None:
+                return False
             root = tree.getroot()
             
             # Find the target endnote
@@ -797,7 +852,7 @@ class WordDocumentProcessor:
                 t.text = text_content
                 t.set(f"{{{self.NS['xml']}}}space", "preserve")
             
-            tree.write(endnotes_path, encoding='UTF-8', xml_declaration=True)
+            self._dirty.add('word/endnotes.xml')
             return True
             
         except Exception as e:
@@ -810,15 +865,13 @@ class WordDocumentProcessor:
         Handles <i> tags for italics using regex (no BeautifulSoup needed).
         PRESERVES the footnoteRef element for proper numbering and linking.
         """
-        footnotes_path = os.path.join(self.temp_dir, 'word', 'footnotes.xml')
-        if not os.path.exists(footnotes_path):
-            return False
-        
         try:
             ET.register_namespace('w', self.NS['w'])
             ET.register_namespace('xml', self.NS['xml'])
             
-            tree = ET.parse(footnotes_path)
+            tree = self._note_tree('word/footnotes.xml')
+            if tree is None:
+                return False
             root = tree.getroot()
             
             target = None
@@ -893,29 +946,35 @@ class WordDocumentProcessor:
                 t.text = text_content
                 t.set(f"{{{self.NS['xml']}}}space", "preserve")
             
-            tree.write(footnotes_path, encoding='UTF-8', xml_declaration=True)
+            self._dirty.add('word/footnotes.xml')
             return True
             
         except Exception as e:
             print(f"[WordDocumentProcessor] Error writing footnote: {e}")
             return False
     
-    def save_to_buffer(self) -> BytesIO:
+    def save_to_buffer(self, add_links: bool = False, cache: Optional[SourceComponentsCache] = None) -> BytesIO:
         """
         Save the modified document to a BytesIO buffer.
         
+        This is the single output stage: note edits, hyperlink activation
+        and cache embedding are applied to the parts in memory and the
+        package is zipped once.
+        
+        Args:
+            add_links: Convert plain-text URLs to clickable hyperlinks
+            cache: Metadata cache to embed as customXml (skipped if empty)
+        
         Returns:
             BytesIO buffer containing the .docx file
         """
-        buffer = BytesIO()
-        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(self.temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, self.temp_dir)
-                    zipf.write(file_path, arcname)
-        buffer.seek(0)
-        return buffer
+        self.flush()
+        parts = read_extracted_parts(self.temp_dir)
+        if add_links:
+            LinkActivator.apply_to_parts(parts)
+        if cache is not None:
+            embed_cache_parts(parts, cache)
+        return write_docx_parts(parts)
     
     def save_as(self, output_path: str) -> None:
         """
@@ -924,16 +983,12 @@ class WordDocumentProcessor:
         Args:
             output_path: Path for the output .docx file
         """
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(self.temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, self.temp_dir)
-                    zipf.write(file_path, arcname)
+        with open(output_path, 'wb') as f:
+            f.write(self.save_to_buffer().getvalue())
     
     def cleanup(self) -> None:
         """Remove temporary files."""
-        if os.path.exists(self.temp_dir):
+        if getattr(self, '_owns_temp_dir', True) and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
     
     def __del__(self):
@@ -959,66 +1014,73 @@ class LinkActivator:
     # Pattern to match URLs
     URL_PATTERN = re.compile(r'(https?://[^\s<>"]+)')
     
+    # URLs within w:t elements
+    RUN_URL_PATTERN = re.compile(r'(<w:t[^>]*>)([^<]*?)(https?://[^\s<>"]+)([^<]*?)(</w:t>)')
+    
+    # Package parts whose text may contain URLs
+    TARGET_PARTS = (
+        'word/document.xml',
+        'word/endnotes.xml',
+        'word/footnotes.xml',
+    )
+    
     @classmethod
     def process(cls, docx_buffer: BytesIO) -> BytesIO:
         """
         Process a .docx file to make all URLs clickable.
         
+        Callers that are writing the document anyway should use
+        WordDocumentProcessor.save_to_buffer(add_links=True) or
+        apply_to_parts() instead of re-zipping a finished package.
+        
         Args:
             docx_buffer: BytesIO containing the input .docx file
             
         Returns:
             BytesIO containing the processed .docx file with clickable URLs
         """
-        temp_dir = tempfile.mkdtemp()
-        
         try:
-            # Extract docx to temp directory
-            docx_buffer.seek(0)
-            with zipfile.ZipFile(docx_buffer, 'r') as zf:
-                zf.extractall(temp_dir)
-            
-            # Process each relevant XML file
-            target_files = [
-                'word/document.xml',
-                'word/endnotes.xml',
-                'word/footnotes.xml'
-            ]
-            
-            for xml_file in target_files:
-                full_path = os.path.join(temp_dir, xml_file)
-                if os.path.exists(full_path):
-                    cls._process_xml_file(full_path)
-            
-            # Repackage as docx
-            output_buffer = BytesIO()
-            with zipfile.ZipFile(output_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-                for root, dirs, files in os.walk(temp_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, temp_dir)
-                        zf.write(file_path, arcname)
-            
-            output_buffer.seek(0)
-            return output_buffer
+            parts = read_docx_parts(docx_buffer)
+            if not cls.apply_to_parts(parts):
+                docx_buffer.seek(0)
+                return docx_buffer
+            return write_docx_parts(parts)
             
         except Exception as e:
             print(f"[LinkActivator] Error: {e}")
             docx_buffer.seek(0)
             return docx_buffer
-            
-        finally:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
     
     @classmethod
-    def _process_xml_file(cls, file_path: str):
-        """Process a single XML file to convert URLs to hyperlinks."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def apply_to_parts(cls, parts: Dict[str, bytes]) -> bool:
+        """
+        Activate URLs in the target parts of an in-memory package.
+        
+        All-or-nothing: if any part fails, ``parts`` is left untouched.
         
-        # Pattern to find URLs within w:t elements
-        pattern = r'(<w:t[^>]*>)([^<]*?)(https?://[^\s<>"]+)([^<]*?)(</w:t>)'
+        Returns:
+            True if any part changed
+        """
+        try:
+            updated = {}
+            for name in cls.TARGET_PARTS:
+                data = parts.get(name)
+                if data is None:
+                    continue
+                content = data.decode('utf-8')
+                new_content = cls.activate_xml(content)
+                if new_content != content:
+                    updated[name] = new_content.encode('utf-8')
+        except Exception as e:
+            print(f"[LinkActivator] Error: {e}")
+            return False
+        
+        parts.update(updated)
+        return bool(updated)
+    
+    @classmethod
+    def activate_xml(cls, content: str) -> str:
+        """Convert URLs in one part's XML to hyperlink fields."""
         
         def replace_url(match):
             t_open = match.group(1)
@@ -1068,12 +1130,7 @@ class LinkActivator:
             
             return result
         
-        # Apply the replacement
-        new_content = re.sub(pattern, replace_url, content)
-        
-        # Write back
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        return cls.RUN_URL_PATTERN.sub(replace_url, content)
     
     @classmethod
     def _build_hyperlink_field(cls, safe_url: str, display_text: str) -> str:
@@ -1166,26 +1223,32 @@ def process_document(
     endnotes = processor.get_endnotes()
     footnotes = processor.get_footnotes()
     
+    # Resolve every DOI/PMID/arXiv id in the notes with batched requests and
+    # seed the metadata cache, so per-note lookups skip the network
+    try:
+        from engines.identifier_batch import prefetch_identifiers
+        prefetched = prefetch_identifiers([n['text'] for n in endnotes + footnotes], metadata_cache)
+        if prefetched:
+            print(f"[process_document] Prefetched {len(prefetched)} identifiers")
+    except Exception as e:
+        print(f"[process_document] Identifier prefetch failed: {e}")
+    
     # Extract document body text for context-aware lookups
     document_context = ""
     try:
         body_text = processor.get_body_text(max_chars=1500)
         if body_text:
-            import openai
-            from config import OPENAI_API_KEY
-            
-            if OPENAI_API_KEY:
-                client = openai.OpenAI(api_key=OPENAI_API_KEY)
-                gist_response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{
-                        "role": "user",
-                        "content": f"In 10-15 words, describe the academic field and topic of this text. Just give the description, no preamble:\n\n{body_text[:1000]}"
-                    }],
-                    max_tokens=50,
-                    temperature=0.3
-                )
-                document_context = gist_response.choices[0].message.content.strip()
+            # Shared pooled client (keep-alive, DNS cache, scheduler, cost log)
+            from engines.ai_lookup import _call_openai
+            
+            gist = _call_openai(
+                f"In 10-15 words, describe the academic field and topic of this text. Just give the description, no preamble:\n\n{body_text[:1000]}",
+                system="You summarize academic documents in one short phrase.",
+                max_tokens=50,
+                model="gpt-4o-mini"
+            )
+            if gist:
+                document_context = gist.strip()
                 print(f"[process_document] Document gist: {document_context}")
     except Exception as e:
         print(f"[process_document] Could not generate document gist: {e}")
@@ -1194,7 +1257,7 @@ def process_document(
     def get_citation_with_timeout(text: str, style: str, context: str = "", timeout: int = NOTE_TIMEOUT):
         """Call get_citation with a timeout wrapper. Uses metadata_cache from outer scope."""
         with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(get_citation, text, style, context, metadata_cache)
+            future = submit_traced(executor, get_citation, text, style, context, metadata_cache)
             try:
                 return future.result(timeout=timeout)
             except FuturesTimeout:
@@ -1388,22 +1451,13 @@ def process_document(
                 success=False
             )
     
-    # Save to buffer
-    doc_buffer = processor.save_to_buffer()
-    
-    # Make URLs clickable if requested
-    if add_links:
-        doc_buffer = LinkActivator.process(doc_buffer)
-    
-    # Get document bytes
-    doc_bytes = doc_buffer.read()
-    
-    # Embed updated metadata cache into document (V4.1)
     cache_hits_after = metadata_cache.size()
     new_citations_cached = cache_hits_after - cache_hits_before
     print(f"[process_document] Cache: {cache_hits_before} existing + {new_citations_cached} new = {cache_hits_after} total")
     
-    doc_bytes = save_cache_to_docx(doc_bytes, metadata_cache)
+    # Single output stage: note write-back, clickable URLs (if requested)
+    # and the embedded metadata cache (V4.1), zipped once
+    doc_bytes = processor.save_to_buffer(add_links=add_links, cache=metadata_cache).getvalue()
     
     # Cleanup
     processor.cleanup()
@@ -1431,34 +1485,19 @@ def update_document_note(doc_bytes: bytes, note_id: int, new_html: str) -> bytes
     Returns:
         Updated document as bytes
     """
-    import io
-    import zipfile
-    import tempfile
-    import shutil
-    import re
-    
     try:
-        # Extract the docx
-        temp_dir = tempfile.mkdtemp()
-        
-        with zipfile.ZipFile(io.BytesIO(doc_bytes), 'r') as zf:
-            zf.extractall(temp_dir)
-        
-        # Find and update the endnote
-        endnotes_path = os.path.join(temp_dir, 'word', 'endnotes.xml')
-        footnotes_path = os.path.join(temp_dir, 'word', 'footnotes.xml')
+        parts = read_docx_parts(doc_bytes)
         
         updated = False
         
-        for xml_path, note_tag in [(endnotes_path, 'w:endnote'), (footnotes_path, 'w:footnote')]:
-            if not os.path.exists(xml_path):
+        for part, note_tag in [('word/endnotes.xml', 'w:endnote'), ('word/footnotes.xml', 'w:footnote')]:
+            if part not in parts:
                 continue
             
             # Determine note type for styling
-            note_type = 'footnote' if 'footnote' in xml_path else 'endnote'
-                
-            with open(xml_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            note_type = 'footnote' if 'footnote' in part else 'endnote'
+            
+            content = parts[part].decode('utf-8')
             
             # Find the note with matching ID
             # Pattern: <w:endnote w:id="N">...</w:endnote>
@@ -1476,29 +1515,14 @@ def update_document_note(doc_bytes: bytes, note_id: int, new_html: str) -> bytes
             new_content, count = re.subn(pattern, replace_note_content, content, flags=re.DOTALL)
             
             if count > 0:
-                with open(xml_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                parts[part] = new_content.encode('utf-8')
                 updated = True
                 break
         
-        # Repackage the docx
-        output_buffer = io.BytesIO()
-        with zipfile.ZipFile(output_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zf.write(file_path, arcname)
-        
-        # Cleanup
-        shutil.rmtree(temp_dir)
-        
-        output_buffer.seek(0)
-        
-        # Activate any URLs as clickable hyperlinks (use internal LinkActivator)
-        output_buffer = LinkActivator.process(output_buffer)
+        # Activate any URLs as clickable hyperlinks, then zip once
+        LinkActivator.apply_to_parts(parts)
         
-        return output_buffer.read()
+        return write_docx_parts(parts).getvalue()
         
     except Exception as e:
         print(f"[update_document_note] Error: {e}")
@@ -22,7 +22,7 @@ Version History:
 """
 
 import os
-import requests
+import http_client
 import base64
 from datetime import datetime
 from pathlib import Path
@@ -215,7 +215,7 @@ def send_email(to: str, subject: str, body: str, attachment_content: str = None,
         }]
     
     try:
-        response = requests.post(
+        response = http_client.post(
             'https://api.resend.com/emails',
             headers={
                 'Authorization': f'Bearer {RESEND_API_KEY}',
@@ -10,17 +10,46 @@ Modules:
     doi.py              - DOI extraction from publisher URLs
     famous_papers.py    - 51K famous papers cache for fast lookup
     author_year_search.py - Multi-engine search by author+year (for APA/Harvard)
-    base.py             - SearchEngine ABC, MultiAttemptEngine base class
+    base.py             - SearchEngine ABC, MultiAttemptEngine base class, LazyEngine, LazyModule
+    cassette.py         - Offline record/replay of HTTP traffic (benchmarks, regression runs)
+    identifier_batch.py - Batched DOI/PMID/arXiv resolution and prefetch store
+    scoring.py          - Batch candidate scoring (author position, title overlap)
+
+Engine classes are re-exported lazily: ``from engines import CrossrefEngine``
+imports engines.academic on first access instead of every engine module
+being imported with the package.
 """
 
-from engines.base import SearchEngine, MultiAttemptEngine
-from engines.academic import CrossrefEngine, OpenAlexEngine, PubMedEngine
-from engines.books import GoogleBooksAPI, OpenLibraryAPI
-from engines.legal import CourtListenerEngine, FamousCasesCache
+import importlib
+
+from engines.base import SearchEngine, MultiAttemptEngine, LazyEngine, LazyModule
+
+# Re-exported name -> defining submodule (imported on first access)
+_LAZY_EXPORTS = {
+    'CrossrefEngine': 'engines.academic',
+    'OpenAlexEngine': 'engines.academic',
+    'PubMedEngine': 'engines.academic',
+    'GoogleBooksAPI': 'engines.books',
+    'OpenLibraryAPI': 'engines.books',
+    'CourtListenerEngine': 'engines.legal',
+    'FamousCasesCache': 'engines.legal',
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module 'engines' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'SearchEngine',
     'MultiAttemptEngine',
+    'LazyEngine',
+    'LazyModule',
     'CrossrefEngine',
     'OpenAlexEngine', 
     'PubMedEngine',
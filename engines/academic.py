@@ -21,6 +21,15 @@ from typing import Optional, List, Tuple
 from engines.base import SearchEngine
 from models import SourceComponents, CitationType
 from config import PUBMED_API_KEY, SEMANTIC_SCHOLAR_API_KEY
+from engines.identifier_batch import get_prefetched
+from engines.scoring import (
+    QueryTokens, TITLE_STOPWORDS, best_index, overlap_counts, partial_match_counts,
+    title_word_sets,
+)
+from engines import scoring
+from tracing import get_logger
+
+logger = get_logger('engines.academic')
 
 # Shorter timeout for faster failures
 ENGINE_TIMEOUT = 5  # seconds
@@ -34,7 +43,7 @@ ENGINE_TIMEOUT = 5  # seconds
 # identify where the query author is sole/first author vs. 47th author.
 
 # Common first names to skip when extracting surname from query
-COMMON_FIRST_NAMES = {
+COMMON_FIRST_NAMES = frozenset({
     'james', 'john', 'robert', 'michael', 'william', 'david', 'richard', 'joseph',
     'thomas', 'charles', 'christopher', 'daniel', 'matthew', 'anthony', 'mark',
     'donald', 'steven', 'paul', 'andrew', 'joshua', 'kenneth', 'kevin', 'brian',
@@ -44,7 +53,7 @@ COMMON_FIRST_NAMES = {
     'ashley', 'dorothy', 'kimberly', 'emily', 'donna', 'michelle', 'carol', 'amanda',
     'eric', 'louis', 'peter', 'henry', 'arthur', 'albert', 'frank', 'raymond',
     'anna', 'ruth', 'helen', 'laura', 'marie', 'ann', 'jane', 'alice', 'grace'
-}
+})
 
 
 def extract_query_author(query: str) -> Optional[str]:
@@ -54,25 +63,7 @@ def extract_query_author(query: str) -> Optional[str]:
     For "Eric Caplan trains brains" → returns "caplan"
     For "trains brains" → returns None
     """
-    words = query.split()
-    
-    # Strategy 1: "FirstName LastName keywords" pattern
-    if len(words) >= 2:
-        first_word = words[0].strip().lower()
-        second_word = words[1].strip()
-        
-        if first_word in COMMON_FIRST_NAMES:
-            if second_word[0].isupper() and len(second_word) >= 3:
-                return second_word.lower()
-    
-    # Strategy 2: Find capitalized word that's not a common first name
-    for word in words:
-        clean = re.sub(r'[^\w]', '', word)
-        if clean and clean[0].isupper() and len(clean) >= 3:
-            if clean.lower() not in COMMON_FIRST_NAMES:
-                return clean.lower()
-    
-    return None
+    return scoring.extract_query_author(query, COMMON_FIRST_NAMES)
 
 
 def score_author_position(authors: List[str], query: str) -> float:
@@ -87,27 +78,16 @@ def score_author_position(authors: List[str], query: str) -> float:
         0.1 = author not found
         0.5 = no clear author in query
     """
-    if not authors:
-        return 0.1
-    
-    query_author = extract_query_author(query)
-    if not query_author:
-        return 0.5  # No clear author in query, can't score
-    
-    # Check each author position
-    for i, author in enumerate(authors):
-        author_lower = author.lower()
-        if query_author in author_lower:
-            if len(authors) == 1:
-                return 1.0  # Sole author — best match!
-            elif i == 0:
-                return 0.9  # First author
-            elif i <= 2:
-                return 0.7  # 2nd-3rd author
-            else:
-                return 0.3  # 4th+ author (likely coincidental)
-    
-    return 0.1  # Author not found
+    return score_author_positions([authors], query)[0]
+
+
+def score_author_positions(author_lists: List[List[str]], query: str) -> List[float]:
+    """
+    score_author_position() for a batch of candidates; the query author is
+    extracted once.
+    """
+    query_author = extract_query_author(query) if any(author_lists) else None
+    return scoring.score_author_positions(author_lists, query_author)
 
 
 # =============================================================================
@@ -156,12 +136,9 @@ class CrossrefEngine(SearchEngine):
                 return self._normalize(items[0], query)
             
             # Score each by author position
-            candidates = []
-            for item in items:
-                meta = self._normalize(item, query)
-                if meta:
-                    score = score_author_position(meta.authors or [], query)
-                    candidates.append((score, meta))
+            metas = [meta for meta in (self._normalize(item, query) for item in items) if meta]
+            scores = score_author_positions([meta.authors or [] for meta in metas], query)
+            candidates = list(zip(scores, metas))
             
             if not candidates:
                 return None
@@ -170,11 +147,11 @@ class CrossrefEngine(SearchEngine):
             candidates.sort(key=lambda x: x[0], reverse=True)
             best_score, best_meta = candidates[0]
             
-            print(f"[{self.name}] Selected result (author-score: {best_score})")
+            logger.debug(f"[{self.name}] Selected result (author-score: {best_score})")
             return best_meta
             
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def search_multiple(self, query: str, limit: int = 5) -> List[SourceComponents]:
@@ -193,13 +170,11 @@ class CrossrefEngine(SearchEngine):
             items = data.get('message', {}).get('items', [])
             
             # Normalize and score all
-            candidates = []
-            for item in items:
-                meta = self._normalize(item, query)
-                if meta:
-                    score = score_author_position(meta.authors or [], query)
-                    meta.confidence = score
-                    candidates.append((score, meta))
+            metas = [meta for meta in (self._normalize(item, query) for item in items) if meta]
+            scores = score_author_positions([meta.authors or [] for meta in metas], query)
+            for score, meta in zip(scores, metas):
+                meta.confidence = score
+            candidates = list(zip(scores, metas))
             
             # Sort by score
             candidates.sort(key=lambda x: x[0], reverse=True)
@@ -212,6 +187,9 @@ class CrossrefEngine(SearchEngine):
         """Look up by DOI directly."""
         # Clean DOI
         doi = doi.replace('https://doi.org/', '').replace('http://dx.doi.org/', '')
+        known, components = get_prefetched('doi', doi)
+        if known:
+            return components
         url = f"{self.base_url}/{doi}"
         
         response = self._make_request(url)
@@ -337,12 +315,9 @@ class OpenAlexEngine(SearchEngine):
                 return self._normalize(results[0], query)
             
             # Score each by author position
-            candidates = []
-            for item in results:
-                meta = self._normalize(item, query)
-                if meta:
-                    score = score_author_position(meta.authors or [], query)
-                    candidates.append((score, meta))
+            metas = [meta for meta in (self._normalize(item, query) for item in results) if meta]
+            scores = score_author_positions([meta.authors or [] for meta in metas], query)
+            candidates = list(zip(scores, metas))
             
             if not candidates:
                 return None
@@ -351,11 +326,11 @@ class OpenAlexEngine(SearchEngine):
             candidates.sort(key=lambda x: x[0], reverse=True)
             best_score, best_meta = candidates[0]
             
-            print(f"[{self.name}] Selected result (author-score: {best_score})")
+            logger.debug(f"[{self.name}] Selected result (author-score: {best_score})")
             return best_meta
             
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def search_multiple(self, query: str, limit: int = 5) -> List[SourceComponents]:
@@ -373,13 +348,11 @@ class OpenAlexEngine(SearchEngine):
             data = response.json()
             results = data.get('results', [])
             
-            candidates = []
-            for item in results:
-                meta = self._normalize(item, query)
-                if meta:
-                    score = score_author_position(meta.authors or [], query)
-                    meta.confidence = score
-                    candidates.append((score, meta))
+            metas = [meta for meta in (self._normalize(item, query) for item in results) if meta]
+            scores = score_author_positions([meta.authors or [] for meta in metas], query)
+            for score, meta in zip(scores, metas):
+                meta.confidence = score
+            candidates = list(zip(scores, metas))
             
             candidates.sort(key=lambda x: x[0], reverse=True)
             return [meta for score, meta in candidates[:limit]]
@@ -439,6 +412,10 @@ class OpenAlexEngine(SearchEngine):
 # SEMANTIC SCHOLAR ENGINE
 # =============================================================================
 
+# Semantic Scholar match points by author-position score
+_SS_POSITION_POINTS = {1.0: 50, 0.9: 30, 0.7: 15, 0.3: 5, 0.1: 0}
+
+
 class SemanticScholarEngine(SearchEngine):
     """
     Search Semantic Scholar - AI-powered with author matching.
@@ -496,7 +473,7 @@ class SemanticScholarEngine(SearchEngine):
             return self._fetch_details(best_match['paperId'], query, headers)
             
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def _find_best_match(self, papers: List[dict], query: str) -> dict:
@@ -505,53 +482,27 @@ class SemanticScholarEngine(SearchEngine):
         
         UPDATED: Sole author scores highest, first author next, 4th+ lowest.
         """
-        query_lower = query.lower()
         query_author = extract_query_author(query)
+        tokens = QueryTokens(query)
         
-        best_match = papers[0]
-        best_score = -1
-        
-        # Stopwords for title matching
-        stopwords = {'the', 'a', 'an', 'of', 'and', 'in', 'on', 'for', 'to'}
-        query_words = [w for w in query_lower.split() if len(w) >= 3 and w not in stopwords]
-        
+        # AUTHOR POSITION SCORING (the key fix!)
+        # Sole author 50, first 30, 2nd-3rd 15, 4th+ 5
+        scores = []
         for paper in papers:
             score = 0
             authors = paper.get('authors', [])
-            title = paper.get('title', '').lower()
-            
-            # AUTHOR POSITION SCORING (the key fix!)
             if query_author:
-                author_names = [a.get('name', '').lower() for a in authors]
-                for i, author_name in enumerate(author_names):
-                    if query_author in author_name:
-                        if len(authors) == 1:
-                            score += 50  # Sole author - huge bonus!
-                        elif i == 0:
-                            score += 30  # First author
-                        elif i <= 2:
-                            score += 15  # 2nd-3rd author
-                        else:
-                            score += 5   # 4th+ author
-                        break
-            
-            # Title word overlap (secondary)
-            title_words = set(title.split()) - stopwords
-            exact_overlap = len(set(query_words) & title_words)
-            score += exact_overlap * 3
-            
-            # Partial word matches
-            for qword in query_words:
-                if len(qword) >= 4:
-                    for tword in title_words:
-                        if qword[:4] in tword or tword[:4] in qword:
-                            score += 2
-            
-            if score > best_score:
-                best_score = score
-                best_match = paper
+                index = scoring.author_index([a.get('name', '') for a in authors], query_author)
+                score = _SS_POSITION_POINTS[scoring.position_score(index, len(authors))]
+            scores.append(score)
+        
+        # Title word overlap (secondary) and partial word matches
+        title_sets = title_word_sets((paper.get('title', '') for paper in papers), TITLE_STOPWORDS)
+        overlaps = overlap_counts(tokens.content_set, title_sets)
+        partials = partial_match_counts(tokens, title_sets)
+        scores = [score + overlap * 3 + partial * 2 for score, overlap, partial in zip(scores, overlaps, partials)]
         
-        return best_match
+        return papers[best_index(scores)]
     
     def _fetch_details(self, paper_id: str, raw_source: str, headers: dict) -> Optional[SourceComponents]:
         """Fetch full paper details by ID."""
@@ -652,12 +603,9 @@ class PubMedEngine(SearchEngine):
             return self._fetch_details(pmids[0], query)
         
         # Fetch details for all and score by author-position
-        candidates = []
-        for pmid in pmids:
-            result = self._fetch_details(pmid, query)
-            if result:
-                score = score_author_position(result.authors or [], query)
-                candidates.append((score, result))
+        results = [result for result in (self._fetch_details(pmid, query) for pmid in pmids) if result]
+        scores = score_author_positions([result.authors or [] for result in results], query)
+        candidates = list(zip(scores, results))
         
         if not candidates:
             return None
@@ -666,7 +614,7 @@ class PubMedEngine(SearchEngine):
         candidates.sort(key=lambda x: x[0], reverse=True)
         
         best_score, best_result = candidates[0]
-        print(f"[{self.name}] Selected PMID {best_result.pmid} (author-score: {best_score})")
+        logger.debug(f"[{self.name}] Selected PMID {best_result.pmid} (author-score: {best_score})")
         
         return best_result
     
@@ -692,7 +640,7 @@ class PubMedEngine(SearchEngine):
                     data = response.json()
                     id_list = data.get('esearchresult', {}).get('idlist', [])
                     if id_list:
-                        print(f"[{self.name}] Found {len(id_list)} results for: {search_query[:50]}...")
+                        logger.debug(f"[{self.name}] Found {len(id_list)} results for: {search_query[:50]}...")
                         return id_list
                 except:
                     pass
@@ -702,6 +650,9 @@ class PubMedEngine(SearchEngine):
     def get_by_id(self, pmid: str) -> Optional[SourceComponents]:
         """Look up by PMID directly."""
         pmid = re.sub(r'\D', '', pmid)
+        known, components = get_prefetched('pmid', pmid)
+        if known:
+            return components
         return self._fetch_details(pmid, f"PMID:{pmid}")
     
     def _build_pubmed_queries(self, query: str) -> List[str]:
@@ -802,7 +753,7 @@ class PubMedEngine(SearchEngine):
             
             return self._normalize_summary(article, pmid, raw_source)
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def _normalize_summary(self, article: dict, pmid: str, raw_source: str) -> SourceComponents:
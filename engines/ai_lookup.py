@@ -35,7 +35,7 @@ import os
 import re
 import json
 import time
-import requests
+import http_client
 from typing import Optional, List, Tuple, Dict, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -48,6 +48,9 @@ from cost_tracker import log_api_call
 # =============================================================================
 
 from config import OPENAI_API_KEY, ANTHROPIC_API_KEY, GEMINI_API_KEY
+from tracing import get_logger, traced
+
+logger = get_logger('engines.ai_lookup')
 
 # =============================================================================
 # PROVIDER CHAIN CONFIGURATION
@@ -87,9 +90,9 @@ if ANTHROPIC_API_KEY:
 ACTIVE_CHAIN = [p for p in AI_PROVIDER_CHAIN if p in AVAILABLE_PROVIDERS]
 
 if ACTIVE_CHAIN:
-    print(f"[AI_Lookup] Provider chain: {' → '.join(ACTIVE_CHAIN)}")
+    logger.info(f"[AI_Lookup] Provider chain: {' → '.join(ACTIVE_CHAIN)}")
 else:
-    print("[AI_Lookup] WARNING: No AI providers configured")
+    logger.warning("[AI_Lookup] WARNING: No AI providers configured")
 
 
 # =============================================================================
@@ -118,12 +121,13 @@ def _call_ai(prompt: str, system: str, max_tokens: int = 1000) -> Optional[str]:
                 return result
                 
         except Exception as e:
-            print(f"[AI_Lookup] {provider} failed: {e}")
+            logger.warning(f"[AI_Lookup] {provider} failed: {e}")
             continue
     
     return None
 
 
+@traced('ai.gemini')
 def _call_gemini(prompt: str, system: str, max_tokens: int) -> Optional[str]:
     """Call Gemini API."""
     if not GEMINI_API_KEY:
@@ -131,7 +135,7 @@ def _call_gemini(prompt: str, system: str, max_tokens: int) -> Optional[str]:
     
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
     
-    response = requests.post(
+    response = http_client.post(
         url,
         headers={
             'Content-Type': 'application/json',
@@ -163,6 +167,7 @@ def _call_gemini(prompt: str, system: str, max_tokens: int) -> Optional[str]:
     return candidates[0].get('content', {}).get('parts', [{}])[0].get('text', '')
 
 
+@traced('ai.openai')
 def _call_openai(prompt: str, system: str, max_tokens: int, model: str = None) -> Optional[str]:
     """Call OpenAI API.
     
@@ -177,7 +182,7 @@ def _call_openai(prompt: str, system: str, max_tokens: int, model: str = None) -
     
     use_model = model or OPENAI_MODEL
     
-    response = requests.post(
+    response = http_client.post(
         "https://api.openai.com/v1/chat/completions",
         headers={
             "Authorization": f"Bearer {OPENAI_API_KEY}",
@@ -200,7 +205,7 @@ def _call_openai(prompt: str, system: str, max_tokens: int, model: str = None) -
     
     if response.status_code != 200:
         error_msg = f"OpenAI API error {response.status_code} for model {use_model}: {response.text[:200]}"
-        print(f"[AI_Lookup] {error_msg}")
+        logger.warning(f"[AI_Lookup] {error_msg}")
         raise Exception(error_msg)
     
     result = response.json()
@@ -214,12 +219,13 @@ def _call_openai(prompt: str, system: str, max_tokens: int, model: str = None) -
     return result['choices'][0]['message']['content']
 
 
+@traced('ai.claude')
 def _call_claude(prompt: str, system: str, max_tokens: int) -> Optional[str]:
     """Call Claude API."""
     if not ANTHROPIC_API_KEY:
         return None
     
-    response = requests.post(
+    response = http_client.post(
         "https://api.anthropic.com/v1/messages",
         headers={
             "x-api-key": ANTHROPIC_API_KEY,
@@ -348,15 +354,16 @@ def lookup_org_name(domain: str) -> Optional[str]:
                 result = result.strip().strip('"').strip("'")
                 # Reject if it looks like an error or too short
                 if len(result) > 3 and 'error' not in result.lower() and 'sorry' not in result.lower():
-                    print(f"[AI_Lookup] Organization name for {domain}: {result}")
+                    logger.debug(f"[AI_Lookup] Organization name for {domain}: {result}")
                     return result
         except Exception as e:
-            print(f"[AI_Lookup] {provider} error for org lookup: {e}")
+            logger.warning(f"[AI_Lookup] {provider} error for org lookup: {e}")
             continue
     
     return None
 
 
+@traced('ai.gemini')
 def _call_gemini_simple(prompt: str) -> Optional[str]:
     """Simple Gemini call for short text responses."""
     url = f"https://generativelanguage.googleapis.com/v1beta/models/{GEMINI_MODEL}:generateContent"
@@ -370,17 +377,18 @@ def _call_gemini_simple(prompt: str) -> Optional[str]:
     }
     
     try:
-        response = requests.post(url, headers=headers, params=params, json=data, timeout=10)
+        response = http_client.post(url, headers=headers, params=params, json=data, timeout=10)
         if response.status_code == 200:
             result = response.json()
             text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
             log_api_call('gemini', 'org_lookup', 0.0001)  # Minimal cost
             return text.strip()
     except Exception as e:
-        print(f"[AI_Lookup] Gemini simple call error: {e}")
+        logger.warning(f"[AI_Lookup] Gemini simple call error: {e}")
     return None
 
 
+@traced('ai.openai')
 def _call_openai_simple(prompt: str) -> Optional[str]:
     """Simple OpenAI call for short text responses."""
     url = "https://api.openai.com/v1/chat/completions"
@@ -398,17 +406,18 @@ def _call_openai_simple(prompt: str) -> Optional[str]:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        response = http_client.post(url, headers=headers, json=data, timeout=10)
         if response.status_code == 200:
             result = response.json()
             text = result.get("choices", [{}])[0].get("message", {}).get("content", "")
             log_api_call('openai', 'org_lookup', 0.001)  # Minimal cost
             return text.strip()
     except Exception as e:
-        print(f"[AI_Lookup] OpenAI simple call error: {e}")
+        logger.warning(f"[AI_Lookup] OpenAI simple call error: {e}")
     return None
 
 
+@traced('ai.claude')
 def _call_claude_simple(prompt: str) -> Optional[str]:
     """Simple Claude call for short text responses."""
     url = "https://api.anthropic.com/v1/messages"
@@ -426,14 +435,14 @@ def _call_claude_simple(prompt: str) -> Optional[str]:
     }
     
     try:
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        response = http_client.post(url, headers=headers, json=data, timeout=10)
         if response.status_code == 200:
             result = response.json()
             text = result.get("content", [{}])[0].get("text", "")
             log_api_call('claude', 'org_lookup', 0.001)  # Minimal cost
             return text.strip()
     except Exception as e:
-        print(f"[AI_Lookup] Claude simple call error: {e}")
+        logger.warning(f"[AI_Lookup] Claude simple call error: {e}")
     return None
 
 
@@ -456,7 +465,7 @@ def lookup_newspaper_url(url: str, verify: bool = False) -> Optional[SourceCompo
         SourceComponents with extracted information, or None if lookup fails
     """
     if not OPENAI_API_KEY:
-        print("[AI_Lookup] OpenAI API key not configured for newspaper lookup")
+        logger.debug("[AI_Lookup] OpenAI API key not configured for newspaper lookup")
         return None
     
     prompt = f"Extract citation metadata from this article URL:\n{url}"
@@ -466,17 +475,17 @@ def lookup_newspaper_url(url: str, verify: bool = False) -> Optional[SourceCompo
         response = _call_openai(prompt, NEWSPAPER_URL_SYSTEM, max_tokens=500, model=OPENAI_NEWSPAPER_MODEL)
         
         if not response:
-            print("[AI_Lookup] No response from AI for newspaper URL")
+            logger.debug("[AI_Lookup] No response from AI for newspaper URL")
             return None
         
         data = _parse_json_response(response)
         
         if not data:
-            print(f"[AI_Lookup] Failed to parse AI response: {response[:200]}")
+            logger.warning(f"[AI_Lookup] Failed to parse AI response: {response[:200]}")
             return None
         
         if data.get('error'):
-            print(f"[AI_Lookup] AI error: {data['error']}")
+            logger.warning(f"[AI_Lookup] AI error: {data['error']}")
             return None
         
         # Build SourceComponents from response
@@ -519,16 +528,16 @@ def lookup_newspaper_url(url: str, verify: bool = False) -> Optional[SourceCompo
             # 1. Title should contain some words from the URL slug
             # 2. Publication should match the domain
             if not _verify_newspaper_consistency(result, url):
-                print(f"[AI_Lookup] ✗ Newspaper metadata failed consistency check")
+                logger.warning(f"[AI_Lookup] ✗ Newspaper metadata failed consistency check")
                 return None
             result.source_engine = f"AI Lookup ({OPENAI_NEWSPAPER_MODEL}, verified)"
             result.confidence = 0.85
         
-        print(f"[AI_Lookup] Extracted newspaper: '{result.title[:50]}...' by {result.authors} from {result.newspaper}")
+        logger.debug(f"[AI_Lookup] Extracted newspaper: '{result.title[:50]}...' by {result.authors} from {result.newspaper}")
         return result
         
     except Exception as e:
-        print(f"[AI_Lookup] Newspaper lookup error: {e}")
+        logger.warning(f"[AI_Lookup] Newspaper lookup error: {e}")
         return None
 
 
@@ -575,7 +584,7 @@ def lookup_academic_url(url: str, verify: bool = False) -> Optional[SourceCompon
         or verification fails
     """
     if not OPENAI_API_KEY:
-        print("[AI_Lookup] OpenAI API key not configured for academic lookup")
+        logger.debug("[AI_Lookup] OpenAI API key not configured for academic lookup")
         return None
     
     prompt = f"Extract citation metadata from this academic publication URL:\n{url}"
@@ -584,17 +593,17 @@ def lookup_academic_url(url: str, verify: bool = False) -> Optional[SourceCompon
         response = _call_openai(prompt, ACADEMIC_URL_SYSTEM, max_tokens=500)
         
         if not response:
-            print("[AI_Lookup] No response from AI for academic URL")
+            logger.debug("[AI_Lookup] No response from AI for academic URL")
             return None
         
         data = _parse_json_response(response)
         
         if not data:
-            print(f"[AI_Lookup] Failed to parse AI response: {response[:200]}")
+            logger.warning(f"[AI_Lookup] Failed to parse AI response: {response[:200]}")
             return None
         
         if data.get('error'):
-            print(f"[AI_Lookup] AI error: {data['error']}")
+            logger.warning(f"[AI_Lookup] AI error: {data['error']}")
             return None
         
         # Build initial SourceComponents from AI response
@@ -618,7 +627,7 @@ def lookup_academic_url(url: str, verify: bool = False) -> Optional[SourceCompon
             raw_data=data,
         )
         
-        print(f"[AI_Lookup] AI suggests: '{ai_result.title[:50]}...' by {ai_result.authors}")
+        logger.debug(f"[AI_Lookup] AI suggests: '{ai_result.title[:50]}...' by {ai_result.authors}")
         
         # If verification requested, check against databases
         if verify:
@@ -627,17 +636,17 @@ def lookup_academic_url(url: str, verify: bool = False) -> Optional[SourceCompon
                 verified.url = url
                 verified.source_engine = "AI + Database (verified)"
                 verified.confidence = 0.95
-                print(f"[AI_Lookup] ✓ Verified: '{verified.title[:50]}...'")
+                logger.debug(f"[AI_Lookup] ✓ Verified: '{verified.title[:50]}...'")
                 return verified
             else:
-                print(f"[AI_Lookup] ✗ Could not verify AI result against databases")
+                logger.warning(f"[AI_Lookup] ✗ Could not verify AI result against databases")
                 return None
         
         # No verification requested - return unverified (legacy behavior)
         return ai_result
         
     except Exception as e:
-        print(f"[AI_Lookup] Academic lookup error: {e}")
+        logger.warning(f"[AI_Lookup] Academic lookup error: {e}")
         return None
 
 
@@ -758,7 +767,7 @@ def batch_classify_notes(notes: list, batch_size: int = 50) -> dict:
         Dict mapping note text → type string
     """
     if not ACTIVE_CHAIN:
-        print("[AI_Lookup] No AI providers available for batch classification")
+        logger.debug("[AI_Lookup] No AI providers available for batch classification")
         return {}
     
     classifications = {}
@@ -782,7 +791,7 @@ def batch_classify_notes(notes: list, batch_size: int = 50) -> dict:
     if not valid_notes:
         return classifications
     
-    print(f"[AI_Lookup] Batch classifying {len(valid_notes)} notes...")
+    logger.debug(f"[AI_Lookup] Batch classifying {len(valid_notes)} notes...")
     start_time = time.time()
     
     # Process in batches
@@ -791,7 +800,7 @@ def batch_classify_notes(notes: list, batch_size: int = 50) -> dict:
         batch_num = batch_start // batch_size + 1
         total_batches = (len(valid_notes) + batch_size - 1) // batch_size
         
-        print(f"[AI_Lookup] Batch {batch_num}/{total_batches} ({len(batch)} notes)...")
+        logger.debug(f"[AI_Lookup] Batch {batch_num}/{total_batches} ({len(batch)} notes)...")
         
         # Build numbered list (truncate long notes)
         notes_text = "\n".join([
@@ -813,10 +822,10 @@ def batch_classify_notes(notes: list, batch_size: int = 50) -> dict:
                         classifications[note_text] = result.get('type', 'unknown')
                         
         except Exception as e:
-            print(f"[AI_Lookup] Batch {batch_num} error: {e}")
+            logger.warning(f"[AI_Lookup] Batch {batch_num} error: {e}")
     
     elapsed = time.time() - start_time
-    print(f"[AI_Lookup] Batch classification done in {elapsed:.1f}s")
+    logger.debug(f"[AI_Lookup] Batch classification done in {elapsed:.1f}s")
     return classifications
 
 
@@ -928,7 +937,7 @@ def lookup_parenthetical_citation(citation_text: str, context: str = "") -> Opti
     """
     parsed = parse_parenthetical_citation(citation_text)
     if not parsed:
-        print(f"[AI_Lookup] Could not parse: {citation_text}")
+        logger.warning(f"[AI_Lookup] Could not parse: {citation_text}")
         return None
     
     authors, year = parsed
@@ -950,7 +959,7 @@ def lookup_parenthetical_citation_options(
         return []
     
     authors, year = parsed
-    print(f"[AI_Lookup] Getting options for: {', '.join(authors)} ({year})")
+    logger.debug(f"[AI_Lookup] Getting options for: {', '.join(authors)} ({year})")
     
     authors_str = ", ".join(authors)
     prompt = f"Authors: {authors_str}\nYear: {year}"
@@ -970,7 +979,7 @@ def lookup_parenthetical_citation_options(
         if meta and meta.title:
             results.append(meta)
     
-    print(f"[AI_Lookup] Found {len(results)} options")
+    logger.debug(f"[AI_Lookup] Found {len(results)} options")
     return results
 
 
@@ -979,7 +988,7 @@ def _ai_lookup_authors_year(authors: List[str], year: str, context: str = "") ->
     if not ACTIVE_CHAIN:
         return None
     
-    print(f"[AI_Lookup] Looking up: {', '.join(authors)} ({year})")
+    logger.debug(f"[AI_Lookup] Looking up: {', '.join(authors)} ({year})")
     
     authors_str = ", ".join(authors)
     prompt = f"Authors: {authors_str}\nYear: {year}"
@@ -991,7 +1000,7 @@ def _ai_lookup_authors_year(authors: List[str], year: str, context: str = "") ->
     data = _parse_json_response(response)
     
     if not data or not data.get('found'):
-        print(f"[AI_Lookup] Not found: {', '.join(authors)} ({year})")
+        logger.debug(f"[AI_Lookup] Not found: {', '.join(authors)} ({year})")
         return None
     
     return _dict_to_components(data, authors, year)
@@ -1054,10 +1063,10 @@ def lookup_fragment(
         "Trains, Brains, and Sprains: Railway Spine and the Origins of Psychoneuroses"
     """
     if not ACTIVE_CHAIN:
-        print("[AI_Lookup] No AI providers available")
+        logger.debug("[AI_Lookup] No AI providers available")
         return None
     
-    print(f"[AI_Lookup] Fragment lookup: {fragment[:50]}...")
+    logger.debug(f"[AI_Lookup] Fragment lookup: {fragment[:50]}...")
     
     # Build prompt with gist context
     prompt = f"Citation fragment: {fragment}"
@@ -1070,16 +1079,16 @@ def lookup_fragment(
     guess = _parse_json_response(response)
     
     if not guess:
-        print("[AI_Lookup] AI returned no guess")
+        logger.debug("[AI_Lookup] AI returned no guess")
         return None
     
     confidence = guess.get('confidence', 0)
     title = guess.get('title', '')
     
-    print(f"[AI_Lookup] AI guess: {title[:60]}... (confidence: {confidence})")
+    logger.debug(f"[AI_Lookup] AI guess: {title[:60]}... (confidence: {confidence})")
     
     if confidence < 0.3:
-        print("[AI_Lookup] Confidence too low, rejecting")
+        logger.debug("[AI_Lookup] Confidence too low, rejecting")
         return None
     
     # Skip verification if disabled
@@ -1090,21 +1099,22 @@ def lookup_fragment(
     verified = _verify_against_databases(guess, fragment)
     
     if verified:
-        print(f"[AI_Lookup] ✓ Verified: {verified.title[:50]}...")
+        logger.debug(f"[AI_Lookup] ✓ Verified: {verified.title[:50]}...")
         return verified
     
     # High-confidence guesses can pass without verification
     if confidence >= 0.9 and title:
-        print("[AI_Lookup] High confidence, returning unverified")
+        logger.debug("[AI_Lookup] High confidence, returning unverified")
         meta = _guess_to_components(guess, fragment)
         meta.source_engine = "AI Lookup (unverified)"
         meta.confidence = confidence * 0.8  # Discount for no verification
         return meta
     
-    print("[AI_Lookup] Could not verify AI guess, rejecting as potential hallucination")
+    logger.warning("[AI_Lookup] Could not verify AI guess, rejecting as potential hallucination")
     return None
 
 
+@traced('verify.databases')
 def _verify_against_databases(guess: dict, original_fragment: str) -> Optional[SourceComponents]:
     """
     Verify AI guess against free academic databases.
@@ -1127,7 +1137,7 @@ def _verify_against_databases(guess: dict, original_fragment: str) -> Optional[S
         try:
             result = CrossrefEngine().get_by_id(doi)
             if result and _result_matches_fragment(result, original_fragment):
-                print(f"[AI_Lookup] Verified via DOI: {doi}")
+                logger.debug(f"[AI_Lookup] Verified via DOI: {doi}")
                 result.source_engine = "AI + Crossref (DOI verified)"
                 return result
         except:
@@ -1137,7 +1147,7 @@ def _verify_against_databases(guess: dict, original_fragment: str) -> Optional[S
         try:
             result = PubMedEngine().get_by_id(pmid)
             if result and _result_matches_fragment(result, original_fragment):
-                print(f"[AI_Lookup] Verified via PMID: {pmid}")
+                logger.debug(f"[AI_Lookup] Verified via PMID: {pmid}")
                 result.source_engine = "AI + PubMed (PMID verified)"
                 return result
         except:
@@ -1171,7 +1181,7 @@ def _verify_against_databases(guess: dict, original_fragment: str) -> Optional[S
             try:
                 result = engine.search(query)
                 if result and result.title and _result_matches_fragment(result, original_fragment):
-                    print(f"[AI_Lookup] Verified via {engine_name}")
+                    logger.debug(f"[AI_Lookup] Verified via {engine_name}")
                     result.source_engine = f"AI + {engine_name} (verified)"
                     return result
             except:
@@ -1225,6 +1235,7 @@ def _result_matches_fragment(result: SourceComponents, fragment: str) -> bool:
     return word_match and year_match
 
 
+@traced('verify.url')
 def _verify_url_components(ai_result: SourceComponents, url: str) -> Optional[SourceComponents]:
     """
     Verify AI-suggested URL metadata against academic databases.
@@ -1282,10 +1293,10 @@ def _verify_url_components(ai_result: SourceComponents, url: str) -> Optional[So
                 if result and result.title:
                     # Check if result matches AI's suggestion
                     if _titles_match(result.title, ai_result.title):
-                        print(f"[AI_Lookup] Verified '{ai_result.title[:40]}...' via {engine_name}")
+                        logger.debug(f"[AI_Lookup] Verified '{ai_result.title[:40]}...' via {engine_name}")
                         return result
             except Exception as e:
-                print(f"[AI_Lookup] {engine_name} search error: {e}")
+                logger.warning(f"[AI_Lookup] {engine_name} search error: {e}")
                 continue
     
     return None
@@ -1337,6 +1348,7 @@ def _titles_match(title1: str, title2: str) -> bool:
     return overlap >= min_words * 0.6
 
 
+@traced('verify.newspaper')
 def _verify_newspaper_consistency(result: SourceComponents, url: str) -> bool:
     """
     Basic consistency check for newspaper metadata.
@@ -1376,7 +1388,7 @@ def _verify_newspaper_consistency(result: SourceComponents, url: str) -> bool:
                 matches = sum(1 for w in slug_words if w in title_lower)
                 # Require at least 1 word match or 30% overlap
                 if matches == 0 and len(slug_words) >= 3:
-                    print(f"[AI_Lookup] Title '{result.title[:40]}' doesn't match URL slug '{slug}'")
+                    logger.debug(f"[AI_Lookup] Title '{result.title[:40]}' doesn't match URL slug '{slug}'")
                     return False
         
         # Check 2: Does publication match domain?
@@ -1402,12 +1414,12 @@ def _verify_newspaper_consistency(result: SourceComponents, url: str) -> bool:
             # Check if publication contains expected string
             if expected_pub not in pub_lower and domain_key not in pub_lower:
                 # Not a hard failure - publication names vary
-                print(f"[AI_Lookup] Warning: Publication '{result.newspaper}' doesn't match domain '{domain}'")
+                logger.warning(f"[AI_Lookup] Warning: Publication '{result.newspaper}' doesn't match domain '{domain}'")
         
         return True
         
     except Exception as e:
-        print(f"[AI_Lookup] Consistency check error: {e}")
+        logger.warning(f"[AI_Lookup] Consistency check error: {e}")
         return True  # Don't fail on parse errors
 
 
@@ -17,6 +17,11 @@ from datetime import datetime
 
 from engines.base import SearchEngine
 from models import SourceComponents, CitationType
+from engines.identifier_batch import get_prefetched
+from engines.scoring import QueryTokens, best_index, name_part_hit_counts, overlap_counts
+from tracing import get_logger
+
+logger = get_logger('engines.arxiv')
 
 
 class ArxivEngine(SearchEngine):
@@ -76,7 +81,7 @@ class ArxivEngine(SearchEngine):
                 return self._normalize(best, query)
             return None
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def get_by_id(self, arxiv_id: str) -> Optional[SourceComponents]:
@@ -93,8 +98,11 @@ class ArxivEngine(SearchEngine):
         arxiv_id = self._clean_arxiv_id(arxiv_id)
         if not arxiv_id:
             return None
+        known, components = get_prefetched('arxiv', arxiv_id)
+        if known:
+            return components
         
-        print(f"[{self.name}] Fetching ID: {arxiv_id}")
+        logger.debug(f"[{self.name}] Fetching ID: {arxiv_id}")
         
         params = {
             'id_list': arxiv_id,
@@ -111,7 +119,7 @@ class ArxivEngine(SearchEngine):
                 return self._normalize(entries[0], arxiv_id)
             return None
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def _extract_arxiv_id(self, text: str) -> Optional[str]:
@@ -238,7 +246,7 @@ class ArxivEngine(SearchEngine):
                 entries.append(data)
                 
         except ET.ParseError as e:
-            print(f"[{self.name}] XML parse error: {e}")
+            logger.warning(f"[{self.name}] XML parse error: {e}")
         
         return entries
     
@@ -247,33 +255,14 @@ class ArxivEngine(SearchEngine):
         if len(entries) == 1:
             return entries[0]
         
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-        
-        best = entries[0]
-        best_score = 0
+        tokens = QueryTokens(query)
         
-        for entry in entries:
-            score = 0
-            title = entry.get('title', '').lower()
-            
-            # Title word overlap
-            title_words = set(title.split())
-            overlap = len(query_words & title_words)
-            score += overlap * 3
-            
-            # Author match
-            for author in entry.get('authors', []):
-                author_lower = author.lower()
-                for name_part in author_lower.split():
-                    if len(name_part) >= 3 and name_part in query_lower:
-                        score += 10
-            
-            if score > best_score:
-                best_score = score
-                best = entry
+        # Title word overlap, plus author name parts found in the query
+        overlaps = overlap_counts(tokens.word_set, [entry.get('title', '').lower() for entry in entries])
+        author_hits = name_part_hit_counts(tokens, [entry.get('authors', []) for entry in entries])
+        scores = [overlap * 3 + hits * 10 for overlap, hits in zip(overlaps, author_hits)]
         
-        return best
+        return entries[best_index(scores)]
     
     def _normalize(self, entry: dict, raw_source: str) -> SourceComponents:
         """Convert arXiv entry to SourceComponents."""
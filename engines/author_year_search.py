@@ -21,7 +21,11 @@ from typing import Optional, List, Tuple, Dict, Any
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from engines.scoring import AuthorYearQuery
 from models import SourceComponents, CitationType
+from tracing import get_logger, submit_traced
+
+logger = get_logger('engines.author_year_search')
 
 
 @dataclass
@@ -141,15 +145,15 @@ class AuthorDateEngine:
             # Crossref (free)
             cr = self._get_crossref()
             if cr:
-                futures[executor.submit(
-                    self._search_crossref, author, year, second_author, third_author
+                futures[submit_traced(
+                    executor, self._search_crossref, author, year, second_author, third_author
                 )] = "crossref"
             
             # OpenAlex (free)
             oa = self._get_openalex()
             if oa:
-                futures[executor.submit(
-                    self._search_openalex, author, year, second_author, third_author
+                futures[submit_traced(
+                    executor, self._search_openalex, author, year, second_author, third_author
                 )] = "openalex"
             
             # DISABLED: Google Scholar via SerpAPI ($0.01/call) - too expensive
@@ -168,7 +172,7 @@ class AuthorDateEngine:
                         results.extend(result)
                 except Exception as e:
                     source = futures.get(future, "unknown")
-                    print(f"[AuthorDateEngine] {source} error: {e}")
+                    logger.warning(f"[AuthorDateEngine] {source} error: {e}")
         
         # Check if we have a good result
         if results:
@@ -177,13 +181,13 @@ class AuthorDateEngine:
             
             # If confidence is decent, use it without calling AI
             if best.confidence >= 0.5:
-                print(f"[AuthorDateEngine] Found {author} ({year}): {best.metadata.title[:50] if best.metadata.title else 'untitled'}... (confidence: {best.confidence:.2f})")
+                logger.debug(f"[AuthorDateEngine] Found {author} ({year}): {best.metadata.title[:50] if best.metadata.title else 'untitled'}... (confidence: {best.confidence:.2f})")
                 best.metadata.raw_source = f"({author}, {year})"
                 return best.metadata
             else:
-                print(f"[AuthorDateEngine] Low confidence ({best.confidence:.2f}) for {author} ({year}), trying AI fallback...")
+                logger.debug(f"[AuthorDateEngine] Low confidence ({best.confidence:.2f}) for {author} ({year}), trying AI fallback...")
         else:
-            print(f"[AuthorDateEngine] No results for {author} ({year}), trying AI fallback...")
+            logger.debug(f"[AuthorDateEngine] No results for {author} ({year}), trying AI fallback...")
         
         # TIER 2 FALLBACK: GPT-4o (~7x cheaper than Claude Opus)
         gpt_results = self._search_gpt4o(author, year, second_author, context)
@@ -192,11 +196,11 @@ class AuthorDateEngine:
             gpt_results.sort(reverse=True)
             if gpt_results[0].confidence >= 0.5:
                 results.extend(gpt_results)
-                print(f"[AuthorDateEngine] GPT-4o success for {author} ({year})")
+                logger.debug(f"[AuthorDateEngine] GPT-4o success for {author} ({year})")
             else:
-                print(f"[AuthorDateEngine] GPT-4o low confidence, trying Claude...")
+                logger.debug(f"[AuthorDateEngine] GPT-4o low confidence, trying Claude...")
         else:
-            print(f"[AuthorDateEngine] GPT-4o failed for {author} ({year}), trying Claude...")
+            logger.warning(f"[AuthorDateEngine] GPT-4o failed for {author} ({year}), trying Claude...")
         
         # TIER 3 FALLBACK: Claude Opus (expensive, last resort)
         # Only call Claude if GPT-4o didn't produce good results
@@ -206,7 +210,7 @@ class AuthorDateEngine:
                 results.extend(claude_results)
         
         if not results:
-            print(f"[AuthorDateEngine] No results found for {author} ({year})")
+            logger.debug(f"[AuthorDateEngine] No results found for {author} ({year})")
             return None
         
         # Sort by confidence (highest first)
@@ -214,7 +218,7 @@ class AuthorDateEngine:
         
         # Return best match
         best = results[0]
-        print(f"[AuthorDateEngine] Best match for {author} ({year}): {best.metadata.title[:50] if best.metadata.title else 'untitled'}... (confidence: {best.confidence:.2f}, source: {best.match_reason})")
+        logger.debug(f"[AuthorDateEngine] Best match for {author} ({year}): {best.metadata.title[:50] if best.metadata.title else 'untitled'}... (confidence: {best.confidence:.2f}, source: {best.match_reason})")
         
         # Add search info to metadata
         best.metadata.raw_source = f"({author}, {year})"
@@ -246,7 +250,7 @@ class AuthorDateEngine:
                     match_reason="Semantic Scholar author+year match"
                 ))
         except Exception as e:
-            print(f"[AuthorDateEngine] Semantic Scholar error: {e}")
+            logger.warning(f"[AuthorDateEngine] Semantic Scholar error: {e}")
         
         return results
     
@@ -287,7 +291,7 @@ class AuthorDateEngine:
                         match_reason="Crossref author+year match"
                     ))
         except Exception as e:
-            print(f"[AuthorDateEngine] Crossref error: {e}")
+            logger.warning(f"[AuthorDateEngine] Crossref error: {e}")
         
         return results
     
@@ -323,7 +327,7 @@ class AuthorDateEngine:
                         match_reason="OpenAlex author+year match"
                     ))
         except Exception as e:
-            print(f"[AuthorDateEngine] OpenAlex error: {e}")
+            logger.warning(f"[AuthorDateEngine] OpenAlex error: {e}")
         
         return results
     
@@ -362,7 +366,7 @@ class AuthorDateEngine:
                     match_reason="Google Scholar author+year match"
                 ))
         except Exception as e:
-            print(f"[AuthorDateEngine] Google Scholar error: {e}")
+            logger.warning(f"[AuthorDateEngine] Google Scholar error: {e}")
         
         return results
     
@@ -399,12 +403,12 @@ class AuthorDateEngine:
             if context:
                 query = f"{query}\n\nContext: This citation appears in a document about {context}."
             
-            print(f"[AuthorDateEngine] Trying Claude for: {authors_str} ({year})")
+            logger.debug(f"[AuthorDateEngine] Trying Claude for: {authors_str} ({year})")
             
             guess = guess_citation(query)
             
             if guess.get('confidence', 0) < 0.5:
-                print(f"[AuthorDateEngine] Claude low confidence: {guess.get('confidence', 0)}")
+                logger.debug(f"[AuthorDateEngine] Claude low confidence: {guess.get('confidence', 0)}")
                 return results
             
             # Build SourceComponents from Claude's guess
@@ -443,14 +447,14 @@ class AuthorDateEngine:
                     confidence=min(0.95, confidence + 0.1),
                     match_reason="Claude AI contextual match"
                 ))
-                print(f"[AuthorDateEngine] Claude found: {metadata.title[:50]}...")
+                logger.debug(f"[AuthorDateEngine] Claude found: {metadata.title[:50]}...")
             else:
-                print(f"[AuthorDateEngine] Claude result didn't match author: {metadata.authors}")
+                logger.debug(f"[AuthorDateEngine] Claude result didn't match author: {metadata.authors}")
                 
         except ImportError:
-            print("[AuthorDateEngine] Claude router not available")
+            logger.warning("[AuthorDateEngine] Claude router not available")
         except Exception as e:
-            print(f"[AuthorDateEngine] Claude error: {e}")
+            logger.warning(f"[AuthorDateEngine] Claude error: {e}")
         
         return results
     
@@ -475,11 +479,11 @@ class AuthorDateEngine:
         
         api_key = os.environ.get('OPENAI_API_KEY', '').strip().lstrip('=')
         if not api_key:
-            print("[AuthorDateEngine] GPT-4o: No OPENAI_API_KEY set")
+            logger.debug("[AuthorDateEngine] GPT-4o: No OPENAI_API_KEY set")
             return results
         
         try:
-            import requests
+            import http_client
             
             # Build query with all available authors
             authors_str = author
@@ -510,9 +514,9 @@ Return a JSON object with these fields:
 
 Only respond with valid JSON, no other text."""
 
-            print(f"[AuthorDateEngine] Trying GPT-4o for: {authors_str} ({year})")
+            logger.debug(f"[AuthorDateEngine] Trying GPT-4o for: {authors_str} ({year})")
             
-            response = requests.post(
+            response = http_client.post(
                 "https://api.openai.com/v1/chat/completions",
                 headers={
                     "Authorization": f"Bearer {api_key}",
@@ -531,7 +535,7 @@ Only respond with valid JSON, no other text."""
             )
             
             if response.status_code != 200:
-                print(f"[AuthorDateEngine] GPT-4o API error: {response.status_code}")
+                logger.warning(f"[AuthorDateEngine] GPT-4o API error: {response.status_code}")
                 return results
             
             data = response.json()
@@ -552,7 +556,7 @@ Only respond with valid JSON, no other text."""
             guess = json.loads(content)
             
             if guess.get('confidence', 0) < 0.5:
-                print(f"[AuthorDateEngine] GPT-4o low confidence: {guess.get('confidence', 0)}")
+                logger.debug(f"[AuthorDateEngine] GPT-4o low confidence: {guess.get('confidence', 0)}")
                 return results
             
             # Build SourceComponents from GPT-4o's guess
@@ -590,16 +594,16 @@ Only respond with valid JSON, no other text."""
                     confidence=min(0.95, confidence + 0.1),
                     match_reason="GPT-4o contextual match"
                 ))
-                print(f"[AuthorDateEngine] GPT-4o found: {metadata.title[:50]}...")
+                logger.debug(f"[AuthorDateEngine] GPT-4o found: {metadata.title[:50]}...")
             else:
-                print(f"[AuthorDateEngine] GPT-4o result didn't match author: {metadata.authors}")
+                logger.debug(f"[AuthorDateEngine] GPT-4o result didn't match author: {metadata.authors}")
                 
         except ImportError as e:
-            print(f"[AuthorDateEngine] GPT-4o import error: {e}")
+            logger.warning(f"[AuthorDateEngine] GPT-4o import error: {e}")
         except json.JSONDecodeError as e:
-            print(f"[AuthorDateEngine] GPT-4o JSON parse error: {e}")
+            logger.warning(f"[AuthorDateEngine] GPT-4o JSON parse error: {e}")
         except Exception as e:
-            print(f"[AuthorDateEngine] GPT-4o error: {e}")
+            logger.warning(f"[AuthorDateEngine] GPT-4o error: {e}")
         
         return results
     
@@ -621,62 +625,7 @@ Only respond with valid JSON, no other text."""
         - Has DOI (more reliable)
         - Has complete metadata
         """
-        confidence = 0.0
-        
-        # Year match (required)
-        if metadata.year == year:
-            confidence += 0.3
-        elif metadata.year:
-            # Close year (off by 1) - might be publication vs. online date
-            try:
-                if abs(int(metadata.year) - int(year)) <= 1:
-                    confidence += 0.2
-            except ValueError:
-                pass
-        
-        # Author match
-        author_lower = author.lower()
-        if metadata.authors:
-            authors_lower = [a.lower() for a in metadata.authors]
-            
-            # Check if author surname appears in any author name
-            for a in authors_lower:
-                if author_lower in a:
-                    confidence += 0.3
-                    break
-            
-            # Check second author if provided
-            if second_author:
-                second_lower = second_author.lower()
-                for a in authors_lower:
-                    if second_lower in a:
-                        confidence += 0.15
-                        break
-            
-            # Check third author if provided
-            if third_author:
-                third_lower = third_author.lower()
-                for a in authors_lower:
-                    if third_lower in a:
-                        confidence += 0.1
-                        break
-        
-        # DOI presence (reliable identifier)
-        if metadata.doi:
-            confidence += 0.15
-        
-        # Complete metadata bonus
-        completeness = 0
-        if metadata.title:
-            completeness += 1
-        if metadata.journal or metadata.publisher:
-            completeness += 1
-        if metadata.volume or metadata.pages:
-            completeness += 1
-        
-        confidence += completeness * 0.05
-        
-        return min(1.0, confidence)
+        return AuthorYearQuery(author, year, second_author, third_author).confidence(metadata)
     
     def search_multiple(
         self,
@@ -713,7 +662,7 @@ Only respond with valid JSON, no other text."""
                 metadata = self.search(author, year, second_author, third_author)
                 results[key] = metadata
             except Exception as e:
-                print(f"[AuthorDateEngine] Error searching {author}, {year}: {e}")
+                logger.warning(f"[AuthorDateEngine] Error searching {author}, {year}: {e}")
                 results[key] = None
             
             # Small delay to avoid rate limiting
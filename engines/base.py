@@ -6,12 +6,18 @@ Each engine must implement the search() method.
 """
 
 import time
+import importlib
+import threading
 from abc import ABC, abstractmethod
 from typing import Optional, List
 import requests
 
+import http_client
 from models import SourceComponents, CitationType
 from config import DEFAULT_HEADERS, DEFAULT_TIMEOUT
+from tracing import get_logger, span
+
+logger = get_logger('engines.base')
 
 
 class SearchEngine(ABC):
@@ -41,10 +47,12 @@ class SearchEngine(ABC):
     
     @property
     def session(self) -> requests.Session:
-        """Lazy-loaded requests session with default headers."""
+        """
+        Lazy-loaded requests session with default headers; connections
+        come from the process-wide pool in http_client.
+        """
         if self._session is None:
-            self._session = requests.Session()
-            self._session.headers.update(DEFAULT_HEADERS)
+            self._session = http_client.new_session(DEFAULT_HEADERS)
         return self._session
     
     @abstractmethod
@@ -94,16 +102,36 @@ class SearchEngine(ABC):
         params: Optional[dict] = None,
         headers: Optional[dict] = None,
         method: str = "GET",
-        retry_count: int = 0
+        retry_count: int = 0,
+        stream: bool = False
     ) -> Optional[requests.Response]:
         """
         Make an HTTP request with error handling and rate limit retry.
         
         Implements exponential backoff for 429 (Too Many Requests) responses.
+        Each call is recorded as an ``engine.<name>`` span when tracing.
+        
+        With stream=True (GET only) the body is not downloaded up front;
+        the caller reads it with iter_content() and must close the response.
         
         Returns:
             Response object if successful, None on error
         """
+        with span(f'engine.{self.name}', method=method.upper(), retry=retry_count) as s:
+            response = self._send_request(url, params, headers, method, retry_count, stream)
+            s.set_attribute('ok', response is not None)
+            return response
+    
+    def _send_request(
+        self,
+        url: str,
+        params: Optional[dict],
+        headers: Optional[dict],
+        method: str,
+        retry_count: int,
+        stream: bool = False
+    ) -> Optional[requests.Response]:
+        """Body of _make_request (untraced)."""
         try:
             merged_headers = dict(DEFAULT_HEADERS)
             if headers:
@@ -114,7 +142,8 @@ class SearchEngine(ABC):
                     url,
                     params=params,
                     headers=merged_headers,
-                    timeout=self.timeout
+                    timeout=self.timeout,
+                    stream=stream
                 )
             else:
                 response = self.session.post(
@@ -137,21 +166,24 @@ class SearchEngine(ABC):
                     else:
                         delay = self.RETRY_DELAY_BASE * (2 ** retry_count)
                     
-                    print(f"[{self.name}] Rate limited. Retrying in {delay}s (attempt {retry_count + 1}/{self.MAX_RETRIES})...")
+                    logger.warning(f"[{self.name}] Rate limited. Retrying in {delay}s (attempt {retry_count + 1}/{self.MAX_RETRIES})...")
                     time.sleep(delay)
-                    return self._make_request(url, params, headers, method, retry_count + 1)
+                    response.close()
+                    return self._make_request(url, params, headers, method, retry_count + 1, stream)
                 else:
-                    print(f"[{self.name}] Rate limit exceeded after {self.MAX_RETRIES} retries")
+                    logger.warning(f"[{self.name}] Rate limit exceeded after {self.MAX_RETRIES} retries")
                     return None
             
+            if stream and not response.ok:
+                response.close()  # release the pooled connection
             response.raise_for_status()
             return response
             
         except requests.Timeout:
-            print(f"[{self.name}] Request timeout after {self.timeout}s")
+            logger.warning(f"[{self.name}] Request timeout after {self.timeout}s")
             return None
         except requests.RequestException as e:
-            print(f"[{self.name}] Request error: {e}")
+            logger.warning(f"[{self.name}] Request error: {e}")
             return None
     
     def _create_components(
@@ -206,14 +238,88 @@ class MultiAttemptEngine(SearchEngine):
             params = attempt.get('params', {})
             url = attempt.get('url', self.base_url)
             
-            print(f"[{self.name}] Attempt {i}: {name}...")
+            logger.debug(f"[{self.name}] Attempt {i}: {name}...")
             
             response = self._make_request(url, params=params)
             if response:
                 result = self.parse_response(response, query)
                 if result and result.has_minimum_data():
-                    print(f"[{self.name}] Found via {name}")
+                    logger.debug(f"[{self.name}] Found via {name}")
                     return result
         
-        print(f"[{self.name}] No results after {len(attempts)} attempts")
+        logger.debug(f"[{self.name}] No results after {len(attempts)} attempts")
         return None
+
+
+class LazyEngine:
+    """
+    Stand-in for a module-level engine instance, built on first use.
+    
+    Holding engines as import-time singletons means importing the router
+    imports every engine module (and its third-party dependencies) up
+    front, which every Lambda cold start pays for even when the document
+    never needs that engine. LazyEngine defers both the import and the
+    construction until the first attribute access.
+    
+    Usage:
+        _generic_url = LazyEngine('engines.generic_url', 'GenericURLEngine')
+        _generic_url.fetch_by_url(url)   # imports + constructs here
+    """
+    
+    def __init__(self, module_path: str, class_name: str, *args, **kwargs):
+        self._module_path = module_path
+        self._class_name = class_name
+        self._args = args
+        self._kwargs = kwargs
+        self._instance = None
+        self._lock = threading.Lock()
+    
+    def get_instance(self):
+        """Import the engine module and construct the engine, once."""
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    module = importlib.import_module(self._module_path)
+                    engine_cls = getattr(module, self._class_name)
+                    self._instance = engine_cls(*self._args, **self._kwargs)
+        return self._instance
+    
+    def __getattr__(self, name):
+        # Only reached for attributes not set in __init__
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.get_instance(), name)
+    
+    def __repr__(self) -> str:
+        state = 'loaded' if self._instance is not None else 'not loaded'
+        return f"<LazyEngine {self._module_path}.{self._class_name} ({state})>"
+
+
+class LazyModule:
+    """
+    Stand-in for a helper module imported at module level, imported on
+    first attribute access (the module counterpart of LazyEngine).
+    
+    Usage:
+        books = LazyModule('engines.books')
+        books.search_all_engines(query)   # imports engines.books here
+    """
+    
+    def __init__(self, module_path: str):
+        self._module_path = module_path
+        self._module = None
+    
+    def get_module(self):
+        """Import the module, once (the import system serializes it)."""
+        if self._module is None:
+            self._module = importlib.import_module(self._module_path)
+        return self._module
+    
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self.get_module(), name)
+    
+    def __repr__(self) -> str:
+        state = 'loaded' if self._module is not None else 'not loaded'
+        return f"<LazyModule {self._module_path} ({state})>"
@@ -21,9 +21,12 @@ Version History:
     2025-12-05 20:30: Moved from root to engines/ directory
 """
 
-import requests
+import http_client
 import re
 import os
+from tracing import get_logger
+
+logger = get_logger('engines.books')
 
 # WorldCat API key (optional - get from https://www.worldcat.org/webservices/)
 WORLDCAT_API_KEY = os.environ.get('WORLDCAT_API_KEY', '')
@@ -494,7 +497,7 @@ class OpenLibraryAPI:
                 'jscmd': 'data' # 'data' endpoint gives rich metadata including places
             }
             
-            response = requests.get(OpenLibraryAPI.BASE_URL, params=params, timeout=5)
+            response = http_client.get(OpenLibraryAPI.BASE_URL, params=params, timeout=5)
             data = response.json()
             
             if key in data:
@@ -532,7 +535,7 @@ class OpenLibraryAPI:
                     'raw_source': f"ISBN: {clean_isbn}"
                 }]
         except Exception as e:
-            print(f"OpenLibrary ISBN Error: {e}")
+            logger.warning(f"OpenLibrary ISBN Error: {e}")
             pass
         return []
     
@@ -549,7 +552,7 @@ class OpenLibraryAPI:
                 'fields': 'title,author_name,publisher,publish_year,isbn'
             }
             
-            response = requests.get(OpenLibraryAPI.SEARCH_URL, params=params, timeout=5)
+            response = http_client.get(OpenLibraryAPI.SEARCH_URL, params=params, timeout=5)
             data = response.json()
             
             candidates = []
@@ -581,7 +584,7 @@ class OpenLibraryAPI:
             
             return candidates
         except Exception as e:
-            print(f"OpenLibrary Search Error: {e}")
+            logger.warning(f"OpenLibrary Search Error: {e}")
             return []
 
 # ==================== ENGINE 2: GOOGLE BOOKS (Legacy / Robust) ====================
@@ -634,7 +637,7 @@ class GoogleBooksAPI:
             
             for q in queries_to_try:
                 params = {'q': q, 'maxResults': 3, 'printType': 'books', 'orderBy': 'relevance'}
-                response = requests.get(GoogleBooksAPI.BASE_URL, params=params, timeout=5)
+                response = http_client.get(GoogleBooksAPI.BASE_URL, params=params, timeout=5)
                 
                 if response.status_code == 200:
                     items = response.json().get('items', [])
@@ -690,9 +693,9 @@ class GoogleBooksAPI:
                     if candidates:
                         break
                 else:
-                    print(f"[GoogleBooks] HTTP {response.status_code} for query: {q[:30]}...")
+                    logger.debug(f"[GoogleBooks] HTTP {response.status_code} for query: {q[:30]}...")
         except Exception as e:
-            print(f"[GoogleBooks] Error: {e}")
+            logger.warning(f"[GoogleBooks] Error: {e}")
         return candidates
 
 
@@ -721,7 +724,7 @@ class LibraryOfCongressAPI:
                 'c': 3  # max 3 results
             }
             
-            response = requests.get(LibraryOfCongressAPI.SEARCH_URL, params=params, timeout=8)
+            response = http_client.get(LibraryOfCongressAPI.SEARCH_URL, params=params, timeout=8)
             
             if response.status_code == 200:
                 data = response.json()
@@ -779,10 +782,10 @@ class LibraryOfCongressAPI:
                             'raw_source': query
                         })
             else:
-                print(f"[LOC] HTTP {response.status_code} for query: {query[:30]}...")
+                logger.debug(f"[LOC] HTTP {response.status_code} for query: {query[:30]}...")
                 
         except Exception as e:
-            print(f"[LOC] Error: {e}")
+            logger.warning(f"[LOC] Error: {e}")
         
         return candidates
 
@@ -805,7 +808,7 @@ class WorldCatAPI:
         """Search WorldCat by keyword."""
         if not query or not WORLDCAT_API_KEY:
             if not WORLDCAT_API_KEY:
-                print("[WorldCat] No API key configured (set WORLDCAT_API_KEY)")
+                logger.debug("[WorldCat] No API key configured (set WORLDCAT_API_KEY)")
             return []
         
         candidates = []
@@ -817,7 +820,7 @@ class WorldCatAPI:
                 'count': 3
             }
             
-            response = requests.get(WorldCatAPI.SEARCH_URL, params=params, timeout=8)
+            response = http_client.get(WorldCatAPI.SEARCH_URL, params=params, timeout=8)
             
             if response.status_code == 200:
                 data = response.json()
@@ -867,10 +870,10 @@ class WorldCatAPI:
                             'raw_source': query
                         })
             else:
-                print(f"[WorldCat] HTTP {response.status_code} for query: {query[:30]}...")
+                logger.debug(f"[WorldCat] HTTP {response.status_code} for query: {query[:30]}...")
                 
         except Exception as e:
-            print(f"[WorldCat] Error: {e}")
+            logger.warning(f"[WorldCat] Error: {e}")
         
         return candidates
 
@@ -903,7 +906,7 @@ class InternetArchiveAPI:
                 'output': 'json'
             }
             
-            response = requests.get(InternetArchiveAPI.SEARCH_URL, params=params, timeout=8)
+            response = http_client.get(InternetArchiveAPI.SEARCH_URL, params=params, timeout=8)
             
             if response.status_code == 200:
                 data = response.json()
@@ -950,10 +953,10 @@ class InternetArchiveAPI:
                             'raw_source': query
                         })
             else:
-                print(f"[InternetArchive] HTTP {response.status_code} for query: {query[:30]}...")
+                logger.debug(f"[InternetArchive] HTTP {response.status_code} for query: {query[:30]}...")
                 
         except Exception as e:
-            print(f"[InternetArchive] Error: {e}")
+            logger.warning(f"[InternetArchive] Error: {e}")
         
         return candidates
 
@@ -978,7 +981,7 @@ def extract_components(text):
     
     if isbn_match:
         isbn_clean = re.sub(r'[-\s]', '', isbn_match.group(0))
-        print(f"[books] ISBN detected: {isbn_clean}, trying Google Books...")
+        logger.debug(f"[books] ISBN detected: {isbn_clean}, trying Google Books...")
         
         # Try Google Books first for ISBN (free, comprehensive)
         results = GoogleBooksAPI.search(f"isbn:{isbn_clean}")
@@ -988,7 +991,7 @@ def extract_components(text):
             return results
         
         # Fallback to Open Library for ISBN
-        print(f"[books] Google Books failed for ISBN, trying Open Library...")
+        logger.warning(f"[books] Google Books failed for ISBN, trying Open Library...")
         results = OpenLibraryAPI.get_by_isbn(isbn_clean)
         if results:
             return results
@@ -999,20 +1002,20 @@ def extract_components(text):
         return results
     
     # STRATEGY 3: LIBRARY OF CONGRESS (no API key needed)
-    print(f"[books] Google Books returned nothing, trying Library of Congress...")
+    logger.debug(f"[books] Google Books returned nothing, trying Library of Congress...")
     results = LibraryOfCongressAPI.search(clean_text)
     if results:
         return results
     
     # STRATEGY 4: WORLDCAT (if API key configured)
     if WORLDCAT_API_KEY:
-        print(f"[books] LOC returned nothing, trying WorldCat...")
+        logger.debug(f"[books] LOC returned nothing, trying WorldCat...")
         results = WorldCatAPI.search(clean_text)
         if results:
             return results
     
     # STRATEGY 5: OPEN LIBRARY SEARCH (final fallback)
-    print(f"[books] Trying Open Library search as final fallback...")
+    logger.debug(f"[books] Trying Open Library search as final fallback...")
     return OpenLibraryAPI.search(clean_text)
 
 
@@ -1028,49 +1031,49 @@ def search_all_engines(text):
     
     # Google Books
     try:
-        print(f"[books] Searching Google Books for: {clean_text[:30]}...")
+        logger.debug(f"[books] Searching Google Books for: {clean_text[:30]}...")
         results = GoogleBooksAPI.search(clean_text)
-        print(f"[books] Google Books returned {len(results)} results")
+        logger.debug(f"[books] Google Books returned {len(results)} results")
         all_results.extend(results[:2])
     except Exception as e:
-        print(f"[books] Google Books error: {e}")
+        logger.warning(f"[books] Google Books error: {e}")
     
     # Library of Congress
     try:
-        print(f"[books] Searching Library of Congress...")
+        logger.debug(f"[books] Searching Library of Congress...")
         results = LibraryOfCongressAPI.search(clean_text)
-        print(f"[books] LOC returned {len(results)} results")
+        logger.debug(f"[books] LOC returned {len(results)} results")
         all_results.extend(results[:2])
     except Exception as e:
-        print(f"[books] LOC error: {e}")
+        logger.warning(f"[books] LOC error: {e}")
     
     # Internet Archive (free, no key needed)
     try:
-        print(f"[books] Searching Internet Archive...")
+        logger.debug(f"[books] Searching Internet Archive...")
         results = InternetArchiveAPI.search(clean_text)
-        print(f"[books] Internet Archive returned {len(results)} results")
+        logger.debug(f"[books] Internet Archive returned {len(results)} results")
         all_results.extend(results[:2])
     except Exception as e:
-        print(f"[books] Internet Archive error: {e}")
+        logger.warning(f"[books] Internet Archive error: {e}")
     
     # WorldCat (if configured)
     if WORLDCAT_API_KEY:
         try:
-            print(f"[books] Searching WorldCat...")
+            logger.debug(f"[books] Searching WorldCat...")
             results = WorldCatAPI.search(clean_text)
-            print(f"[books] WorldCat returned {len(results)} results")
+            logger.debug(f"[books] WorldCat returned {len(results)} results")
             all_results.extend(results[:2])
         except Exception as e:
-            print(f"[books] WorldCat error: {e}")
+            logger.warning(f"[books] WorldCat error: {e}")
     
     # Open Library
     try:
-        print(f"[books] Searching Open Library...")
+        logger.debug(f"[books] Searching Open Library...")
         results = OpenLibraryAPI.search(clean_text)
-        print(f"[books] Open Library returned {len(results)} results")
+        logger.debug(f"[books] Open Library returned {len(results)} results")
         all_results.extend(results[:2])
     except Exception as e:
-        print(f"[books] Open Library error: {e}")
+        logger.warning(f"[books] Open Library error: {e}")
     
-    print(f"[books] Total results from all engines: {len(all_results)}")
+    logger.debug(f"[books] Total results from all engines: {len(all_results)}")
     return all_results
@@ -0,0 +1,386 @@
+"""
+citeflex/engines/cassette.py
+
+Offline record/replay of HTTP traffic for benchmarking and regression runs.
+
+Every outbound call in the resolution pipeline goes through ``requests``:
+SearchEngine._make_request (session.get/post), the raw requests.post calls
+in ai_lookup.py, the book APIs in books.py and the waterfall news
+resolvers. The cassette layer sits underneath all of them by wrapping
+``requests.adapters.HTTPAdapter.send``, so no engine code has to change.
+
+Cassette store:
+    Each interaction is saved as JSON under
+    ``<store>/<key[:2]>/<key>.json``, where key is the SHA-256 of the
+    canonical request (method, URL with sorted query and credentials
+    removed, JSON body with sorted keys). Identical requests share one
+    file, and re-recording appends a timing sample to it.
+
+Modes:
+    replay  - serve from the store only; a miss raises CassetteMiss (a
+              requests.ConnectionError, so engines treat it like a failed
+              request)
+    record  - always hit the network and (over)write the store
+    auto    - replay when recorded, otherwise record
+
+Latency injection (replay only):
+    none          - return immediately (throughput benchmarks)
+    recorded      - sleep for the interaction's own recorded duration
+    distribution  - sleep for a duration sampled from every recording to
+                    the same host (realistic latency benchmarks)
+
+Usage:
+    from engines.cassette import use_cassettes
+
+    with use_cassettes('cassettes/', mode='replay', latency='distribution'):
+        results = get_multiple_citations(query, style)
+
+    # Or from the environment (see install_from_env):
+    CITEFLEX_CASSETTE_DIR=cassettes CITEFLEX_CASSETTE_MODE=auto python ...
+
+Request credentials are kept out of the store: request headers are not
+recorded and key-like query/body parameters are removed before hashing
+and saving. Response bodies are stored as received.
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: api_token (TheNewsAPI) treated as a credential
+"""
+
+import base64
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, List, Any
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+MODES = ('replay', 'record', 'auto')
+LATENCY_MODES = ('none', 'recorded', 'distribution')
+
+# Query/body parameter names treated as credentials (case-insensitive)
+SECRET_PARAMS = {
+    'key', 'api_key', 'apikey', 'api-key', 'token', 'access_token',
+    'api_token', 'apitoken', 'auth', 'password', 'secret', 'client_secret',
+}
+
+# Response headers that describe the wire encoding rather than the content
+_DROPPED_RESPONSE_HEADERS = {
+    'content-encoding', 'transfer-encoding', 'content-length',
+    'set-cookie', 'connection', 'keep-alive',
+}
+
+# Timing samples kept per interaction
+MAX_TIMING_SAMPLES = 20
+
+
+class CassetteMiss(requests.ConnectionError):
+    """No recorded interaction for a request in replay mode."""
+
+
+# =============================================================================
+# REQUEST CANONICALIZATION
+# =============================================================================
+
+def _strip_secrets(obj: Any) -> Any:
+    """Recursively drop credential-like keys from a JSON body."""
+    if isinstance(obj, dict):
+        return {
+            k: _strip_secrets(v) for k, v in obj.items()
+            if str(k).lower() not in SECRET_PARAMS
+        }
+    if isinstance(obj, list):
+        return [_strip_secrets(v) for v in obj]
+    return obj
+
+
+def canonical_url(url: str) -> str:
+    """URL with sorted query parameters and credentials removed."""
+    parts = urlsplit(url)
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in SECRET_PARAMS
+    )
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, urlencode(query), ''))
+
+
+def _canonical_body(body: Any) -> str:
+    """Stable text form of a request body (JSON bodies get sorted keys)."""
+    if body is None:
+        return ''
+    if isinstance(body, bytes):
+        try:
+            body = body.decode('utf-8')
+        except UnicodeDecodeError:
+            return 'sha256:' + hashlib.sha256(body).hexdigest()
+    try:
+        return json.dumps(_strip_secrets(json.loads(body)), sort_keys=True, separators=(',', ':'))
+    except (ValueError, TypeError):
+        return str(body)
+
+
+def request_key(method: str, url: str, body: Any = None) -> str:
+    """Content address of a request: SHA-256 of its canonical form."""
+    canonical = '\n'.join([method.upper(), canonical_url(url), _canonical_body(body)])
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+# =============================================================================
+# CASSETTE STORE
+# =============================================================================
+
+class CassetteStore:
+    """
+    Content-addressed directory of recorded HTTP interactions.
+
+    Thread-safe: writes go to a temp file and are moved into place, and the
+    per-host timing index used for latency sampling is guarded by a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._host_timings: Optional[Dict[str, List[float]]] = None
+        os.makedirs(path, exist_ok=True)
+
+    def _file_for(self, key: str) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.json")
+
+    def load(self, key: str) -> Optional[Dict]:
+        """Recorded interaction for ``key``, or None."""
+        try:
+            with open(self._file_for(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, interaction: Dict) -> None:
+        """Write an interaction, keeping earlier timing samples for the key."""
+        path = self._file_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self._lock:
+            new_samples = list(interaction['elapsed_ms_samples'])
+            previous = self.load(key)
+            if previous:
+                samples = previous.get('elapsed_ms_samples', []) + interaction['elapsed_ms_samples']
+                interaction['elapsed_ms_samples'] = samples[-MAX_TIMING_SAMPLES:]
+
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(interaction, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, path)
+
+            if self._host_timings is not None:
+                self._host_timings.setdefault(interaction['host'], []).extend(new_samples)
+
+    def host_timings(self, host: str) -> List[float]:
+        """All recorded durations (ms) for requests to ``host``."""
+        with self._lock:
+            if self._host_timings is None:
+                self._host_timings = {}
+                for root, _, files in os.walk(self.path):
+                    for name in files:
+                        if not name.endswith('.json'):
+                            continue
+                        try:
+                            with open(os.path.join(root, name), 'r', encoding='utf-8') as f:
+                                data = json.load(f)
+                        except (OSError, ValueError):
+                            continue
+                        self._host_timings.setdefault(data.get('host', ''), []).extend(
+                            data.get('elapsed_ms_samples', [])
+                        )
+            return self._host_timings.get(host, [])
+
+
+# =============================================================================
+# RECORD / REPLAY
+# =============================================================================
+
+def _serialize_response(response: requests.Response, elapsed_ms: float, method: str, url: str) -> Dict:
+    content = response.content or b''
+    headers = {
+        k: v for k, v in response.headers.items()
+        if k.lower() not in _DROPPED_RESPONSE_HEADERS
+    }
+    return {
+        'method': method.upper(),
+        'url': canonical_url(url),
+        'host': urlsplit(url).netloc.lower(),
+        'recorded_at': datetime.now(timezone.utc).isoformat(),
+        'status_code': response.status_code,
+        'reason': response.reason,
+        'headers': headers,
+        'encoding': response.encoding,
+        'body_b64': base64.b64encode(content).decode('ascii'),
+        'elapsed_ms_samples': [round(elapsed_ms, 1)],
+    }
+
+
+def _build_response(interaction: Dict, request: requests.PreparedRequest) -> requests.Response:
+    response = requests.Response()
+    response.status_code = interaction['status_code']
+    response.reason = interaction.get('reason')
+    response.headers = CaseInsensitiveDict(interaction.get('headers', {}))
+    response._content = base64.b64decode(interaction.get('body_b64', ''))
+    response._content_consumed = True  # lets iter_content() serve stream=True callers
+    response.encoding = interaction.get('encoding')
+    response.url = request.url
+    response.request = request
+    samples = interaction.get('elapsed_ms_samples') or [0.0]
+    response.elapsed = timedelta(milliseconds=samples[-1])
+    return response
+
+
+class _CassettePlayer:
+    """Active cassette configuration; replaces HTTPAdapter.send while installed."""
+
+    def __init__(self, store: CassetteStore, mode: str, latency: str, latency_scale: float, seed: Optional[int]):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode: {mode} (expected one of {MODES})")
+        if latency not in LATENCY_MODES:
+            raise ValueError(f"Unknown latency mode: {latency} (expected one of {LATENCY_MODES})")
+        self.store = store
+        self.mode = mode
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.stats = {'replayed': 0, 'recorded': 0, 'missed': 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _sleep_for(self, interaction: Dict) -> None:
+        if self.latency == 'none':
+            return
+        if self.latency == 'recorded':
+            samples = interaction.get('elapsed_ms_samples') or [0.0]
+            delay_ms = samples[-1]
+        else:
+            samples = self.store.host_timings(interaction.get('host', '')) or [0.0]
+            with self._rng_lock:
+                delay_ms = self._rng.choice(samples)
+        time.sleep(delay_ms * self.latency_scale / 1000.0)
+
+    def send(self, adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request.method, request.url, request.body)
+
+        if self.mode in ('replay', 'auto'):
+            interaction = self.store.load(key)
+            if interaction is not None:
+                self._count('replayed')
+                self._sleep_for(interaction)
+                return _build_response(interaction, request)
+            if self.mode == 'replay':
+                self._count('missed')
+                raise CassetteMiss(
+                    f"No cassette for {request.method} {canonical_url(request.url)} (key {key[:12]})",
+                    request=request,
+                )
+
+        start = time.perf_counter()
+        live = _ORIGINAL_SEND(adapter, request, **kwargs)
+        interaction = _serialize_response(live, (time.perf_counter() - start) * 1000, request.method, request.url)
+        self.store.save(key, interaction)
+        self._count('recorded')
+        return _build_response(interaction, request)
+
+
+_ORIGINAL_SEND = HTTPAdapter.send
+_active_player: Optional[_CassettePlayer] = None
+_install_lock = threading.Lock()
+
+
+def _patched_send(adapter, request, **kwargs):
+    player = _active_player
+    if player is None:
+        return _ORIGINAL_SEND(adapter, request, **kwargs)
+    return player.send(adapter, request, **kwargs)
+
+
+def install(
+    path: str,
+    mode: str = 'replay',
+    latency: str = 'none',
+    latency_scale: float = 1.0,
+    seed: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Route all ``requests`` traffic in this process through a cassette store.
+
+    Args:
+        path: Cassette directory (created if missing)
+        mode: 'replay', 'record' or 'auto'
+        latency: 'none', 'recorded' or 'distribution' (replay only)
+        latency_scale: Multiplier applied to injected delays
+        seed: Seed for latency sampling (deterministic benchmarks)
+
+    Returns:
+        Live stats dict ({'replayed', 'recorded', 'missed'}) for this install
+    """
+    global _active_player
+    with _install_lock:
+        _active_player = _CassettePlayer(CassetteStore(path), mode, latency, latency_scale, seed)
+        HTTPAdapter.send = _patched_send
+        return _active_player.stats
+
+
+def uninstall() -> None:
+    """Restore live network access."""
+    global _active_player
+    with _install_lock:
+        _active_player = None
+        HTTPAdapter.send = _ORIGINAL_SEND
+
+
+def is_installed() -> bool:
+    return _active_player is not None
+
+
+@contextmanager
+def use_cassettes(path: str, mode: str = 'replay', latency: str = 'none',
+                  latency_scale: float = 1.0, seed: Optional[int] = None):
+    """Context manager form of install()/uninstall(); yields the stats dict."""
+    stats = install(path, mode, latency, latency_scale, seed)
+    try:
+        yield stats
+    finally:
+        uninstall()
+
+
+def install_from_env() -> Optional[Dict[str, int]]:
+    """
+    Install from environment variables, if CITEFLEX_CASSETTE_DIR is set.
+
+    CITEFLEX_CASSETTE_DIR      cassette directory (required to enable)
+    CITEFLEX_CASSETTE_MODE     replay | record | auto (default: replay)
+    CITEFLEX_CASSETTE_LATENCY  none | recorded | distribution (default: none)
+    CITEFLEX_CASSETTE_SEED     integer seed for latency sampling
+
+    Returns:
+        Stats dict if installed, None otherwise
+    """
+    path = os.environ.get('CITEFLEX_CASSETTE_DIR')
+    if not path:
+        return None
+    seed = os.environ.get('CITEFLEX_CASSETTE_SEED')
+    return install(
+        path,
+        mode=os.environ.get('CITEFLEX_CASSETTE_MODE', 'replay'),
+        latency=os.environ.get('CITEFLEX_CASSETTE_LATENCY', 'none'),
+        seed=int(seed) if seed else None,
+    )
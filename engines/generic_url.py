@@ -12,8 +12,13 @@ This engine fetches a URL and extracts metadata from:
 
 This is the fallback engine for URLs that don't match specialized handlers.
 
+Only <head> plus a bounded prefix of <body> is downloaded, and sources 1-4
+are read from a single-pass tokenizer (engines/html_meta.py). The
+BeautifulSoup tree is built only when a byline or deep fallback needs it.
+
 Version History:
     2025-12-08: Initial creation
+    2026-10-18: Head-only streaming fetch; soup built on demand
 """
 
 import re
@@ -26,6 +31,10 @@ from engines.base import SearchEngine
 from models import SourceComponents, CitationType
 from config import DEFAULT_HEADERS, NEWSPAPER_DOMAINS, GOV_AGENCY_MAP
 from engines.gov_ngo_domains import get_org_author as get_org_author_from_cache
+from engines.html_meta import HtmlPage, read_html_prefix, decode_html
+from tracing import get_logger
+
+logger = get_logger('engines.generic_url')
 
 # Try to import AI org lookup - optional fallback for .org domains
 try:
@@ -41,7 +50,15 @@ try:
     HAS_BS4 = True
 except ImportError:
     HAS_BS4 = False
-    print("[GenericURLEngine] BeautifulSoup not available - install with: pip install beautifulsoup4")
+    logger.warning("[GenericURLEngine] BeautifulSoup not available - install with: pip install beautifulsoup4")
+
+# Raw-HTML prefilters: a soup-based fallback is only run (and the soup only
+# built) if its target text can appear in the page at all
+_DATE_CONTENT_HINT_RE = re.compile(r'published|posted|date|updated|released|timestamp|©|copyright', re.I)
+_DOI_HINT_RE = re.compile(r'10\.\d+/')
+_VOLUME_CITATION_HINT_RE = re.compile(r'L\.?\s*(?:Rev|J)|Vol')
+_VOLUME_LABEL_RE = re.compile(r'volume\s*:?\s*\d+', re.I)
+_ISSUE_LABEL_RE = re.compile(r'issue\s*:?\s*\d+', re.I)
 
 
 class GenericURLEngine(SearchEngine):
@@ -85,7 +102,7 @@ class GenericURLEngine(SearchEngine):
             SourceComponents with extracted information
         """
         if not HAS_BS4:
-            print(f"[{self.name}] BeautifulSoup not available")
+            logger.warning(f"[{self.name}] BeautifulSoup not available")
             return self._minimal_components(url)
         
         if not url:
@@ -95,25 +112,30 @@ class GenericURLEngine(SearchEngine):
         if not url.startswith(('http://', 'https://')):
             url = 'https://' + url
         
-        print(f"[{self.name}] Fetching: {url}")
+        logger.debug(f"[{self.name}] Fetching: {url}")
         
         try:
-            response = self._make_request(url)
+            response = self._make_request(url, stream=True)
             if not response:
-                print(f"[{self.name}] Failed to fetch URL")
+                logger.warning(f"[{self.name}] Failed to fetch URL")
                 return self._minimal_components(url)
             
             # Check content type - only parse HTML
             content_type = response.headers.get('Content-Type', '')
             if 'text/html' not in content_type and 'application/xhtml' not in content_type:
-                print(f"[{self.name}] Not HTML content: {content_type}")
+                logger.debug(f"[{self.name}] Not HTML content: {content_type}")
+                response.close()
                 return self._minimal_components(url)
             
-            html = response.text
-            soup = BeautifulSoup(html, 'html.parser')
+            data, truncated = read_html_prefix(response)
+            page = HtmlPage(decode_html(data, content_type), truncated)
             
             # Extract metadata from various sources
-            metadata = self._extract_all_components(soup, url)
+            metadata = self._extract_all_components(page, url)
+            logger.debug(
+                f"[{self.name}] Read {len(data)} bytes{' (truncated)' if truncated else ''}, "
+                f"soup {'built' if page.soup_built else 'skipped'}"
+            )
             
             # Determine citation type based on domain
             citation_type = self._determine_citation_type(url)
@@ -122,10 +144,10 @@ class GenericURLEngine(SearchEngine):
             return self._build_citation_components(metadata, url, citation_type)
             
         except Exception as e:
-            print(f"[{self.name}] Error: {e}")
+            logger.warning(f"[{self.name}] Error: {e}")
             return self._minimal_components(url)
     
-    def _extract_all_components(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
+    def _extract_all_components(self, page: HtmlPage, url: str) -> Dict[str, Any]:
         """
         Extract metadata from all available sources in the HTML.
         
@@ -157,37 +179,39 @@ class GenericURLEngine(SearchEngine):
         }
         
         # 1. JSON-LD (Schema.org structured data)
-        json_ld = self._extract_json_ld(soup)
+        json_ld = self._extract_json_ld(page)
         if json_ld:
             self._merge_json_ld(metadata, json_ld)
         
         # 2. Open Graph tags
-        og_data = self._extract_open_graph(soup)
+        og_data = self._extract_open_graph(page)
         self._merge_components(metadata, og_data)
         
         # 3. Twitter Card tags
-        twitter_data = self._extract_twitter_card(soup)
+        twitter_data = self._extract_twitter_card(page)
         self._merge_components(metadata, twitter_data)
         
         # 4. Standard meta tags
-        meta_data = self._extract_meta_tags(soup)
+        meta_data = self._extract_meta_tags(page)
         self._merge_components(metadata, meta_data)
         
         # 5. HTML content fallbacks
-        html_data = self._extract_html_fallbacks(soup, url)
+        html_data = self._extract_html_fallbacks(page, url, need_authors=not metadata['authors'])
         self._merge_components(metadata, html_data)
         
         # 6. Deep fallbacks for missing critical fields
-        self._apply_deep_fallbacks(metadata, soup, url)
+        self._apply_deep_fallbacks(metadata, page, url)
         
         return metadata
     
-    def _apply_deep_fallbacks(self, metadata: Dict, soup: BeautifulSoup, url: str):
+    def _apply_deep_fallbacks(self, metadata: Dict, page: HtmlPage, url: str):
         """
         Apply intelligent fallback strategies for missing metadata.
         
         These are "deep" extractions that go beyond standard meta tags,
         analyzing URL structure, page content, and applying heuristics.
+        Content strategies only touch page.soup (building it) when a cheap
+        raw-text check says they could match.
         """
         # Clean title (remove site name suffix)
         if metadata['title'] and metadata['site_name']:
@@ -195,7 +219,7 @@ class GenericURLEngine(SearchEngine):
         
         # Date fallback: extract from URL, title, or page content
         if not metadata['date']:
-            fallback_date = self._extract_date_fallback(url, metadata, soup)
+            fallback_date = self._extract_date_fallback(url, metadata, page)
             if fallback_date:
                 metadata['date'] = fallback_date
         
@@ -207,18 +231,18 @@ class GenericURLEngine(SearchEngine):
         
         # DOI discovery: check URL, meta tags, page content
         if not metadata['doi']:
-            found_doi = self._discover_doi(url, soup)
+            found_doi = self._discover_doi(url, page)
             if found_doi:
                 metadata['doi'] = found_doi
         
         # Volume/Issue extraction for academic content
         if not metadata['volume']:
-            vol_issue = self._extract_volume_issue(url, soup)
+            vol_issue = self._extract_volume_issue(url, page)
             metadata.update({k: v for k, v in vol_issue.items() if v and not metadata.get(k)})
         
         # Document type inference
         if not metadata['document_type']:
-            metadata['document_type'] = self._infer_document_type(url, metadata, soup)
+            metadata['document_type'] = self._infer_document_type(url, metadata)
     
     def _clean_title(self, title: str, site_name: str) -> str:
         """
@@ -293,7 +317,7 @@ class GenericURLEngine(SearchEngine):
         except (ValueError, TypeError):
             return False
     
-    def _extract_date_fallback(self, url: str, metadata: Dict, soup: BeautifulSoup) -> Optional[str]:
+    def _extract_date_fallback(self, url: str, metadata: Dict, page: HtmlPage) -> Optional[str]:
         """
         Extract date from URL patterns, title, or page content when meta tags fail.
         
@@ -379,6 +403,10 @@ class GenericURLEngine(SearchEngine):
                 if any(ind in title.lower() for ind in year_indicators):
                     return year
         
+        if not page.contains(_DATE_CONTENT_HINT_RE):
+            return None
+        soup = page.soup
+        
         # Strategy 5: Look for date in page content
         # Common patterns: "Published: March 15, 2024" or "Date: 2024-03-15"
         date_labels = soup.find_all(['span', 'time', 'p', 'div'], 
@@ -423,7 +451,7 @@ class GenericURLEngine(SearchEngine):
         
         return None
     
-    def _discover_doi(self, url: str, soup: BeautifulSoup) -> Optional[str]:
+    def _discover_doi(self, url: str, page: HtmlPage) -> Optional[str]:
         """
         Discover DOI from various sources.
         
@@ -460,9 +488,8 @@ class GenericURLEngine(SearchEngine):
         ]
         
         for name in doi_meta_names:
-            tag = soup.find('meta', attrs={'name': name})
-            if tag and tag.get('content'):
-                content = tag['content'].strip()
+            content = page.meta(name=name).strip()
+            if content:
                 if '10.' in content:
                     # Extract DOI from content (might have prefix like "doi:")
                     match = re.search(doi_pattern, content)
@@ -471,6 +498,12 @@ class GenericURLEngine(SearchEngine):
                         if self._is_valid_doi(cleaned):
                             return cleaned
         
+        # Strategies 3-5 read page content; all of them need a DOI-shaped
+        # string somewhere in the HTML
+        if not page.contains(_DOI_HINT_RE):
+            return None
+        soup = page.soup
+        
         # Strategy 3: Link with DOI
         doi_links = soup.find_all('a', href=re.compile(r'doi\.org/10\.'))
         for link in doi_links[:3]:
@@ -609,7 +642,7 @@ class GenericURLEngine(SearchEngine):
         except (ValueError, TypeError):
             return False
     
-    def _extract_volume_issue(self, url: str, soup: BeautifulSoup) -> Dict[str, str]:
+    def _extract_volume_issue(self, url: str, page: HtmlPage) -> Dict[str, str]:
         """
         Extract volume, issue, and page numbers for academic journals.
         
@@ -634,9 +667,8 @@ class GenericURLEngine(SearchEngine):
         }
         
         for meta_name, field in meta_mappings.items():
-            tag = soup.find('meta', attrs={'name': meta_name})
-            if tag and tag.get('content'):
-                value = tag['content'].strip()
+            value = page.meta(name=meta_name).strip()
+            if value:
                 # VALIDATION: Check if value is in reasonable range
                 if field == 'volume' and not self._is_valid_volume(value):
                     continue
@@ -699,11 +731,11 @@ class GenericURLEngine(SearchEngine):
         ]
         
         # Look in citation/header areas
-        cite_areas = soup.find_all(['span', 'div', 'p'], 
-                                   class_=re.compile(r'citation|cite|volume|issue|header', re.I))
-        page_text = ' '.join(area.get_text() for area in cite_areas[:10])
-        
-        if not result.get('volume'):
+        if not result.get('volume') and page.contains(_VOLUME_CITATION_HINT_RE):
+            cite_areas = page.soup.find_all(['span', 'div', 'p'], 
+                                            class_=re.compile(r'citation|cite|volume|issue|header', re.I))
+            page_text = ' '.join(area.get_text() for area in cite_areas[:10])
+            
             for pattern in citation_patterns[:2]:
                 match = re.search(pattern, page_text)
                 if match:
@@ -721,27 +753,29 @@ class GenericURLEngine(SearchEngine):
                     break
         
         # Strategy 4: Look for explicit volume/issue labels
-        vol_elem = soup.find(string=re.compile(r'volume\s*:?\s*\d+', re.I))
-        if vol_elem and not result.get('volume'):
-            match = re.search(r'volume\s*:?\s*(\d+)', str(vol_elem), re.I)
-            if match:
-                vol = match.group(1)
-                # VALIDATION: Check volume is reasonable
-                if self._is_valid_volume(vol):
-                    result['volume'] = vol
-        
-        issue_elem = soup.find(string=re.compile(r'issue\s*:?\s*\d+', re.I))
-        if issue_elem and not result.get('issue'):
-            match = re.search(r'issue\s*:?\s*(\d+)', str(issue_elem), re.I)
-            if match:
-                iss = match.group(1)
-                # VALIDATION: Check issue is reasonable
-                if self._is_valid_issue(iss):
-                    result['issue'] = iss
+        if not result.get('volume') and page.contains(_VOLUME_LABEL_RE):
+            vol_elem = page.soup.find(string=_VOLUME_LABEL_RE)
+            if vol_elem:
+                match = re.search(r'volume\s*:?\s*(\d+)', str(vol_elem), re.I)
+                if match:
+                    vol = match.group(1)
+                    # VALIDATION: Check volume is reasonable
+                    if self._is_valid_volume(vol):
+                        result['volume'] = vol
+        
+        if not result.get('issue') and page.contains(_ISSUE_LABEL_RE):
+            issue_elem = page.soup.find(string=_ISSUE_LABEL_RE)
+            if issue_elem:
+                match = re.search(r'issue\s*:?\s*(\d+)', str(issue_elem), re.I)
+                if match:
+                    iss = match.group(1)
+                    # VALIDATION: Check issue is reasonable
+                    if self._is_valid_issue(iss):
+                        result['issue'] = iss
         
         return result
     
-    def _infer_document_type(self, url: str, metadata: Dict, soup: BeautifulSoup) -> str:
+    def _infer_document_type(self, url: str, metadata: Dict) -> str:
         """
         Infer document type from URL patterns, title, and content.
         
@@ -873,17 +907,16 @@ class GenericURLEngine(SearchEngine):
         
         return 'webpage'
     
-    def _extract_json_ld(self, soup: BeautifulSoup) -> Optional[Dict]:
+    def _extract_json_ld(self, page: HtmlPage) -> Optional[Dict]:
         """Extract JSON-LD structured data."""
-        scripts = soup.find_all('script', type='application/ld+json')
         
         # Types we recognize as articles
         article_types = ['Article', 'NewsArticle', 'WebPage', 'BlogPosting', 
                          'ScholarlyArticle', 'Report', 'TechArticle', 'Review']
         
-        for script in scripts:
+        for block in page.json_ld:
             try:
-                data = json.loads(script.string)
+                data = json.loads(block)
                 
                 # Handle @graph arrays
                 if isinstance(data, dict) and '@graph' in data:
@@ -955,7 +988,7 @@ class GenericURLEngine(SearchEngine):
         if not metadata['description']:
             metadata['description'] = json_ld.get('description', '')
     
-    def _extract_open_graph(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_open_graph(self, page: HtmlPage) -> Dict[str, Any]:
         """Extract Open Graph meta tags."""
         data = {}
         
@@ -971,9 +1004,8 @@ class GenericURLEngine(SearchEngine):
         }
         
         for og_prop, key in og_mappings.items():
-            tag = soup.find('meta', property=og_prop)
-            if tag and tag.get('content'):
-                value = tag['content'].strip()
+            value = page.meta(property=og_prop).strip()
+            if value:
                 if key == 'date':
                     value = self._normalize_date(value)
                 if key == 'author':
@@ -997,7 +1029,7 @@ class GenericURLEngine(SearchEngine):
         
         return data
     
-    def _extract_twitter_card(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_twitter_card(self, page: HtmlPage) -> Dict[str, Any]:
         """Extract Twitter Card meta tags."""
         data = {}
         
@@ -1009,9 +1041,8 @@ class GenericURLEngine(SearchEngine):
         }
         
         for tw_name, key in twitter_mappings.items():
-            tag = soup.find('meta', attrs={'name': tw_name})
-            if tag and tag.get('content'):
-                value = tag['content'].strip()
+            value = page.meta(name=tw_name).strip()
+            if value:
                 # Reject URLs - they're not author names
                 if key == 'author' and value.startswith('http'):
                     continue
@@ -1092,7 +1123,7 @@ class GenericURLEngine(SearchEngine):
         
         return True
     
-    def _extract_meta_tags(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _extract_meta_tags(self, page: HtmlPage) -> Dict[str, Any]:
         """Extract standard HTML meta tags including academic/Dublin Core metadata."""
         data = {}
         
@@ -1110,11 +1141,11 @@ class GenericURLEngine(SearchEngine):
         
         for name in author_meta_names:
             # Find all tags with this name (articles can have multiple authors)
-            tags = soup.find_all('meta', attrs={'name': name})
-            if tags:
+            contents = page.meta_all(name)
+            if contents:
                 authors = []
-                for tag in tags:
-                    content = tag.get('content', '').strip()
+                for content in contents:
+                    content = content.strip()
                     if content and self._is_valid_author_name(content):
                         authors.append(content)
                 if authors:
@@ -1135,43 +1166,42 @@ class GenericURLEngine(SearchEngine):
             'DC.date.issued',             # Dublin Core specific
         ]
         for name in date_names:
-            tag = soup.find('meta', attrs={'name': name})
-            if tag and tag.get('content'):
-                data['date'] = self._normalize_date(tag['content'].strip())
+            content = page.meta(name=name).strip()
+            if content:
+                data['date'] = self._normalize_date(content)
                 break
         
         # Journal/publication name (for academic articles)
         # Separate journal from publisher - they're different!
         journal_names = ['citation_journal_title', 'citation_journal_abbrev', 'DC.relation.ispartof']
         for name in journal_names:
-            tag = soup.find('meta', attrs={'name': name})
-            if tag and tag.get('content'):
-                data['journal'] = tag['content'].strip()
+            content = page.meta(name=name).strip()
+            if content:
+                data['journal'] = content
                 break
         
         # Publisher (separate from journal)
         publisher_names = ['citation_publisher', 'DC.publisher', 'publisher']
         for name in publisher_names:
-            tag = soup.find('meta', attrs={'name': name})
-            if tag and tag.get('content'):
-                data['publisher'] = tag['content'].strip()
+            content = page.meta(name=name).strip()
+            if content:
+                data['publisher'] = content
                 break
         
         # Site name fallback (for non-academic or when journal not found)
         if not data.get('journal'):
             site_name_tags = ['og:site_name', 'application-name']
             for name in site_name_tags:
-                tag = soup.find('meta', attrs={'property': name}) or soup.find('meta', attrs={'name': name})
-                if tag and tag.get('content'):
-                    data['site_name'] = tag['content'].strip()
+                content = (page.meta(property=name) or page.meta(name=name)).strip()
+                if content:
+                    data['site_name'] = content
                     break
         
         # DOI extraction from meta tags
         doi_names = ['citation_doi', 'DC.identifier', 'dc.identifier', 'prism.doi', 'bepress_citation_doi']
         for name in doi_names:
-            tag = soup.find('meta', attrs={'name': name})
-            if tag and tag.get('content'):
-                content = tag['content'].strip()
+            content = page.meta(name=name).strip()
+            if content:
                 # Clean DOI - remove prefixes
                 if '10.' in content:
                     doi_match = re.search(r'(10\.\d{4,}/[^\s]+)', content)
@@ -1180,37 +1210,41 @@ class GenericURLEngine(SearchEngine):
                         break
         
         # Volume, issue, pages (academic)
-        vol_tag = soup.find('meta', attrs={'name': 'citation_volume'})
-        if vol_tag and vol_tag.get('content'):
-            data['volume'] = vol_tag['content'].strip()
-        
-        issue_tag = soup.find('meta', attrs={'name': 'citation_issue'})
-        if issue_tag and issue_tag.get('content'):
-            data['issue'] = issue_tag['content'].strip()
-        
-        firstpage = soup.find('meta', attrs={'name': 'citation_firstpage'})
-        lastpage = soup.find('meta', attrs={'name': 'citation_lastpage'})
-        if firstpage and firstpage.get('content'):
-            pages = firstpage['content'].strip()
-            if lastpage and lastpage.get('content'):
-                pages += '-' + lastpage['content'].strip()
+        volume = page.meta(name='citation_volume').strip()
+        if volume:
+            data['volume'] = volume
+        
+        issue = page.meta(name='citation_issue').strip()
+        if issue:
+            data['issue'] = issue
+        
+        firstpage = page.meta(name='citation_firstpage').strip()
+        lastpage = page.meta(name='citation_lastpage').strip()
+        if firstpage:
+            pages = firstpage
+            if lastpage:
+                pages += '-' + lastpage
             data['pages'] = pages
         
         # Description
-        desc_tag = soup.find('meta', attrs={'name': 'description'})
-        if desc_tag and desc_tag.get('content'):
-            data['description'] = desc_tag['content'].strip()
+        description = page.meta(name='description').strip()
+        if description:
+            data['description'] = description
         
         return data
     
-    def _extract_html_fallbacks(self, soup: BeautifulSoup, url: str) -> Dict[str, Any]:
-        """Extract metadata from HTML content when meta tags are missing."""
+    def _extract_html_fallbacks(self, page: HtmlPage, url: str, need_authors: bool = True) -> Dict[str, Any]:
+        """
+        Extract metadata from HTML content when meta tags are missing.
+        
+        Byline scanning needs the full parse tree, so it is skipped when an
+        earlier source already supplied authors (need_authors=False).
+        """
         data = {}
         
         # Title from <title> tag
-        title_tag = soup.find('title')
-        if title_tag and title_tag.string:
-            title = title_tag.string.strip()
+        if page.title and page.title.strip():
+            title = page.title.strip()
             # Clean up title - remove site name suffix
             # e.g., "Article Title | The Atlantic" -> "Article Title"
             separators = [' | ', ' - ', ' – ', ' — ', ' :: ']
@@ -1240,30 +1274,31 @@ class GenericURLEngine(SearchEngine):
             {'class_': re.compile(r'essay-author|article-byline', re.I)},
         ]
         
-        for selector in byline_selectors:
-            # Find all matching elements (for multiple authors)
-            bylines = soup.find_all(['span', 'div', 'a', 'p', 'address', 'li', 'h2', 'h3'], **selector)
-            if bylines:
-                authors = []
-                for byline in bylines:
-                    author_text = byline.get_text(strip=True)
-                    # Clean up "By John Smith" -> "John Smith"
-                    author_text = re.sub(r'^by\s+', '', author_text, flags=re.IGNORECASE)
-                    # Remove footnote markers (e.g., "John Smith†" or "John Smith*")
-                    author_text = re.sub(r'[†‡§*¶\d]+$', '', author_text).strip()
-                    # Sanity checks
-                    if author_text and len(author_text) < 100 and self._is_valid_author_name(author_text):
-                        # Avoid duplicates
-                        if author_text not in authors:
-                            authors.append(author_text)
-                if authors:
-                    data['authors'] = authors
-                    break
+        if need_authors:
+            for selector in byline_selectors:
+                # Find all matching elements (for multiple authors)
+                bylines = page.soup.find_all(['span', 'div', 'a', 'p', 'address', 'li', 'h2', 'h3'], **selector)
+                if bylines:
+                    authors = []
+                    for byline in bylines:
+                        author_text = byline.get_text(strip=True)
+                        # Clean up "By John Smith" -> "John Smith"
+                        author_text = re.sub(r'^by\s+', '', author_text, flags=re.IGNORECASE)
+                        # Remove footnote markers (e.g., "John Smith†" or "John Smith*")
+                        author_text = re.sub(r'[†‡§*¶\d]+$', '', author_text).strip()
+                        # Sanity checks
+                        if author_text and len(author_text) < 100 and self._is_valid_author_name(author_text):
+                            # Avoid duplicates
+                            if author_text not in authors:
+                                authors.append(author_text)
+                    if authors:
+                        data['authors'] = authors
+                        break
         
         # If still no author, try looking for author links near the title
-        if 'authors' not in data:
+        if need_authors and 'authors' not in data:
             # Look for links with "author" in href
-            author_links = soup.find_all('a', href=re.compile(r'/authors?/|/people/|/contributors?/', re.I))
+            author_links = page.soup.find_all('a', href=re.compile(r'/authors?/|/people/|/contributors?/', re.I))
             authors = []
             for link in author_links[:5]:  # Limit to first 5 to avoid nav links
                 name = link.get_text(strip=True)
@@ -1274,9 +1309,8 @@ class GenericURLEngine(SearchEngine):
                 data['authors'] = authors
         
         # Date from <time> element
-        time_tag = soup.find('time', datetime=True)
-        if time_tag:
-            data['date'] = self._normalize_date(time_tag['datetime'])
+        if page.time_datetime is not None:
+            data['date'] = self._normalize_date(page.time_datetime)
         
         # Site name from domain if not found elsewhere
         if 'site_name' not in data:
@@ -1629,7 +1663,7 @@ class GenericURLEngine(SearchEngine):
         # Ask AI: "What organization owns this domain?"
         if HAS_AI_LOOKUP and lookup_org_name:
             if any(domain.endswith(tld) for tld in ['.org', '.edu']):
-                print(f"[GenericURL] Trying AI lookup for org name: {domain}")
+                logger.debug(f"[GenericURL] Trying AI lookup for org name: {domain}")
                 ai_org_name = lookup_org_name(domain)
                 if ai_org_name:
                     return ai_org_name
@@ -10,9 +10,13 @@ Google Scholar search via SerpAPI.
 from typing import Optional, List
 
 from engines.base import SearchEngine
+from engines.scoring import QueryTokens, best_index, name_part_hit_counts, overlap_counts
 from models import SourceComponents, CitationType
 from config import SERPAPI_KEY
 from cost_tracker import log_api_call
+from tracing import get_logger
+
+logger = get_logger('engines.google_scholar')
 
 ENGINE_TIMEOUT = 10  # SerpAPI can be slower
 
@@ -36,13 +40,13 @@ class GoogleScholarEngine(SearchEngine):
     
     def search(self, query: str) -> Optional[SourceComponents]:
         """Search Google Scholar and return best match."""
-        print(f"[{self.name}] Searching for: {query}")
+        logger.debug(f"[{self.name}] Searching for: {query}")
         
         if not self.api_key:
-            print(f"[{self.name}] No API key configured")
+            logger.debug(f"[{self.name}] No API key configured")
             return None
         
-        print(f"[{self.name}] API key present (length: {len(self.api_key)})")
+        logger.debug(f"[{self.name}] API key present (length: {len(self.api_key)})")
         
         params = {
             'engine': 'google_scholar',
@@ -53,10 +57,10 @@ class GoogleScholarEngine(SearchEngine):
         
         response = self._make_request(self.base_url, params=params)
         if not response:
-            print(f"[{self.name}] No response from API")
+            logger.debug(f"[{self.name}] No response from API")
             return None
         
-        print(f"[{self.name}] Got response, status: {response.status_code}")
+        logger.debug(f"[{self.name}] Got response, status: {response.status_code}")
         
         # Log SerpAPI cost (flat rate per search)
         log_api_call('serpapi', query=query, function='google_scholar')
@@ -66,22 +70,22 @@ class GoogleScholarEngine(SearchEngine):
             
             # Check for errors
             if 'error' in data:
-                print(f"[{self.name}] API error: {data['error']}")
+                logger.warning(f"[{self.name}] API error: {data['error']}")
                 return None
             
             results = data.get('organic_results', [])
-            print(f"[{self.name}] Found {len(results)} results")
+            logger.debug(f"[{self.name}] Found {len(results)} results")
             
             if not results:
                 return None
             
             # Find best match
             best = self._find_best_match(results, query)
-            print(f"[{self.name}] Best match: {best.get('title', 'No title')[:50]}")
+            logger.debug(f"[{self.name}] Best match: {best.get('title', 'No title')[:50]}")
             return self._normalize(best, query)
             
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def search_multiple(self, query: str, limit: int = 5) -> List[SourceComponents]:
@@ -112,40 +116,29 @@ class GoogleScholarEngine(SearchEngine):
     
     def _find_best_match(self, results: List[dict], query: str) -> dict:
         """Score results and return best match."""
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
+        tokens = QueryTokens(query)
+        titles = [result.get('title', '').lower() for result in results]
+        
+        # Author name parts found in the query
+        author_hits = name_part_hit_counts(
+            tokens,
+            ([author.get('name', '') for author in result.get('publication_info', {}).get('authors', [])]
+             for result in results),
+        )
         
-        best = results[0]
-        best_score = 0
+        # Title word overlap
+        overlaps = overlap_counts(tokens.word_set, titles)
         
-        for result in results:
-            score = 0
-            title = result.get('title', '').lower()
-            
-            # Check author match
-            pub_info = result.get('publication_info', {})
-            authors = pub_info.get('authors', [])
-            for author in authors:
-                author_name = author.get('name', '').lower()
-                for name_part in author_name.split():
-                    if len(name_part) >= 3 and name_part in query_lower:
-                        score += 15
-            
-            # Check title word overlap
-            title_words = set(title.split())
-            overlap = len(query_words & title_words)
-            score += overlap * 3
-            
-            # Bonus for exact phrase matches
-            for word in query_words:
-                if len(word) >= 4 and word in title:
-                    score += 2
-            
-            if score > best_score:
-                best_score = score
-                best = result
+        # Bonus for exact phrase matches
+        long_words = tokens.long_words
+        phrase_hits = [len([word for word in long_words if word in title]) for title in titles]
+        
+        scores = [
+            hits * 15 + overlap * 3 + phrases * 2
+            for hits, overlap, phrases in zip(author_hits, overlaps, phrase_hits)
+        ]
         
-        return best
+        return results[best_index(scores)]
     
     def _normalize(self, item: dict, raw_source: str) -> SourceComponents:
         """Convert SerpAPI Google Scholar response to SourceComponents."""
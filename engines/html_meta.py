@@ -0,0 +1,215 @@
+"""
+citeflex/engines/html_meta.py
+
+Head-only HTML fetching and single-pass metadata tokenizing for URL engines.
+
+Citation metadata (meta tags, Open Graph, citation_*, JSON-LD, <title>)
+lives in <head>, but news pages routinely ship 1-3 MB of HTML. Rather than
+downloading everything and building a full BeautifulSoup tree for a
+handful of tags:
+
+- read_html_prefix() streams the response and stops once </head> plus a
+  bounded prefix of <body> has arrived (bylines and <time> elements are
+  usually near the top of the body)
+- HtmlPage scans that prefix once with a regex tokenizer, collecting meta
+  tags, JSON-LD blocks, the first <title> and the first <time datetime>
+- HtmlPage.soup builds the BeautifulSoup tree only when a deep fallback
+  actually asks for it
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+"""
+
+import re
+from html import unescape
+from typing import Dict, List, Optional, Pattern, Tuple, Union
+
+
+# Defaults for read_html_prefix()
+BODY_PREFIX_BYTES = 128 * 1024   # how much of <body> to keep after </head>
+MAX_HTML_BYTES = 1024 * 1024     # hard cap, for pages with enormous <head>s
+CHUNK_BYTES = 16 * 1024
+
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+_CHARSET_HEADER_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_CHARSET_META_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+# Comments are skipped whole; everything else we care about is one of
+# these tags. Attribute text may contain '>' inside quotes.
+_TAG_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(meta|title|script|style|time)\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.I | re.S,
+)
+_ATTR_RE = re.compile(
+    r'([^\s=/>"\']+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?'
+)
+_CLOSE_RE = {
+    tag: re.compile(rf'</{tag}\s*>', re.I)
+    for tag in ('title', 'script', 'style')
+}
+_INNER_TAG_RE = re.compile(r'<[^>]*>')
+
+JSON_LD_TYPE = 'application/ld+json'
+
+
+def read_html_prefix(
+    response,
+    body_prefix_bytes: int = BODY_PREFIX_BYTES,
+    max_bytes: int = MAX_HTML_BYTES,
+    chunk_size: int = CHUNK_BYTES,
+) -> Tuple[bytes, bool]:
+    """
+    Read a streamed response up to </head> plus ``body_prefix_bytes``.
+
+    The response is always closed, so the rest of the body is never
+    downloaded.
+
+    Args:
+        response: requests.Response opened with stream=True
+        body_prefix_bytes: Bytes of <body> to keep after </head>
+        max_bytes: Upper bound on bytes read when </head> never appears
+
+    Returns:
+        (data, truncated) - truncated is True if the page continued past
+        what was read
+    """
+    buf = bytearray()
+    head_end = -1
+    truncated = False
+    try:
+        for chunk in response.iter_content(chunk_size):
+            if not chunk:
+                continue
+            # Re-scan a few bytes of the previous chunk in case the closing
+            # tag straddles the boundary
+            scan_from = max(len(buf) - 16, 0)
+            buf.extend(chunk)
+            if head_end < 0:
+                match = _HEAD_END_RE.search(buf, scan_from)
+                if match:
+                    head_end = match.end()
+            limit = head_end + body_prefix_bytes if head_end >= 0 else max_bytes
+            if len(buf) >= min(limit, max_bytes):
+                truncated = True
+                del buf[min(limit, max_bytes):]
+                break
+    finally:
+        response.close()
+    return bytes(buf), truncated
+
+
+def decode_html(data: bytes, content_type: str = '') -> str:
+    """
+    Decode page bytes using the Content-Type charset, then <meta charset>,
+    then UTF-8.
+    """
+    encoding = None
+    match = _CHARSET_HEADER_RE.search(content_type or '')
+    if match:
+        encoding = match.group(1)
+    else:
+        match = _CHARSET_META_RE.search(data[:4096])
+        if match:
+            encoding = match.group(1).decode('ascii', 'ignore')
+    try:
+        return data.decode(encoding or 'utf-8', errors='replace')
+    except LookupError:
+        return data.decode('utf-8', errors='replace')
+
+
+def _parse_attrs(text: str) -> Dict[str, str]:
+    attrs = {}
+    for match in _ATTR_RE.finditer(text):
+        name = match.group(1).lower()
+        if name in attrs:
+            continue
+        value = match.group(2)
+        if value is None:
+            value = match.group(3)
+        if value is None:
+            value = match.group(4) or ''
+        attrs[name] = unescape(value)
+    return attrs
+
+
+class HtmlPage:
+    """
+    Metadata tokens for one fetched page, with the parse tree built on demand.
+
+    Meta lookups mirror ``soup.find('meta', attrs={...}).get('content')``:
+    attribute values match exactly and the first matching tag wins.
+    """
+
+    def __init__(self, html: str, truncated: bool = False):
+        self.html = html
+        self.truncated = truncated
+        self.meta_by_name: Dict[str, List[str]] = {}
+        self.meta_by_property: Dict[str, List[str]] = {}
+        self.json_ld: List[str] = []
+        self.title: Optional[str] = None
+        self.time_datetime: Optional[str] = None
+        self._soup = None
+        self._scan()
+
+    def _scan(self) -> None:
+        html = self.html
+        pos = 0
+        while True:
+            match = _TAG_RE.search(html, pos)
+            if not match:
+                break
+            pos = match.end()
+            tag = match.group(1)
+            if not tag:
+                continue  # comment
+            tag = tag.lower()
+            attrs = _parse_attrs(match.group(2))
+
+            if tag == 'meta':
+                content = attrs.get('content', '')
+                if 'name' in attrs:
+                    self.meta_by_name.setdefault(attrs['name'], []).append(content)
+                if 'property' in attrs:
+                    self.meta_by_property.setdefault(attrs['property'], []).append(content)
+            elif tag == 'time':
+                if self.time_datetime is None and 'datetime' in attrs:
+                    self.time_datetime = attrs['datetime']
+            else:
+                # Raw-text elements: jump past the closing tag so markup
+                # inside scripts and styles is never tokenized
+                close = _CLOSE_RE[tag].search(html, pos)
+                end = close.start() if close else len(html)
+                if tag == 'script':
+                    if attrs.get('type', '').strip().lower() == JSON_LD_TYPE:
+                        self.json_ld.append(html[pos:end])
+                elif tag == 'title' and self.title is None:
+                    self.title = unescape(_INNER_TAG_RE.sub('', html[pos:end]))
+                pos = close.end() if close else len(html)
+
+    def meta(self, name: Optional[str] = None, property: Optional[str] = None) -> str:
+        """Content of the first <meta name=...> (or property=...) tag, or ''."""
+        values = self.meta_by_name.get(name) if name is not None else self.meta_by_property.get(property)
+        return values[0] if values else ''
+
+    def meta_all(self, name: str) -> List[str]:
+        """Contents of every <meta name=...> tag, in document order."""
+        return self.meta_by_name.get(name, [])
+
+    def contains(self, pattern: Union[str, Pattern]) -> bool:
+        """Cheap raw-text check used to skip soup-based fallbacks that cannot match."""
+        if isinstance(pattern, str):
+            return re.search(pattern, self.html, re.I) is not None
+        return pattern.search(self.html) is not None
+
+    @property
+    def soup(self):
+        """BeautifulSoup tree of the fetched HTML, built on first access."""
+        if self._soup is None:
+            from bs4 import BeautifulSoup
+            self._soup = BeautifulSoup(self.html, 'html.parser')
+        return self._soup
+
+    @property
+    def soup_built(self) -> bool:
+        return self._soup is not None
@@ -0,0 +1,376 @@
+"""
+citeflex/engines/identifier_batch.py
+
+Batch resolution of DOIs, PMIDs and arXiv ids found in a document.
+
+A reference list routinely carries dozens of identifiers, and each one used
+to cost its own request (CrossrefEngine.get_by_id, PubMedEngine.get_by_id,
+ArxivEngine.get_by_id). prefetch_identifiers() collects every identifier in
+a document up front and resolves them with multi-id requests:
+
+- DOIs:   Crossref  /works?filter=doi:A,doi:B,...   (same normalization as
+          CrossrefEngine.get_by_id); DOIs Crossref does not know are retried
+          on OpenAlex /works?filter=doi:A|B|...
+- PMIDs:  PubMed esummary with comma-separated ids
+- arXiv:  arXiv API id_list=A,B,...
+
+Results are kept in a bounded process-wide store that the engines'
+get_by_id() methods consult before going to the network ("not found" only
+for PREFETCH_MISS_TTL seconds, so a transient miss is retried later),
+and are seeded into the document's SourceComponentsCache so route_citation
+can answer identifier citations without any lookup at all.
+
+Usage:
+    from engines.identifier_batch import prefetch_identifiers
+
+    prefetch_identifiers(note_texts, metadata_cache)
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: "Not found" entries expire after PREFETCH_MISS_TTL
+"""
+
+import copy
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from models import SourceComponents, normalize_doi
+from tracing import get_logger, span, submit_traced
+
+logger = get_logger('engines.identifier_batch')
+
+
+# Ids per request. Crossref and OpenAlex put the filter in the query string,
+# so these also bound URL length.
+CROSSREF_BATCH_SIZE = 20
+OPENALEX_BATCH_SIZE = 50
+PUBMED_BATCH_SIZE = 200
+ARXIV_BATCH_SIZE = 50
+
+MAX_WORKERS = 4
+
+# Resolved identifiers kept per process (LRU)
+MAX_PREFETCHED = 5000
+
+# Seconds a "not found" answer is trusted: long enough to cover the document
+# that prefetched it, short enough that a new or briefly unreachable record
+# is looked up again
+PREFETCH_MISS_TTL = 600
+
+KINDS = ('doi', 'pmid', 'arxiv')
+
+
+def identifier_key(kind: str, value: str) -> str:
+    """
+    Store key for an identifier: "doi:<normalized doi>", "pmid:<digits>",
+    "arxiv:<lowercased id>". SourceComponentsCache uses the same keys.
+    """
+    if kind == 'doi':
+        return f"doi:{normalize_doi(value)}"
+    if kind == 'pmid':
+        return f"pmid:{re.sub(r'[^0-9]', '', value)}"
+    if kind == 'arxiv':
+        value = re.sub(r'^arxiv:\s*', '', value.strip(), flags=re.IGNORECASE)
+        return f"arxiv:{value.lower()}"
+    raise ValueError(f"Unknown identifier kind: {kind}")
+
+
+# =============================================================================
+# PROCESS-WIDE STORE
+# =============================================================================
+
+class _PrefetchStore:
+    """
+    Thread-safe LRU of identifier key -> SourceComponents (or None = not
+    found). Misses expire after ``miss_ttl`` seconds; hits only by eviction.
+    """
+
+    def __init__(self, max_size: int = MAX_PREFETCHED, miss_ttl: float = PREFETCH_MISS_TTL):
+        self.max_size = max_size
+        self.miss_ttl = miss_ttl
+        # key -> (components, expires_at); expires_at is None for hits
+        self._items: 'OrderedDict[str, Tuple[Optional[SourceComponents], Optional[float]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, components: Optional[SourceComponents]) -> None:
+        expires_at = None if components is not None else time.monotonic() + self.miss_ttl
+        with self._lock:
+            self._items[key] = (components, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def _live(self, key: str) -> bool:
+        # Caller holds the lock
+        entry = self._items.get(key)
+        if entry is None:
+            return False
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._items[key]
+            return False
+        return True
+
+    def get(self, key: str) -> Tuple[bool, Optional[SourceComponents]]:
+        with self._lock:
+            if not self._live(key):
+                return False, None
+            self._items.move_to_end(key)
+            components = self._items[key][0]
+        # Callers may mutate what they get back
+        return True, copy.deepcopy(components)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._live(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_store = _PrefetchStore()
+
+
+def get_prefetched(kind: str, value: str) -> Tuple[bool, Optional[SourceComponents]]:
+    """
+    Look up a batch-resolved identifier.
+
+    Returns:
+        (known, components) - known is False if the id was never batch
+        resolved; components is None if it was resolved and not found
+    """
+    try:
+        key = identifier_key(kind, value)
+    except ValueError:
+        return False, None
+    return _store.get(key)
+
+
+def clear_prefetched() -> None:
+    """Drop every batch-resolved identifier."""
+    _store.clear()
+
+
+# =============================================================================
+# BATCH REQUESTS
+# =============================================================================
+
+def _chunks(items: List[str], size: int) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _crossref_batch(engine, dois: List[str]) -> Optional[Dict[str, SourceComponents]]:
+    # Commas separate filters, so a DOI containing one cannot be batched
+    params = {
+        'filter': ','.join(f'doi:{doi}' for doi in dois),
+        'rows': len(dois),
+    }
+    response = engine._make_request(engine.base_url, params=params)
+    if not response:
+        return None
+    by_doi = {normalize_doi(doi): doi for doi in dois}
+    found = {}
+    for item in response.json().get('message', {}).get('items', []):
+        requested = by_doi.get(normalize_doi(item.get('DOI', '')))
+        if requested:
+            found[requested] = engine._normalize(item, requested)
+    return found
+
+
+def _openalex_batch(engine, dois: List[str]) -> Optional[Dict[str, SourceComponents]]:
+    params = {
+        'filter': 'doi:' + '|'.join(dois),
+        'per-page': len(dois),
+    }
+    response = engine._make_request(engine.base_url, params=params)
+    if not response:
+        return None
+    by_doi = {normalize_doi(doi): doi for doi in dois}
+    found = {}
+    for item in response.json().get('results', []):
+        requested = by_doi.get(normalize_doi(item.get('doi') or ''))
+        if requested:
+            found[requested] = engine._normalize(item, requested)
+    return found
+
+
+def _pubmed_batch(engine, pmids: List[str]) -> Optional[Dict[str, SourceComponents]]:
+    params = {
+        'db': 'pubmed',
+        'id': ','.join(pmids),
+        'retmode': 'json',
+    }
+    if engine.api_key:
+        params['api_key'] = engine.api_key
+    response = engine._make_request(f"{engine.base_url}esummary.fcgi", params=params)
+    if not response:
+        return None
+    result = response.json().get('result', {})
+    found = {}
+    for pmid in pmids:
+        article = result.get(pmid)
+        if article and 'error' not in article:
+            found[pmid] = engine._normalize_summary(article, pmid, f"PMID:{pmid}")
+    return found
+
+
+def _arxiv_batch(engine, arxiv_ids: List[str]) -> Optional[Dict[str, SourceComponents]]:
+    params = {
+        'id_list': ','.join(arxiv_ids),
+        'max_results': len(arxiv_ids),
+    }
+    response = engine._make_request(engine.base_url, params=params)
+    if not response:
+        return None
+    # Entries come back versioned (2301.12345v2); match requests with or
+    # without a version suffix
+    entries = {}
+    for entry in engine._parse_response(response.text):
+        entry_id = entry.get('arxiv_id', '').lower()
+        entries.setdefault(entry_id, entry)
+        entries.setdefault(re.sub(r'v\d+$', '', entry_id), entry)
+    found = {}
+    for arxiv_id in arxiv_ids:
+        entry = entries.get(arxiv_id.lower())
+        if entry:
+            found[arxiv_id] = engine._normalize(entry, arxiv_id)
+    return found
+
+
+def _run_batches(batch_fn, engine, ids: List[str], size: int, kind: str, executor) -> Dict[str, Optional[SourceComponents]]:
+    """
+    Submit ``ids`` in chunks; returns {id: components or None} for every id
+    whose batch request succeeded (ids in failed batches are left out so
+    get_by_id will still try them individually).
+    """
+    futures = [
+        (chunk, submit_traced(executor, _traced_batch, batch_fn, engine, chunk, kind))
+        for chunk in _chunks(ids, size)
+    ]
+    resolved = {}
+    for chunk, future in futures:
+        try:
+            found = future.result()
+        except Exception as e:
+            logger.warning(f"[IdentifierBatch] {kind} batch failed: {e}")
+            continue
+        if found is None:
+            continue
+        for identifier in chunk:
+            resolved[identifier] = found.get(identifier)
+    return resolved
+
+
+def _traced_batch(batch_fn, engine, chunk: List[str], kind: str):
+    with span(f'batch.{kind}', size=len(chunk)):
+        return batch_fn(engine, chunk)
+
+
+def resolve_identifiers(
+    dois: Iterable[str] = (),
+    pmids: Iterable[str] = (),
+    arxiv_ids: Iterable[str] = (),
+) -> Dict[str, Optional[SourceComponents]]:
+    """
+    Resolve identifiers with multi-id requests and record them in the
+    process-wide store. Identifiers already in the store are not re-fetched.
+
+    Returns:
+        {identifier_key: SourceComponents or None} for every identifier that
+        is now known (found or confirmed missing)
+    """
+    from engines.academic import CrossrefEngine, OpenAlexEngine, PubMedEngine
+    from engines.arxiv import ArxivEngine
+
+    def pending(kind: str, values: Iterable[str]) -> List[str]:
+        unique = {}
+        for value in values:
+            value = value.strip()
+            key = identifier_key(kind, value)
+            if value and key not in _store and key not in unique:
+                unique[key] = value
+        return list(unique.values())
+
+    todo_dois = pending('doi', dois)
+    todo_pmids = pending('pmid', pmids)
+    todo_arxiv = pending('arxiv', arxiv_ids)
+
+    resolved: Dict[str, Optional[SourceComponents]] = {}
+    if todo_dois or todo_pmids or todo_arxiv:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            batchable_dois = [doi for doi in todo_dois if ',' not in doi and '|' not in doi]
+            doi_results = _run_batches(_crossref_batch, CrossrefEngine(), batchable_dois, CROSSREF_BATCH_SIZE, 'crossref', executor)
+            pmid_results = _run_batches(_pubmed_batch, PubMedEngine(), todo_pmids, PUBMED_BATCH_SIZE, 'pubmed', executor)
+            arxiv_results = _run_batches(_arxiv_batch, ArxivEngine(), todo_arxiv, ARXIV_BATCH_SIZE, 'arxiv', executor)
+
+            # DOIs Crossref does not have (e.g. DataCite) get a second chance
+            crossref_misses = [doi for doi, found in doi_results.items() if found is None]
+            if crossref_misses:
+                for doi, found in _run_batches(_openalex_batch, OpenAlexEngine(), crossref_misses,
+                                               OPENALEX_BATCH_SIZE, 'openalex', executor).items():
+                    if found is not None:
+                        doi_results[doi] = found
+
+        for kind, results in (('doi', doi_results), ('pmid', pmid_results), ('arxiv', arxiv_results)):
+            for identifier, components in results.items():
+                key = identifier_key(kind, identifier)
+                _store.put(key, components)
+                resolved[key] = components
+
+        found = sum(1 for c in resolved.values() if c is not None)
+        logger.debug(f"[IdentifierBatch] Resolved {found}/{len(resolved)} identifiers "
+                     f"({len(todo_dois)} DOI, {len(todo_pmids)} PMID, {len(todo_arxiv)} arXiv)")
+
+    # Include identifiers that were already known
+    for kind, values in (('doi', dois), ('pmid', pmids), ('arxiv', arxiv_ids)):
+        for value in values:
+            key = identifier_key(kind, value.strip())
+            if key not in resolved:
+                known, components = _store.get(key)
+                if known:
+                    resolved[key] = components
+    return resolved
+
+
+def prefetch_identifiers(texts: Iterable[str], cache=None) -> Dict[str, Optional[SourceComponents]]:
+    """
+    Batch-resolve every DOI, PMID and arXiv id found in ``texts``.
+
+    Args:
+        texts: Citation/note/body texts to scan
+        cache: Optional SourceComponentsCache to seed with the results
+
+    Returns:
+        {identifier_key: SourceComponents or None}
+    """
+    from processors.doi_extractor import extract_all_identifiers
+
+    found: Dict[str, List[str]] = {kind: [] for kind in KINDS}
+    for text in texts:
+        if not text:
+            continue
+        for item in extract_all_identifiers(text):
+            if item['type'] in found:
+                found[item['type']].append(item['identifier'])
+
+    if not any(found.values()):
+        return {}
+
+    with span('prefetch_identifiers', count=sum(len(v) for v in found.values())):
+        try:
+            resolved = resolve_identifiers(found['doi'], found['pmid'], found['arxiv'])
+        except Exception as e:
+            # Prefetching is an optimization; lookups fall back to per-id requests
+            logger.warning(f"[IdentifierBatch] Prefetch failed: {e}")
+            return {}
+
+    if cache is not None:
+        for key, components in resolved.items():
+            if components is not None:
+                cache.seed_identifier(key, components)
+    return resolved
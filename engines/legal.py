@@ -36,7 +36,7 @@ Features:
 
 import re
 import difflib
-import requests
+import http_client
 import time
 from typing import Optional, List, Dict
 from urllib.parse import urlparse, unquote
@@ -44,6 +44,9 @@ from urllib.parse import urlparse, unquote
 from engines.base import SearchEngine
 from models import SourceComponents, CitationType
 from config import COURTLISTENER_API_KEY
+from tracing import get_logger
+
+logger = get_logger('engines.legal')
 
 
 # =============================================================================
@@ -618,7 +621,7 @@ class CourtListenerEngine(SearchEngine):
                 'order_by': 'score desc',
                 'format': 'json'
             }
-            response = requests.get(
+            response = http_client.get(
                 self.base_url,
                 params=params,
                 headers=self.headers,
@@ -627,7 +630,7 @@ class CourtListenerEngine(SearchEngine):
             if response.status_code == 200:
                 return response.json().get('results', [])
         except Exception as e:
-            print(f"[CourtListener] Error: {e}")
+            logger.warning(f"[CourtListener] Error: {e}")
         return []
     
     def _to_components(self, item: dict, query: str) -> Optional[SourceComponents]:
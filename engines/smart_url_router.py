@@ -15,15 +15,22 @@ Cost comparison:
 - Direct fetch: Free
 
 Total free daily capacity: 300 news URLs before hitting paid APIs!
+The free-tier counts live in the shared quota ledger (quota_ledger.py), so
+that capacity is per API key and host, not per worker.
 """
 
 import requests
+import http_client
 from typing import Optional
 from urllib.parse import urlparse
 import time
 
 from config import SERPAPI_KEY, THENEWSAPI_KEY, NEWSDATA_KEY
 from cost_tracker import log_api_call
+from quota_ledger import get_quota_ledger
+from tracing import get_logger
+
+logger = get_logger('engines.smart_url_router')
 
 # AI fallback for author extraction when SERPAPI/News APIs return title but no author
 try:
@@ -179,11 +186,12 @@ class SmartURLRouter:
         self.has_thenewsapi = bool(THENEWSAPI_KEY)
         self.has_newsdata = bool(NEWSDATA_KEY)
         self.has_serpapi = bool(SERPAPI_KEY)
+        self.quota = get_quota_ledger()
         
         if self.debug:
-            print(f"[SmartURLRouter] TheNewsAPI: {self.has_thenewsapi}")
-            print(f"[SmartURLRouter] NewsData: {self.has_newsdata}")
-            print(f"[SmartURLRouter] SerpAPI: {self.has_serpapi}")
+            logger.debug(f"[SmartURLRouter] TheNewsAPI: {self.has_thenewsapi}")
+            logger.debug(f"[SmartURLRouter] NewsData: {self.has_newsdata}")
+            logger.debug(f"[SmartURLRouter] SerpAPI: {self.has_serpapi}")
     
     def resolve(self, url: str):
         """
@@ -198,19 +206,18 @@ class SmartURLRouter:
         institutional_author = self._get_institutional_author(domain)
         if institutional_author:
             if self.debug:
-                print(f"[SmartURLRouter] Institutional author detected: {institutional_author}")
+                logger.debug(f"[SmartURLRouter] Institutional author detected: {institutional_author}")
             return self._institutional_metadata(url, institutional_author)
         
         # For news domains, try news APIs first (free!)
         if domain in NEWS_DOMAINS:
-            # Try free APIs first
-            if self.has_thenewsapi:
-                result = self._search_thenewsapi(url)
-                if result.is_complete():
-                    return result
-            
-            if self.has_newsdata:
-                result = self._search_newsdata(url)
+            # Try free APIs first, the one with more quota left today first
+            free_tiers = {
+                'thenewsapi': (self.has_thenewsapi, self._search_thenewsapi),
+                'newsdata': (self.has_newsdata, self._search_newsdata),
+            }
+            for provider in self.quota.by_capacity([p for p, (available, _) in free_tiers.items() if available]):
+                result = free_tiers[provider][1](url)
                 if result.is_complete():
                     return result
             
@@ -239,7 +246,7 @@ class SmartURLRouter:
         4. If still no authors: AI fallback (if enabled)
         """
         if self.debug:
-            print(f"[SmartURLRouter] Using SerpAPI for paywalled URL: {url[:60]}")
+            logger.debug(f"[SmartURLRouter] Using SerpAPI for paywalled URL: {url[:60]}")
         
         try:
             domain = self._extract_domain(url)
@@ -254,8 +261,8 @@ class SmartURLRouter:
                 publication = self._extract_publication_name(url)
                 
                 if self.debug:
-                    print(f"[SmartURLRouter] Using Google News API for news domain")
-                    print(f"[SmartURLRouter] Search keywords: {keywords}")
+                    logger.debug(f"[SmartURLRouter] Using Google News API for news domain")
+                    logger.debug(f"[SmartURLRouter] Search keywords: {keywords}")
                 
                 # Google News works better with keywords than exact URLs
                 params = {
@@ -272,7 +279,7 @@ class SmartURLRouter:
                     'num': 1
                 }
             
-            response = requests.get(
+            response = http_client.get(
                 'https://serpapi.com/search',
                 params=params,
                 timeout=10
@@ -286,24 +293,24 @@ class SmartURLRouter:
                 data = response.json()
                 
                 if self.debug:
-                    print(f"[SmartURLRouter] SerpAPI response status: {response.status_code}")
+                    logger.debug(f"[SmartURLRouter] SerpAPI response status: {response.status_code}")
                 
                 # Extract results based on engine type
                 if is_news:
                     # Google News returns 'news_results'
                     results = data.get('news_results', [])
                     if self.debug:
-                        print(f"[SmartURLRouter] Google News results count: {len(results)}")
+                        logger.debug(f"[SmartURLRouter] Google News results count: {len(results)}")
                 else:
                     # Regular Google returns 'organic_results'
                     results = data.get('organic_results', [])
                     if self.debug:
-                        print(f"[SmartURLRouter] Google organic results count: {len(results)}")
+                        logger.debug(f"[SmartURLRouter] Google organic results count: {len(results)}")
                 
                 # If 0 results and we used regular Google, try keyword fallback
                 if not results and not is_news:
                     if self.debug:
-                        print(f"[SmartURLRouter] No results, trying keyword search...")
+                        logger.debug(f"[SmartURLRouter] No results, trying keyword search...")
                     
                     keywords = self._extract_keywords_from_url(url)
                     
@@ -311,10 +318,10 @@ class SmartURLRouter:
                         keyword_query = f"site:{domain} {keywords}"
                         
                         if self.debug:
-                            print(f"[SmartURLRouter] Keyword query: {keyword_query}")
+                            logger.debug(f"[SmartURLRouter] Keyword query: {keyword_query}")
                         
                         params['q'] = keyword_query
-                        response = requests.get(
+                        response = http_client.get(
                             'https://serpapi.com/search',
                             params=params,
                             timeout=10
@@ -327,7 +334,7 @@ class SmartURLRouter:
                             results = data.get('organic_results', [])
                             
                             if self.debug:
-                                print(f"[SmartURLRouter] Keyword search found {len(results)} results")
+                                logger.debug(f"[SmartURLRouter] Keyword search found {len(results)} results")
                 
                 if results:
                     # IMPORTANT: Verify the result matches our input URL
@@ -339,7 +346,7 @@ class SmartURLRouter:
                     url_parts = set(url_path.replace('-', ' ').replace('_', ' ').split())
                     
                     if self.debug:
-                        print(f"[SmartURLRouter] Looking for URL match. Key parts: {url_parts}")
+                        logger.debug(f"[SmartURLRouter] Looking for URL match. Key parts: {url_parts}")
                     
                     for r in results:
                         result_link = r.get('link', '').lower()
@@ -348,7 +355,7 @@ class SmartURLRouter:
                         if url.lower() in result_link or result_link in url.lower():
                             matched_result = r
                             if self.debug:
-                                print(f"[SmartURLRouter] ✓ Direct URL match found")
+                                logger.debug(f"[SmartURLRouter] ✓ Direct URL match found")
                             break
                         
                         # Partial path match - check if key parts of URL appear in result
@@ -362,12 +369,12 @@ class SmartURLRouter:
                         if len(significant_overlap) >= 2:
                             matched_result = r
                             if self.debug:
-                                print(f"[SmartURLRouter] ✓ Partial match found via: {significant_overlap}")
+                                logger.debug(f"[SmartURLRouter] ✓ Partial match found via: {significant_overlap}")
                             break
                     
                     if not matched_result:
                         if self.debug:
-                            print(f"[SmartURLRouter] ✗ No URL match in {len(results)} results, using first result as fallback")
+                            logger.warning(f"[SmartURLRouter] ✗ No URL match in {len(results)} results, using first result as fallback")
                         matched_result = results[0]
                     
                     result = matched_result
@@ -412,11 +419,11 @@ class SmartURLRouter:
                         authors = self._extract_authors_from_snippet(snippet)
                     
                     if self.debug:
-                        print(f"[SmartURLRouter] Extracted title: {title}")
-                        print(f"[SmartURLRouter] Extracted authors: {authors}")
-                        print(f"[SmartURLRouter] Extracted authors_parsed: {authors_parsed}")
-                        print(f"[SmartURLRouter] Extracted date: {date}")
-                        print(f"[SmartURLRouter] Extracted publication: {publication}")
+                        logger.debug(f"[SmartURLRouter] Extracted title: {title}")
+                        logger.debug(f"[SmartURLRouter] Extracted authors: {authors}")
+                        logger.debug(f"[SmartURLRouter] Extracted authors_parsed: {authors_parsed}")
+                        logger.debug(f"[SmartURLRouter] Extracted date: {date}")
+                        logger.debug(f"[SmartURLRouter] Extracted publication: {publication}")
                     
                     # Create metadata object with the authors_parsed from Google News
                     class Metadata:
@@ -437,7 +444,7 @@ class SmartURLRouter:
                     
                     # AI AUTHOR FALLBACK: If we got title but no authors, use AI
                     if metadata.title and not metadata.authors and AI_AUTHOR_FALLBACK:
-                        print(f"[SmartURLRouter] Title found but no authors - trying AI fallback for: {url[:60]}...")
+                        logger.debug(f"[SmartURLRouter] Title found but no authors - trying AI fallback for: {url[:60]}...")
                         try:
                             ai_result = lookup_newspaper_url(url, verify=False)  # No verification needed, just author extraction
                             if ai_result and ai_result.authors:
@@ -446,31 +453,31 @@ class SmartURLRouter:
                                 if hasattr(ai_result, 'authors_parsed') and ai_result.authors_parsed:
                                     metadata.authors_parsed = ai_result.authors_parsed
                                 metadata.method_used += '+ai_author'
-                                print(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
+                                logger.debug(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
                                 # Also grab date if AI found it and we didn't
                                 if not metadata.date and ai_result.date:
                                     metadata.date = ai_result.date
                             else:
-                                print(f"[SmartURLRouter] ✗ AI returned no authors for: {url[:60]}")
+                                logger.warning(f"[SmartURLRouter] ✗ AI returned no authors for: {url[:60]}")
                         except Exception as ai_err:
-                            print(f"[SmartURLRouter] ✗ AI author fallback FAILED: {ai_err}")
+                            logger.warning(f"[SmartURLRouter] ✗ AI author fallback FAILED: {ai_err}")
                     
                     if self.debug:
-                        print(f"[SmartURLRouter] ✓ SerpAPI found: {metadata.title[:50] if metadata.title else 'N/A'}")
-                        print(f"[SmartURLRouter] is_complete: {metadata.is_complete()}")
+                        logger.debug(f"[SmartURLRouter] ✓ SerpAPI found: {metadata.title[:50] if metadata.title else 'N/A'}")
+                        logger.debug(f"[SmartURLRouter] is_complete: {metadata.is_complete()}")
                     
                     return metadata
         
         except Exception as e:
             if self.debug:
-                print(f"[SmartURLRouter] SerpAPI error: {e}")
+                logger.warning(f"[SmartURLRouter] SerpAPI error: {e}")
             import traceback
             if self.debug:
                 traceback.print_exc()
         
         # Failed - return empty to trigger fallback
         if self.debug:
-            print(f"[SmartURLRouter] SerpAPI failed, returning empty metadata")
+            logger.warning(f"[SmartURLRouter] SerpAPI failed, returning empty metadata")
         return self._empty_metadata(url)
     
     def _search_thenewsapi(self, url: str):
@@ -480,8 +487,14 @@ class SmartURLRouter:
         FREE tier: 100 requests/day
         Endpoint: https://api.thenewsapi.com/v1/news/all
         """
+        slot = self.quota.reserve('thenewsapi')
+        if slot is None:
+            if self.debug:
+                logger.debug(f"[SmartURLRouter] TheNewsAPI daily quota used up")
+            return self._empty_metadata(url)
+        
         if self.debug:
-            print(f"[SmartURLRouter] Trying TheNewsAPI: {url[:60]}")
+            logger.debug(f"[SmartURLRouter] Trying TheNewsAPI: {url[:60]}")
         
         try:
             # Extract domain for search
@@ -494,11 +507,16 @@ class SmartURLRouter:
                 'limit': 1,
             }
             
-            response = requests.get(
-                'https://api.thenewsapi.com/v1/news/all',
-                params=params,
-                timeout=10
-            )
+            try:
+                response = http_client.get(
+                    'https://api.thenewsapi.com/v1/news/all',
+                    params=params,
+                    timeout=10
+                )
+            except requests.RequestException:
+                slot.release()
+                raise
+            slot.commit()
             
             # Log the call (free API, no cost)
             log_api_call('thenewsapi', query=url, function='url_metadata')
@@ -507,7 +525,7 @@ class SmartURLRouter:
                 data = response.json()
                 
                 if self.debug:
-                    print(f"[SmartURLRouter] TheNewsAPI status: {response.status_code}")
+                    logger.debug(f"[SmartURLRouter] TheNewsAPI status: {response.status_code}")
                 
                 # Check for results
                 articles = data.get('data', [])
@@ -538,9 +556,9 @@ class SmartURLRouter:
                             pass
                     
                     if self.debug:
-                        print(f"[SmartURLRouter] TheNewsAPI found: {title[:50] if title else 'N/A'}")
-                        print(f"[SmartURLRouter] Authors: {authors}")
-                        print(f"[SmartURLRouter] Publication: {publication}")
+                        logger.debug(f"[SmartURLRouter] TheNewsAPI found: {title[:50] if title else 'N/A'}")
+                        logger.debug(f"[SmartURLRouter] Authors: {authors}")
+                        logger.debug(f"[SmartURLRouter] Publication: {publication}")
                     
                     # Create metadata object
                     class Metadata:
@@ -560,7 +578,7 @@ class SmartURLRouter:
                     
                     # AI AUTHOR FALLBACK: If we got title but no authors, use AI
                     if metadata.title and not metadata.authors and AI_AUTHOR_FALLBACK:
-                        print(f"[SmartURLRouter] TheNewsAPI: Title found but no authors - trying AI fallback...")
+                        logger.debug(f"[SmartURLRouter] TheNewsAPI: Title found but no authors - trying AI fallback...")
                         try:
                             ai_result = lookup_newspaper_url(url, verify=False)
                             if ai_result and ai_result.authors:
@@ -569,17 +587,17 @@ class SmartURLRouter:
                                 if hasattr(ai_result, 'authors_parsed') and ai_result.authors_parsed:
                                     metadata.authors_parsed = ai_result.authors_parsed
                                 metadata.method_used += '+ai_author'
-                                print(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
+                                logger.debug(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
                             else:
-                                print(f"[SmartURLRouter] ✗ TheNewsAPI AI returned no authors")
+                                logger.warning(f"[SmartURLRouter] ✗ TheNewsAPI AI returned no authors")
                         except Exception as ai_err:
-                            print(f"[SmartURLRouter] ✗ TheNewsAPI AI fallback FAILED: {ai_err}")
+                            logger.warning(f"[SmartURLRouter] ✗ TheNewsAPI AI fallback FAILED: {ai_err}")
                     
                     return metadata
         
         except Exception as e:
             if self.debug:
-                print(f"[SmartURLRouter] TheNewsAPI error: {e}")
+                logger.warning(f"[SmartURLRouter] TheNewsAPI error: {e}")
         
         return self._empty_metadata(url)
     
@@ -590,8 +608,14 @@ class SmartURLRouter:
         FREE tier: 200 requests/day
         Endpoint: https://newsdata.io/api/1/news
         """
+        slot = self.quota.reserve('newsdata')
+        if slot is None:
+            if self.debug:
+                logger.debug(f"[SmartURLRouter] NewsData daily quota used up")
+            return self._empty_metadata(url)
+        
         if self.debug:
-            print(f"[SmartURLRouter] Trying NewsData: {url[:60]}")
+            logger.debug(f"[SmartURLRouter] Trying NewsData: {url[:60]}")
         
         try:
             # NewsData search by URL pattern
@@ -600,11 +624,16 @@ class SmartURLRouter:
                 'qInUrl': url,  # Search URLs containing this pattern
             }
             
-            response = requests.get(
-                'https://newsdata.io/api/1/news',
-                params=params,
-                timeout=10
-            )
+            try:
+                response = http_client.get(
+                    'https://newsdata.io/api/1/news',
+                    params=params,
+                    timeout=10
+                )
+            except requests.RequestException:
+                slot.release()
+                raise
+            slot.commit()
             
             # Log the call (free API, no cost)
             log_api_call('newsdata', query=url, function='url_metadata')
@@ -613,7 +642,7 @@ class SmartURLRouter:
                 data = response.json()
                 
                 if self.debug:
-                    print(f"[SmartURLRouter] NewsData status: {response.status_code}")
+                    logger.debug(f"[SmartURLRouter] NewsData status: {response.status_code}")
                 
                 # Check for results
                 results = data.get('results', [])
@@ -644,9 +673,9 @@ class SmartURLRouter:
                             pass
                     
                     if self.debug:
-                        print(f"[SmartURLRouter] NewsData found: {title[:50] if title else 'N/A'}")
-                        print(f"[SmartURLRouter] Authors: {authors}")
-                        print(f"[SmartURLRouter] Publication: {publication}")
+                        logger.debug(f"[SmartURLRouter] NewsData found: {title[:50] if title else 'N/A'}")
+                        logger.debug(f"[SmartURLRouter] Authors: {authors}")
+                        logger.debug(f"[SmartURLRouter] Publication: {publication}")
                     
                     # Create metadata object
                     class Metadata:
@@ -666,7 +695,7 @@ class SmartURLRouter:
                     
                     # AI AUTHOR FALLBACK: If we got title but no authors, use AI
                     if metadata.title and not metadata.authors and AI_AUTHOR_FALLBACK:
-                        print(f"[SmartURLRouter] NewsData: Title found but no authors - trying AI fallback...")
+                        logger.debug(f"[SmartURLRouter] NewsData: Title found but no authors - trying AI fallback...")
                         try:
                             ai_result = lookup_newspaper_url(url, verify=False)
                             if ai_result and ai_result.authors:
@@ -675,17 +704,17 @@ class SmartURLRouter:
                                 if hasattr(ai_result, 'authors_parsed') and ai_result.authors_parsed:
                                     metadata.authors_parsed = ai_result.authors_parsed
                                 metadata.method_used += '+ai_author'
-                                print(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
+                                logger.debug(f"[SmartURLRouter] ✓ AI found authors: {metadata.authors}")
                             else:
-                                print(f"[SmartURLRouter] ✗ NewsData AI returned no authors")
+                                logger.warning(f"[SmartURLRouter] ✗ NewsData AI returned no authors")
                         except Exception as ai_err:
-                            print(f"[SmartURLRouter] ✗ NewsData AI fallback FAILED: {ai_err}")
+                            logger.warning(f"[SmartURLRouter] ✗ NewsData AI fallback FAILED: {ai_err}")
                     
                     return metadata
         
         except Exception as e:
             if self.debug:
-                print(f"[SmartURLRouter] NewsData error: {e}")
+                logger.warning(f"[SmartURLRouter] NewsData error: {e}")
         
         return self._empty_metadata(url)
     
@@ -25,7 +25,7 @@ Features:
 
 import re
 import difflib
-import requests
+import http_client
 import time
 from typing import Optional, List, Dict
 from urllib.parse import urlparse, unquote
@@ -33,6 +33,9 @@ from urllib.parse import urlparse, unquote
 from engines.base import SearchEngine
 from models import SourceComponents, CitationType
 from config import COURTLISTENER_API_KEY
+from tracing import get_logger
+
+logger = get_logger('engines.superlegal')
 
 
 # =============================================================================
@@ -536,7 +539,7 @@ class CourtListenerEngine(SearchEngine):
                 'order_by': 'score desc',
                 'format': 'json'
             }
-            response = requests.get(
+            response = http_client.get(
                 self.base_url,
                 params=params,
                 headers=self.headers,
@@ -545,7 +548,7 @@ class CourtListenerEngine(SearchEngine):
             if response.status_code == 200:
                 return response.json().get('results', [])
         except Exception as e:
-            print(f"[CourtListener] Error: {e}")
+            logger.warning(f"[CourtListener] Error: {e}")
         return []
     
     def _to_components(self, item: dict, query: str) -> Optional[SourceComponents]:
@@ -5,6 +5,7 @@ Integrates with actual search/fetch APIs
 
 from typing import Dict, List, Optional
 import requests
+import http_client
 from bs4 import BeautifulSoup
 import json
 import re
@@ -53,8 +54,7 @@ class FetchClient:
     
     def __init__(self, timeout: int = 10):
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = http_client.new_session({
             'User-Agent': 'CitateGenie/1.0 (Citation Processor; +https://citategenie.com)'
         })
     
@@ -270,7 +270,7 @@ class CrossRefClient:
         doi = doi.replace('https://doi.org/', '').replace('http://doi.org/', '')
         
         try:
-            response = requests.get(f"{self.BASE_URL}{doi}")
+            response = http_client.get(f"{self.BASE_URL}{doi}")
             response.raise_for_status()
             data = response.json()
             return data.get('message', {})
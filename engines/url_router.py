@@ -11,6 +11,9 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from urllib.parse import urlparse
 import re
+from tracing import get_logger
+
+logger = get_logger('engines.url_router')
 
 
 @dataclass
@@ -232,7 +235,7 @@ class URLRouter:
                 crossref_data = self.crossref.lookup(url)
                 return self._parse_crossref(crossref_data, metadata)
             except Exception as e:
-                print(f"CrossRef lookup failed: {e}")
+                logger.warning(f"CrossRef lookup failed: {e}")
         
         # Fall back to search
         return self._search_url(url, metadata)
@@ -281,7 +284,7 @@ class URLRouter:
                         metadata.metadata_sources['authors'] = 'search_snippet'
         
         except Exception as e:
-            print(f"Search failed: {e}")
+            logger.warning(f"Search failed: {e}")
         
         return metadata
     
@@ -310,7 +313,7 @@ class URLRouter:
                 metadata = self._parse_opengraph(html, metadata)
         
         except Exception as e:
-            print(f"Fetch failed: {e}")
+            logger.warning(f"Fetch failed: {e}")
         
         return metadata
     
@@ -335,7 +338,7 @@ class URLRouter:
             metadata = self._merge_ai_response(response, metadata)
         
         except Exception as e:
-            print(f"AI extraction failed: {e}")
+            logger.warning(f"AI extraction failed: {e}")
         
         return metadata
     
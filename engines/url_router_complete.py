@@ -9,6 +9,9 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from urllib.parse import urlparse
 import re
+from tracing import get_logger
+
+logger = get_logger('engines.url_router_complete')
 
 
 # ============================================================================
@@ -113,8 +116,8 @@ class URLRouter:
         domain = self._extract_domain(url)
         
         if self.debug:
-            print(f"\n[DEBUG] Resolving: {url}")
-            print(f"[DEBUG] Domain: {domain}")
+            logger.debug(f"\n[DEBUG] Resolving: {url}")
+            logger.debug(f"[DEBUG] Domain: {domain}")
         
         # Route based on domain type
         if self._is_doi(url):
@@ -131,7 +134,7 @@ class URLRouter:
             self.stats['success'] += 1
         
         if self.debug:
-            print(f"[DEBUG] Result: {metadata.method_used}, complete={metadata.is_complete()}")
+            logger.debug(f"[DEBUG] Result: {metadata.method_used}, complete={metadata.is_complete()}")
         
         return metadata
     
@@ -186,8 +189,8 @@ class URLRouter:
         doi = url.replace('https://doi.org/', '').replace('http://dx.doi.org/', '')
         
         try:
-            import requests
-            response = requests.get(f"https://api.crossref.org/works/{doi}")
+            import http_client
+            response = http_client.get(f"https://api.crossref.org/works/{doi}")
             if response.status_code == 200:
                 data = response.json()['message']
                 
@@ -211,7 +214,7 @@ class URLRouter:
                 metadata.confidence = 1.0
         except Exception as e:
             if self.debug:
-                print(f"[DEBUG] CrossRef failed: {e}")
+                logger.warning(f"[DEBUG] CrossRef failed: {e}")
             # Fall back to search
             metadata = self._try_search(url, metadata)
         
@@ -226,7 +229,7 @@ class URLRouter:
         
         if not self.search_key:
             if self.debug:
-                print("[DEBUG] Search skipped (no API key)")
+                logger.debug("[DEBUG] Search skipped (no API key)")
             return metadata
         
         self.stats['search'] += 1
@@ -236,7 +239,7 @@ class URLRouter:
             query = self._build_search_query(url)
             
             if self.debug:
-                print(f"[DEBUG] Search query: {query}")
+                logger.debug(f"[DEBUG] Search query: {query}")
             
             # TODO: Replace with your actual search API call
             # Example structure of what you'd get back:
@@ -260,7 +263,7 @@ class URLRouter:
         
         except Exception as e:
             if self.debug:
-                print(f"[DEBUG] Search failed: {e}")
+                logger.warning(f"[DEBUG] Search failed: {e}")
         
         return metadata
     
@@ -270,10 +273,10 @@ class URLRouter:
         self.stats['fetch'] += 1
         
         try:
-            import requests
+            import http_client
             from bs4 import BeautifulSoup
             
-            response = requests.get(url, timeout=10, headers={
+            response = http_client.get(url, timeout=10, headers={
                 'User-Agent': 'CitateGenie/1.0'
             })
             
@@ -309,7 +312,7 @@ class URLRouter:
         
         except Exception as e:
             if self.debug:
-                print(f"[DEBUG] Fetch failed: {e}")
+                logger.warning(f"[DEBUG] Fetch failed: {e}")
         
         return metadata
     
@@ -318,7 +321,7 @@ class URLRouter:
         
         if not self.ai_key:
             if self.debug:
-                print("[DEBUG] AI skipped (no API key)")
+                logger.debug("[DEBUG] AI skipped (no API key)")
             return metadata
         
         self.stats['ai'] += 1
@@ -344,14 +347,14 @@ Return ONLY valid JSON with missing fields:
             
             # For now, placeholder
             if self.debug:
-                print("[DEBUG] AI extraction would run here")
+                logger.debug("[DEBUG] AI extraction would run here")
             
             metadata.method_used = 'ai'
             metadata.confidence = 0.7
         
         except Exception as e:
             if self.debug:
-                print(f"[DEBUG] AI failed: {e}")
+                logger.warning(f"[DEBUG] AI failed: {e}")
         
         return metadata
     
@@ -17,6 +17,9 @@ from urllib.parse import urlparse, parse_qs
 
 from engines.base import SearchEngine
 from models import SourceComponents, CitationType
+from tracing import get_logger
+
+logger = get_logger('engines.video')
 
 
 class YouTubeEngine(SearchEngine):
@@ -70,7 +73,7 @@ class YouTubeEngine(SearchEngine):
             return None
         
         video_id = video_id.strip()
-        print(f"[{self.name}] Fetching video: {video_id}")
+        logger.debug(f"[{self.name}] Fetching video: {video_id}")
         
         # Build the video URL for oEmbed
         video_url = f"https://www.youtube.com/watch?v={video_id}"
@@ -88,7 +91,7 @@ class YouTubeEngine(SearchEngine):
             data = response.json()
             return self._normalize(data, video_url, video_id)
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def _extract_video_id(self, text: str) -> Optional[str]:
@@ -201,7 +204,7 @@ class VimeoEngine(SearchEngine):
             return None
         
         video_id = video_id.strip()
-        print(f"[{self.name}] Fetching video: {video_id}")
+        logger.debug(f"[{self.name}] Fetching video: {video_id}")
         
         video_url = f"https://vimeo.com/{video_id}"
         
@@ -217,7 +220,7 @@ class VimeoEngine(SearchEngine):
             data = response.json()
             return self._normalize(data, video_url, video_id)
         except Exception as e:
-            print(f"[{self.name}] Parse error: {e}")
+            logger.warning(f"[{self.name}] Parse error: {e}")
             return None
     
     def _extract_video_id(self, text: str) -> Optional[str]:
@@ -11,17 +11,25 @@ WATERFALL STRATEGY:
 
 Expected cost reduction: 90%+ 
 (Most queries resolved by free tier, SerpAPI only for edge cases)
+
+Free-tier usage is counted in the shared quota ledger (quota_ledger.py), so
+every worker and container on a host draws on the same daily allowance,
+and the two free APIs are tried in order of remaining capacity.
 """
 
 import requests
+import http_client
 import feedparser
 import re
 from typing import Optional, Dict
 from urllib.parse import urlparse, quote_plus
-from datetime import datetime
 
 from config import SERPAPI_KEY, THENEWSAPI_KEY, NEWSDATA_KEY
 from cost_tracker import log_api_call
+from quota_ledger import get_quota_ledger
+from tracing import get_logger
+
+logger = get_logger('engines.waterfall_news_resolver')
 
 
 class WaterfallNewsResolver:
@@ -34,22 +42,21 @@ class WaterfallNewsResolver:
     def __init__(self, debug=False):
         self.debug = debug
         
-        # Track daily usage for rate-limited free APIs
-        self.thenewsapi_calls_today = 0
-        self.newsdata_calls_today = 0
-        self.last_reset = datetime.now().date()
+        # Daily usage of the rate-limited free APIs is shared across
+        # processes (see quota_ledger)
+        self.quota = get_quota_ledger()
         
         # Check which APIs are available
         self.has_serpapi = bool(SERPAPI_KEY)
-        self.has_thenewsapi = bool(THENEWSAPI_KEY) if 'THENEWSAPI_KEY' in dir() else False
-        self.has_newsdata = bool(NEWSDATA_KEY) if 'NEWSDATA_KEY' in dir() else False
+        self.has_thenewsapi = bool(THENEWSAPI_KEY)
+        self.has_newsdata = bool(NEWSDATA_KEY)
         
         if self.debug:
-            print(f"[WaterfallNews] Available APIs:")
-            print(f"  - Google News RSS: Always available (FREE)")
-            print(f"  - The News API: {self.has_thenewsapi} (FREE 100/day)")
-            print(f"  - NewsData.io: {self.has_newsdata} (FREE 200/day)")
-            print(f"  - SerpAPI: {self.has_serpapi} (PAID $0.01/call)")
+            logger.debug(f"[WaterfallNews] Available APIs:")
+            logger.debug(f"  - Google News RSS: Always available (FREE)")
+            logger.debug(f"  - The News API: {self.has_thenewsapi} (FREE 100/day)")
+            logger.debug(f"  - NewsData.io: {self.has_newsdata} (FREE 200/day)")
+            logger.debug(f"  - SerpAPI: {self.has_serpapi} (PAID $0.01/call)")
     
     def resolve(self, url: str):
         """
@@ -57,11 +64,8 @@ class WaterfallNewsResolver:
         
         Returns metadata object compatible with SmartURLRouter.
         """
-        # Reset daily counters if new day
-        self._check_daily_reset()
-        
         if self.debug:
-            print(f"[WaterfallNews] Resolving: {url[:60]}...")
+            logger.debug(f"[WaterfallNews] Resolving: {url[:60]}...")
         
         # Extract search parameters from URL
         domain = self._extract_domain(url)
@@ -69,7 +73,7 @@ class WaterfallNewsResolver:
         
         if not keywords:
             if self.debug:
-                print(f"[WaterfallNews] No keywords extracted, will use direct HTML scraping")
+                logger.debug(f"[WaterfallNews] No keywords extracted, will use direct HTML scraping")
             return self._empty_metadata(url)
         
         # TIER 1: Google News RSS (FREE, unlimited, ALWAYS TRY FIRST)
@@ -77,15 +81,14 @@ class WaterfallNewsResolver:
         if result and result.is_complete():
             return result
         
-        # TIER 2: The News API (FREE, 100/day limit)
-        if self.has_thenewsapi and self.thenewsapi_calls_today < 100:
-            result = self._try_thenewsapi(url, keywords)
-            if result and result.is_complete():
-                return result
-        
-        # TIER 3: NewsData.io (FREE, 200/day limit)
-        if self.has_newsdata and self.newsdata_calls_today < 200:
-            result = self._try_newsdata(url, keywords)
+        # TIERS 2-3: The News API (FREE, 100/day) and NewsData.io (FREE, 200/day),
+        # whichever has more of today's shared quota left goes first
+        free_tiers = {
+            'thenewsapi': (self.has_thenewsapi, self._try_thenewsapi),
+            'newsdata': (self.has_newsdata, self._try_newsdata),
+        }
+        for provider in self.quota.by_capacity([p for p, (available, _) in free_tiers.items() if available]):
+            result = free_tiers[provider][1](url, keywords)
             if result and result.is_complete():
                 return result
         
@@ -95,14 +98,14 @@ class WaterfallNewsResolver:
         # TIER 5: SerpAPI (PAID, last resort)
         if self.has_serpapi:
             if self.debug:
-                print(f"[WaterfallNews] All free sources exhausted, falling back to SerpAPI")
+                logger.debug(f"[WaterfallNews] All free sources exhausted, falling back to SerpAPI")
             result = self._try_serpapi(url, domain, keywords)
             if result and result.is_complete():
                 return result
         
         # All methods failed
         if self.debug:
-            print(f"[WaterfallNews] All resolution methods failed")
+            logger.warning(f"[WaterfallNews] All resolution methods failed")
         return self._empty_metadata(url)
     
     def _try_google_news_rss(self, url: str, domain: str, keywords: str):
@@ -113,7 +116,7 @@ class WaterfallNewsResolver:
         Example: site:washingtonpost.com economy great year election
         """
         if self.debug:
-            print(f"[WaterfallNews] Trying Google News RSS (FREE)...")
+            logger.debug(f"[WaterfallNews] Trying Google News RSS (FREE)...")
         
         try:
             # Build Google News RSS search URL
@@ -121,10 +124,10 @@ class WaterfallNewsResolver:
             rss_url = f"https://news.google.com/rss/search?q={quote_plus(search_query)}&hl=en-US&gl=US&ceid=US:en"
             
             if self.debug:
-                print(f"[WaterfallNews] RSS query: {search_query}")
+                logger.debug(f"[WaterfallNews] RSS query: {search_query}")
             
             # Fetch RSS feed
-            response = requests.get(rss_url, timeout=10)
+            response = http_client.get(rss_url, timeout=10)
             
             # Log as free (no cost)
             log_api_call('google_news_rss', query=search_query, function='news_metadata', cost=0.0)
@@ -134,7 +137,7 @@ class WaterfallNewsResolver:
                 feed = feedparser.parse(response.content)
                 
                 if self.debug:
-                    print(f"[WaterfallNews] RSS returned {len(feed.entries)} entries")
+                    logger.debug(f"[WaterfallNews] RSS returned {len(feed.entries)} entries")
                 
                 if feed.entries:
                     entry = feed.entries[0]
@@ -165,10 +168,10 @@ class WaterfallNewsResolver:
                     authors = self._extract_authors_from_snippet(snippet)
                     
                     if self.debug:
-                        print(f"[WaterfallNews] ✓ Google RSS found: {title[:50]}")
-                        print(f"[WaterfallNews]   Source: {source}")
-                        print(f"[WaterfallNews]   Authors: {authors}")
-                        print(f"[WaterfallNews]   Date: {date}")
+                        logger.debug(f"[WaterfallNews] ✓ Google RSS found: {title[:50]}")
+                        logger.debug(f"[WaterfallNews]   Source: {source}")
+                        logger.debug(f"[WaterfallNews]   Authors: {authors}")
+                        logger.debug(f"[WaterfallNews]   Date: {date}")
                     
                     # Create metadata object
                     class Metadata:
@@ -187,7 +190,7 @@ class WaterfallNewsResolver:
         
         except Exception as e:
             if self.debug:
-                print(f"[WaterfallNews] Google RSS error: {e}")
+                logger.warning(f"[WaterfallNews] Google RSS error: {e}")
         
         return None
     
@@ -197,8 +200,12 @@ class WaterfallNewsResolver:
         
         Requires API key: https://www.thenewsapi.com/
         """
+        slot = self.quota.reserve('thenewsapi')
+        if slot is None:
+            return None
+        
         if self.debug:
-            print(f"[WaterfallNews] Trying The News API (FREE 100/day, used: {self.thenewsapi_calls_today})...")
+            logger.debug(f"[WaterfallNews] Trying The News API (FREE 100/day, remaining: {self.quota.remaining('thenewsapi')})...")
         
         try:
             # The News API search endpoint
@@ -211,8 +218,12 @@ class WaterfallNewsResolver:
                 'limit': 1
             }
             
-            response = requests.get(api_url, params=params, timeout=10)
-            self.thenewsapi_calls_today += 1
+            try:
+                response = http_client.get(api_url, params=params, timeout=10)
+            except requests.RequestException:
+                slot.release()
+                raise
+            slot.commit()
             
             # Log as free (within free tier)
             log_api_call('thenewsapi', query=keywords, function='news_metadata', cost=0.0)
@@ -222,7 +233,7 @@ class WaterfallNewsResolver:
                 articles = data.get('data', [])
                 
                 if self.debug:
-                    print(f"[WaterfallNews] The News API returned {len(articles)} articles")
+                    logger.debug(f"[WaterfallNews] The News API returned {len(articles)} articles")
                 
                 if articles:
                     article = articles[0]
@@ -234,7 +245,7 @@ class WaterfallNewsResolver:
                     authors = self._extract_authors_from_snippet(snippet)
                     
                     if self.debug:
-                        print(f"[WaterfallNews] ✓ The News API found: {title[:50]}")
+                        logger.debug(f"[WaterfallNews] ✓ The News API found: {title[:50]}")
                     
                     class Metadata:
                         def __init__(self):
@@ -252,7 +263,7 @@ class WaterfallNewsResolver:
         
         except Exception as e:
             if self.debug:
-                print(f"[WaterfallNews] The News API error: {e}")
+                logger.warning(f"[WaterfallNews] The News API error: {e}")
         
         return None
     
@@ -262,8 +273,12 @@ class WaterfallNewsResolver:
         
         Requires API key: https://newsdata.io/
         """
+        slot = self.quota.reserve('newsdata')
+        if slot is None:
+            return None
+        
         if self.debug:
-            print(f"[WaterfallNews] Trying NewsData.io (FREE 200/day, used: {self.newsdata_calls_today})...")
+            logger.debug(f"[WaterfallNews] Trying NewsData.io (FREE 200/day, remaining: {self.quota.remaining('newsdata')})...")
         
         try:
             # NewsData.io search endpoint
@@ -276,8 +291,12 @@ class WaterfallNewsResolver:
                 'size': 1
             }
             
-            response = requests.get(api_url, params=params, timeout=10)
-            self.newsdata_calls_today += 1
+            try:
+                response = http_client.get(api_url, params=params, timeout=10)
+            except requests.RequestException:
+                slot.release()
+                raise
+            slot.commit()
             
             # Log as free (within free tier)
             log_api_call('newsdata', query=keywords, function='news_metadata', cost=0.0)
@@ -287,7 +306,7 @@ class WaterfallNewsResolver:
                 articles = data.get('results', [])
                 
                 if self.debug:
-                    print(f"[WaterfallNews] NewsData.io returned {len(articles)} articles")
+                    logger.debug(f"[WaterfallNews] NewsData.io returned {len(articles)} articles")
                 
                 if articles:
                     article = articles[0]
@@ -299,7 +318,7 @@ class WaterfallNewsResolver:
                     authors = article.get('creator', []) or self._extract_authors_from_snippet(snippet)
                     
                     if self.debug:
-                        print(f"[WaterfallNews] ✓ NewsData.io found: {title[:50]}")
+                        logger.debug(f"[WaterfallNews] ✓ NewsData.io found: {title[:50]}")
                     
                     class Metadata:
                         def __init__(self):
@@ -317,7 +336,7 @@ class WaterfallNewsResolver:
         
         except Exception as e:
             if self.debug:
-                print(f"[WaterfallNews] NewsData.io error: {e}")
+                logger.warning(f"[WaterfallNews] NewsData.io error: {e}")
         
         return None
     
@@ -328,7 +347,7 @@ class WaterfallNewsResolver:
         Only called as last resort when all free sources fail.
         """
         if self.debug:
-            print(f"[WaterfallNews] Trying SerpAPI Google News (PAID $0.01)...")
+            logger.debug(f"[WaterfallNews] Trying SerpAPI Google News (PAID $0.01)...")
         
         try:
             # Use Google News engine (better for news than regular Google)
@@ -338,7 +357,7 @@ class WaterfallNewsResolver:
                 'api_key': SERPAPI_KEY,
             }
             
-            response = requests.get(
+            response = http_client.get(
                 'https://serpapi.com/search',
                 params=params,
                 timeout=10
@@ -352,7 +371,7 @@ class WaterfallNewsResolver:
                 results = data.get('news_results', [])
                 
                 if self.debug:
-                    print(f"[WaterfallNews] SerpAPI returned {len(results)} results")
+                    logger.debug(f"[WaterfallNews] SerpAPI returned {len(results)} results")
                 
                 if results:
                     result = results[0]
@@ -364,7 +383,7 @@ class WaterfallNewsResolver:
                     authors = self._extract_authors_from_snippet(snippet)
                     
                     if self.debug:
-                        print(f"[WaterfallNews] ✓ SerpAPI found: {title[:50]}")
+                        logger.debug(f"[WaterfallNews] ✓ SerpAPI found: {title[:50]}")
                     
                     class Metadata:
                         def __init__(self):
@@ -382,7 +401,7 @@ class WaterfallNewsResolver:
         
         except Exception as e:
             if self.debug:
-                print(f"[WaterfallNews] SerpAPI error: {e}")
+                logger.warning(f"[WaterfallNews] SerpAPI error: {e}")
         
         return None
     
@@ -478,21 +497,12 @@ class WaterfallNewsResolver:
         
         return EmptyMetadata()
     
-    def _check_daily_reset(self):
-        """Reset daily API call counters at midnight."""
-        today = datetime.now().date()
-        if today != self.last_reset:
-            if self.debug:
-                print(f"[WaterfallNews] Daily reset: The News API and NewsData.io counters reset to 0")
-            self.thenewsapi_calls_today = 0
-            self.newsdata_calls_today = 0
-            self.last_reset = today
-    
     def get_stats(self):
-        """Get usage statistics."""
+        """Get usage statistics (shared across processes, current UTC day)."""
+        usage = self.quota.stats()
         return {
-            'thenewsapi_used_today': self.thenewsapi_calls_today,
-            'newsdata_used_today': self.newsdata_calls_today,
-            'thenewsapi_remaining': 100 - self.thenewsapi_calls_today,
-            'newsdata_remaining': 200 - self.newsdata_calls_today,
+            'thenewsapi_used_today': usage['thenewsapi']['used'],
+            'newsdata_used_today': usage['newsdata']['used'],
+            'thenewsapi_remaining': usage['thenewsapi']['remaining'],
+            'newsdata_remaining': usage['newsdata']['remaining'],
         }
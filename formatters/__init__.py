@@ -2,17 +2,40 @@
 citeflex/formatters/__init__.py
 
 Citation formatters package.
+
+Style formatters are re-exported lazily; get_formatter() already imports
+the one it needs, so importing the package only loads formatters.base.
+get_cached_formatter() (formatters.cache) memoizes format()/format_short().
 """
 
+import importlib
+
 from formatters.base import BaseFormatter, get_formatter
-from formatters.chicago import ChicagoFormatter
-from formatters.apa import APAFormatter
-from formatters.mla import MLAFormatter
-from formatters.legal import BluebookFormatter, OSCOLAFormatter
+from formatters.cache import get_cached_formatter
+
+# Re-exported name -> defining submodule (imported on first access)
+_LAZY_EXPORTS = {
+    'ChicagoFormatter': 'formatters.chicago',
+    'APAFormatter': 'formatters.apa',
+    'MLAFormatter': 'formatters.mla',
+    'BluebookFormatter': 'formatters.legal',
+    'OSCOLAFormatter': 'formatters.legal',
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module 'formatters' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'BaseFormatter',
     'get_formatter',
+    'get_cached_formatter',
     'ChicagoFormatter',
     'APAFormatter',
     'MLAFormatter',
@@ -0,0 +1,200 @@
+"""
+citeflex/formatters/cache.py
+
+Process-wide memo cache for formatted citations.
+
+Formatters are pure functions of a SourceComponents' fields, but the
+workbench re-formats the same components every time the user switches an
+option or style, and the author-date builder re-formats every bibliography
+entry when one changes. Results are cached here under:
+
+    (formatter class, formatter code version, method, components key)
+
+- components key: the values of every SourceComponents field that can
+  affect output (raw_data, raw_source, source_engine and confidence are
+  ignored) as one hashable tuple, so equal components from different
+  sessions share entries and distinct ones can never collide
+- formatter code version: hash of the source files of the formatter class
+  and its bases (plus FORMAT_CACHE_VERSION), so a deploy that changes a
+  formatter never serves output from the old code
+- styles resolving to the same formatter ("Chicago", "Turabian") share
+  entries
+- bounded LRU (FORMAT_CACHE_SIZE entries, default 5000)
+
+Usage:
+    from formatters import get_cached_formatter
+
+    formatter = get_cached_formatter(style)
+    formatted = formatter.format(components)       # cached
+    short = formatter.format_short(components)     # cached
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+"""
+
+import dataclasses
+import hashlib
+import inspect
+import operator
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict
+
+from formatters.base import get_formatter
+from models import SourceComponents
+
+# Bump to drop every cached result (e.g. after a models.py change)
+FORMAT_CACHE_VERSION = 1
+
+# Max cached (formatter, method, components) results
+FORMAT_CACHE_SIZE = int(os.environ.get('FORMAT_CACHE_SIZE', '5000'))
+
+# Fields that never reach formatted output
+_IGNORED_FIELDS = frozenset({'_raw_data', 'raw_source', 'source_engine', 'confidence'})
+
+# List-valued fields, keyed separately (lists are not hashable)
+_LIST_FIELDS = ('authors', 'authors_parsed')
+
+_SCALAR_FIELDS = tuple(
+    f.name for f in dataclasses.fields(SourceComponents)
+    if f.name not in _IGNORED_FIELDS and f.name not in _LIST_FIELDS
+)
+_get_scalars = operator.attrgetter(*_SCALAR_FIELDS)
+
+
+def components_key(metadata: SourceComponents) -> tuple:
+    """Hashable key of the fields of ``metadata`` that formatting reads."""
+    key = (
+        _get_scalars(metadata),
+        tuple(metadata.authors or ()),
+        tuple(tuple(author.items()) for author in metadata.authors_parsed or ()),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        # A field holding an unexpected container: key on its text form
+        key = (repr(key),)
+    return key
+
+
+@lru_cache(maxsize=None)
+def formatter_version(formatter_cls: type) -> str:
+    """Hash of the source of ``formatter_cls`` and its formatter base classes."""
+    digest = hashlib.blake2b(str(FORMAT_CACHE_VERSION).encode(), digest_size=8)
+    seen = set()
+    for cls in formatter_cls.__mro__:
+        if cls is object:
+            continue
+        try:
+            path = inspect.getsourcefile(cls)
+        except TypeError:
+            path = None
+        if path is None:
+            # No source (builtin / frozen): fall back to the qualified name
+            digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+            continue
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        except OSError:
+            digest.update(path.encode())
+    return digest.hexdigest()
+
+
+class FormatCache:
+    """Thread-safe LRU of formatted strings with hit/miss counters."""
+
+    def __init__(self, max_size: int = FORMAT_CACHE_SIZE):
+        self.max_size = max_size
+        self._items: 'OrderedDict[tuple, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: str) -> None:
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_cache = FormatCache()
+
+
+class CachedFormatter:
+    """
+    Wraps a formatter so format() / format_short() go through the shared
+    cache; every other attribute is the wrapped formatter's.
+    """
+
+    __slots__ = ('formatter', '_prefix')
+
+    def __init__(self, formatter):
+        self.formatter = formatter
+        cls = type(formatter)
+        self._prefix = (f"{cls.__module__}.{cls.__qualname__}", formatter_version(cls))
+
+    def _cached(self, method: str, metadata: SourceComponents) -> str:
+        key = self._prefix + (method, components_key(metadata))
+        value = _cache.get(key)
+        if value is None:
+            value = getattr(self.formatter, method)(metadata)
+            if value is not None:
+                _cache.put(key, value)
+        return value
+
+    def format(self, metadata: SourceComponents) -> str:
+        return self._cached('format', metadata)
+
+    def format_short(self, metadata: SourceComponents) -> str:
+        return self._cached('format_short', metadata)
+
+    def __getattr__(self, name):
+        return getattr(self.formatter, name)
+
+
+def get_cached_formatter(style: str) -> CachedFormatter:
+    """get_formatter(style) with cached format() / format_short()."""
+    return CachedFormatter(get_formatter(style))
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Size and hit rate of the shared format cache."""
+    return _cache.stats()
+
+
+def clear_cache() -> None:
+    _cache.clear()
@@ -0,0 +1,317 @@
+"""
+citeflex/http_client.py
+
+Process-wide pooled HTTP client for every outbound call.
+
+Engines used to get a fresh requests.Session each (and drop it with the
+engine), while books.py, ai_lookup.py, the URL/news routers,
+lambda_processor and email_service called bare ``requests.get/post``, which
+opens and tears down a connection - TCP + TLS handshake - per call. All of
+them now share one connection pool:
+
+    PooledAdapter (one per process)
+        urllib3 PoolManager: up to HTTP_POOL_HOSTS host pools, each keeping
+        up to HTTP_POOL_MAXSIZE keep-alive connections
+    new_session(headers)  - a Session of its own (headers, cookies) that
+                            sends through the shared adapter; for engines
+    get() / post() / request()
+                          - drop-in for requests.get/post on a shared,
+                            cookie-less session
+
+HTTP_POOL_MAXSIZE defaults to 20, the largest worker pool that fans out to a
+single host (lambda_processor's lookup executor); a request beyond that on
+one host opens a non-pooled connection rather than blocking.
+
+DNS: opt-in. The cache replaces socket.getaddrinfo for the whole process,
+so it is never installed as a side effect: an entry point that wants it
+calls install_dns_cache(), which only acts when HTTP_DNS_CACHE_TTL > 0
+(default 0, i.e. off). Successful lookups are then reused for that many
+seconds, so new connections to a known host skip the resolver.
+
+HTTP/2 is not offered: requests/urllib3 speak HTTP/1.1 only, and keep-alive
+pooling already removes the per-call handshake, which was the cost here.
+
+Everything still goes through requests.adapters.HTTPAdapter.send, so the
+cassette layer (engines/cassette.py) keeps working unchanged.
+
+Each send first takes a slot from scheduler.py, which orders calls by
+workload class (interactive > document > background) and user; a shed call
+raises scheduler.Overloaded (a requests.ConnectionError).
+
+Usage:
+    import http_client
+
+    response = http_client.get(url, params=params, timeout=5)
+
+    self._session = http_client.new_session(DEFAULT_HEADERS)
+
+    http_client.pool_stats()   # per-host pool utilization
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: Sends take a scheduler slot (priority classes, fair queuing)
+    2026-10-18 V1.2: DNS cache is opt-in (install_dns_cache), not installed
+                     by get_adapter()
+"""
+
+import os
+import socket
+import threading
+import time
+from http.cookiejar import CookiePolicy
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import scheduler
+
+# Host pools kept by the shared PoolManager (least recently used evicted)
+POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', '32'))
+
+# Keep-alive connections kept per host
+POOL_MAXSIZE = int(os.environ.get('HTTP_POOL_MAXSIZE', '20'))
+
+# Seconds a resolved address is reused once install_dns_cache() is called
+# (0, the default, keeps the system resolver)
+DNS_CACHE_TTL = float(os.environ.get('HTTP_DNS_CACHE_TTL', '0'))
+
+# Cached (host, port, ...) lookups before the DNS cache is reset
+DNS_CACHE_MAX_ENTRIES = 1024
+
+
+# =============================================================================
+# SHARED ADAPTER
+# =============================================================================
+
+class PooledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter shared by every session in the process. Session.close()
+    must not close the shared pools, so close() is a no-op; shutdown()
+    really closes them. Counts requests and errors per host.
+    """
+
+    def __init__(self, pool_connections: int = POOL_HOSTS, pool_maxsize: int = POOL_MAXSIZE):
+        self._counts_lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        super().__init__(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+
+    def send(self, request, **kwargs):
+        host = requests.utils.urlparse(request.url).netloc
+        ticket = scheduler.acquire()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self._count(host, 'errors')
+            raise
+        finally:
+            scheduler.release(ticket)
+        self._count(host, 'requests')
+        return response
+
+    def _count(self, host: str, key: str) -> None:
+        with self._counts_lock:
+            counts = self._counts.get(host)
+            if counts is None:
+                counts = self._counts[host] = {'requests': 0, 'errors': 0}
+            counts[key] += 1
+
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+_adapter: Optional[PooledAdapter] = None
+_adapter_pid: Optional[int] = None
+_shared_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+
+def get_adapter() -> PooledAdapter:
+    """The process's shared adapter (recreated after fork)."""
+    global _adapter, _adapter_pid, _shared_session
+    pid = os.getpid()
+    if _adapter is None or _adapter_pid != pid:
+        with _lock:
+            if _adapter is None or _adapter_pid != pid:
+                # Sockets inherited across fork must not be shared
+                _adapter = PooledAdapter()
+                _adapter_pid = pid
+                _shared_session = None
+    return _adapter
+
+
+def new_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    A Session with its own headers and cookies that sends through the
+    shared connection pool.
+    """
+    session = requests.Session()
+    adapter = get_adapter()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+class _NoCookies(CookiePolicy):
+    """Keeps the shared session as stateless as a bare requests.get()."""
+
+    netscape = True
+    rfc2965 = False
+    hide_cookie2 = False
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+    def domain_return_ok(self, domain, request):
+        return False
+
+    def path_return_ok(self, path, request):
+        return False
+
+
+def get_session() -> requests.Session:
+    """Shared cookie-less session behind get()/post()/request()."""
+    global _shared_session
+    get_adapter()
+    session = _shared_session
+    if session is None:
+        with _lock:
+            if _shared_session is None:
+                session = new_session()
+                session.cookies.set_policy(_NoCookies())
+                _shared_session = session
+            session = _shared_session
+    return session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """requests.request() over the shared pool."""
+    return get_session().request(method, url, **kwargs)
+
+
+def get(url: str, params=None, **kwargs) -> requests.Response:
+    """requests.get() over the shared pool."""
+    return get_session().request('GET', url, params=params, **kwargs)
+
+
+def post(url: str, data=None, json=None, **kwargs) -> requests.Response:
+    """requests.post() over the shared pool."""
+    return get_session().request('POST', url, data=data, json=json, **kwargs)
+
+
+# =============================================================================
+# DNS CACHE
+# =============================================================================
+
+_original_getaddrinfo = socket.getaddrinfo
+_dns_cache: Dict[tuple, tuple] = {}
+_dns_lock = threading.Lock()
+_dns_stats = {'hits': 0, 'misses': 0}
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    key = (host, port, family, type, proto, flags)
+    now = time.monotonic()
+    entry = _dns_cache.get(key)
+    if entry is not None and entry[0] > now:
+        with _dns_lock:
+            _dns_stats['hits'] += 1
+        return list(entry[1])
+
+    result = _original_getaddrinfo(host, port, family, type, proto, flags)
+    with _dns_lock:
+        _dns_stats['misses'] += 1
+        if len(_dns_cache) >= DNS_CACHE_MAX_ENTRIES:
+            _dns_cache.clear()
+        _dns_cache[key] = (now + DNS_CACHE_TTL, tuple(result))
+    return result
+
+
+def install_dns_cache() -> bool:
+    """
+    Route this process's getaddrinfo() through the cache, if
+    HTTP_DNS_CACHE_TTL > 0. This patches socket.getaddrinfo process-wide
+    (every library, not only the shared pool), so call it once from an
+    entry point that wants it.
+
+    Returns:
+        True if the cache is installed
+    """
+    if DNS_CACHE_TTL > 0:
+        socket.getaddrinfo = _cached_getaddrinfo
+    return socket.getaddrinfo is _cached_getaddrinfo
+
+
+def uninstall_dns_cache() -> None:
+    """Restore the system getaddrinfo()."""
+    if socket.getaddrinfo is _cached_getaddrinfo:
+        socket.getaddrinfo = _original_getaddrinfo
+
+
+def clear_dns_cache() -> None:
+    with _dns_lock:
+        _dns_cache.clear()
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+def pool_stats() -> Dict[str, Any]:
+    """
+    Pool utilization for the admin/health endpoints.
+
+    Returns:
+        {'pool_hosts': n, 'pool_maxsize': n,
+         'hosts': {netloc: {'requests', 'errors', 'connections_opened',
+                            'in_use', 'idle', 'maxsize'}},
+         'dns_cache': {'enabled', 'hits', 'misses', 'entries'}}
+    """
+    adapter = _adapter
+    hosts: Dict[str, Dict[str, int]] = {}
+    if adapter is not None and _adapter_pid == os.getpid():
+        with adapter._counts_lock:
+            for host, counts in adapter._counts.items():
+                hosts[host] = dict(counts)
+
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            netloc = pool.host if pool.port in (None, 80, 443) else f"{pool.host}:{pool.port}"
+            entry = hosts.setdefault(netloc, {'requests': 0, 'errors': 0})
+            queue = pool.pool
+            # The LIFO queue holds idle connections plus unused (None) slots
+            available = queue.qsize() if queue is not None else 0
+            maxsize = queue.maxsize if queue is not None else pool.num_connections
+            idle = sum(1 for conn in list(queue.queue) if conn is not None) if queue is not None else 0
+            entry.update({
+                'connections_opened': pool.num_connections,
+                'in_use': max(0, maxsize - available),
+                'idle': idle,
+                'maxsize': maxsize,
+            })
+
+    with _dns_lock:
+        dns = {
+            'enabled': socket.getaddrinfo is _cached_getaddrinfo,
+            'hits': _dns_stats['hits'],
+            'misses': _dns_stats['misses'],
+            'entries': len(_dns_cache),
+        }
+
+    return {
+        'pool_hosts': POOL_HOSTS,
+        'pool_maxsize': POOL_MAXSIZE,
+        'hosts': hosts,
+        'dns_cache': dns,
+    }
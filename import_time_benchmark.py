@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for Citate Genie
+Measures what a cold start pays to import the Lambda/web entry points, using
+CPython's ``-X importtime`` output, and gates regressions against a baseline.
+
+Each target is imported in a fresh interpreter several times; per-module
+self/cumulative times are the median across runs so one noisy run does not
+trip the gate.
+
+Usage:
+    python import_time_benchmark.py                      # report
+    python import_time_benchmark.py --save-baseline import_baseline.json
+    python import_time_benchmark.py --check import_baseline.json
+    python import_time_benchmark.py --runs 9 --top 25 unified_router
+
+Exit codes (--check): 0 ok, 1 regression, 2 a target failed to import.
+"""
+
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry points whose import cost is paid on a cold start
+DEFAULT_TARGETS = [
+    'lambda_processor',
+    'unified_router',
+    'author_date_transformer',
+    'detectors',
+    'config',
+    'engines',
+    'formatters',
+    'processors',
+]
+
+DEFAULT_RUNS = 5
+DEFAULT_TOP = 15
+
+# A target regresses only if it is slower by BOTH the relative tolerance and
+# the absolute floor (import times of a few ms are too noisy to gate on %)
+REGRESSION_TOLERANCE = 0.25
+REGRESSION_FLOOR_MS = 5.0
+
+# "import time:       123 |        456 |   package.module"
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$')
+
+
+def _is_repo_module(name: str) -> bool:
+    """True if the module is part of this repository (not stdlib/site-packages)."""
+    top = name.split('.')[0]
+    return (
+        os.path.exists(os.path.join(REPO_DIR, top + '.py'))
+        or os.path.isdir(os.path.join(REPO_DIR, top))
+    )
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse ``-X importtime`` output into {module: (self_us, cumulative_us)}."""
+    timings = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_once(target: str) -> Tuple[Optional[Dict[str, Tuple[int, int]]], str]:
+    """Import ``target`` in a fresh interpreter; return (timings, error)."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {target}'],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        last_line = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'unknown error'
+        return None, last_line
+    return parse_importtime(proc.stderr), ''
+
+
+def measure_target(target: str, runs: int = DEFAULT_RUNS) -> Dict:
+    """
+    Measure one target over several runs.
+
+    Returns:
+        Dict with 'total_ms' (median cumulative import time of the target),
+        'modules' ({module: {'self_ms', 'cumulative_ms'}}, medians) and
+        'error' (set if the target could not be imported)
+    """
+    samples: Dict[str, List[Tuple[int, int]]] = {}
+    for _ in range(runs):
+        timings, error = measure_once(target)
+        if timings is None:
+            return {'total_ms': None, 'modules': {}, 'error': error}
+        for name, value in timings.items():
+            samples.setdefault(name, []).append(value)
+
+    modules = {
+        name: {
+            'self_ms': statistics.median(v[0] for v in values) / 1000,
+            'cumulative_ms': statistics.median(v[1] for v in values) / 1000,
+        }
+        for name, values in samples.items()
+    }
+    total = modules.get(target, {}).get('cumulative_ms')
+    return {'total_ms': total, 'modules': modules, 'error': None}
+
+
+def print_report(results: Dict[str, Dict], top: int = DEFAULT_TOP) -> None:
+    """Print per-target totals and the most expensive modules by self time."""
+    print("=" * 70)
+    print("IMPORT TIME REPORT (median of runs, ms)")
+    print("=" * 70)
+    for target, result in results.items():
+        if result['error']:
+            print(f"\n{target}: FAILED TO IMPORT - {result['error']}")
+            continue
+        print(f"\n{target}: {result['total_ms']:.1f} ms total")
+        ranked = sorted(result['modules'].items(), key=lambda kv: kv[1]['self_ms'], reverse=True)
+        print(f"  {'self':>8}  {'cumul':>8}  module")
+        for name, timing in ranked[:top]:
+            marker = '*' if _is_repo_module(name) else ' '
+            print(f"  {timing['self_ms']:8.1f}  {timing['cumulative_ms']:8.1f} {marker}{name}")
+    print("\n(* = module in this repository)")
+
+
+def check_against_baseline(results: Dict[str, Dict], baseline: Dict[str, Dict]) -> int:
+    """Compare totals to a saved baseline; return the process exit code."""
+    exit_code = 0
+    print("\n" + "=" * 70)
+    print(f"REGRESSION CHECK (tolerance {REGRESSION_TOLERANCE:.0%}, floor {REGRESSION_FLOOR_MS} ms)")
+    print("=" * 70)
+    for target, result in results.items():
+        if result['error']:
+            print(f"  FAIL  {target}: import failed ({result['error']})")
+            exit_code = max(exit_code, 2)
+            continue
+        expected = baseline.get(target, {}).get('total_ms')
+        if expected is None:
+            print(f"  NEW   {target}: {result['total_ms']:.1f} ms (no baseline)")
+            continue
+        delta = result['total_ms'] - expected
+        limit = max(expected * REGRESSION_TOLERANCE, REGRESSION_FLOOR_MS)
+        status = 'OK  '
+        if delta > limit:
+            status = 'SLOW'
+            exit_code = max(exit_code, 1)
+        print(f"  {status}  {target}: {result['total_ms']:.1f} ms (baseline {expected:.1f}, {delta:+.1f})")
+
+        if status == 'SLOW':
+            # Point at the repo modules that got slower
+            base_modules = baseline[target].get('modules', {})
+            worst = sorted(
+                (
+                    (timing['self_ms'] - base_modules.get(name, {}).get('self_ms', 0.0), name)
+                    for name, timing in result['modules'].items()
+                    if _is_repo_module(name)
+                ),
+                reverse=True,
+            )
+            for growth, name in worst[:5]:
+                if growth > 0:
+                    print(f"          {name}: +{growth:.1f} ms self")
+    return exit_code
+
+
+def main(argv: List[str]) -> int:
+    runs = DEFAULT_RUNS
+    top = DEFAULT_TOP
+    save_path = None
+    check_path = None
+    targets = []
+
+    args = iter(argv)
+    for arg in args:
+        if arg == '--runs':
+            runs = int(next(args))
+        elif arg == '--top':
+            top = int(next(args))
+        elif arg == '--save-baseline':
+            save_path = next(args)
+        elif arg == '--check':
+            check_path = next(args)
+        elif arg.startswith('--'):
+            print(f"Unknown option: {arg}")
+            print(__doc__)
+            return 2
+        else:
+            targets.append(arg)
+    targets = targets or DEFAULT_TARGETS
+
+    results = {target: measure_target(target, runs) for target in targets}
+    print_report(results, top)
+
+    if save_path:
+        with open(save_path, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {save_path}")
+
+    if check_path:
+        with open(check_path) as f:
+            baseline = json.load(f)
+        return check_against_baseline(results, baseline)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -29,17 +29,27 @@ SOC 2 Compliance:
 
 Version History:
     2025-12-20 V1.0: Initial Lambda-ready implementation
+    2026-10-18 V1.1: Runs bound to the scheduler's DOCUMENT class per user
+    2026-10-18 V1.2: Each invocation runs inside a soc2_logging audit context
+    2026-10-18 V1.3: Audit events are flushed before the handler returns
 """
 
 import os
 import time
 import math
 import uuid
-import requests
-from io import BytesIO
+import http_client
+import scheduler
+import soc2_logging
 from typing import List, Dict, Tuple, Optional, Any
 from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeout
+from tracing import get_logger, span, start_trace, submit_traced
+
+logger = get_logger('lambda_processor')
+
+# Warm containers reuse lookups; no-op unless HTTP_DNS_CACHE_TTL > 0
+http_client.install_dns_cache()
 
 
 # =============================================================================
@@ -139,6 +149,7 @@ class ProcessingResult:
     error: str = ""
     request_id: str = ""
     duration_ms: int = 0
+    trace_summary: Optional[Dict[str, Any]] = None  # Trace.summary() when sampled
 
 
 # =============================================================================
@@ -174,7 +185,7 @@ def extract_document_gist(body_text: str, cost_tracker: CostTracker, request_id:
     try:
         prompt = f"In 10-15 words, describe the academic field and topic:\n\n{body_text[:1000]}"
         
-        response = requests.post(
+        response = http_client.post(
             "https://api.anthropic.com/v1/messages",
             headers={
                 "x-api-key": ANTHROPIC_API_KEY,
@@ -199,11 +210,11 @@ def extract_document_gist(body_text: str, cost_tracker: CostTracker, request_id:
         )
         
         gist = result['content'][0]['text'].strip()
-        print(f"[LambdaProcessor] Document gist: {gist}")
+        logger.debug(f"[LambdaProcessor] Document gist: {gist}")
         return gist
         
     except Exception as e:
-        print(f"[LambdaProcessor] Gist extraction failed: {e}")
+        logger.warning(f"[LambdaProcessor] Gist extraction failed: {e}")
         return ""
 
 
@@ -223,6 +234,7 @@ def lookup_citation_components_batch(
     """Look up citation components for all raw citations in parallel."""
     from unified_router import route_citation
     from formatters.base import get_formatter
+    from engines.identifier_batch import prefetch_identifiers
     
     formatter = get_formatter(style)
     results: Dict[str, LookupResult] = {}
@@ -238,7 +250,11 @@ def lookup_citation_components_batch(
             text_to_keys[normalized] = []
         text_to_keys[normalized].append(raw.key)
     
-    print(f"[LambdaProcessor] {len(raw_citations)} citations -> {len(unique_texts)} unique")
+    logger.debug(f"[LambdaProcessor] {len(raw_citations)} citations -> {len(unique_texts)} unique")
+    
+    # Batch-resolve identifiers so route_citation's DOI/PMID/arXiv lookups
+    # are answered from the prefetch store
+    prefetch_identifiers(raw.text for raw in unique_texts.values())
     
     def lookup_single(raw: RawCitation) -> LookupResult:
         try:
@@ -259,9 +275,10 @@ def lookup_citation_components_batch(
             return LookupResult(raw=raw, formatted=raw.text, success=False, error=str(e))
     
     # Parallel execution
+    raw_by_key = {raw.key: raw for raw in raw_citations}
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         futures = {
-            executor.submit(lookup_single, raw): normalized
+            submit_traced(executor, lookup_single, raw): normalized
             for normalized, raw in unique_texts.items()
         }
         
@@ -270,9 +287,8 @@ def lookup_citation_components_batch(
             try:
                 result = future.result(timeout=30)
                 for key in text_to_keys[normalized]:
-                    matching_raw = next(r for r in raw_citations if r.key == key)
                     results[key] = LookupResult(
-                        raw=matching_raw,
+                        raw=raw_by_key[key],
                         components=result.components,
                         formatted=result.formatted,
                         success=result.success,
@@ -281,9 +297,8 @@ def lookup_citation_components_batch(
                     )
             except Exception as e:
                 for key in text_to_keys[normalized]:
-                    matching_raw = next(r for r in raw_citations if r.key == key)
                     results[key] = LookupResult(
-                        raw=matching_raw,
+                        raw=raw_by_key[key],
                         formatted=unique_texts[normalized].text,
                         success=False,
                         error=str(e)
@@ -311,17 +326,33 @@ class LambdaDocumentProcessor:
         document_id: Optional[str] = None
     ) -> ProcessingResult:
         """Process a document with the specified citation style."""
+        # Lambda concurrency admits runs; bind the class for fair queuing only
+        with scheduler.workload(scheduler.Priority.DOCUMENT, self.user_id), \
+                start_trace('process_document', request_id=self.request_id, style=style) as trace:
+            result = self._process(docx_bytes, style, document_id)
+        if trace is not None:
+            result.trace_summary = trace.summary()
+        return result
+    
+    def _process(
+        self,
+        docx_bytes: bytes,
+        style: str,
+        document_id: Optional[str] = None
+    ) -> ProcessingResult:
         start_time = time.time()
         doc_id = document_id or f"doc_{uuid.uuid4().hex[:8]}"
         
+        document = None
         try:
-            from author_date_transformer import (
-                AuthorDateTransformer, ResolvedNote,
-                build_parenthetical, build_sort_key
-            )
+            from author_date_transformer import AuthorDateTransformer
             
-            # Extract notes from document
-            raw_citations = self._extract_citations(docx_bytes)
+            with span('extract'):
+                # One extraction + parse, shared by every phase below
+                document = AuthorDateTransformer(docx_bytes)
+                
+                # Extract notes from document
+                raw_citations = self._extract_citations(document)
             
             if not raw_citations:
                 return ProcessingResult(
@@ -333,20 +364,23 @@ class LambdaDocumentProcessor:
                 )
             
             # Extract document gist
-            body_text = self._extract_body_text(docx_bytes)
-            gist = extract_document_gist(body_text, self.cost_tracker, self.request_id)
+            with span('gist'):
+                body_text = self._extract_body_text(document)
+                gist = extract_document_gist(body_text, self.cost_tracker, self.request_id)
             
             # Parallel lookup
-            lookup_results = lookup_citation_components_batch(
-                raw_citations, style, gist, self.cost_tracker, 
-                self.request_id, self.user_id
-            )
+            with span('lookup', citations=len(raw_citations)):
+                lookup_results = lookup_citation_components_batch(
+                    raw_citations, style, gist, self.cost_tracker, 
+                    self.request_id, self.user_id
+                )
             
             # Transform based on style
-            if is_author_date_style(style):
-                result_bytes = self._transform_author_date(docx_bytes, lookup_results, style)
-            else:
-                result_bytes = self._transform_footnotes(docx_bytes, lookup_results, style)
+            with span('transform'):
+                if is_author_date_style(style):
+                    result_bytes = self._transform_author_date(document, lookup_results, style)
+                else:
+                    result_bytes = self._transform_footnotes(document, lookup_results, style)
             
             resolved = sum(1 for r in lookup_results.values() if r.success)
             
@@ -369,13 +403,13 @@ class LambdaDocumentProcessor:
                 request_id=self.request_id,
                 duration_ms=int((time.time() - start_time) * 1000)
             )
+        finally:
+            if document is not None:
+                document.cleanup()
     
-    def _extract_citations(self, docx_bytes: bytes) -> List[RawCitation]:
+    def _extract_citations(self, document: Any) -> List[RawCitation]:
         """Extract all citations from document footnotes/endnotes."""
-        from author_date_transformer import AuthorDateTransformer
-        
-        transformer = AuthorDateTransformer(docx_bytes)
-        note_texts = transformer.extract_note_texts()
+        note_texts = document.extract_note_texts(keep_loaded=True)
         
         citations = []
         for i, (key, text) in enumerate(note_texts.items()):
@@ -390,26 +424,21 @@ class LambdaDocumentProcessor:
         
         return citations
     
-    def _extract_body_text(self, docx_bytes: bytes, max_chars: int = 1500) -> str:
+    def _extract_body_text(self, document: Any, max_chars: int = 1500) -> str:
         """Extract body text for gist generation."""
         try:
-            from document_processor import WordDocumentProcessor
-            processor = WordDocumentProcessor(BytesIO(docx_bytes))
-            text = processor.get_body_text(max_chars=max_chars)
-            processor.cleanup()
-            return text
+            return document.get_body_text(max_chars=max_chars)
         except Exception:
             return ""
     
     def _transform_author_date(
-        self, docx_bytes: bytes,
+        self, document: Any,
         lookup_results: Dict[str, LookupResult],
         style: str
     ) -> bytes:
         """Transform to author-date format."""
         from author_date_transformer import (
-            AuthorDateTransformer, ResolvedNote,
-            build_parenthetical, build_sort_key
+            ResolvedNote, build_parenthetical, build_sort_key
         )
         from formatters.base import get_formatter
         
@@ -441,11 +470,10 @@ class LambdaDocumentProcessor:
                 )
         
         heading = "Works Cited" if 'mla' in style.lower() else "References"
-        transformer = AuthorDateTransformer(docx_bytes)
-        return transformer.transform(resolved_notes, heading)
+        return document.transform(resolved_notes, heading)
     
     def _transform_footnotes(
-        self, docx_bytes: bytes,
+        self, document: Any,
         lookup_results: Dict[str, LookupResult],
         style: str
     ) -> bytes:
@@ -473,7 +501,9 @@ class LambdaDocumentProcessor:
             
             last = normalized
         
-        processor = WordDocumentProcessor(BytesIO(docx_bytes))
+        # Write into the package the document already extracted (nothing has
+        # been saved over it yet) instead of unzipping the upload again
+        processor = WordDocumentProcessor.from_extracted(document.temp_dir)
         for key, text in formatted.items():
             parts = key.split('_', 1)
             note_type = parts[0] if len(parts) > 1 else 'endnote'
@@ -484,9 +514,7 @@ class LambdaDocumentProcessor:
             else:
                 processor.write_footnote(note_id, text)
         
-        result_bytes = processor.save_to_buffer()
-        processor.cleanup()
-        return result_bytes
+        return processor.save_to_buffer().getvalue()
     
     def _build_short_form(self, components: Any, style: str) -> str:
         """Build short form citation."""
@@ -519,43 +547,51 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         return {"statusCode": 400, "body": json.dumps({"error": "user_id required"})}
     
     try:
-        if action == 'process_document':
-            s3 = boto3.client('s3')
-            s3_bucket = event.get('s3_bucket')
-            s3_key = event.get('s3_key')
-            style = event.get('style', 'Chicago Manual of Style')
-            
-            response = s3.get_object(Bucket=s3_bucket, Key=s3_key)
-            docx_bytes = response['Body'].read()
-            
-            processor = LambdaDocumentProcessor(user_id, request_id)
-            result = processor.process(docx_bytes, style, event.get('document_id'))
-            
-            if result.success and result.document_bytes:
-                output_key = s3_key.replace('/uploads/', '/outputs/').replace('.docx', '_processed.docx')
-                s3.put_object(Bucket=s3_bucket, Key=output_key, Body=result.document_bytes)
+        # Audit events logged during this invocation share its request_id/user
+        with soc2_logging.context(user_id=user_id, request_id=request_id):
+            try:
+                if action == 'process_document':
+                    s3 = boto3.client('s3')
+                    s3_bucket = event.get('s3_bucket')
+                    s3_key = event.get('s3_key')
+                    style = event.get('style', 'Chicago Manual of Style')
+                    
+                    response = s3.get_object(Bucket=s3_bucket, Key=s3_key)
+                    docx_bytes = response['Body'].read()
+                    
+                    processor = LambdaDocumentProcessor(user_id, request_id)
+                    result = processor.process(docx_bytes, style, event.get('document_id'))
+                    
+                    if result.success and result.document_bytes:
+                        output_key = s3_key.replace('/uploads/', '/outputs/').replace('.docx', '_processed.docx')
+                        s3.put_object(Bucket=s3_bucket, Key=output_key, Body=result.document_bytes)
+                        
+                        return {
+                            "statusCode": 200,
+                            "body": json.dumps({
+                                "success": True,
+                                "request_id": result.request_id,
+                                "output_s3_key": output_key,
+                                "citations_processed": result.citations_processed,
+                                "citations_resolved": result.citations_resolved,
+                                "credits_charged": result.cost_tracker.credits_charged if result.cost_tracker else 1,
+                                "cost_usd": result.cost_tracker.total_cost if result.cost_tracker else 0,
+                                "duration_ms": result.duration_ms,
+                                "trace_summary": result.trace_summary
+                            })
+                        }
+                    else:
+                        return {"statusCode": 500, "body": json.dumps({"error": result.error})}
                 
-                return {
-                    "statusCode": 200,
-                    "body": json.dumps({
-                        "success": True,
-                        "request_id": result.request_id,
-                        "output_s3_key": output_key,
-                        "citations_processed": result.citations_processed,
-                        "citations_resolved": result.citations_resolved,
-                        "credits_charged": result.cost_tracker.credits_charged if result.cost_tracker else 1,
-                        "cost_usd": result.cost_tracker.total_cost if result.cost_tracker else 0,
-                        "duration_ms": result.duration_ms
-                    })
-                }
-            else:
-                return {"statusCode": 500, "body": json.dumps({"error": result.error})}
-        
-        else:
-            return {"statusCode": 400, "body": json.dumps({"error": f"Unknown action: {action}"})}
-    
-    except Exception as e:
-        return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+                else:
+                    return {"statusCode": 400, "body": json.dumps({"error": f"Unknown action: {action}"})}
+            
+            except Exception as e:
+                return {"statusCode": 500, "body": json.dumps({"error": str(e)})}
+    finally:
+        # The sandbox is frozen once the handler returns: emit queued
+        # audit events now rather than on some later invocation
+        soc2_logging.get_audit_logger().flush()
 
 
 def process_document_local(docx_path: str, style: str, user_id: str = "test") -> ProcessingResult:
@@ -3,9 +3,16 @@ citeflex/models.py
 
 Core data models for the citation system.
 All modules communicate through these standardized structures.
+
+Version History:
+    2026-10-18: SourceComponents is slotted, interns repeated strings and
+                keeps raw_data as a compressed blob until it is read
 """
 
-from dataclasses import dataclass, field
+import pickle
+import sys
+import zlib
+from dataclasses import dataclass, field, fields, InitVar, MISSING
 from typing import Optional, List, Dict, Any
 from enum import Enum, auto
 
@@ -248,7 +255,56 @@ def _is_organizational_author(name: str) -> bool:
     return False
 
 
-@dataclass
+# =============================================================================
+# COMPACT STORAGE
+# =============================================================================
+
+# Fields whose values repeat across instances (engine names, journals,
+# publishers, courts, ...); one shared string object per distinct value
+INTERNED_FIELDS = (
+    'source_engine', 'year', 'journal', 'publisher', 'place', 'edition',
+    'court', 'jurisdiction', 'newspaper', 'agency', 'access_date',
+)
+
+# zlib level for packed raw_data (speed over ratio: packing is per candidate)
+RAW_DATA_COMPRESS_LEVEL = 1
+
+
+class _PackedRawData(bytes):
+    """zlib-compressed pickle of a raw_data value."""
+    __slots__ = ()
+
+
+def _pack_raw_data(value: Any) -> Any:
+    """Compress a raw_data value; empty -> None, unpicklable -> unchanged."""
+    if value is None or isinstance(value, _PackedRawData):
+        return value
+    if not value and isinstance(value, (dict, list)):
+        return None
+    try:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return value
+    return _PackedRawData(zlib.compress(blob, RAW_DATA_COMPRESS_LEVEL))
+
+
+def _unpack_raw_data(stored: Any) -> Any:
+    if stored is None:
+        return {}
+    if isinstance(stored, _PackedRawData):
+        return pickle.loads(zlib.decompress(stored))
+    return stored
+
+
+def _intern_fields(obj: "SourceComponents") -> None:
+    intern = sys.intern
+    for name in INTERNED_FIELDS:
+        value = getattr(obj, name)
+        if type(value) is str and value:
+            setattr(obj, name, intern(value))
+
+
+@dataclass(slots=True)
 class SourceComponents:
     """
     Universal source components container.
@@ -260,6 +316,13 @@ class SourceComponents:
     - Formatters consume this to produce citation strings
     
     All fields are optional because different source types use different subsets.
+    
+    Instances are held per candidate, per session and pickled to disk, so
+    the layout is compact:
+    - slotted (no per-instance __dict__; unknown attributes raise)
+    - INTERNED_FIELDS values are interned on construction and unpickling
+    - raw_data (the full API response) is stored as a compressed pickle and
+      only rebuilt when read; it takes no part in ==/repr
     """
     
     # Core identification
@@ -328,7 +391,45 @@ class SourceComponents:
     # Metadata
     access_date: str = ""
     confidence: float = 1.0  # How confident are we in this result (0-1)
-    raw_data: Dict[str, Any] = field(default_factory=dict)  # Original API response
+    raw_data: InitVar[Optional[Dict[str, Any]]] = None  # Original API response (see raw_data property)
+    
+    # Storage behind raw_data: None (empty), a packed blob, or the value once read
+    _raw_data: Any = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self, raw_data: Optional[Dict[str, Any]]) -> None:
+        self._raw_data = _pack_raw_data(raw_data)
+        _intern_fields(self)
+    
+    def _get_raw_data(self) -> Dict[str, Any]:
+        # Unpack on first read and keep the value, so in-place edits stick
+        stored = self._raw_data
+        if stored is None or isinstance(stored, _PackedRawData):
+            stored = self._raw_data = _unpack_raw_data(stored)
+        return stored
+    
+    def _set_raw_data(self, value: Optional[Dict[str, Any]]) -> None:
+        self._raw_data = _pack_raw_data(value)
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name) for name in self.__slots__}
+        state['_raw_data'] = _pack_raw_data(self._raw_data)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        # Pickles from before slotting hold the plain instance __dict__,
+        # with raw_data under its own name
+        state = dict(state)
+        if 'raw_data' in state:
+            state['_raw_data'] = _pack_raw_data(state.pop('raw_data'))
+        for f in fields(self):
+            if f.name in state:
+                value = state[f.name]
+            elif f.default_factory is not MISSING:
+                value = f.default_factory()
+            else:
+                value = f.default
+            object.__setattr__(self, f.name, value)
+        _intern_fields(self)
     
     def get_normalized_doi(self) -> str:
         """Get normalized DOI for comparison purposes."""
@@ -349,9 +450,9 @@ class SourceComponents:
         else:  # JOURNAL, BOOK, MEDICAL
             return bool(self.title)
     
-    def to_dict(self) -> Dict[str, Any]:
+    def to_dict(self, include_raw_data: bool = True) -> Dict[str, Any]:
         """Convert to dictionary (for backward compatibility)."""
-        return {
+        result = {
             'type': self.citation_type.name.lower(),
             'raw_source': self.raw_source,
             'source_engine': self.source_engine,
@@ -386,8 +487,11 @@ class SourceComponents:
             'document_number': self.document_number,
             'access_date': self.access_date,
             'confidence': self.confidence,
-            'raw_data': self.raw_data,
         }
+        if include_raw_data:
+            # Unpacked per call: to_dict() must not pin the full response on self
+            result['raw_data'] = _unpack_raw_data(self._raw_data)
+        return result
     
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "SourceComponents":
@@ -443,6 +547,12 @@ class SourceComponents:
         )
 
 
+SourceComponents.raw_data = property(
+    SourceComponents._get_raw_data, SourceComponents._set_raw_data,
+    doc="Original API response, stored compressed until read.",
+)
+
+
 @dataclass
 class DetectionResult:
     """Result from the detection layer."""
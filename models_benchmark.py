@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+SourceComponents memory benchmark for Citate Genie
+Builds N SourceComponents from synthetic engine responses (each record parsed
+from its own JSON document, as engines receive them) and measures the memory
+they hold with tracemalloc: the previous plain-dataclass layout (per-instance
+__dict__, raw_data kept as parsed, no interning) against the slotted,
+interned, packed-raw_data layout in models.py.
+
+Also checks that both layouts give identical to_dict() output and that
+from_dict() and pickle round-trip the compact layout.
+
+Usage:
+    python models_benchmark.py                    # 100k instances
+    python models_benchmark.py --count 20000 --no-raw-data
+
+Exit codes: 0 ok, 1 the layouts disagreed or a round-trip lost data.
+"""
+
+import argparse
+import dataclasses
+import gc
+import json
+import pickle
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from models import CitationType, SourceComponents
+
+DEFAULT_COUNT = 100_000
+SEED = 20261018
+
+ENGINES = ['crossref', 'openalex', 'pubmed', 'semantic_scholar', 'google_books', 'courtlistener']
+JOURNALS = [
+    'Nature', 'Science', 'The Lancet', 'Journal of American History',
+    'American Economic Review', 'New England Journal of Medicine',
+    'Journal of the American Chemical Society', 'Harvard Law Review',
+    'Past & Present', 'Cell', 'Physical Review Letters', 'PLOS ONE',
+]
+PUBLISHERS = ['Elsevier', 'Springer', 'Wiley', 'Oxford University Press', 'Cambridge University Press']
+FAMILIES = ['Smith', 'Caplan', 'Nguyen', 'Garcia', 'Okafor', 'Muller', 'Rossi', 'Tanaka', 'Kowalski']
+GIVENS = ['Eric', 'Maria', 'Wei', 'Amara', 'Jonas', 'Priya', 'Lucas', 'Sofia']
+WORDS = ['history', 'policy', 'clinical', 'outcomes', 'market', 'networks', 'reform', 'evidence', 'climate', 'trial']
+
+
+def build_records(count: int, with_raw_data: bool) -> List[str]:
+    """One JSON document per instance, shaped like an engine response."""
+    rng = random.Random(SEED)
+    records = []
+    for i in range(count):
+        authors = [f"{rng.choice(GIVENS)} {rng.choice(FAMILIES)}" for _ in range(rng.randint(1, 4))]
+        title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 10))).capitalize()
+        record: Dict[str, Any] = {
+            'source_engine': rng.choice(ENGINES),
+            'title': title,
+            'authors': authors,
+            'year': str(rng.randint(1950, 2025)),
+            'doi': f"10.{rng.randint(1000, 9999)}/{i:08x}",
+            'journal': rng.choice(JOURNALS),
+            'volume': str(rng.randint(1, 300)),
+            'issue': str(rng.randint(1, 12)),
+            'pages': f"{rng.randint(1, 500)}-{rng.randint(501, 900)}",
+            'publisher': rng.choice(PUBLISHERS),
+            'access_date': '2026-10-18',
+        }
+        if with_raw_data:
+            record['raw_data'] = {
+                'DOI': record['doi'],
+                'title': [title],
+                'container-title': [record['journal']],
+                'publisher': record['publisher'],
+                'author': [{'given': a.split()[0], 'family': a.split()[1], 'sequence': 'additional',
+                            'affiliation': []} for a in authors],
+                'issued': {'date-parts': [[int(record['year'])]]},
+                'reference-count': rng.randint(0, 80),
+                'subject': rng.sample(WORDS, 3),
+                'link': [{'URL': f"https://example.org/{i}.pdf", 'content-type': 'application/pdf'}],
+                'license': [{'URL': 'https://creativecommons.org/licenses/by/4.0/'}],
+                'score': rng.random() * 100,
+            }
+        records.append(json.dumps(record))
+    return records
+
+
+def _legacy_class() -> type:
+    """The pre-slotting layout: plain dataclass, raw_data held as given."""
+    specs = []
+    for f in dataclasses.fields(SourceComponents):
+        if f.name == '_raw_data':
+            continue
+        if f.default_factory is not dataclasses.MISSING:
+            specs.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            specs.append((f.name, f.type, dataclasses.field(default=f.default)))
+    specs.append(('raw_data', Dict[str, Any], dataclasses.field(default_factory=dict)))
+    legacy = dataclasses.make_dataclass('LegacySourceComponents', specs)
+    legacy.to_dict = lambda self: {'type': self.citation_type.name.lower(), **{
+        name: value for name, value in vars(self).items() if name != 'citation_type'}}
+    legacy.__module__ = __name__
+    return legacy
+
+
+LegacySourceComponents = _legacy_class()
+
+
+def _build(cls: type, records: List[str]) -> List[Any]:
+    out = []
+    for text in records:
+        data = json.loads(text)
+        out.append(cls(citation_type=CitationType.JOURNAL, **data))
+    return out
+
+
+def _measure(build: Callable[[], List[Any]]):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    items = build()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items, current, seconds
+
+
+def _check(legacy: List[Any], compact: List[SourceComponents]) -> bool:
+    for old, new in zip(legacy, compact):
+        expected = old.to_dict()
+        got = new.to_dict()
+        if any(got[key] != value for key, value in expected.items()):
+            return False
+        if SourceComponents.from_dict(got).to_dict() != got:
+            return False
+    sample = compact[:1000]
+    restored = pickle.loads(pickle.dumps(sample))
+    return all(a == b and a.raw_data == b.raw_data for a, b in zip(sample, restored))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=DEFAULT_COUNT)
+    parser.add_argument('--no-raw-data', action='store_true', help='records without an API response')
+    args = parser.parse_args(argv)
+
+    records = build_records(args.count, not args.no_raw_data)
+
+    print(f"{args.count} instances, raw_data {'off' if args.no_raw_data else 'on'}")
+    print(f"  {'layout':<10} {'MB held':>9} {'bytes/obj':>10} {'build s':>8} {'pickle MB':>10}")
+
+    legacy, legacy_bytes, legacy_s = _measure(lambda: _build(LegacySourceComponents, records))
+    legacy_pickle = len(pickle.dumps(legacy[:10_000])) * len(legacy) / min(len(legacy), 10_000)
+    print(f"  {'legacy':<10} {legacy_bytes / 1e6:>9.1f} {legacy_bytes / args.count:>10.0f} "
+          f"{legacy_s:>8.2f} {legacy_pickle / 1e6:>10.1f}")
+
+    compact, compact_bytes, compact_s = _measure(lambda: _build(SourceComponents, records))
+    compact_pickle = len(pickle.dumps(compact[:10_000])) * len(compact) / min(len(compact), 10_000)
+    print(f"  {'compact':<10} {compact_bytes / 1e6:>9.1f} {compact_bytes / args.count:>10.0f} "
+          f"{compact_s:>8.2f} {compact_pickle / 1e6:>10.1f}")
+    print(f"  memory saved: {1 - compact_bytes / legacy_bytes:.0%}")
+
+    if not _check(legacy, compact):
+        print("MISMATCH: compact SourceComponents lost or changed data")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,18 +18,40 @@ Modules:
     
     # Embedded metadata cache (2025-12-14):
     document_components.py    - Read/write citation cache embedded in documents
+    
+    # Shared body-text parse (2026-10-18):
+    docx_text.py              - Single-pass streaming document.xml extractor (cached per upload)
+
+The names below are re-exported lazily, as in engines/ and formatters/.
 """
 
-from processors.word_document import WordDocumentProcessor
-from processors.author_date import process_author_date_document
-from processors.orchestrator import process_document_unified, ProcessingResult
-from processors.document_components import (
-    SourceComponentsCache,
-    load_cache_from_docx,
-    save_cache_to_docx,
-    export_cache_to_csv,
-    hash_citation_text,
-)
+import importlib
+
+# Re-exported name -> defining submodule (imported on first access), so
+# importing one processor (e.g. processors.doi_extractor) does not import
+# the whole pipeline and the HTTP stack behind it
+_LAZY_EXPORTS = {
+    'WordDocumentProcessor': 'processors.word_document',
+    'process_author_date_document': 'processors.author_date',
+    'process_document_unified': 'processors.orchestrator',
+    'ProcessingResult': 'processors.orchestrator',
+    'SourceComponentsCache': 'processors.document_components',
+    'load_cache_from_docx': 'processors.document_components',
+    'save_cache_to_docx': 'processors.document_components',
+    'embed_cache_parts': 'processors.document_components',
+    'export_cache_to_csv': 'processors.document_components',
+    'hash_citation_text': 'processors.document_components',
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_EXPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module 'processors' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     # Legacy
@@ -42,6 +64,7 @@ __all__ = [
     'SourceComponentsCache',
     'load_cache_from_docx',
     'save_cache_to_docx',
+    'embed_cache_parts',
     'export_cache_to_csv',
     'hash_citation_text',
 ]
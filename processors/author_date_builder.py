@@ -25,7 +25,7 @@ from typing import List, Dict, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 from models import SourceComponents, CitationType
-from formatters.base import get_formatter
+from formatters.cache import get_cached_formatter
 
 
 # Styles that use author-date format
@@ -164,7 +164,7 @@ def format_reference_entry(
     Returns:
         Formatted reference entry string
     """
-    formatter = get_formatter(style)
+    formatter = get_cached_formatter(style)
     return formatter.format(metadata)
 
 
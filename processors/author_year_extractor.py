@@ -17,6 +17,7 @@ Created: 2025-12-10
 """
 
 import re
+from bisect import bisect_left, bisect_right
 from typing import List, Tuple, Set, Optional, NamedTuple
 from dataclasses import dataclass
 
@@ -45,6 +46,37 @@ class AuthorYearCitation:
         return False
 
 
+class _SpanIndex:
+    """
+    Sorted, non-overlapping character spans with O(log k) overlap checks.
+    
+    Replaces a set of (start, end) tuples that was scanned linearly on every
+    candidate match. Spans only ever enter the index when they do not
+    overlap an existing one, so starts and ends are both sorted and the only
+    span that can overlap [start, end) is the last one starting before end.
+    """
+    
+    __slots__ = ('_starts', '_ends')
+    
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+    
+    def overlaps(self, start: int, end: int) -> bool:
+        """True if [start, end) intersects any stored span."""
+        i = bisect_left(self._starts, end)
+        return i > 0 and self._ends[i - 1] > start
+    
+    def add(self, start: int, end: int) -> None:
+        """Insert a span (caller guarantees it does not overlap)."""
+        i = bisect_right(self._starts, start)
+        self._starts.insert(i, start)
+        self._ends.insert(i, end)
+    
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
 class AuthorDateExtractor:
     """
     Extracts author-date citations from document text.
@@ -418,19 +450,24 @@ class AuthorDateExtractor:
             # No year = explanatory phrase, not a citation
             return True
         
-        # Replace explanatory parentheticals with placeholder to prevent matching
-        processed_text = text
+        # Replace explanatory parentheticals with placeholder to prevent matching.
+        # Built as one list of segments and joined once (linear in text size).
+        pieces = []
+        last_end = 0
         for match in self.EXPLANATORY_ABBREVS.finditer(text):
             if is_explanatory_not_citation(match):
                 # Replace with spaces to preserve character positions for other matches
-                placeholder = ' ' * len(match.group(0))
-                processed_text = processed_text[:match.start()] + placeholder + processed_text[match.end():]
+                pieces.append(text[last_end:match.start()])
+                pieces.append(' ' * (match.end() - match.start()))
+                last_end = match.end()
         
         # Use processed text for extraction
-        text = processed_text
+        if pieces:
+            pieces.append(text[last_end:])
+            text = ''.join(pieces)
         
         citations = []
-        found_spans = set()  # Track character spans to avoid duplicates
+        found_spans = _SpanIndex()  # Track character spans to avoid duplicates
         found_keys = set()   # Track (author, year) to avoid dupes in multi-citations
         
         def add_if_new(citation, start, end, use_span=True):
@@ -438,12 +475,10 @@ class AuthorDateExtractor:
             key = (citation.author.lower(), citation.year)
             
             if use_span:
-                span_key = (start, end)
                 # Check for overlapping spans
-                for existing_start, existing_end in found_spans:
-                    if start < existing_end and end > existing_start:
-                        return False  # Overlapping
-                found_spans.add(span_key)
+                if found_spans.overlaps(start, end):
+                    return False  # Overlapping
+                found_spans.add(start, end)
             else:
                 # For multi-citations, just check the key
                 if key in found_keys:
@@ -460,7 +495,7 @@ class AuthorDateExtractor:
             # Check if it actually contains multiple citations (has semicolon)
             if ';' in inner:
                 # Mark this span as used to prevent single-citation patterns from re-matching
-                found_spans.add((match.start(), match.end()))
+                found_spans.add(match.start(), match.end())
                 
                 # Split by semicolon and process each citation segment
                 segments = inner.split(';')
@@ -1193,33 +1228,15 @@ def extract_body_text_from_docx(file_bytes: bytes) -> str:
     Returns:
         Plain text content of document body
     """
-    import zipfile
-    import xml.etree.ElementTree as ET
-    from io import BytesIO
-    
-    NS = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
+    from processors.docx_text import parse_docx_body
     
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            # Read main document
-            if 'word/document.xml' not in zf.namelist():
-                return ""
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            # Extract all text from paragraphs
-            text_parts = []
-            for para in root.findall('.//w:p', NS):
-                para_text = []
-                for t in para.findall('.//w:t', NS):
-                    if t.text:
-                        para_text.append(t.text)
-                if para_text:
-                    text_parts.append(''.join(para_text))
-            
-            return '\n'.join(text_parts)
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            return ""
+        
+        # Non-empty paragraphs, newline-separated
+        return body.text
     
     except Exception as e:
         print(f"[extract_body_text_from_docx] Error: {e}")
@@ -1335,3 +1352,37 @@ if __name__ == "__main__":
     print("\nSearch queries:")
     for author, year, second, third in extractor.get_search_queries():
         print(f"  - Author: {author}, Year: {year}, Second: {second}")
+    
+    print("\n" + "=" * 60)
+    print("BENCHMARK: SYNTHETIC LARGE MANUSCRIPT")
+    print("=" * 60)
+    
+    # ~100k words with a parenthetical every dozen words. Extraction time
+    # should grow linearly with manuscript size (span checks are O(log k),
+    # explanatory masking is a single join).
+    import random
+    import time
+    
+    rng = random.Random(42)
+    filler = "the survey data shows social outcomes across regions over time".split()
+    snippets = [
+        "(Smith, 2020)", "Jones (2019) argues", "(Smith & Jones, 2018, p. 4)",
+        "(e.g., an example)", "(Brown et al., 2001; White, 1999)",
+        "Miller and Davis (2010)", "(WHO, 2020)", "(i.e., a note)",
+        "World Bank (2019)", "(see Lee, 2003)", "(Garcia, 2011, 2012, 2013)",
+        "Harris et al. (2015)",
+    ]
+    
+    def synthetic_manuscript(paragraphs: int) -> str:
+        parts = []
+        for _ in range(paragraphs):
+            parts.append(' '.join(rng.choice(filler) for _ in range(12)))
+            parts.append(rng.choice(snippets))
+        return ' '.join(parts)
+    
+    for size in (2000, 4000, 8000):
+        manuscript = synthetic_manuscript(size)
+        start = time.perf_counter()
+        found = AuthorDateExtractor().extract_from_text(manuscript)
+        elapsed = time.perf_counter() - start
+        print(f"  {len(manuscript.split()):>7,} words: {len(found):>5} citations in {elapsed:.2f}s")
@@ -17,24 +17,42 @@ Technical Details:
 - .docx files are ZIP archives containing XML
 - Word preserves Custom XML Parts through edits
 - We use SHA-256 hash of exact citation text as cache key (exact matching)
-- Metadata is serialized to/from XML format
+- Exact misses fall back to secondary indexes: a normalized text
+  fingerprint (case, punctuation, whitespace and trailing pin-cites removed)
+  and identifier keys (DOI, URL, ISBN, PMID, arXiv) found in the citation text
+- Identifiers batch-resolved before processing (engines.identifier_batch)
+  are seeded per document and answer citations that carry that identifier
+- Metadata is serialized as zlib-compressed JSON in a base64 element (v2);
+  the original per-field XML format (v1) is still read
 
 Created: 2025-12-14
+
+Version History:
+    2026-10-18: Compact v2 cache format (non-default fields only, no raw_data,
+                compressed payload); XML is parsed lazily on first access
+    2026-10-18: Normalized-fingerprint and identifier secondary indexes
+    2026-10-18: Seeded identifier tier for batch-resolved DOIs/PMIDs/arXiv ids
+    2026-10-18: embed_cache_parts() for the single-zip output stage; cache
+                embedding no longer extracts to a temp dir
+    2026-10-18: Fingerprints also drop parenthesized pin-cites ("(p. 12)")
+    2026-10-18: In-memory entries no longer hold raw_data (never embedded)
 """
 
-import os
 import re
+import zlib
+import base64
 import hashlib
+import threading
 import zipfile
-import tempfile
-import shutil
 import json
 import xml.etree.ElementTree as ET
 from typing import Dict, Optional, Any, List
 from io import BytesIO
 from datetime import datetime
+from urllib.parse import urlsplit, parse_qsl, urlencode
 
-from models import SourceComponents, CitationType
+from models import SourceComponents, CitationType, normalize_doi
+from processors.docx_package import read_docx_parts, write_docx_parts
 
 
 # =============================================================================
@@ -50,6 +68,24 @@ CUSTOM_XML_DIR = "customXml"
 CUSTOM_XML_ITEM_FILENAME = "citategenie.xml"
 CUSTOM_XML_ITEM_PROPS_FILENAME = "citategenieProps.xml"
 
+# Cache part format versions
+# v1: one XML element per SourceComponents field (including raw_data as JSON)
+# v2: single <payload> element holding zlib-compressed JSON, base64-encoded
+CACHE_FORMAT_VERSION = "2.0"
+LEGACY_FORMAT_VERSION = "1.0"
+PAYLOAD_ENCODING = "zlib+base64"
+
+# Fields never embedded in the document. raw_data is the full API response:
+# it is only needed during the run that fetched it and dominated part size.
+EMBED_EXCLUDED_FIELDS = {'raw_data'}
+
+# Field values of an empty SourceComponents; equal values are not stored
+_DEFAULT_COMPONENT_FIELDS = SourceComponents().to_dict()
+
+# Root start tag attributes, read without parsing the whole part
+_ROOT_VERSION_RE = re.compile(r'<citategenie\b[^>]*?\bversion="([^"]*)"')
+_ROOT_COUNT_RE = re.compile(r'<citategenie\b[^>]*?\bcount="(\d+)"')
+
 
 # =============================================================================
 # HASHING
@@ -79,6 +115,153 @@ def hash_citation_text(text: str) -> str:
     return hash_obj.hexdigest()[:16]
 
 
+# =============================================================================
+# NORMALIZED KEYS (secondary indexes)
+# =============================================================================
+
+# Trailing pin-cites: "p. 45", "pp. 45-50", "at 12", a parenthesized
+# "(p. 12)", or a bare ", 45" that is not a year ("Smith, 2020" must keep its
+# year). A pin-cite just inside a closing parenthesis ("(Smith 2020, p. 4)")
+# is removed and the parenthesis kept (group 1).
+_PIN = r'(?:\bat|\bpp?\.?)\s*\d+[a-z]?(?:\s*[-\u2013\u2014]\s*\d+[a-z]?)?'
+_PIN_CITE_RE = re.compile(
+    r'(?:\s*\(\s*' + _PIN + r'\s*\)'
+    r'|,?\s*' + _PIN +
+    r'|,\s*(?!(?:1[5-9]|20)\d\d\b)\d{1,4}(?:\s*[-\u2013\u2014]\s*\d+)?)'
+    r'\s*(\))?\s*[.;]?\s*$',
+    re.IGNORECASE
+)
+_NON_WORD_RE = re.compile(r'[^\w\s]+', re.UNICODE)
+
+# Fingerprints shorter than this (or single-token, e.g. "ibid") are too
+# ambiguous to share a cache entry
+MIN_FINGERPRINT_LENGTH = 8
+
+_DOI_IN_TEXT_RE = re.compile(r'\b10\.\d{4,9}/[^\s"<>]+', re.IGNORECASE)
+_URL_IN_TEXT_RE = re.compile(r'https?://[^\s,\)]+', re.IGNORECASE)
+_ISBN_IN_TEXT_RE = re.compile(r'\bISBN(?:-1[03])?:?\s*([\dXx][\d\-\sXx]{8,16}[\dXx])', re.IGNORECASE)
+_PMID_IN_TEXT_RE = re.compile(r'\bPMID:?\s*(\d{6,9})\b', re.IGNORECASE)
+_ARXIV_IN_TEXT_RE = re.compile(r'\barXiv:?\s*(\d{4}\.\d{4,5}(?:v\d+)?|[a-z-]+/\d{7})\b', re.IGNORECASE)
+
+
+def citation_fingerprint(text: str) -> str:
+    """
+    Normalize citation text for fuzzy cache matching.
+    
+    Lowercases, drops a trailing pin-cite, replaces punctuation with spaces
+    and collapses whitespace, so "Smith, 2020", "smith 2020.",
+    "Smith, 2020, p. 4" and "Smith, 2020 (p. 4)" share one fingerprint.
+    
+    Args:
+        text: The citation text
+        
+    Returns:
+        Fingerprint string ("" if too short to be a safe key)
+    """
+    if not text:
+        return ""
+    
+    cleaned = text.strip()
+    for _ in range(2):  # e.g. "..., p. 4, at 5"
+        stripped = _PIN_CITE_RE.sub(r'\1', cleaned)
+        if stripped == cleaned:
+            break
+        cleaned = stripped
+    
+    cleaned = _NON_WORD_RE.sub(' ', cleaned.lower())
+    fingerprint = ' '.join(cleaned.split())
+    
+    if len(fingerprint) < MIN_FINGERPRINT_LENGTH or ' ' not in fingerprint:
+        return ""
+    return fingerprint
+
+
+def _url_key(url: str) -> str:
+    """Canonical URL key: no scheme, no www., no fragment/tracking params."""
+    url = url.rstrip('.,;:')
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return ""
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if not host:
+        return ""
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_')
+    ])
+    path = parts.path.rstrip('/')
+    return f"{host}{path}" + (f"?{query}" if query else "")
+
+
+def _isbn_key(raw: str) -> str:
+    digits = re.sub(r'[^\dXx]', '', raw).upper()
+    return digits if len(digits) in (10, 13) else ""
+
+
+def extract_identifier_keys(text: str) -> List[str]:
+    """
+    Identifier keys (doi:, url:, isbn:, pmid:, arxiv:) found in citation text.
+    
+    A kind of identifier is only used when exactly one appears in the text;
+    compound citations with several DOIs or URLs are not keyed by them.
+    
+    Args:
+        text: The citation text
+        
+    Returns:
+        List of keys such as "doi:10.1086/228943"
+    """
+    if not text:
+        return []
+    
+    keys = []
+    
+    dois = {normalize_doi(m.group(0).rstrip('.,;:)]')) for m in _DOI_IN_TEXT_RE.finditer(text)}
+    if len(dois) == 1:
+        keys.append(f"doi:{dois.pop()}")
+    
+    urls = {_url_key(m.group(0)) for m in _URL_IN_TEXT_RE.finditer(text)} - {""}
+    # When a DOI is present it is the stronger key (and covers doi.org URLs)
+    if len(urls) == 1 and not keys:
+        keys.append(f"url:{urls.pop()}")
+    
+    isbns = {_isbn_key(m.group(1)) for m in _ISBN_IN_TEXT_RE.finditer(text)} - {""}
+    if len(isbns) == 1:
+        keys.append(f"isbn:{isbns.pop()}")
+    
+    pmids = {m.group(1) for m in _PMID_IN_TEXT_RE.finditer(text)}
+    if len(pmids) == 1:
+        keys.append(f"pmid:{pmids.pop()}")
+    
+    arxiv_ids = {m.group(1).lower() for m in _ARXIV_IN_TEXT_RE.finditer(text)}
+    if len(arxiv_ids) == 1:
+        keys.append(f"arxiv:{arxiv_ids.pop()}")
+    
+    return keys
+
+
+def _metadata_identifier_keys(metadata: Dict[str, Any]) -> List[str]:
+    """Identifier keys for resolved metadata (DOI, URL, ISBN fields)."""
+    keys = []
+    doi = metadata.get('doi')
+    if doi:
+        keys.append(f"doi:{normalize_doi(doi)}")
+    url = metadata.get('url')
+    if url:
+        url_key = _url_key(url)
+        if url_key:
+            keys.append(f"url:{url_key}")
+    isbn = metadata.get('isbn')
+    if isbn:
+        isbn_key = _isbn_key(isbn)
+        if isbn_key:
+            keys.append(f"isbn:{isbn_key}")
+    return keys
+
+
 # =============================================================================
 # METADATA CACHE CLASS
 # =============================================================================
@@ -89,13 +272,49 @@ class SourceComponentsCache:
     
     Manages the mapping between citation text hashes and resolved metadata.
     Can be serialized to/from XML for embedding in documents.
+    
+    Lookups try the exact text hash first, then the normalized fingerprint
+    index, then identifier keys, then identifiers seeded by batch
+    resolution. Secondary indexes are rebuilt from entries on load; neither
+    they nor seeded identifiers are serialized.
     """
     
     def __init__(self):
         """Initialize an empty cache."""
         self._cache: Dict[str, Dict[str, Any]] = {}
-        self._version = "1.0"
+        self._version = CACHE_FORMAT_VERSION
         self._created = datetime.utcnow().isoformat()
+        
+        # Lazy loading: XML read from a document is kept unparsed until the
+        # cache is first accessed
+        self._pending_xml: Optional[str] = None
+        self._pending_count: Optional[int] = None
+        self._load_lock = threading.Lock()
+        
+        # Secondary indexes -> exact hash key
+        self._fingerprint_index: Dict[str, str] = {}
+        self._identifier_index: Dict[str, str] = {}
+        
+        # Identifier key -> metadata dict from batch resolution
+        self._seeded: Dict[str, Dict[str, Any]] = {}
+        
+        # Lookup outcomes by tier (for hit-rate reporting)
+        self.lookup_stats: Dict[str, int] = {'exact': 0, 'fingerprint': 0, 'identifier': 0, 'seeded': 0, 'miss': 0}
+    
+    def _ensure_loaded(self) -> None:
+        """Parse pending XML (if any) on first access. Thread-safe."""
+        if self._pending_xml is None:
+            return
+        with self._load_lock:
+            if self._pending_xml is None:
+                return
+            xml_string = self._pending_xml
+            self._parse_xml(xml_string)
+            for hash_key, entry in self._cache.items():
+                self._index_entry(hash_key, entry)
+            self._pending_xml = None
+            self._pending_count = None
+            print(f"[MetadataCache] Loaded {len(self._cache)} cached citations from XML (v{self._version})")
     
     def get(self, citation_text: str) -> Optional[SourceComponents]:
         """
@@ -111,14 +330,61 @@ class SourceComponentsCache:
         if not hash_key:
             return None
         
-        if hash_key in self._cache:
-            print(f"[MetadataCache] Cache HIT for hash {hash_key}: {citation_text[:40]}...")
-            data = self._cache[hash_key]
+        self._ensure_loaded()
+        
+        found_key, tier = self._resolve_key(citation_text, hash_key)
+        self.lookup_stats[tier] = self.lookup_stats.get(tier, 0) + 1
+        
+        if found_key is not None:
+            print(f"[MetadataCache] Cache HIT ({tier}) for hash {hash_key}: {citation_text[:40]}...")
+            if tier == 'seeded':
+                # Promote so the resolved citation is embedded with the document
+                components = SourceComponents.from_dict(self._seeded[found_key])
+                self.set(citation_text, components)
+                return components
+            data = self._cache[found_key]
             return SourceComponents.from_dict(data.get('metadata', {}))
         
         print(f"[MetadataCache] Cache MISS for hash {hash_key}: {citation_text[:40]}...")
         return None
     
+    def _resolve_key(self, citation_text: str, hash_key: str):
+        """
+        Find the entry for a citation: exact hash, fingerprint, identifiers,
+        then seeded identifiers (whose key is an identifier key, not a hash).
+        """
+        if hash_key in self._cache:
+            return hash_key, 'exact'
+        
+        fingerprint = citation_fingerprint(citation_text)
+        if fingerprint and fingerprint in self._fingerprint_index:
+            return self._fingerprint_index[fingerprint], 'fingerprint'
+        
+        id_keys = extract_identifier_keys(citation_text)
+        for id_key in id_keys:
+            if id_key in self._identifier_index:
+                return self._identifier_index[id_key], 'identifier'
+        
+        if self._seeded:
+            for id_key in id_keys:
+                if id_key in self._seeded:
+                    return id_key, 'seeded'
+        
+        return None, 'miss'
+    
+    def _index_entry(self, hash_key: str, entry: Dict[str, Any]) -> None:
+        """Add an entry to the secondary indexes (first writer wins)."""
+        original_text = entry.get('original_text', '')
+        
+        fingerprint = citation_fingerprint(original_text)
+        if fingerprint:
+            self._fingerprint_index.setdefault(fingerprint, hash_key)
+        
+        id_keys = extract_identifier_keys(original_text)
+        id_keys += _metadata_identifier_keys(entry.get('metadata', {}))
+        for id_key in id_keys:
+            self._identifier_index.setdefault(id_key, hash_key)
+    
     def set(self, citation_text: str, metadata: SourceComponents) -> None:
         """
         Store metadata in the cache.
@@ -131,21 +397,43 @@ class SourceComponentsCache:
         if not hash_key or not metadata:
             return
         
-        self._cache[hash_key] = {
+        self._ensure_loaded()
+        
+        entry = {
             'original_text': citation_text.strip(),
             'hash': hash_key,
-            'metadata': metadata.to_dict(),
+            'metadata': metadata.to_dict(include_raw_data=False),
             'cached_at': datetime.utcnow().isoformat(),
         }
+        self._cache[hash_key] = entry
+        self._index_entry(hash_key, entry)
         print(f"[MetadataCache] Stored metadata for hash {hash_key}")
     
+    def seed_identifier(self, id_key: str, metadata: SourceComponents) -> None:
+        """
+        Record batch-resolved metadata for an identifier key
+        ("doi:...", "pmid:...", "arxiv:..."). Seeded entries answer lookups
+        for citations carrying that identifier but are not embedded in the
+        document until a citation is resolved from them.
+        """
+        if not id_key or not metadata:
+            return
+        self._seeded[id_key] = metadata.to_dict(include_raw_data=False)
+    
     def has(self, citation_text: str) -> bool:
         """Check if citation is in cache without retrieving it."""
         hash_key = hash_citation_text(citation_text)
-        return hash_key in self._cache
+        if not hash_key:
+            return False
+        self._ensure_loaded()
+        return self._resolve_key(citation_text, hash_key)[0] is not None
     
     def size(self) -> int:
         """Return number of cached citations."""
+        # v2 parts record their entry count on the root element
+        if self._pending_xml is not None and self._pending_count is not None:
+            return self._pending_count
+        self._ensure_loaded()
         return len(self._cache)
     
     def get_all_components(self) -> List[Dict[str, Any]]:
@@ -156,6 +444,7 @@ class SourceComponentsCache:
         Returns:
             List of metadata dictionaries with original text included
         """
+        self._ensure_loaded()
         results = []
         for hash_key, entry in self._cache.items():
             item = entry.get('metadata', {}).copy()
@@ -165,55 +454,59 @@ class SourceComponentsCache:
             results.append(item)
         return results
     
+    @staticmethod
+    def _compact_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only fields that differ from an empty SourceComponents."""
+        compact = {}
+        for key, value in metadata.items():
+            if key in EMBED_EXCLUDED_FIELDS or value is None:
+                continue
+            if key != 'type' and key in _DEFAULT_COMPONENT_FIELDS and value == _DEFAULT_COMPONENT_FIELDS[key]:
+                continue
+            compact[key] = value
+        return compact
+    
     def to_xml_string(self) -> str:
         """
-        Serialize the cache to XML string.
+        Serialize the cache to XML string (v2 format).
         
         Returns:
             XML string representation of the cache
         """
+        # Untouched v2 part: write it back verbatim without decoding
+        if self._pending_xml is not None and self._pending_count is not None:
+            return self._pending_xml
+        
+        self._ensure_loaded()
+        
+        entries = [
+            {
+                'h': hash_key,
+                'o': entry.get('original_text', ''),
+                'c': entry.get('cached_at', ''),
+                'm': self._compact_metadata(entry.get('metadata', {})),
+            }
+            for hash_key, entry in self._cache.items()
+        ]
+        packed = json.dumps(entries, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        
         root = ET.Element('citategenie', {
-            'version': self._version,
+            'version': CACHE_FORMAT_VERSION,
             'created': self._created,
+            'count': str(len(entries)),
             'xmlns': CITATEGENIE_NS,
         })
-        
-        for hash_key, entry in self._cache.items():
-            citation_el = ET.SubElement(root, 'citation', {'hash': hash_key})
-            
-            # Original text
-            original_el = ET.SubElement(citation_el, 'original')
-            original_el.text = entry.get('original_text', '')
-            
-            # Cached timestamp
-            cached_el = ET.SubElement(citation_el, 'cached_at')
-            cached_el.text = entry.get('cached_at', '')
-            
-            # Metadata fields
-            metadata = entry.get('metadata', {})
-            meta_el = ET.SubElement(citation_el, 'metadata')
-            
-            for key, value in metadata.items():
-                if value is None:
-                    continue
-                
-                field_el = ET.SubElement(meta_el, key)
-                
-                if isinstance(value, list):
-                    # Handle lists (e.g., authors)
-                    field_el.text = json.dumps(value)
-                elif isinstance(value, dict):
-                    # Handle dicts (e.g., raw_data)
-                    field_el.text = json.dumps(value)
-                else:
-                    field_el.text = str(value)
+        payload_el = ET.SubElement(root, 'payload', {'encoding': PAYLOAD_ENCODING})
+        payload_el.text = base64.b64encode(zlib.compress(packed, 9)).decode('ascii')
         
         return ET.tostring(root, encoding='unicode', xml_declaration=True)
     
     @classmethod
     def from_xml_string(cls, xml_string: str) -> 'SourceComponentsCache':
         """
-        Deserialize cache from XML string.
+        Create a cache backed by an XML string (v1 or v2).
+        
+        Parsing is deferred until the cache is first accessed.
         
         Args:
             xml_string: XML representation of the cache
@@ -222,63 +515,107 @@ class SourceComponentsCache:
             SourceComponentsCache instance
         """
         cache = cls()
+        cache._pending_xml = xml_string
         
+        header = xml_string[:1024]
+        version_match = _ROOT_VERSION_RE.search(header)
+        count_match = _ROOT_COUNT_RE.search(header)
+        if version_match and version_match.group(1) == CACHE_FORMAT_VERSION and count_match:
+            cache._pending_count = int(count_match.group(1))
+        
+        return cache
+    
+    def _parse_xml(self, xml_string: str) -> None:
+        """Parse a cache part into self._cache, dispatching on format version."""
         try:
             root = ET.fromstring(xml_string)
             
-            cache._version = root.get('version', '1.0')
-            cache._created = root.get('created', datetime.utcnow().isoformat())
+            self._version = root.get('version', LEGACY_FORMAT_VERSION)
+            self._created = root.get('created', datetime.utcnow().isoformat())
             
-            for citation_el in root.findall('.//citation'):
-                hash_key = citation_el.get('hash')
-                if not hash_key:
-                    continue
-                
-                # Get original text
-                original_el = citation_el.find('original')
-                original_text = original_el.text if original_el is not None and original_el.text else ''
-                
-                # Get cached timestamp
-                cached_el = citation_el.find('cached_at')
-                cached_at = cached_el.text if cached_el is not None and cached_el.text else ''
-                
-                # Get metadata
-                metadata = {}
-                meta_el = citation_el.find('metadata')
-                if meta_el is not None:
-                    for field_el in meta_el:
-                        key = field_el.tag
-                        value = field_el.text
-                        
-                        if value is None:
-                            metadata[key] = None
-                        elif value.startswith('[') or value.startswith('{'):
-                            # Parse JSON for lists/dicts
-                            try:
-                                metadata[key] = json.loads(value)
-                            except json.JSONDecodeError:
-                                metadata[key] = value
-                        elif key == 'confidence':
-                            try:
-                                metadata[key] = float(value)
-                            except ValueError:
-                                metadata[key] = 1.0
-                        else:
-                            metadata[key] = value
-                
-                cache._cache[hash_key] = {
-                    'original_text': original_text,
-                    'hash': hash_key,
-                    'metadata': metadata,
-                    'cached_at': cached_at,
-                }
+            payload_el = root.find(f'{{{CITATEGENIE_NS}}}payload')
+            if payload_el is None:
+                payload_el = root.find('payload')
             
-            print(f"[MetadataCache] Loaded {cache.size()} cached citations from XML")
+            if payload_el is not None:
+                self._parse_v2_payload(payload_el)
+            else:
+                self._parse_v1_elements(root)
             
         except ET.ParseError as e:
             print(f"[MetadataCache] Failed to parse XML: {e}")
+        except (ValueError, zlib.error) as e:
+            print(f"[MetadataCache] Failed to decode cache payload: {e}")
+    
+    def _parse_v2_payload(self, payload_el: ET.Element) -> None:
+        """Decode a v2 compressed JSON payload."""
+        encoding = payload_el.get('encoding', PAYLOAD_ENCODING)
+        if encoding != PAYLOAD_ENCODING:
+            print(f"[MetadataCache] Unsupported payload encoding: {encoding}")
+            return
         
-        return cache
+        packed = zlib.decompress(base64.b64decode(payload_el.text or ''))
+        for entry in json.loads(packed.decode('utf-8')):
+            hash_key = entry.get('h')
+            if not hash_key:
+                continue
+            self._cache[hash_key] = {
+                'original_text': entry.get('o', ''),
+                'hash': hash_key,
+                'metadata': entry.get('m', {}),
+                'cached_at': entry.get('c', ''),
+            }
+    
+    def _parse_v1_elements(self, root: ET.Element) -> None:
+        """Read the legacy one-element-per-field format."""
+        for citation_el in root.iter():
+            if citation_el.tag.rsplit('}', 1)[-1] != 'citation':
+                continue
+            hash_key = citation_el.get('hash')
+            if not hash_key:
+                continue
+            
+            # Child lookups ignore the (default) namespace the v1 writer declared
+            children = {child.tag.rsplit('}', 1)[-1]: child for child in citation_el}
+            
+            # Get original text
+            original_el = children.get('original')
+            original_text = original_el.text if original_el is not None and original_el.text else ''
+            
+            # Get cached timestamp
+            cached_el = children.get('cached_at')
+            cached_at = cached_el.text if cached_el is not None and cached_el.text else ''
+            
+            # Get metadata
+            metadata = {}
+            meta_el = children.get('metadata')
+            if meta_el is not None:
+                for field_el in meta_el:
+                    key = field_el.tag.rsplit('}', 1)[-1]
+                    value = field_el.text
+                    
+                    if value is None:
+                        metadata[key] = None
+                    elif value.startswith('[') or value.startswith('{'):
+                        # Parse JSON for lists/dicts
+                        try:
+                            metadata[key] = json.loads(value)
+                        except json.JSONDecodeError:
+                            metadata[key] = value
+                    elif key == 'confidence':
+                        try:
+                            metadata[key] = float(value)
+                        except ValueError:
+                            metadata[key] = 1.0
+                    else:
+                        metadata[key] = value
+            
+            self._cache[hash_key] = {
+                'original_text': original_text,
+                'hash': hash_key,
+                'metadata': metadata,
+                'cached_at': cached_at,
+            }
 
 
 # =============================================================================
@@ -331,6 +668,33 @@ def load_cache_from_docx(file_bytes: bytes) -> SourceComponentsCache:
         return SourceComponentsCache()
 
 
+def embed_cache_parts(parts: Dict[str, bytes], cache: SourceComponentsCache) -> bool:
+    """
+    Add the citation metadata cache to in-memory package parts.
+    
+    Adds or replaces customXml/citategenie.xml and registers its content
+    type in [Content_Types].xml.
+    
+    Args:
+        parts: Part name -> bytes (see processors.docx_package), updated in place
+        cache: The SourceComponentsCache to embed
+        
+    Returns:
+        True if the cache was embedded
+    """
+    if cache.size() == 0:
+        print("[DocumentMetadata] Empty cache, skipping embed")
+        return False
+    
+    parts[f'{CUSTOM_XML_DIR}/{CUSTOM_XML_ITEM_FILENAME}'] = cache.to_xml_string().encode('utf-8')
+    print(f"[DocumentMetadata] Wrote cache with {cache.size()} citations to {CUSTOM_XML_ITEM_FILENAME}")
+    
+    content_types = parts.get('[Content_Types].xml')
+    if content_types is not None:
+        parts['[Content_Types].xml'] = _update_content_types(content_types)
+    return True
+
+
 def save_cache_to_docx(file_bytes: bytes, cache: SourceComponentsCache) -> bytes:
     """
     Embed the citation metadata cache into a Word document.
@@ -338,6 +702,9 @@ def save_cache_to_docx(file_bytes: bytes, cache: SourceComponentsCache) -> bytes
     Adds or updates customXml/citategenie.xml within the docx archive.
     Also updates Content_Types and relationships as needed.
     
+    Documents written by WordDocumentProcessor.save_to_buffer(cache=...)
+    already carry the cache; this is for callers holding finished bytes.
+    
     Args:
         file_bytes: The document as bytes
         cache: The SourceComponentsCache to embed
@@ -349,62 +716,25 @@ def save_cache_to_docx(file_bytes: bytes, cache: SourceComponentsCache) -> bytes
         print("[DocumentMetadata] Empty cache, skipping embed")
         return file_bytes
     
-    temp_dir = tempfile.mkdtemp()
-    
     try:
-        # Extract docx
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            zf.extractall(temp_dir)
-        
-        # Create customXml directory if it doesn't exist
-        custom_xml_dir = os.path.join(temp_dir, CUSTOM_XML_DIR)
-        os.makedirs(custom_xml_dir, exist_ok=True)
-        
-        # Write our XML cache
-        cache_path = os.path.join(custom_xml_dir, CUSTOM_XML_ITEM_FILENAME)
-        xml_content = cache.to_xml_string()
-        with open(cache_path, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-        
-        print(f"[DocumentMetadata] Wrote cache with {cache.size()} citations to {CUSTOM_XML_ITEM_FILENAME}")
-        
-        # Update [Content_Types].xml to include our custom XML part
-        content_types_path = os.path.join(temp_dir, '[Content_Types].xml')
-        _update_content_types(content_types_path)
-        
-        # Repackage docx
-        output_buffer = BytesIO()
-        with zipfile.ZipFile(output_buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for root_dir, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = os.path.join(root_dir, file)
-                    arcname = os.path.relpath(file_path, temp_dir)
-                    zf.write(file_path, arcname)
-        
-        output_buffer.seek(0)
-        return output_buffer.read()
+        parts = read_docx_parts(file_bytes)
+        embed_cache_parts(parts, cache)
+        return write_docx_parts(parts).getvalue()
         
     except Exception as e:
         print(f"[DocumentMetadata] Error saving cache: {e}")
         return file_bytes
-        
-    finally:
-        shutil.rmtree(temp_dir, ignore_errors=True)
 
 
-def _update_content_types(content_types_path: str) -> None:
+def _update_content_types(content_types: bytes) -> bytes:
     """
     Update [Content_Types].xml to include our custom XML content type.
     
-    This ensures Word recognizes our custom XML part.
+    This ensures Word recognizes our custom XML part. Returns the input
+    unchanged if the override already exists or the XML cannot be parsed.
     """
-    if not os.path.exists(content_types_path):
-        return
-    
     try:
-        # Parse existing content types
-        tree = ET.parse(content_types_path)
-        root = tree.getroot()
+        root = ET.fromstring(content_types)
         
         # Namespace for content types
         ns = {'ct': 'http://schemas.openxmlformats.org/package/2006/content-types'}
@@ -420,11 +750,15 @@ def _update_content_types(content_types_path: str) -> None:
             override.set('PartName', our_path)
             override.set('ContentType', 'application/xml')
             
-            tree.write(content_types_path, encoding='UTF-8', xml_declaration=True)
+            buffer = BytesIO()
+            ET.ElementTree(root).write(buffer, encoding='UTF-8', xml_declaration=True)
             print(f"[DocumentMetadata] Added content type for {our_path}")
+            return buffer.getvalue()
             
     except Exception as e:
         print(f"[DocumentMetadata] Error updating content types: {e}")
+    
+    return content_types
 
 
 # =============================================================================
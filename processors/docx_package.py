@@ -0,0 +1,64 @@
+"""
+citeflex/processors/docx_package.py
+
+In-memory .docx package parts for the single output stage.
+
+A processed document used to be zipped, unzipped and re-zipped three
+times on the way out (save_to_buffer -> LinkActivator.process ->
+save_cache_to_docx), each pass inflating and deflating every part. Output
+steps now work on a dict of part name -> bytes and the package is written
+once:
+
+    parts = read_extracted_parts(temp_dir)     # or read_docx_parts(bytes)
+    LinkActivator.apply_to_parts(parts)         # rewrite note/body XML
+    embed_cache_parts(parts, metadata_cache)    # add customXml + content type
+    buffer = write_docx_parts(parts)
+
+Part names use forward slashes, as inside the zip. Dict order is kept, so
+parts that already existed keep their position in the archive and added
+parts go at the end.
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+"""
+
+import os
+import zipfile
+from io import BytesIO
+from typing import Dict, Union, BinaryIO
+
+
+def read_docx_parts(source: Union[bytes, BinaryIO]) -> Dict[str, bytes]:
+    """Read every part of a .docx (bytes or file-like) into memory."""
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    else:
+        source.seek(0)
+    with zipfile.ZipFile(source, 'r') as zf:
+        return {
+            info.filename: zf.read(info)
+            for info in zf.infolist()
+            if not info.is_dir()
+        }
+
+
+def read_extracted_parts(temp_dir: str) -> Dict[str, bytes]:
+    """Read every part of a package extracted to ``temp_dir``."""
+    parts = {}
+    for root, dirs, files in os.walk(temp_dir):
+        for file in files:
+            file_path = os.path.join(root, file)
+            arcname = os.path.relpath(file_path, temp_dir).replace(os.sep, '/')
+            with open(file_path, 'rb') as f:
+                parts[arcname] = f.read()
+    return parts
+
+
+def write_docx_parts(parts: Dict[str, bytes]) -> BytesIO:
+    """Write parts to a new deflated .docx; the buffer is rewound."""
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+    buffer.seek(0)
+    return buffer
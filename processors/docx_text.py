@@ -0,0 +1,265 @@
+"""
+citeflex/processors/docx_text.py
+
+Single-pass streaming text extraction for Word document bodies.
+
+Every body-text consumer (word_document, author_year_extractor,
+topic_extractor, parenthetical_extractor, url_extractor, doi_extractor)
+used to unzip and ET.parse() word/document.xml on its own, so one
+author-date upload parsed the same 5-20 MB XML four or five times and held
+the full element tree in memory each time.
+
+This module walks document.xml once with iterparse(), detaching every
+element as soon as it has been read, and records:
+- paragraphs (text + global character offsets)
+- text runs (each w:t segment, in document order)
+- hyperlinks (target URL/anchor + paragraph-relative span)
+
+The parsed result is cached per upload (keyed on a SHA-256 of the document
+bytes; the bytes themselves are not kept), so all extractors working on the
+same upload share one parse.
+
+Text semantics match the previous ET.findall('.//w:p') / ('.//w:t') loops
+exactly, including paragraphs nested inside text boxes: an outer paragraph's
+text contains the text of any paragraph nested within it.
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: Cache keyed on a content hash instead of the upload bytes
+"""
+
+import hashlib
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import List, Dict, Optional, NamedTuple
+
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+
+_TAG_P = f'{{{W_NS}}}p'
+_TAG_T = f'{{{W_NS}}}t'
+_TAG_HYPERLINK = f'{{{W_NS}}}hyperlink'
+_ATTR_R_ID = f'{{{R_NS}}}id'
+_ATTR_ANCHOR = f'{{{W_NS}}}anchor'
+
+DOCUMENT_PART = 'word/document.xml'
+DOCUMENT_RELS_PART = 'word/_rels/document.xml.rels'
+
+# Number of distinct uploads whose parsed body is kept in memory
+BODY_CACHE_SIZE = 4
+
+
+class TextRun(NamedTuple):
+    """One w:t text segment, in document order."""
+    text: str
+    para_index: int   # innermost enclosing paragraph
+    offset: int       # start offset within that paragraph's text
+
+
+@dataclass
+class Hyperlink:
+    """A w:hyperlink element and the span of text it covers."""
+    para_index: int
+    start: int                    # paragraph-relative
+    end: int                      # paragraph-relative
+    url: Optional[str] = None     # external target (from relationships)
+    anchor: Optional[str] = None  # internal bookmark target
+
+
+@dataclass
+class Paragraph:
+    """A w:p element with its concatenated text and global offsets."""
+    index: int
+    text: str = ''
+    char_start: int = 0
+    char_end: int = 0
+    run_start: int = 0   # index of first TextRun inside this paragraph
+    run_end: int = 0     # one past the last TextRun inside this paragraph
+
+
+@dataclass
+class DocxBody:
+    """Parsed body of a Word document (word/document.xml)."""
+    paragraphs: List[Paragraph] = field(default_factory=list)
+    runs: List[TextRun] = field(default_factory=list)
+    hyperlinks: List[Hyperlink] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        """Non-empty paragraphs joined by newlines."""
+        return '\n'.join(p.text for p in self.paragraphs if p.text)
+
+    def run_text(self, separator: str = ' ') -> str:
+        """All w:t segments joined by ``separator`` (ignores paragraphs)."""
+        return separator.join(run.text for run in self.runs)
+
+    def positions(self) -> List[Dict]:
+        """Paragraph position dicts as returned by extract_body_text_with_positions."""
+        return [
+            {
+                'text': p.text,
+                'para_index': p.index,
+                'char_start': p.char_start,
+                'char_end': p.char_end,
+            }
+            for p in self.paragraphs
+        ]
+
+    def hyperlink_text(self, link: Hyperlink) -> str:
+        """Visible text covered by a hyperlink."""
+        return self.paragraphs[link.para_index].text[link.start:link.end]
+
+
+def _read_relationship_targets(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """Map relationship ids to targets for external hyperlinks."""
+    if DOCUMENT_RELS_PART not in zf.namelist():
+        return {}
+    targets = {}
+    with zf.open(DOCUMENT_RELS_PART) as f:
+        root = ET.parse(f).getroot()
+    for rel in root.iter(f'{{{PKG_REL_NS}}}Relationship'):
+        rel_id = rel.get('Id')
+        if rel_id and rel.get('TargetMode') == 'External':
+            targets[rel_id] = rel.get('Target', '')
+    return targets
+
+
+def stream_document_body(stream, rel_targets: Optional[Dict[str, str]] = None) -> DocxBody:
+    """
+    Parse a document.xml stream in a single iterparse pass.
+
+    Elements are detached from their parent as soon as their end tag has
+    been processed, so peak memory is bounded by nesting depth rather than
+    document size.
+
+    Args:
+        stream: File-like object positioned at the start of document.xml
+        rel_targets: Relationship id -> URL map for resolving hyperlinks
+
+    Returns:
+        DocxBody with paragraphs, runs and hyperlinks
+    """
+    rel_targets = rel_targets or {}
+    body = DocxBody()
+    paragraphs = body.paragraphs
+    runs = body.runs
+
+    elem_stack = []   # open elements, for detaching finished children
+    open_paras = []   # (Paragraph, parts list, [length]) for each open w:p
+    open_links = []   # Hyperlink records awaiting their end offset
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        tag = elem.tag
+
+        if event == 'start':
+            if tag == _TAG_P:
+                # Allocate in document (pre-)order so nested paragraphs
+                # follow their container, matching findall('.//w:p')
+                para = Paragraph(index=len(paragraphs), run_start=len(runs))
+                paragraphs.append(para)
+                open_paras.append((para, [], [0]))
+            elif tag == _TAG_HYPERLINK and open_paras:
+                para, _, length = open_paras[-1]
+                open_links.append(Hyperlink(
+                    para_index=para.index,
+                    start=length[0],
+                    end=length[0],
+                    url=rel_targets.get(elem.get(_ATTR_R_ID, '')),
+                    anchor=elem.get(_ATTR_ANCHOR),
+                ))
+            elem_stack.append(elem)
+            continue
+
+        # event == 'end'
+        elem_stack.pop()
+
+        if tag == _TAG_T:
+            text = elem.text
+            if text and open_paras:
+                inner, _, inner_length = open_paras[-1]
+                runs.append(TextRun(text, inner.index, inner_length[0]))
+                for _, parts, length in open_paras:
+                    parts.append(text)
+                    length[0] += len(text)
+        elif tag == _TAG_P:
+            para, parts, _ = open_paras.pop()
+            para.text = ''.join(parts)
+            para.run_end = len(runs)
+        elif tag == _TAG_HYPERLINK and open_links:
+            link = open_links.pop()
+            link.end = open_paras[-1][2][0] if open_paras else link.start
+            body.hyperlinks.append(link)
+
+        # Detach the finished element: it is always its parent's last child
+        if elem_stack:
+            del elem_stack[-1][-1]
+
+    # Global offsets: one separator character between consecutive paragraphs
+    char_offset = 0
+    for para in paragraphs:
+        para.char_start = char_offset
+        para.char_end = char_offset + len(para.text)
+        char_offset = para.char_end + 1
+
+    body.hyperlinks.sort(key=lambda h: (h.para_index, h.start))
+    return body
+
+
+def _parse_docx_body(file_bytes: bytes) -> Optional[DocxBody]:
+    with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
+        if DOCUMENT_PART not in zf.namelist():
+            return None
+        rel_targets = _read_relationship_targets(zf)
+        with zf.open(DOCUMENT_PART) as f:
+            return stream_document_body(f, rel_targets)
+
+
+# SHA-256 of the upload -> parsed body (LRU). Keys are digests so a cached
+# entry does not keep a multi-megabyte upload alive.
+_body_cache: 'OrderedDict[bytes, Optional[DocxBody]]' = OrderedDict()
+_body_cache_lock = threading.Lock()
+
+
+def parse_docx_body(file_bytes: bytes) -> Optional[DocxBody]:
+    """
+    Parse (or fetch from cache) the body of a .docx file.
+
+    The same upload is parsed at most once while it stays in the small LRU
+    cache, so every extractor in a processing run shares the result. The
+    returned object is shared: callers must not mutate it.
+
+    Args:
+        file_bytes: The .docx file as bytes
+
+    Returns:
+        DocxBody, or None if the package has no word/document.xml
+
+    Raises:
+        zipfile.BadZipFile / ET.ParseError on malformed input
+    """
+    key = hashlib.sha256(file_bytes).digest()
+    with _body_cache_lock:
+        if key in _body_cache:
+            _body_cache.move_to_end(key)
+            return _body_cache[key]
+
+    body = _parse_docx_body(file_bytes)
+
+    with _body_cache_lock:
+        _body_cache[key] = body
+        _body_cache.move_to_end(key)
+        while len(_body_cache) > BODY_CACHE_SIZE:
+            _body_cache.popitem(last=False)
+    return body
+
+
+def clear_body_cache() -> None:
+    """Drop all cached document bodies."""
+    with _body_cache_lock:
+        _body_cache.clear()
@@ -14,10 +14,9 @@ Version History:
 """
 
 import re
-import zipfile
-from io import BytesIO
 from typing import List, Dict, Optional
-import xml.etree.ElementTree as ET
+
+from processors.docx_text import parse_docx_body
 
 
 # =============================================================================
@@ -193,49 +192,32 @@ def extract_identifiers_from_docx(file_bytes: bytes) -> List[Dict]:
         List of identifier dicts with position data
     """
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            if 'word/document.xml' not in zf.namelist():
-                print("[DOIExtractor] No document.xml found")
-                return []
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            
-            results = []
-            char_offset = 0
-            
-            for para in root.findall('.//w:p', ns):
-                para_text_parts = []
-                
-                for t in para.findall('.//w:t', ns):
-                    if t.text:
-                        para_text_parts.append(t.text)
-                
-                para_text = ''.join(para_text_parts)
-                
-                # Find identifiers in this paragraph
-                para_ids = extract_all_identifiers(para_text)
-                
-                for id_info in para_ids:
-                    id_info['paragraph_offset'] = char_offset
-                    id_info['global_start'] = char_offset + id_info['start']
-                    id_info['global_end'] = char_offset + id_info['end']
-                    results.append(id_info)
-                
-                char_offset += len(para_text) + 1
-            
-            # Count by type
-            type_counts = {}
-            for r in results:
-                t = r['type']
-                type_counts[t] = type_counts.get(t, 0) + 1
-            
-            print(f"[DOIExtractor] Found identifiers: {type_counts}")
-            return results
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            print("[DOIExtractor] No document.xml found")
+            return []
+        
+        results = []
+        
+        for para in body.paragraphs:
+            # Find identifiers in this paragraph
+            para_ids = extract_all_identifiers(para.text)
             
+            for id_info in para_ids:
+                id_info['paragraph_offset'] = para.char_start
+                id_info['global_start'] = para.char_start + id_info['start']
+                id_info['global_end'] = para.char_start + id_info['end']
+                results.append(id_info)
+        
+        # Count by type
+        type_counts = {}
+        for r in results:
+            t = r['type']
+            type_counts[t] = type_counts.get(t, 0) + 1
+        
+        print(f"[DOIExtractor] Found identifiers: {type_counts}")
+        return results
+        
     except Exception as e:
         print(f"[DOIExtractor] Error: {e}")
         return []
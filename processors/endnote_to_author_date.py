@@ -35,6 +35,7 @@ from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from models import SourceComponents, CitationType
+from tracing import submit_traced
 from formatters.base import get_formatter
 
 
@@ -260,14 +261,38 @@ class EndnoteToAuthorDateProcessor:
         position = 0
         paragraphs = body.findall('.//w:p', NAMESPACES)
         
+        w = NAMESPACES['w']
+        footnote_tag = f'{{{w}}}footnoteReference'
+        endnote_tag = f'{{{w}}}endnoteReference'
+        text_tag = f'{{{w}}}t'
+        id_attr = f'{{{w}}}id'
+        
         for para_idx, para in enumerate(paragraphs):
             runs = para.findall('.//w:r', NAMESPACES)
             
             for run in runs:
+                # One walk over the run collects the first footnote/endnote
+                # reference and the run's text length
+                footnote_ref = None
+                endnote_ref = None
+                run_text_len = 0
+                for elem in run.iter():
+                    if elem is run:
+                        continue
+                    tag = elem.tag
+                    if tag == text_tag:
+                        if elem.text:
+                            run_text_len += len(elem.text)
+                    elif tag == footnote_tag:
+                        if footnote_ref is None:
+                            footnote_ref = elem
+                    elif tag == endnote_tag:
+                        if endnote_ref is None:
+                            endnote_ref = elem
+                
                 # Check for footnote reference
-                footnote_ref = run.find('.//w:footnoteReference', NAMESPACES)
                 if footnote_ref is not None:
-                    note_id = footnote_ref.get(f'{{{NAMESPACES["w"]}}}id')
+                    note_id = footnote_ref.get(id_attr)
                     if note_id and note_id not in ('0', '-1'):  # Skip separator/continuation
                         self.note_references.append(NoteReference(
                             note_id=note_id,
@@ -279,9 +304,8 @@ class EndnoteToAuthorDateProcessor:
                         ))
                 
                 # Check for endnote reference
-                endnote_ref = run.find('.//w:endnoteReference', NAMESPACES)
                 if endnote_ref is not None:
-                    note_id = endnote_ref.get(f'{{{NAMESPACES["w"]}}}id')
+                    note_id = endnote_ref.get(id_attr)
                     if note_id and note_id not in ('0', '-1'):
                         self.note_references.append(NoteReference(
                             note_id=note_id,
@@ -293,9 +317,7 @@ class EndnoteToAuthorDateProcessor:
                         ))
                 
                 # Track position (approximate by counting text elements)
-                for text_elem in run.findall('.//w:t', NAMESPACES):
-                    if text_elem.text:
-                        position += len(text_elem.text)
+                position += run_text_len
         
         print(f"[EndnoteToAuthorDate] Found {len(self.note_references)} note references")
     
@@ -404,7 +426,7 @@ class EndnoteToAuthorDateProcessor:
         
         # Process in parallel for speed
         with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(lookup_single, c): c for c in self.citations}
+            futures = {submit_traced(executor, lookup_single, c): c for c in self.citations}
             for future in as_completed(futures):
                 try:
                     future.result()
@@ -18,7 +18,7 @@ from typing import List, Dict, Optional, Tuple
 import xml.etree.ElementTree as ET
 
 from models import SourceComponents, CitationType
-from formatters.base import get_formatter
+from formatters.cache import get_cached_formatter
 
 
 # Styles that use footnotes/endnotes
@@ -75,7 +75,7 @@ def format_footnote(
     Returns:
         Formatted footnote string
     """
-    formatter = get_formatter(style)
+    formatter = get_cached_formatter(style)
     
     if is_first_occurrence:
         formatted = formatter.format(metadata)
@@ -200,7 +200,7 @@ def update_document_footnotes(
     Returns:
         Updated document bytes
     """
-    from document_processor import WordDocumentProcessor, LinkActivator
+    from document_processor import WordDocumentProcessor
     
     processor = WordDocumentProcessor(BytesIO(file_bytes))
     
@@ -215,11 +215,8 @@ def update_document_footnotes(
             else:
                 processor.write_endnote(str(note_id), formatted)
     
-    # Save to buffer
-    output_buffer = processor.save_to_buffer()
-    
-    # Activate URLs as hyperlinks
-    output_buffer = LinkActivator.process(output_buffer)
+    # Save to buffer, activating URLs as hyperlinks in the same pass
+    output_buffer = processor.save_to_buffer(add_links=True)
     
     processor.cleanup()
     
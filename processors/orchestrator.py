@@ -49,6 +49,7 @@ from processors.word_document import (
     apply_text_replacements,
     append_references_section
 )
+from engines.identifier_batch import resolve_identifiers
 from models import SourceComponents
 
 
@@ -207,6 +208,19 @@ def _process_author_date_style(
         document_context = ", ".join(topics) if topics else ""
         print(f"[Orchestrator] Document topics: {document_context[:100]}...")
         
+        # Resolve all DOIs/PMIDs/arXiv ids with batched requests; the
+        # per-item lookups below then hit the prefetch store
+        if identifiers:
+            try:
+                by_type = {'doi': [], 'pmid': [], 'arxiv': []}
+                for ident in identifiers:
+                    if ident.get('type') in by_type:
+                        by_type[ident['type']].append(ident['identifier'])
+                prefetched = resolve_identifiers(by_type['doi'], by_type['pmid'], by_type['arxiv'])
+                print(f"[Orchestrator] Prefetched {len(prefetched)} identifiers")
+            except Exception as e:
+                print(f"[Orchestrator] Identifier prefetch failed: {e}")
+        
         # Step 3: Classify and lookup each extraction
         metadata_map = {}  # original_text -> SourceComponents
         all_metadata = []
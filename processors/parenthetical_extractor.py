@@ -15,10 +15,9 @@ Version History:
 """
 
 import re
-import zipfile
-from io import BytesIO
 from typing import List, Dict, Optional, Tuple
-import xml.etree.ElementTree as ET
+
+from processors.docx_text import parse_docx_body
 
 
 # =============================================================================
@@ -317,49 +316,32 @@ def extract_parentheticals_from_docx(file_bytes: bytes) -> List[Dict]:
         List of citation dicts with position data
     """
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            if 'word/document.xml' not in zf.namelist():
-                print("[ParentheticalExtractor] No document.xml found")
-                return []
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            
-            results = []
-            char_offset = 0
-            
-            for para in root.findall('.//w:p', ns):
-                para_text_parts = []
-                
-                for t in para.findall('.//w:t', ns):
-                    if t.text:
-                        para_text_parts.append(t.text)
-                
-                para_text = ''.join(para_text_parts)
-                
-                # Find citations in this paragraph
-                para_citations = extract_all_parentheticals(para_text)
-                
-                for cite in para_citations:
-                    cite['paragraph_offset'] = char_offset
-                    cite['global_start'] = char_offset + cite['start']
-                    cite['global_end'] = char_offset + cite['end']
-                    results.append(cite)
-                
-                char_offset += len(para_text) + 1
-            
-            # Count by type
-            type_counts = {}
-            for r in results:
-                t = r['type']
-                type_counts[t] = type_counts.get(t, 0) + 1
-            
-            print(f"[ParentheticalExtractor] Found citations: {type_counts}")
-            return results
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            print("[ParentheticalExtractor] No document.xml found")
+            return []
+        
+        results = []
+        
+        for para in body.paragraphs:
+            # Find citations in this paragraph
+            para_citations = extract_all_parentheticals(para.text)
             
+            for cite in para_citations:
+                cite['paragraph_offset'] = para.char_start
+                cite['global_start'] = para.char_start + cite['start']
+                cite['global_end'] = para.char_start + cite['end']
+                results.append(cite)
+        
+        # Count by type
+        type_counts = {}
+        for r in results:
+            t = r['type']
+            type_counts[t] = type_counts.get(t, 0) + 1
+        
+        print(f"[ParentheticalExtractor] Found citations: {type_counts}")
+        return results
+        
     except Exception as e:
         print(f"[ParentheticalExtractor] Error: {e}")
         return []
@@ -11,10 +11,9 @@ Version History:
 """
 
 import re
-import zipfile
-from io import BytesIO
 from typing import List, Dict, Optional
-import xml.etree.ElementTree as ET
+
+from processors.docx_text import parse_docx_body
 
 
 # URL pattern - matches http/https URLs
@@ -131,45 +130,26 @@ def extract_urls_from_docx(file_bytes: bytes) -> List[Dict[str, any]]:
         List of dicts with URL info including position data
     """
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            # Read document.xml (main body only)
-            if 'word/document.xml' not in zf.namelist():
-                print("[URLExtractor] No document.xml found")
-                return []
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            
-            # Extract text while tracking paragraph positions
-            results = []
-            char_offset = 0
-            
-            for para in root.findall('.//w:p', ns):
-                para_text_parts = []
-                
-                for t in para.findall('.//w:t', ns):
-                    if t.text:
-                        para_text_parts.append(t.text)
-                
-                para_text = ''.join(para_text_parts)
-                
-                # Find URLs in this paragraph
-                para_urls = extract_urls_from_text(para_text)
-                
-                for url_info in para_urls:
-                    url_info['paragraph_offset'] = char_offset
-                    url_info['global_start'] = char_offset + url_info['start']
-                    url_info['global_end'] = char_offset + url_info['end']
-                    results.append(url_info)
-                
-                char_offset += len(para_text) + 1  # +1 for paragraph break
-            
-            print(f"[URLExtractor] Found {len(results)} URLs in document body")
-            return results
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            print("[URLExtractor] No document.xml found")
+            return []
+        
+        results = []
+        
+        for para in body.paragraphs:
+            # Find URLs in this paragraph
+            para_urls = extract_urls_from_text(para.text)
             
+            for url_info in para_urls:
+                url_info['paragraph_offset'] = para.char_start
+                url_info['global_start'] = para.char_start + url_info['start']
+                url_info['global_end'] = para.char_start + url_info['end']
+                results.append(url_info)
+        
+        print(f"[URLExtractor] Found {len(results)} URLs in document body")
+        return results
+        
     except Exception as e:
         print(f"[URLExtractor] Error: {e}")
         return []
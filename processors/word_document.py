@@ -32,6 +32,8 @@ from dataclasses import dataclass, field
 from io import BytesIO
 
 from models import normalize_doi
+from tracing import submit_traced
+from processors.docx_text import parse_docx_body
 
 
 # =============================================================================
@@ -1024,7 +1026,8 @@ def process_document(
         return fetch_metadata_for_note(note, note_type)
     
     with ThreadPoolExecutor(max_workers=PARALLEL_WORKERS) as executor:
-        fetched_data = list(executor.map(fetch_wrapper, all_notes))
+        futures = [submit_traced(executor, fetch_wrapper, args) for args in all_notes]
+        fetched_data = [future.result() for future in futures]
     
     print(f"[process_document] Phase 1 complete: {len(fetched_data)} notes fetched")
     
@@ -1357,36 +1360,20 @@ def extract_body_text(file_bytes: bytes) -> str:
     """
     Extract plain text from document body.
     
+    Uses the shared streaming parse (processors.docx_text), so repeated
+    calls for the same upload do not re-parse document.xml.
+    
     Args:
         file_bytes: Document as bytes
         
     Returns:
         Plain text string
     """
-    NS_BODY = {
-        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    }
-    
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            if 'word/document.xml' not in zf.namelist():
-                return ""
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            text_parts = []
-            
-            for para in root.findall('.//w:p', NS_BODY):
-                para_text = []
-                for t in para.findall('.//w:t', NS_BODY):
-                    if t.text:
-                        para_text.append(t.text)
-                if para_text:
-                    text_parts.append(''.join(para_text))
-            
-            return '\n'.join(text_parts)
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            return ""
+        return body.text
             
     except Exception as e:
         print(f"[WordDocument] Error extracting text: {e}")
@@ -1405,40 +1392,11 @@ def extract_body_text_with_positions(file_bytes: bytes) -> List[Dict]:
     Returns:
         List of dicts with 'text', 'para_index', 'char_start', 'char_end'
     """
-    NS_BODY = {
-        'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main',
-    }
-    
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            if 'word/document.xml' not in zf.namelist():
-                return []
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            paragraphs = []
-            char_offset = 0
-            
-            for idx, para in enumerate(root.findall('.//w:p', NS_BODY)):
-                para_text = []
-                for t in para.findall('.//w:t', NS_BODY):
-                    if t.text:
-                        para_text.append(t.text)
-                
-                full_text = ''.join(para_text)
-                
-                paragraphs.append({
-                    'text': full_text,
-                    'para_index': idx,
-                    'char_start': char_offset,
-                    'char_end': char_offset + len(full_text),
-                })
-                
-                char_offset += len(full_text) + 1  # +1 for newline
-            
-            return paragraphs
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            return []
+        return body.positions()
             
     except Exception as e:
         print(f"[WordDocument] Error extracting positions: {e}")
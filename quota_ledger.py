@@ -0,0 +1,433 @@
+"""
+citeflex/quota_ledger.py
+
+Shared daily-quota accounting for metered (free-tier) APIs.
+
+The free news APIs allow a fixed number of calls per day per API key, but
+every gunicorn worker, thread-local resolver and Lambda container used to
+keep its own counter and so believed it had the whole allowance. This
+ledger keeps one count per (provider, UTC day) that every process on the
+host shares, with reserve/commit semantics so concurrent callers can never
+overshoot the limit:
+
+    ledger = get_quota_ledger()
+    slot = ledger.reserve('thenewsapi')
+    if slot is None:
+        ...                      # quota exhausted - skip this tier
+    try:
+        response = requests.get(...)
+    except requests.RequestException:
+        slot.release()           # request never reached the provider
+        raise
+    slot.commit()
+
+A reservation that is neither committed nor released (crashed worker)
+stops holding capacity after RESERVATION_TTL_SECONDS.
+
+Backends:
+    SQLiteQuotaBackend  (default) one SQLite file per host; writes run in
+                        BEGIN IMMEDIATE transactions, i.e. under SQLite's
+                        file lock, so all local processes share the count
+    MemoryQuotaBackend  process-local; used if the SQLite file is unusable
+    anything else       implement QuotaBackend and pass it to
+                        set_quota_backend(), or name a factory in
+                        CITEFLEX_QUOTA_BACKEND ("package.module:factory")
+                        to share one count across hosts/containers
+
+Environment:
+    CITEFLEX_QUOTA_DB           SQLite path (default: <tmpdir>/citeflex_quota.sqlite3)
+    CITEFLEX_QUOTA_BACKEND      "module:factory" returning a QuotaBackend
+    CITEFLEX_QUOTA_<PROVIDER>   override a daily limit, e.g. CITEFLEX_QUOTA_NEWSDATA=150
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: QuotaBackend is an abstract base class
+"""
+
+import importlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from tracing import get_logger
+
+logger = get_logger('quota_ledger')
+
+
+# =============================================================================
+# LIMITS
+# =============================================================================
+
+# Free-tier calls per UTC day
+DEFAULT_DAILY_LIMITS = {
+    'thenewsapi': 100,
+    'newsdata': 200,
+}
+
+RESERVATION_TTL_SECONDS = 120
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), 'citeflex_quota.sqlite3')
+
+
+def _daily_limits() -> Dict[str, int]:
+    limits = dict(DEFAULT_DAILY_LIMITS)
+    for provider in limits:
+        override = os.environ.get(f'CITEFLEX_QUOTA_{provider.upper()}')
+        if override:
+            try:
+                limits[provider] = int(override)
+            except ValueError:
+                logger.warning(f"[QuotaLedger] Ignoring invalid CITEFLEX_QUOTA_{provider.upper()}={override!r}")
+    return limits
+
+
+def _today() -> str:
+    """Quota day key; the providers reset their counters at UTC midnight."""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
+
+
+# =============================================================================
+# BACKENDS
+# =============================================================================
+
+class QuotaBackend(ABC):
+    """
+    Storage for per-day usage counts. All methods must be atomic with
+    respect to every process that shares the backend.
+    """
+
+    @abstractmethod
+    def reserve(self, provider: str, day: str, limit: int, amount: int, token: str) -> bool:
+        """Hold ``amount`` units if used + held + amount <= limit."""
+        pass
+
+    @abstractmethod
+    def commit(self, token: str) -> None:
+        """Turn a held reservation into usage."""
+        pass
+
+    @abstractmethod
+    def release(self, token: str) -> None:
+        """Drop a held reservation without using it."""
+        pass
+
+    @abstractmethod
+    def usage(self, provider: str, day: str) -> Dict[str, int]:
+        """{'used': committed units, 'reserved': live held units}"""
+        pass
+
+
+class MemoryQuotaBackend(QuotaBackend):
+    """Process-local backend (threads share it, processes do not)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._used: Dict[tuple, int] = {}
+        self._held: Dict[str, tuple] = {}   # token -> (provider, day, amount, created)
+
+    def _prune(self, now: float) -> None:
+        # Expired reservations belong to callers that died mid-request
+        expired = [token for token, (_, _, _, created) in self._held.items()
+                   if now - created >= RESERVATION_TTL_SECONDS]
+        for token in expired:
+            del self._held[token]
+
+    def _live_held(self, provider: str, day: str) -> int:
+        return sum(amount for p, d, amount, _ in self._held.values() if p == provider and d == day)
+
+    def reserve(self, provider, day, limit, amount, token):
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            used = self._used.get((provider, day), 0)
+            if used + self._live_held(provider, day) + amount > limit:
+                return False
+            self._held[token] = (provider, day, amount, now)
+            return True
+
+    def commit(self, token):
+        with self._lock:
+            self._prune(time.time())
+            held = self._held.pop(token, None)
+            if held:
+                provider, day, amount, _ = held
+                self._used[(provider, day)] = self._used.get((provider, day), 0) + amount
+
+    def release(self, token):
+        with self._lock:
+            self._held.pop(token, None)
+
+    def usage(self, provider, day):
+        with self._lock:
+            self._prune(time.time())
+            return {
+                'used': self._used.get((provider, day), 0),
+                'reserved': self._live_held(provider, day),
+            }
+
+
+class SQLiteQuotaBackend(QuotaBackend):
+    """
+    Host-wide backend on a SQLite file. Every read-modify-write runs in a
+    BEGIN IMMEDIATE transaction, which takes SQLite's write lock on the
+    file, so reservations from different processes are serialized.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS quota_usage (
+            provider TEXT NOT NULL,
+            day TEXT NOT NULL,
+            used INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (provider, day)
+        );
+        CREATE TABLE IF NOT EXISTS quota_reservations (
+            token TEXT PRIMARY KEY,
+            provider TEXT NOT NULL,
+            day TEXT NOT NULL,
+            amount INTEGER NOT NULL,
+            created REAL NOT NULL
+        );
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, timeout: float = 10.0):
+        self.path = path
+        self.timeout = timeout
+        conn = self._connect()
+        try:
+            conn.executescript(self._SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are opened explicitly below
+        return sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+
+    def _transaction(self, conn: sqlite3.Connection):
+        conn.execute('BEGIN IMMEDIATE')
+        # Expired reservations belong to callers that died mid-request
+        conn.execute(
+            'DELETE FROM quota_reservations WHERE created < ?',
+            (time.time() - RESERVATION_TTL_SECONDS,),
+        )
+
+    def reserve(self, provider, day, limit, amount, token):
+        conn = self._connect()
+        try:
+            self._transaction(conn)
+            used = conn.execute(
+                'SELECT used FROM quota_usage WHERE provider = ? AND day = ?',
+                (provider, day),
+            ).fetchone()
+            held = conn.execute(
+                'SELECT COALESCE(SUM(amount), 0) FROM quota_reservations WHERE provider = ? AND day = ?',
+                (provider, day),
+            ).fetchone()[0]
+            if (used[0] if used else 0) + held + amount > limit:
+                conn.execute('COMMIT')
+                return False
+            conn.execute(
+                'INSERT INTO quota_reservations (token, provider, day, amount, created) VALUES (?, ?, ?, ?, ?)',
+                (token, provider, day, amount, time.time()),
+            )
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def commit(self, token):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT provider, day, amount FROM quota_reservations WHERE token = ?',
+                (token,),
+            ).fetchone()
+            if row:
+                provider, day, amount = row
+                conn.execute('DELETE FROM quota_reservations WHERE token = ?', (token,))
+                conn.execute(
+                    'INSERT INTO quota_usage (provider, day, used) VALUES (?, ?, ?) '
+                    'ON CONFLICT (provider, day) DO UPDATE SET used = used + excluded.used',
+                    (provider, day, amount),
+                )
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def release(self, token):
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM quota_reservations WHERE token = ?', (token,))
+        finally:
+            conn.close()
+
+    def usage(self, provider, day):
+        conn = self._connect()
+        try:
+            used = conn.execute(
+                'SELECT used FROM quota_usage WHERE provider = ? AND day = ?',
+                (provider, day),
+            ).fetchone()
+            held = conn.execute(
+                'SELECT COALESCE(SUM(amount), 0) FROM quota_reservations '
+                'WHERE provider = ? AND day = ? AND created >= ?',
+                (provider, day, time.time() - RESERVATION_TTL_SECONDS),
+            ).fetchone()[0]
+            return {'used': used[0] if used else 0, 'reserved': held}
+        finally:
+            conn.close()
+
+
+# =============================================================================
+# LEDGER
+# =============================================================================
+
+# Reservations that are not counted anywhere (unmetered provider, or the
+# backend failed); commit/release on them are no-ops
+_UNTRACKED = MemoryQuotaBackend()
+
+
+class Reservation:
+    """Capacity held for one metered call; commit() or release() it."""
+
+    __slots__ = ('provider', 'amount', '_backend', '_token', '_done')
+
+    def __init__(self, backend: QuotaBackend, provider: str, amount: int, token: str):
+        self.provider = provider
+        self.amount = amount
+        self._backend = backend
+        self._token = token
+        self._done = False
+
+    def commit(self) -> None:
+        if not self._done:
+            self._done = True
+            self._backend.commit(self._token)
+
+    def release(self) -> None:
+        if not self._done:
+            self._done = True
+            self._backend.release(self._token)
+
+
+class QuotaLedger:
+    """Daily quotas for metered providers on top of a QuotaBackend."""
+
+    def __init__(self, backend: QuotaBackend, limits: Optional[Dict[str, int]] = None):
+        self.backend = backend
+        self.limits = limits if limits is not None else _daily_limits()
+
+    def is_metered(self, provider: str) -> bool:
+        return provider in self.limits
+
+    def reserve(self, provider: str, amount: int = 1) -> Optional[Reservation]:
+        """
+        Hold capacity for a call. Returns None when today's quota is used
+        up; unmetered providers always get a reservation.
+        """
+        token = uuid.uuid4().hex
+        if not self.is_metered(provider):
+            return Reservation(_UNTRACKED, provider, amount, token)
+        try:
+            granted = self.backend.reserve(provider, _today(), self.limits[provider], amount, token)
+        except Exception as e:
+            # Never let quota bookkeeping take down a lookup: fall back to
+            # allowing the call (the provider enforces its own limit)
+            logger.warning(f"[QuotaLedger] Backend error reserving {provider}: {e}")
+            return Reservation(_UNTRACKED, provider, amount, token)
+        return Reservation(self.backend, provider, amount, token) if granted else None
+
+    def remaining(self, provider: str) -> Optional[int]:
+        """Calls left today (None for unmetered providers)."""
+        if not self.is_metered(provider):
+            return None
+        try:
+            usage = self.backend.usage(provider, _today())
+        except Exception as e:
+            logger.warning(f"[QuotaLedger] Backend error reading {provider}: {e}")
+            return self.limits[provider]
+        return max(self.limits[provider] - usage['used'] - usage['reserved'], 0)
+
+    def by_capacity(self, providers: List[str]) -> List[str]:
+        """
+        Providers that still have quota today, most remaining capacity
+        (as a fraction of the daily limit) first. Ties keep the given order.
+        """
+        ranked = []
+        for index, provider in enumerate(providers):
+            left = self.remaining(provider)
+            if left is None:
+                ranked.append((-1.0, index, provider))
+            elif left > 0:
+                ranked.append((-left / self.limits[provider], index, provider))
+        return [provider for _, _, provider in sorted(ranked)]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Today's usage for every metered provider."""
+        day = _today()
+        result = {}
+        for provider, limit in self.limits.items():
+            try:
+                usage = self.backend.usage(provider, day)
+            except Exception:
+                usage = {'used': 0, 'reserved': 0}
+            result[provider] = {
+                'limit': limit,
+                'used': usage['used'],
+                'reserved': usage['reserved'],
+                'remaining': max(limit - usage['used'] - usage['reserved'], 0),
+            }
+        return result
+
+
+_ledger: Optional[QuotaLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def _backend_from_env() -> QuotaBackend:
+    spec = os.environ.get('CITEFLEX_QUOTA_BACKEND', '')
+    if spec:
+        module_name, _, factory_name = spec.partition(':')
+        try:
+            factory = getattr(importlib.import_module(module_name), factory_name)
+            return factory()
+        except Exception as e:
+            logger.warning(f"[QuotaLedger] Could not load backend {spec!r}: {e}")
+    path = os.environ.get('CITEFLEX_QUOTA_DB', DEFAULT_DB_PATH)
+    try:
+        return SQLiteQuotaBackend(path)
+    except sqlite3.Error as e:
+        logger.warning(f"[QuotaLedger] SQLite ledger unavailable at {path} ({e}); using process-local counts")
+        return MemoryQuotaBackend()
+
+
+def get_quota_ledger() -> QuotaLedger:
+    """Process-wide ledger, created from the environment on first use."""
+    global _ledger
+    if _ledger is None:
+        with _ledger_lock:
+            if _ledger is None:
+                _ledger = QuotaLedger(_backend_from_env())
+    return _ledger
+
+
+def set_quota_backend(backend: QuotaBackend, limits: Optional[Dict[str, int]] = None) -> QuotaLedger:
+    """Replace the process-wide ledger's backend (e.g. with a shared remote store)."""
+    global _ledger
+    with _ledger_lock:
+        _ledger = QuotaLedger(backend, limits)
+    return _ledger
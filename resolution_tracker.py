@@ -28,20 +28,42 @@ Usage:
         citation_style='apa',
         citation_type='journal'
     )
+    
+    # Many resolutions for one document: collect, then one INSERT
+    batch = ResolutionBatch(session_id='abc123', citation_style='apa')
+    for note in notes:
+        batch.add(citation_id=note.id, original_text=..., final_text=...)
+    batch.flush()  # also refreshes the document_session resolution stats
+    
+    # Rows may be kept between requests (app.py keeps them in the document
+    # session) and flushed later: ResolutionBatch(session_id, rows=rows)
 
 Version History:
     2025-12-22: Initial implementation
+    2026-10-18: ResolutionBatch (one bulk insert per document); similarity
+                short-circuits equal texts and length-bounded mismatches
+    2026-10-18: similarity_ratio is always the exact ratio (the quick_ratio
+                bounds were being stored); app.py logs through a
+                request-scoped ResolutionBatch
+    2026-10-18: Very different lengths classify as user_provided without
+                SequenceMatcher (similarity_ratio NULL); ResolutionBatch can
+                be rebuilt from stored rows (app.py batches per document)
 """
 
 import os
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from difflib import SequenceMatcher
 
 # =============================================================================
 # SIMILARITY CALCULATION
 # =============================================================================
 
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return ' '.join(text.lower().split())
+
+
 def calculate_similarity(text1: str, text2: str) -> float:
     """
     Calculate similarity ratio between two strings using SequenceMatcher.
@@ -49,6 +71,8 @@ def calculate_similarity(text1: str, text2: str) -> float:
     Uses Python's difflib which implements a variation of Levenshtein distance
     that's more focused on matching blocks of text.
     
+    Equal (normalized) texts return 1.0 without running SequenceMatcher.
+    
     Args:
         text1: First string
         text2: Second string
@@ -61,9 +85,11 @@ def calculate_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2:
         return 0.0
     
-    # Normalize: lowercase, strip whitespace
-    t1 = ' '.join(text1.lower().split())
-    t2 = ' '.join(text2.lower().split())
+    t1 = _normalize(text1)
+    t2 = _normalize(text2)
+    
+    if t1 == t2:
+        return 1.0
     
     return SequenceMatcher(None, t1, t2).ratio()
 
@@ -74,10 +100,15 @@ def determine_resolution_type(
     alternative_index: Optional[int] = None,
     similarity_threshold_original: float = 0.95,
     similarity_threshold_minor: float = 0.80
-) -> tuple[str, float]:
+) -> tuple[str, Optional[float]]:
     """
     Determine the resolution type based on text similarity and user action.
     
+    When the (normalized) lengths alone cap the similarity below
+    ``similarity_threshold_minor`` (upper bound 2*min/(len1+len2)), the
+    result is user_provided without running SequenceMatcher, and the
+    similarity is None rather than the bound.
+    
     Args:
         original_text: What CitateGenie recommended
         final_text: What user accepted/saved
@@ -86,13 +117,19 @@ def determine_resolution_type(
         similarity_threshold_minor: Threshold for "minor_edit" (default 80%)
         
     Returns:
-        Tuple of (resolution_type, similarity_ratio)
+        Tuple of (resolution_type, similarity_ratio or None)
     """
     # If user selected an alternative, that's always "accepted_alternative"
     if alternative_index is not None:
         similarity = calculate_similarity(original_text, final_text)
         return ('accepted_alternative', similarity)
     
+    # Very different lengths cannot reach the minor-edit threshold
+    len1 = len(_normalize(original_text or ''))
+    len2 = len(_normalize(final_text or ''))
+    if len1 + len2 and 2.0 * min(len1, len2) / (len1 + len2) < similarity_threshold_minor:
+        return ('user_provided', None)
+    
     # Calculate similarity
     similarity = calculate_similarity(original_text, final_text)
     
@@ -138,10 +175,11 @@ def log_resolution(
         resolution_type: One of 'accepted_original', 'accepted_alternative', 
                         'minor_edit', 'user_provided'
     """
-    # Determine resolution type
-    resolution_type, similarity = determine_resolution_type(
-        original_text, final_text, alternative_index
+    row = _resolution_row(
+        session_id, citation_id, original_text, final_text, alternative_index,
+        source_engine, citation_style, citation_type, document_session_id
     )
+    resolution_type, similarity = row['resolution_type'], row['similarity_ratio']
     
     # Log to database
     try:
@@ -149,33 +187,19 @@ def log_resolution(
         from billing.admin_models import ResolutionEvent
         
         db = get_db()
-        
-        event = ResolutionEvent(
-            document_session_id=document_session_id,
-            session_id=session_id,
-            citation_id=citation_id,
-            resolution_type=resolution_type,
-            original_text=original_text[:2000] if original_text else None,  # Truncate for storage
-            final_text=final_text[:2000] if final_text else None,
-            similarity_ratio=similarity,
-            alternative_index=alternative_index,
-            source_engine=source_engine,
-            citation_style=citation_style,
-            citation_type=citation_type
-        )
-        db.add(event)
+        db.add(ResolutionEvent(**row))
         db.commit()
         
         # Log to console
         status = "✓" if resolution_type != 'user_provided' else "✗"
-        print(f"[Resolution] {status} {resolution_type} (sim={similarity:.2f}) "
+        print(f"[Resolution] {status} {resolution_type} (sim={_format_similarity(similarity)}) "
               f"session={session_id[:8]}... cite={citation_id} engine={source_engine or 'unknown'}")
         
         return resolution_type
         
     except ImportError:
         # Models not available yet - log to console only
-        print(f"[Resolution] {resolution_type} (sim={similarity:.2f}) "
+        print(f"[Resolution] {resolution_type} (sim={_format_similarity(similarity)}) "
               f"session={session_id[:8]}... cite={citation_id} [DB not available]")
         return resolution_type
         
@@ -185,6 +209,130 @@ def log_resolution(
         return resolution_type
 
 
+def _format_similarity(similarity: Optional[float]) -> str:
+    return 'n/a' if similarity is None else f"{similarity:.2f}"
+
+
+def _resolution_row(
+    session_id: str,
+    citation_id: int,
+    original_text: str,
+    final_text: str,
+    alternative_index: Optional[int] = None,
+    source_engine: Optional[str] = None,
+    citation_style: Optional[str] = None,
+    citation_type: Optional[str] = None,
+    document_session_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """ResolutionEvent column values for one resolution (similarity computed once)."""
+    resolution_type, similarity = determine_resolution_type(
+        original_text, final_text, alternative_index
+    )
+    return {
+        'document_session_id': document_session_id,
+        'session_id': session_id,
+        'citation_id': citation_id,
+        'resolution_type': resolution_type,
+        'original_text': original_text[:2000] if original_text else None,  # Truncate for storage
+        'final_text': final_text[:2000] if final_text else None,
+        'similarity_ratio': similarity,
+        'alternative_index': alternative_index,
+        'source_engine': source_engine,
+        'citation_style': citation_style,
+        'citation_type': citation_type,
+    }
+
+
+class ResolutionBatch:
+    """
+    Collects resolution events for one document in memory and writes them
+    with a single bulk INSERT at document end, instead of one INSERT and
+    commit per citation.
+    
+    Usage:
+        batch = ResolutionBatch(session_id, citation_style='apa')
+        batch.add(citation_id=1, original_text=..., final_text=...)
+        ...
+        batch.flush()
+    """
+    
+    def __init__(
+        self,
+        session_id: str,
+        citation_style: Optional[str] = None,
+        document_session_id: Optional[int] = None,
+        rows: Optional[List[Dict[str, Any]]] = None
+    ):
+        self.session_id = session_id
+        self.citation_style = citation_style
+        self.document_session_id = document_session_id
+        # Queued ResolutionEvent column dicts (plain values, picklable)
+        self.rows: List[Dict[str, Any]] = list(rows or [])
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def add(
+        self,
+        citation_id: int,
+        original_text: str,
+        final_text: str,
+        alternative_index: Optional[int] = None,
+        source_engine: Optional[str] = None,
+        citation_type: Optional[str] = None,
+        citation_style: Optional[str] = None
+    ) -> str:
+        """
+        Queue one resolution (see log_resolution for the arguments).
+        
+        Returns:
+            resolution_type
+        """
+        row = _resolution_row(
+            self.session_id, citation_id, original_text, final_text, alternative_index,
+            source_engine, citation_style or self.citation_style, citation_type,
+            self.document_session_id
+        )
+        self.rows.append(row)
+        return row['resolution_type']
+    
+    def flush(self, update_stats: bool = True) -> Dict[str, Any]:
+        """
+        Insert every queued event in one statement, then (optionally)
+        refresh the document_session resolution counts.
+        
+        Returns:
+            update_document_resolution_stats() result, or {} when nothing
+            was written / stats were not requested
+        """
+        if not self.rows:
+            return {}
+        rows, self.rows = self.rows, []
+        
+        try:
+            from billing.db import get_db
+            from billing.admin_models import ResolutionEvent
+            from sqlalchemy import insert
+            
+            db = get_db()
+            db.execute(insert(ResolutionEvent), rows)
+            db.commit()
+        except ImportError:
+            print(f"[Resolution] {len(rows)} events session={self.session_id[:8]}... [DB not available]")
+            return {}
+        except Exception as e:
+            print(f"[Resolution] Error logging {len(rows)} events: {e}")
+            return {}
+        
+        failures = sum(1 for row in rows if row['resolution_type'] == 'user_provided')
+        print(f"[Resolution] Logged {len(rows)} events ({len(rows) - failures} accepted) "
+              f"session={self.session_id[:8]}...")
+        
+        if update_stats:
+            return update_document_resolution_stats(self.session_id)
+        return {}
+
+
 def update_document_resolution_stats(session_id: str) -> Dict[str, Any]:
     """
     Update document_session with aggregated resolution stats.
@@ -386,7 +534,7 @@ if __name__ == "__main__":
     # User provided (completely different)
     user = "Jones, A. (2019). Different paper entirely. Other Journal, 1, 1-10."
     res_type, sim = determine_resolution_type(original, user)
-    print(f"  User provided: {res_type} ({sim:.2f})")
+    print(f"  User provided: {res_type} ({_format_similarity(sim)})")
     
     # Alternative selected
     res_type, sim = determine_resolution_type(original, edited, alternative_index=1)
@@ -0,0 +1,516 @@
+"""
+citeflex/scheduler.py
+
+Priority scheduling of outbound engine and AI calls between interactive
+lookups and bulk document work.
+
+Single-citation endpoints and full-document runs share the same engines,
+rate limits and AI quotas; without scheduling, one 800-note upload fills the
+connection pool and every interactive lookup queues behind it. Every
+outbound call (http_client's PooledAdapter.send) now takes a slot here
+first:
+
+    Priority classes (strict order when slots are contended)
+        INTERACTIVE  /api/cite, /api/cite/multiple, /api/cite/parenthetical,
+                     /api/format-citation, the workbench edit endpoints
+        DOCUMENT     /api/process, /api/process-author-date, lambda_handler
+        BACKGROUND   verification and benchmark runs (stress_test_runner)
+
+    Slots: SCHED_MAX_CONCURRENCY calls in flight per process. DOCUMENT and
+    BACKGROUND together hold at most SCHED_BULK_SHARE of them and BACKGROUND
+    at most SCHED_BACKGROUND_SHARE, so interactive calls always find
+    headroom even while a bulk run has every one of its calls outstanding.
+
+    Fairness: within a class, waiting calls are served by weighted fair
+    queuing on the user they are made for (start tag = max(class virtual
+    time, user's last tag) + 1/weight), so one user's 800 notes interleave
+    with another user's 20 instead of running first.
+
+    Admission control:
+    - a call waits at most SCHED_MAX_WAIT_<CLASS> seconds and is shed
+      (Overloaded) when its class queue already holds SCHED_MAX_QUEUE_<CLASS>
+      calls; BACKGROUND waits briefly and is shed first
+    - job(): DOCUMENT/BACKGROUND runs as a whole take a job slot
+      (SCHED_MAX_BULK_JOBS per process, SCHED_MAX_JOBS_PER_USER per user;
+      anonymous runs, user '', are held to the process cap only);
+      a run is deferred up to SCHED_JOB_WAIT seconds for one, then refused
+      with a retry-after hint
+
+Overloaded is a requests.ConnectionError (as engines/cassette.CassetteMiss
+is), so engines treat a shed call like a failed request.
+
+The class and user of the current work are bound with workload(); they are
+context variables, so thread pool work must be submitted with
+tracing.submit_traced() to keep them. Unbound work runs as
+DEFAULT_PRIORITY (DOCUMENT) for an anonymous user.
+
+Usage:
+    import scheduler
+
+    with scheduler.workload(scheduler.Priority.INTERACTIVE, user_id):
+        result = get_citation(query, style)
+
+    with scheduler.job(scheduler.Priority.DOCUMENT, user_id):
+        process_document(...)
+
+    scheduler.stats()   # queue depth, in flight, wait times per class
+
+Environment:
+    SCHED_ENABLED               1 (default) | 0 - no slots, no queuing
+    SCHED_MAX_CONCURRENCY       outbound calls in flight (default 24)
+    SCHED_BULK_SHARE            DOCUMENT + BACKGROUND share (default 0.75)
+    SCHED_BACKGROUND_SHARE      BACKGROUND share (default 0.25)
+    SCHED_MAX_WAIT_INTERACTIVE / _DOCUMENT / _BACKGROUND
+                                seconds a call may wait (30 / 120 / 5)
+    SCHED_MAX_QUEUE_INTERACTIVE / _DOCUMENT / _BACKGROUND
+                                waiting calls per class (256 / 1024 / 64)
+    SCHED_MAX_BULK_JOBS         concurrent document/background runs (4)
+    SCHED_MAX_JOBS_PER_USER     concurrent runs per user (2)
+    SCHED_JOB_WAIT              seconds a run waits for a job slot (30)
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: Per-user job cap not applied to the anonymous '' user
+"""
+
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from tracing import get_logger
+
+logger = get_logger('scheduler')
+
+
+class Priority(IntEnum):
+    """Workload classes, most urgent first."""
+    INTERACTIVE = 0
+    DOCUMENT = 1
+    BACKGROUND = 2
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+ENABLED = os.environ.get('SCHED_ENABLED', '1').lower() not in ('0', 'false', 'no')
+MAX_CONCURRENCY = int(os.environ.get('SCHED_MAX_CONCURRENCY', '24'))
+BULK_SHARE = _env_float('SCHED_BULK_SHARE', 0.75)
+BACKGROUND_SHARE = _env_float('SCHED_BACKGROUND_SHARE', 0.25)
+
+MAX_WAIT = {
+    Priority.INTERACTIVE: _env_float('SCHED_MAX_WAIT_INTERACTIVE', 30),
+    Priority.DOCUMENT: _env_float('SCHED_MAX_WAIT_DOCUMENT', 120),
+    Priority.BACKGROUND: _env_float('SCHED_MAX_WAIT_BACKGROUND', 5),
+}
+MAX_QUEUE = {
+    Priority.INTERACTIVE: int(os.environ.get('SCHED_MAX_QUEUE_INTERACTIVE', '256')),
+    Priority.DOCUMENT: int(os.environ.get('SCHED_MAX_QUEUE_DOCUMENT', '1024')),
+    Priority.BACKGROUND: int(os.environ.get('SCHED_MAX_QUEUE_BACKGROUND', '64')),
+}
+
+MAX_BULK_JOBS = int(os.environ.get('SCHED_MAX_BULK_JOBS', '4'))
+MAX_JOBS_PER_USER = int(os.environ.get('SCHED_MAX_JOBS_PER_USER', '2'))
+JOB_WAIT = _env_float('SCHED_JOB_WAIT', 30)
+
+DEFAULT_PRIORITY = Priority.DOCUMENT
+
+# Recent wait times kept per class for the percentiles in stats()
+WAIT_SAMPLES = 1024
+
+# Per-user fair-queuing tags kept before tags already behind the class
+# virtual time are pruned
+MAX_USER_TAGS = 10000
+
+
+class Overloaded(requests.ConnectionError):
+    """A call or run refused by admission control."""
+
+    def __init__(self, message: str, priority: Priority, retry_after: float = 0.0):
+        super().__init__(message)
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+# =============================================================================
+# WORKLOAD CONTEXT
+# =============================================================================
+
+_current_workload: contextvars.ContextVar = contextvars.ContextVar('citeflex_workload', default=None)
+_default_workload: Tuple[Priority, str] = (DEFAULT_PRIORITY, '')
+
+
+class workload:
+    """
+    Bind the priority class and user of the work done in this context.
+
+        with workload(Priority.INTERACTIVE, user_id):
+            ...
+    """
+
+    __slots__ = ('priority', 'user', '_token')
+
+    def __init__(self, priority: Priority, user: Optional[Any] = None):
+        self.priority = Priority(priority)
+        self.user = str(user) if user is not None else ''
+        self._token = None
+
+    def __enter__(self) -> 'workload':
+        self._token = _current_workload.set((self.priority, self.user))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_workload.reset(self._token)
+
+
+def current_workload() -> Tuple[Priority, str]:
+    """(priority, user) of the current context."""
+    return _current_workload.get() or _default_workload
+
+
+def set_default_workload(priority: Priority, user: Optional[Any] = None) -> None:
+    """Process-wide class for work outside any workload() (e.g. batch tools)."""
+    global _default_workload
+    _default_workload = (Priority(priority), str(user) if user is not None else '')
+
+
+# =============================================================================
+# CALL SCHEDULER
+# =============================================================================
+
+class _Waiter:
+    __slots__ = ('priority', 'event', 'granted', 'cancelled')
+
+    def __init__(self, priority: Priority):
+        self.priority = priority
+        self.event = threading.Event()
+        self.granted = False
+        self.cancelled = False
+
+
+class _ClassState:
+    """Queue and counters of one priority class."""
+
+    def __init__(self):
+        self.heap: List[Tuple[float, int, _Waiter]] = []
+        self.queued = 0
+        self.in_flight = 0
+        self.vtime = 0.0
+        self.user_tags: Dict[str, float] = {}
+        self.admitted = 0
+        self.shed = 0
+        self.timed_out = 0
+        self.waits: deque = deque(maxlen=WAIT_SAMPLES)
+
+
+class CallScheduler:
+    """
+    Grants outbound-call slots by priority class, with per-class caps and
+    weighted fair queuing between users inside a class.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        bulk_share: float = BULK_SHARE,
+        background_share: float = BACKGROUND_SHARE,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.bulk_cap = max(1, int(self.max_concurrency * bulk_share))
+        self.background_cap = max(1, int(self.max_concurrency * background_share))
+        self._lock = threading.Lock()
+        self._classes = {priority: _ClassState() for priority in Priority}
+        self._weights: Dict[str, float] = {}
+        self._seq = itertools.count()
+
+    def set_user_weight(self, user: Any, weight: float) -> None:
+        """Share of a user within a class relative to others (default 1)."""
+        with self._lock:
+            if weight == 1:
+                self._weights.pop(str(user), None)
+            else:
+                self._weights[str(user)] = max(weight, 0.01)
+
+    # -------------------------------------------------------------------------
+    # Slots
+    # -------------------------------------------------------------------------
+
+    def _total_in_flight(self) -> int:
+        return sum(state.in_flight for state in self._classes.values())
+
+    def _has_room(self, priority: Priority) -> bool:
+        classes = self._classes
+        if self._total_in_flight() >= self.max_concurrency:
+            return False
+        if priority == Priority.INTERACTIVE:
+            return True
+        bulk = classes[Priority.DOCUMENT].in_flight + classes[Priority.BACKGROUND].in_flight
+        if bulk >= self.bulk_cap:
+            return False
+        if priority == Priority.BACKGROUND:
+            return classes[Priority.BACKGROUND].in_flight < self.background_cap
+        return True
+
+    def _waiting_at_or_above(self, priority: Priority) -> bool:
+        return any(self._classes[p].queued for p in Priority if p <= priority)
+
+    def _dispatch(self) -> None:
+        # Called with the lock held after a slot frees or a waiter leaves
+        for priority in Priority:
+            state = self._classes[priority]
+            while state.queued and self._has_room(priority):
+                tag, _, waiter = heapq.heappop(state.heap)
+                if waiter.cancelled:
+                    continue
+                state.queued -= 1
+                state.in_flight += 1
+                state.vtime = max(state.vtime, tag)
+                waiter.granted = True
+                waiter.event.set()
+            if state.queued and self._total_in_flight() >= self.max_concurrency:
+                # Higher class still waiting for a free slot: nothing below
+                # it may take one
+                return
+
+    def _start_tag(self, state: _ClassState, user: str) -> float:
+        weight = self._weights.get(user, 1.0)
+        tag = max(state.vtime, state.user_tags.get(user, 0.0)) + 1.0 / weight
+        state.user_tags[user] = tag
+        if len(state.user_tags) > MAX_USER_TAGS:
+            state.user_tags = {u: t for u, t in state.user_tags.items() if t > state.vtime}
+        return tag
+
+    def acquire(self, priority: Optional[Priority] = None, user: Optional[str] = None) -> Optional[Priority]:
+        """
+        Take a slot for one outbound call, waiting per the class rules.
+
+        Returns the class to pass to release(), or None when scheduling is
+        disabled. Raises Overloaded when the call is shed.
+        """
+        if not ENABLED:
+            return None
+        if priority is None:
+            priority, bound_user = current_workload()
+            if user is None:
+                user = bound_user
+        user = user or ''
+        state = self._classes[priority]
+
+        with self._lock:
+            if not self._waiting_at_or_above(priority) and self._has_room(priority):
+                state.in_flight += 1
+                state.admitted += 1
+                state.waits.append(0.0)
+                return priority
+            if state.queued >= MAX_QUEUE[priority]:
+                state.shed += 1
+                raise self._overloaded(priority, 'queue full')
+            waiter = _Waiter(priority)
+            heapq.heappush(state.heap, (self._start_tag(state, user), next(self._seq), waiter))
+            state.queued += 1
+
+        start = time.monotonic()
+        waiter.event.wait(MAX_WAIT[priority])
+        waited = time.monotonic() - start
+
+        with self._lock:
+            if waiter.granted:
+                state.admitted += 1
+                state.waits.append(waited)
+                return priority
+            waiter.cancelled = True
+            state.queued -= 1
+            if not state.queued:
+                state.heap.clear()
+            state.timed_out += 1
+            state.shed += 1
+            self._dispatch()
+        raise self._overloaded(priority, f'no slot within {MAX_WAIT[priority]:g}s')
+
+    def release(self, priority: Optional[Priority]) -> None:
+        if priority is None:
+            return
+        with self._lock:
+            self._classes[priority].in_flight -= 1
+            self._dispatch()
+
+    def _overloaded(self, priority: Priority, reason: str) -> Overloaded:
+        logger.warning(f"[Scheduler] Shed {priority.name.lower()} call: {reason}")
+        return Overloaded(f"Outbound call shed ({priority.name.lower()}: {reason})",
+                          priority, retry_after=MAX_WAIT[priority])
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            classes = {}
+            for priority, state in self._classes.items():
+                waits = sorted(state.waits)
+                classes[priority.name.lower()] = {
+                    'queue_depth': state.queued,
+                    'in_flight': state.in_flight,
+                    'admitted': state.admitted,
+                    'shed': state.shed,
+                    'timed_out': state.timed_out,
+                    'wait_ms': _wait_summary(waits),
+                }
+            return {
+                'enabled': ENABLED,
+                'max_concurrency': self.max_concurrency,
+                'bulk_cap': self.bulk_cap,
+                'background_cap': self.background_cap,
+                'in_flight': self._total_in_flight(),
+                'classes': classes,
+            }
+
+
+def _wait_summary(waits: List[float]) -> Dict[str, float]:
+    if not waits:
+        return {'samples': 0, 'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+    count = len(waits)
+    return {
+        'samples': count,
+        'avg': round(sum(waits) / count * 1000, 1),
+        'p50': round(waits[(count - 1) // 2] * 1000, 1),
+        'p95': round(waits[min(count - 1, int(count * 0.95))] * 1000, 1),
+        'max': round(waits[-1] * 1000, 1),
+    }
+
+
+# =============================================================================
+# JOB ADMISSION
+# =============================================================================
+
+class JobAdmission:
+    """Caps concurrent bulk runs, overall and per user."""
+
+    def __init__(self, max_jobs: int = MAX_BULK_JOBS, max_per_user: int = MAX_JOBS_PER_USER):
+        self.max_jobs = max(1, max_jobs)
+        self.max_per_user = max(1, max_per_user)
+        self._cond = threading.Condition()
+        self._running: Dict[str, int] = {}
+        self._total = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.deferred = 0
+        self.rejected = 0
+
+    def _has_room(self, user: str) -> bool:
+        if self._total >= self.max_jobs:
+            return False
+        # '' is every anonymous caller at once, not one user
+        return not user or self._running.get(user, 0) < self.max_per_user
+
+    def enter(self, user: str, timeout: float = JOB_WAIT) -> None:
+        with self._cond:
+            if not self._has_room(user):
+                self.deferred += 1
+                self.waiting += 1
+                try:
+                    if not self._cond.wait_for(lambda: self._has_room(user), timeout):
+                        self.rejected += 1
+                        raise Overloaded("Too many documents in progress, try again shortly",
+                                         Priority.DOCUMENT, retry_after=timeout)
+                finally:
+                    self.waiting -= 1
+            self._total += 1
+            self._running[user] = self._running.get(user, 0) + 1
+            self.admitted += 1
+
+    def exit(self, user: str) -> None:
+        with self._cond:
+            self._total -= 1
+            remaining = self._running.get(user, 1) - 1
+            if remaining:
+                self._running[user] = remaining
+            else:
+                self._running.pop(user, None)
+            self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'running': self._total,
+                'waiting': self.waiting,
+                'max_jobs': self.max_jobs,
+                'max_per_user': self.max_per_user,
+                'admitted': self.admitted,
+                'deferred': self.deferred,
+                'rejected': self.rejected,
+            }
+
+
+class job:
+    """
+    Run a bulk workload: admits it (deferring or refusing under load) and
+    binds its class and user for the calls it makes.
+
+        with job(Priority.DOCUMENT, user_id):
+            process_document(...)
+    """
+
+    __slots__ = ('priority', 'user', '_workload', '_admitted')
+
+    def __init__(self, priority: Priority = Priority.DOCUMENT, user: Optional[Any] = None):
+        self.priority = Priority(priority)
+        self.user = str(user) if user is not None else ''
+        self._workload = workload(self.priority, self.user)
+        self._admitted = False
+
+    def __enter__(self) -> 'job':
+        if ENABLED and self.priority != Priority.INTERACTIVE:
+            _jobs.enter(self.user)
+            self._admitted = True
+        self._workload.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._workload.__exit__(exc_type, exc, tb)
+        if self._admitted:
+            _jobs.exit(self.user)
+
+
+# =============================================================================
+# MODULE API
+# =============================================================================
+
+_calls = CallScheduler()
+_jobs = JobAdmission()
+
+
+def acquire(priority: Optional[Priority] = None, user: Optional[str] = None) -> Optional[Priority]:
+    """Take an outbound-call slot for the current workload (see CallScheduler)."""
+    return _calls.acquire(priority, user)
+
+
+def release(ticket: Optional[Priority]) -> None:
+    _calls.release(ticket)
+
+
+def set_user_weight(user: Any, weight: float) -> None:
+    _calls.set_user_weight(user, weight)
+
+
+def stats() -> Dict[str, Any]:
+    """
+    Scheduler metrics for the admin/health endpoints.
+
+    Returns:
+        {'enabled', 'max_concurrency', 'bulk_cap', 'background_cap', 'in_flight',
+         'classes': {class: {'queue_depth', 'in_flight', 'admitted', 'shed',
+                             'timed_out', 'wait_ms': {samples, avg, p50, p95, max}}},
+         'jobs': {'running', 'waiting', 'admitted', 'deferred', 'rejected', ...}}
+    """
+    result = _calls.stats()
+    result['jobs'] = _jobs.stats()
+    return result
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Candidate-scoring benchmark for Citate Genie
+Checks that the batch scorers in engines/scoring.py rank candidates exactly
+like the per-candidate loops they replaced, and times both on synthetic
+candidate lists.
+
+The fixture set is generated from a fixed seed: queries in the shapes the
+engines see ("FirstName Surname keywords", "Surname keywords", keywords
+only) against candidate lists mixing sole/first/middle/late/absent author
+positions and overlapping/unrelated titles.
+
+Usage:
+    python scoring_benchmark.py                       # 60 candidates/query
+    python scoring_benchmark.py --candidates 200 --queries 100 --repeat 5
+
+Exit codes: 0 ok, 1 a batch scorer disagreed with the reference loop.
+"""
+
+import argparse
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from engines import scoring
+from engines.academic import (
+    SemanticScholarEngine,
+    extract_query_author,
+    score_author_positions,
+)
+from engines.arxiv import ArxivEngine
+from engines.author_year_search import AuthorDateEngine
+from engines.google_scholar import GoogleScholarEngine
+from models import SourceComponents
+
+DEFAULT_CANDIDATES = 60
+DEFAULT_QUERIES = 50
+DEFAULT_REPEAT = 3
+SEED = 20261018
+
+SURNAMES = ['caplan', 'smith', 'nguyen', 'garcia', 'okafor', 'tanaka', 'muller', 'rossi',
+            'kowalski', 'haddad', 'johansson', 'silva', 'chen', 'patel', 'obrien']
+FIRST_NAMES = ['eric', 'louis', 'mary', 'john', 'anna', 'peter', 'helen', 'karim', 'yuki']
+TITLE_WORDS = ['trains', 'brains', 'history', 'medicine', 'neural', 'networks', 'social',
+               'capital', 'theory', 'evidence', 'clinical', 'trial', 'learning', 'market',
+               'migration', 'policy', 'urban', 'climate', 'memory', 'language', 'the', 'of',
+               'and', 'in', 'a', 'model', 'models', 'modeling', 'analysis', 'analyses']
+
+
+# =============================================================================
+# REFERENCE (PER-CANDIDATE) IMPLEMENTATIONS
+# =============================================================================
+
+def _legacy_score_author_position(authors: List[str], query: str) -> float:
+    if not authors:
+        return 0.1
+    query_author = extract_query_author(query)
+    if not query_author:
+        return 0.5
+    for i, author in enumerate(authors):
+        if query_author in author.lower():
+            if len(authors) == 1:
+                return 1.0
+            elif i == 0:
+                return 0.9
+            elif i <= 2:
+                return 0.7
+            else:
+                return 0.3
+    return 0.1
+
+
+def _legacy_semantic_best(papers: List[dict], query: str) -> dict:
+    query_lower = query.lower()
+    query_author = extract_query_author(query)
+    best_match = papers[0]
+    best_score = -1
+    stopwords = {'the', 'a', 'an', 'of', 'and', 'in', 'on', 'for', 'to'}
+    query_words = [w for w in query_lower.split() if len(w) >= 3 and w not in stopwords]
+    for paper in papers:
+        score = 0
+        authors = paper.get('authors', [])
+        title = paper.get('title', '').lower()
+        if query_author:
+            author_names = [a.get('name', '').lower() for a in authors]
+            for i, author_name in enumerate(author_names):
+                if query_author in author_name:
+                    if len(authors) == 1:
+                        score += 50
+                    elif i == 0:
+                        score += 30
+                    elif i <= 2:
+                        score += 15
+                    else:
+                        score += 5
+                    break
+        title_words = set(title.split()) - stopwords
+        score += len(set(query_words) & title_words) * 3
+        for qword in query_words:
+            if len(qword) >= 4:
+                for tword in title_words:
+                    if qword[:4] in tword or tword[:4] in qword:
+                        score += 2
+        if score > best_score:
+            best_score = score
+            best_match = paper
+    return best_match
+
+
+def _legacy_arxiv_best(entries: List[dict], query: str) -> dict:
+    if len(entries) == 1:
+        return entries[0]
+    query_lower = query.lower()
+    query_words = set(query_lower.split())
+    best = entries[0]
+    best_score = 0
+    for entry in entries:
+        score = 0
+        title = entry.get('title', '').lower()
+        score += len(query_words & set(title.split())) * 3
+        for author in entry.get('authors', []):
+            for name_part in author.lower().split():
+                if len(name_part) >= 3 and name_part in query_lower:
+                    score += 10
+        if score > best_score:
+            best_score = score
+            best = entry
+    return best
+
+
+def _legacy_scholar_best(results: List[dict], query: str) -> dict:
+    query_lower = query.lower()
+    query_words = set(query_lower.split())
+    best = results[0]
+    best_score = 0
+    for result in results:
+        score = 0
+        title = result.get('title', '').lower()
+        for author in result.get('publication_info', {}).get('authors', []):
+            for name_part in author.get('name', '').lower().split():
+                if len(name_part) >= 3 and name_part in query_lower:
+                    score += 15
+        score += len(query_words & set(title.split())) * 3
+        for word in query_words:
+            if len(word) >= 4 and word in title:
+                score += 2
+        if score > best_score:
+            best_score = score
+            best = result
+    return best
+
+
+def _legacy_confidence(metadata: SourceComponents, author: str, year: str,
+                       second_author, third_author) -> float:
+    confidence = 0.0
+    if metadata.year == year:
+        confidence += 0.3
+    elif metadata.year:
+        try:
+            if abs(int(metadata.year) - int(year)) <= 1:
+                confidence += 0.2
+        except ValueError:
+            pass
+    author_lower = author.lower()
+    if metadata.authors:
+        authors_lower = [a.lower() for a in metadata.authors]
+        for a in authors_lower:
+            if author_lower in a:
+                confidence += 0.3
+                break
+        if second_author:
+            for a in authors_lower:
+                if second_author.lower() in a:
+                    confidence += 0.15
+                    break
+        if third_author:
+            for a in authors_lower:
+                if third_author.lower() in a:
+                    confidence += 0.1
+                    break
+    if metadata.doi:
+        confidence += 0.15
+    completeness = 0
+    if metadata.title:
+        completeness += 1
+    if metadata.journal or metadata.publisher:
+        completeness += 1
+    if metadata.volume or metadata.pages:
+        completeness += 1
+    confidence += completeness * 0.05
+    return min(1.0, confidence)
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+def _name(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES).title()} {rng.choice(SURNAMES).title()}"
+
+
+def _title(rng: random.Random) -> str:
+    return ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(3, 9))).capitalize()
+
+
+def _authors(rng: random.Random, surname: str) -> List[str]:
+    count = rng.choice([0, 1, 1, 2, 3, 5, 8, 20])
+    authors = [_name(rng) for _ in range(count)]
+    if authors and rng.random() < 0.5:
+        authors[rng.randrange(len(authors))] = f"{rng.choice(FIRST_NAMES).title()} {surname.title()}"
+    return authors
+
+
+def build_fixtures(queries: int, candidates: int, seed: int = SEED) -> List[Tuple[str, dict]]:
+    """[(query, {'authors': [[...]], 'titles': [...], 'years': [...], ...})]"""
+    rng = random.Random(seed)
+    fixtures = []
+    for _ in range(queries):
+        surname = rng.choice(SURNAMES)
+        keywords = ' '.join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(1, 4)))
+        shape = rng.randrange(3)
+        if shape == 0:
+            query = f"{rng.choice(FIRST_NAMES).title()} {surname.title()} {keywords}"
+        elif shape == 1:
+            query = f"{surname.title()} {keywords}"
+        else:
+            query = keywords
+        fixtures.append((query, {
+            'surname': surname,
+            'authors': [_authors(rng, surname) for _ in range(candidates)],
+            'titles': [_title(rng) for _ in range(candidates)],
+            'years': [str(rng.randint(1995, 2005)) for _ in range(candidates)],
+            'dois': [rng.random() < 0.5 for _ in range(candidates)],
+        }))
+    return fixtures
+
+
+def _metadata(data: dict) -> List[SourceComponents]:
+    return [
+        SourceComponents(title=title, authors=authors, year=year,
+                         doi='10.1000/x' if doi else '', journal='J' if i % 3 else '')
+        for i, (title, authors, year, doi) in enumerate(
+            zip(data['titles'], data['authors'], data['years'], data['dois']))
+    ]
+
+
+# =============================================================================
+# CASES
+# =============================================================================
+
+def _case_author_position(fixtures):
+    def legacy():
+        return [[_legacy_score_author_position(a, q) for a in d['authors']] for q, d in fixtures]
+
+    def batch():
+        return [score_author_positions(d['authors'], q) for q, d in fixtures]
+    return legacy, batch
+
+
+def _case_semantic(fixtures):
+    engine = SemanticScholarEngine.__new__(SemanticScholarEngine)
+    inputs = [
+        (q, [{'title': t, 'authors': [{'name': n} for n in a]} for t, a in zip(d['titles'], d['authors'])])
+        for q, d in fixtures
+    ]
+
+    def legacy():
+        return [id(_legacy_semantic_best(papers, q)) for q, papers in inputs]
+
+    def batch():
+        return [id(engine._find_best_match(papers, q)) for q, papers in inputs]
+    return legacy, batch
+
+
+def _case_arxiv(fixtures):
+    engine = ArxivEngine.__new__(ArxivEngine)
+    inputs = [
+        (q, [{'title': t, 'authors': a} for t, a in zip(d['titles'], d['authors'])])
+        for q, d in fixtures
+    ]
+
+    def legacy():
+        return [id(_legacy_arxiv_best(entries, q)) for q, entries in inputs]
+
+    def batch():
+        return [id(engine._find_best_match(entries, q)) for q, entries in inputs]
+    return legacy, batch
+
+
+def _case_scholar(fixtures):
+    engine = GoogleScholarEngine.__new__(GoogleScholarEngine)
+    inputs = [
+        (q, [{'title': t, 'publication_info': {'authors': [{'name': n} for n in a]}}
+             for t, a in zip(d['titles'], d['authors'])])
+        for q, d in fixtures
+    ]
+
+    def legacy():
+        return [id(_legacy_scholar_best(results, q)) for q, results in inputs]
+
+    def batch():
+        return [id(engine._find_best_match(results, q)) for q, results in inputs]
+    return legacy, batch
+
+
+def _case_author_year(fixtures):
+    engine = AuthorDateEngine.__new__(AuthorDateEngine)
+    inputs = [(d['surname'], '2000', _metadata(d)) for _, d in fixtures]
+
+    def legacy():
+        return [[_legacy_confidence(m, a, y, 'smith', None) for m in metas] for a, y, metas in inputs]
+
+    def batch():
+        return [scoring.AuthorYearQuery(a, y, 'smith').confidences(metas) for a, y, metas in inputs]
+
+    def engine_path():
+        return [[engine._calculate_confidence(m, a, y, 'smith') for m in metas] for a, y, metas in inputs]
+
+    # The engine wrapper must agree too
+    assert engine_path() == legacy(), "AuthorDateEngine._calculate_confidence disagrees"
+    return legacy, batch
+
+
+def _case_router(fixtures):
+    try:
+        import unified_router
+    except Exception as e:
+        print(f"  router: skipped (unified_router not importable: {e.__class__.__name__}: {e})")
+        return None
+    first_names, skip_words = unified_router._QUERY_FIRST_NAMES, unified_router._QUERY_SKIP_WORDS
+    inputs = [(q, _metadata(d)) for q, d in fixtures]
+
+    def legacy_one(result, query):
+        # The old scorer rebuilt both name sets on every call
+        names, skips = set(first_names), set(skip_words)
+        if not result or not result.authors:
+            return 0.1
+        query_author = scoring.extract_query_author(query, names, skips)
+        if not query_author:
+            return 0.5
+        index = scoring.author_index([a.lower() for a in result.authors], query_author)
+        return scoring.position_score(index, len(result.authors))
+
+    def legacy():
+        return [[legacy_one(m, q) for m in metas] for q, metas in inputs]
+
+    def batch():
+        return [unified_router._score_author_positions(metas, q) for q, metas in inputs]
+    return legacy, batch
+
+
+CASES: Dict[str, Callable] = {
+    'author_position': _case_author_position,
+    'semantic_scholar': _case_semantic,
+    'arxiv': _case_arxiv,
+    'google_scholar': _case_scholar,
+    'author_year': _case_author_year,
+    'router': _case_router,
+}
+
+
+def _best_time(fn: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--candidates', type=int, default=DEFAULT_CANDIDATES)
+    parser.add_argument('--queries', type=int, default=DEFAULT_QUERIES)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('cases', nargs='*', help=f"subset of: {', '.join(CASES)}")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    fixtures = build_fixtures(args.queries, args.candidates)
+    print(f"{args.queries} queries x {args.candidates} candidates, best of {args.repeat}")
+    print(f"  {'case':<18} {'legacy ms':>10} {'batch ms':>10} {'speedup':>8}")
+
+    failed = False
+    for name in args.cases or CASES:
+        pair = CASES[name](fixtures)
+        if pair is None:
+            continue
+        legacy, batch = pair
+        if legacy() != batch():
+            print(f"  {name:<18} MISMATCH: batch scorer ranks differently from the reference")
+            failed = True
+            continue
+        legacy_s = _best_time(legacy, args.repeat)
+        batch_s = _best_time(batch, args.repeat)
+        speedup = legacy_s / batch_s if batch_s else float('inf')
+        print(f"  {name:<18} {legacy_s * 1000:>10.1f} {batch_s * 1000:>10.1f} {speedup:>7.1f}x")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
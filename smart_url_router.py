@@ -18,7 +18,7 @@ For paywalled content:
 - Savings: 90% cost reduction on paywalled URLs!
 """
 
-import requests
+import http_client
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -95,7 +95,7 @@ class SmartURLRouter:
                 'num': 1
             }
             
-            response = requests.get(
+            response = http_client.get(
                 'https://serpapi.com/search',
                 params=params,
                 timeout=10
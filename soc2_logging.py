@@ -29,9 +29,16 @@ Log Structure:
         "action": "action category",
         "resource": "resource identifier",
         "outcome": "success|failure|denied",
-        "details": { ... action-specific data ... }
+        "details": { ... action-specific data ... },
+        "chain_id": "per-process chain", "prev_hash": "...", "hash": "..."
     }
 
+Delivery:
+    Events are emitted by an audit_pipeline.AuditPipeline writer thread in
+    batches, hash-chained per process. SOC2_AUDIT_MODE selects 'async'
+    (default; flushed at exit), 'group' (log_event waits until emitted;
+    default on AWS Lambda) or 'sync' (emitted on the calling thread).
+
 Usage:
     from soc2_logging import AuditLogger, SecurityEvent
     
@@ -53,21 +60,37 @@ Usage:
         outcome="success",
         ip_address="192.168.1.1"
     )
+    
+    # One request / Lambda invocation: identities are hashed once and
+    # filled into every event logged inside the block
+    with logger.context(user_id="user_123", ip_address="192.168.1.1"):
+        logger.log_document_process(document_id="doc_456", ...)
+        logger.log_api_call(...)
 
 Version History:
     2025-12-20 V1.0: Initial SOC 2 compliant implementation
+    2026-10-18 V1.1: Emit events through a batched, hash-chained AuditPipeline
+    2026-10-18 V1.2: LRU-cached PII hashes, salt rotation, per-request AuditContext
+    2026-10-18 V1.3: Module-level context(); entered per request in app.py and
+                     per invocation in lambda_processor.py
+    2026-10-18 V1.4: SOC2_AUDIT_MODE defaults to 'group' on AWS Lambda
 """
 
 import os
 import json
 import hashlib
 import logging
+import threading
+import contextvars
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 import uuid
 
+from audit_pipeline import AuditPipeline, LogSink
+
 
 # =============================================================================
 # CONFIGURATION
@@ -81,6 +104,20 @@ SERVICE_NAME = os.environ.get('SERVICE_NAME', 'citategenie')
 # Log levels by environment
 LOG_LEVEL = logging.DEBUG if ENVIRONMENT == 'development' else logging.INFO
 
+# Audit pipeline mode: 'async', 'group' or 'sync'. Lambda freezes the
+# sandbox when the handler returns (and atexit is unreliable there), so a
+# writer thread's queue could sit unflushed; default to group commit there.
+AUDIT_MODE = os.environ.get(
+    'SOC2_AUDIT_MODE',
+    'group' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else 'async'
+)
+
+# PII hash salt (defaults to the service name, the historical salt)
+PII_SALT = os.environ.get('AUDIT_PII_SALT', '')
+
+# Raw value -> hash entries kept per logger
+PII_HASH_CACHE_SIZE = int(os.environ.get('AUDIT_PII_CACHE_SIZE', '4096'))
+
 
 # =============================================================================
 # ENUMS
@@ -228,6 +265,64 @@ class SecurityEvent(AuditEvent):
     alert_triggered: bool = False
 
 
+# =============================================================================
+# REQUEST CONTEXT
+# =============================================================================
+
+_current_context: contextvars.ContextVar = contextvars.ContextVar('soc2_audit_context', default=None)
+
+
+class AuditContext:
+    """
+    Actor identities for one request or Lambda invocation.
+    
+    Created by AuditLogger.context(). While the context is active, events
+    logged through that logger default to its request_id, user, session,
+    IP and user agent, and every identity is hashed at most once per
+    context (and per salt: a rotation is picked up on the next event).
+    """
+    
+    __slots__ = ('audit_logger', 'request_id', 'user_id', 'session_id',
+                 'ip_address', 'user_agent', '_hashes', '_generation', '_tokens')
+    
+    def __init__(
+        self,
+        audit_logger: 'AuditLogger',
+        request_id: str,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ):
+        self.audit_logger = audit_logger
+        self.request_id = request_id
+        self.user_id = user_id
+        self.session_id = session_id
+        self.ip_address = ip_address
+        self.user_agent = user_agent
+        self._hashes: Dict[str, str] = {}
+        self._generation = audit_logger._pii_generation
+        self._tokens = []
+    
+    def hash_pii(self, value: str) -> str:
+        """Hash ``value`` once for this context."""
+        if self._generation != self.audit_logger._pii_generation:
+            # Salt rotated since these were computed
+            self._hashes.clear()
+            self._generation = self.audit_logger._pii_generation
+        digest = self._hashes.get(value)
+        if digest is None:
+            digest = self._hashes[value] = self.audit_logger._hash_pii(value)
+        return digest
+    
+    def __enter__(self) -> 'AuditContext':
+        self._tokens.append(_current_context.set(self))
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        _current_context.reset(self._tokens.pop())
+
+
 # =============================================================================
 # AUDIT LOGGER
 # =============================================================================
@@ -252,12 +347,20 @@ class AuditLogger:
         self,
         service_name: str = SERVICE_NAME,
         environment: str = ENVIRONMENT,
-        region: str = AWS_REGION
+        region: str = AWS_REGION,
+        mode: str = AUDIT_MODE,
+        pii_salt: Optional[str] = None
     ):
         self.service_name = service_name
         self.environment = environment
         self.region = region
         
+        # PII hashing: salt plus an LRU of raw value -> hash, dropped on rotation
+        self._pii_salt = pii_salt or PII_SALT or service_name
+        self._pii_generation = 0
+        self._pii_cache: 'OrderedDict[str, str]' = OrderedDict()
+        self._pii_lock = threading.Lock()
+        
         # Configure Python logger
         self._logger = logging.getLogger(f"{service_name}.audit")
         self._logger.setLevel(LOG_LEVEL)
@@ -267,6 +370,48 @@ class AuditLogger:
             handler = logging.StreamHandler()
             handler.setFormatter(logging.Formatter('%(message)s'))
             self._logger.addHandler(handler)
+        
+        # Serialization and emission happen on the pipeline's writer thread
+        self._pipeline = AuditPipeline(LogSink(self._logger), mode=mode, name='soc2_audit')
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event logged so far has been emitted."""
+        return self._pipeline.flush(timeout)
+    
+    def pipeline_stats(self) -> Dict[str, Any]:
+        """Writer pipeline metrics (queue depth, drops, batch size, latency)."""
+        return self._pipeline.stats()
+    
+    def context(
+        self,
+        user_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        request_id: Optional[str] = None
+    ) -> AuditContext:
+        """
+        Audit context for one request / Lambda invocation; use as
+        ``with logger.context(user_id=...):``.
+        """
+        return AuditContext(
+            self,
+            request_id=request_id or self._generate_request_id(),
+            user_id=user_id,
+            session_id=session_id,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+    
+    def rotate_pii_salt(self, salt: str) -> None:
+        """
+        Switch to a new PII salt. Cached hashes (here and in open
+        AuditContexts) are discarded.
+        """
+        with self._pii_lock:
+            self._pii_salt = salt
+            self._pii_generation += 1
+            self._pii_cache.clear()
     
     # =========================================================================
     # CORE LOGGING METHODS
@@ -292,7 +437,20 @@ class AuditLogger:
         
         This is the base method - use specific methods like log_document_process()
         for better type safety and consistency.
+        
+        Inside ``with logger.context(...)`` missing identities and request_id
+        come from the active AuditContext.
         """
+        hash_pii = self._hash_pii
+        ctx = _current_context.get()
+        if ctx is not None and ctx.audit_logger is self:
+            request_id = request_id or ctx.request_id
+            user_id = user_id or ctx.user_id
+            session_id = session_id or ctx.session_id
+            ip_address = ip_address or ctx.ip_address
+            user_agent = user_agent or ctx.user_agent
+            hash_pii = ctx.hash_pii
+        
         event = AuditEvent(
             timestamp=datetime.now(timezone.utc).isoformat(),
             service=self.service_name,
@@ -301,19 +459,19 @@ class AuditLogger:
             request_id=request_id or self._generate_request_id(),
             action=action.value if isinstance(action, ActionCategory) else action,
             outcome=outcome.value if isinstance(outcome, Outcome) else outcome,
-            user_id_hash=self._hash_pii(user_id) if user_id else None,
-            session_id_hash=self._hash_pii(session_id) if session_id else None,
+            user_id_hash=hash_pii(user_id) if user_id else None,
+            session_id_hash=hash_pii(session_id) if session_id else None,
             resource_type=resource_type,
             resource_id=resource_id,
-            ip_address_hash=self._hash_pii(ip_address) if ip_address else None,
-            user_agent_hash=self._hash_pii(user_agent) if user_agent else None,
+            ip_address_hash=hash_pii(ip_address) if ip_address else None,
+            user_agent_hash=hash_pii(user_agent) if user_agent else None,
             duration_ms=duration_ms,
             details=details or {},
             severity=severity.value if isinstance(severity, Severity) else severity
         )
         
-        # Output to logger (CloudWatch in production)
-        self._logger.info(event.to_json())
+        # Output to logger (CloudWatch in production) via the writer thread
+        self._pipeline.submit(event.to_dict())
         
         return event
     
@@ -636,14 +794,29 @@ class AuditLogger:
         Hash PII for privacy while maintaining traceability.
         
         Uses SHA-256 with a consistent salt so the same input
-        always produces the same hash (for correlation).
+        always produces the same hash (for correlation). Results are kept
+        in an LRU keyed by raw value until the salt rotates.
         """
         if not value:
             return ""
         
-        # Use service name as salt for consistency within service
-        salted = f"{self.service_name}:{value}"
-        return hashlib.sha256(salted.encode()).hexdigest()[:16]
+        cache = self._pii_cache
+        with self._pii_lock:
+            digest = cache.get(value)
+            if digest is not None:
+                cache.move_to_end(value)
+                return digest
+            salt, generation = self._pii_salt, self._pii_generation
+        
+        digest = hashlib.sha256(f"{salt}:{value}".encode()).hexdigest()[:16]
+        
+        with self._pii_lock:
+            # Don't cache a hash made with a salt rotated away meanwhile
+            if generation == self._pii_generation:
+                cache[value] = digest
+                if len(cache) > PII_HASH_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return digest
     
     def _generate_request_id(self) -> str:
         """Generate unique request ID for distributed tracing."""
@@ -670,6 +843,11 @@ def get_audit_logger() -> AuditLogger:
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
+def context(**kwargs) -> AuditContext:
+    """Convenience function for the global logger's per-request context."""
+    return get_audit_logger().context(**kwargs)
+
+
 def log_document_process(**kwargs) -> AuditEvent:
     """Convenience function for logging document processing."""
     return get_audit_logger().log_document_process(**kwargs)
@@ -2,12 +2,26 @@
 """
 Stress Test Runner for Citate Genie
 Evaluates accuracy of first recommendation and alternatives against answer key.
+
+Benchmark mode (capacity planning) runs the corpus on parallel worker
+processes and reports throughput, p50/p95/p99 latency by source type, API
+calls and AI cost alongside accuracy:
+
+    python stress_test_runner.py corpus.csv results.csv --benchmark --workers=8 \
+        --checkpoint=run.jsonl --json=run.json --compare=previous_run.json
+
+Rerunning with the same --checkpoint resumes an interrupted run.
 """
 
 import csv
 import sys
 import os
-from typing import List, Tuple, Optional
+import json
+import math
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Tuple, Optional, Dict
 import re
 
 # Add current directory to path
@@ -130,9 +144,9 @@ def citations_match(actual: str, expected: str, strict: bool = False) -> Tuple[b
     return score >= threshold, score
 
 
-def run_single_test(test_id: int, input_type: str, input_text: str, expected: str, source_type: str) -> dict:
-    """Run a single test case and return results."""
-    result = {
+def _empty_result(test_id: int, input_type: str, input_text: str, expected: str, source_type: str) -> dict:
+    """Result dict for a test case before it has run (no match)."""
+    return {
         'test_id': test_id,
         'input_type': input_type,
         'input': input_text,
@@ -145,6 +159,11 @@ def run_single_test(test_id: int, input_type: str, input_text: str, expected: st
         'all_recommendations': [],
         'notes': ''
     }
+
+
+def run_single_test(test_id: int, input_type: str, input_text: str, expected: str, source_type: str) -> dict:
+    """Run a single test case and return results."""
+    result = _empty_result(test_id, input_type, input_text, expected, source_type)
     
     try:
         # Get multiple citation recommendations (style = chicago for CMS)
@@ -262,6 +281,53 @@ def print_summary(results: List[dict]):
             print(f"    Got: {f['first_recommendation'][:60] if f['first_recommendation'] else 'None'}...")
 
 
+def measure_cache_hit_rate(csv_path: str) -> dict:
+    """
+    Measure SourceComponentsCache hit rates on the stress corpus (offline).
+    
+    Rows sharing an Expected_CMS_Citation are variants of one source. The
+    first variant of each source is stored in a fresh cache (with any URL
+    it contains as resolved metadata); every later variant is then looked
+    up. Reports how many lookups hit on the exact hash versus the
+    normalized-fingerprint and identifier indexes.
+    """
+    from processors.document_components import SourceComponentsCache
+    
+    cache = SourceComponentsCache()
+    seen_sources = set()
+    lookups = []
+    
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            expected = row['Expected_CMS_Citation']
+            if expected not in seen_sources:
+                seen_sources.add(expected)
+                url_match = re.search(r'https?://[^\s,\)]+', row['Input'])
+                cache.set(row['Input'], SourceComponents(
+                    raw_source=row['Input'],
+                    url=url_match.group(0) if url_match else '',
+                ))
+            else:
+                lookups.append(row['Input'])
+    
+    for text in lookups:
+        cache.get(text)
+    
+    stats = dict(cache.lookup_stats)
+    total = max(len(lookups), 1)
+    extra = stats.get('fingerprint', 0) + stats.get('identifier', 0)
+    
+    print("\n" + "="*70)
+    print("EMBEDDED CACHE HIT RATE")
+    print("="*70)
+    print(f"Sources: {len(seen_sources)}, repeat lookups: {len(lookups)}")
+    for tier in ('exact', 'fingerprint', 'identifier', 'miss'):
+        print(f"  {tier:<11} {stats.get(tier, 0):>5} ({100*stats.get(tier, 0)/total:.1f}%)")
+    print(f"Extra hit rate from normalized/identifier keys: {100*extra/total:.1f}%")
+    
+    return stats
+
+
 def save_results(results: List[dict], output_path: str):
     """Save results to CSV."""
     with open(output_path, 'w', newline='', encoding='utf-8') as f:
@@ -275,19 +341,361 @@ def save_results(results: List[dict], output_path: str):
     print(f"\nResults saved to: {output_path}")
 
 
+# =============================================================================
+# BENCHMARK MODE (parallel, resumable, latency/cost reporting)
+# =============================================================================
+#
+# Each worker is a separate process that runs one test at a time, like a
+# Lambda container. Process-wide counters therefore attribute every API call
+# and HTTP request (including those from the router's own worker threads) to
+# the test that caused them.
+
+# Per-process counters, reset by _benchmark_single for every test
+_bench_counters = {'providers': {}, 'hosts': {}, 'cost_usd': 0.0, 'input_tokens': 0, 'output_tokens': 0}
+_bench_lock = threading.Lock()
+
+
+def _observe_api_call(provider: str, input_tokens: int, output_tokens: int, cost: float):
+    with _bench_lock:
+        providers = _bench_counters['providers']
+        providers[provider] = providers.get(provider, 0) + 1
+        _bench_counters['cost_usd'] += cost
+        _bench_counters['input_tokens'] += input_tokens or 0
+        _bench_counters['output_tokens'] += output_tokens or 0
+
+
+def _benchmark_worker_init(cassette_options: Optional[dict], verbose: bool):
+    """Process initializer: cassettes (optional), call observers, quiet stdout."""
+    from urllib.parse import urlsplit
+    from requests.adapters import HTTPAdapter
+    from cost_tracker import add_call_observer
+    
+    from engines.cassette import install, install_from_env
+    if cassette_options:
+        install(**cassette_options)
+    else:
+        install_from_env()
+    
+    # Count HTTP requests per host, whether live or replayed from cassettes
+    inner_send = HTTPAdapter.send
+    
+    def counting_send(adapter, request, **kwargs):
+        host = urlsplit(request.url).netloc.lower()
+        with _bench_lock:
+            hosts = _bench_counters['hosts']
+            hosts[host] = hosts.get(host, 0) + 1
+        return inner_send(adapter, request, **kwargs)
+    
+    HTTPAdapter.send = counting_send
+    add_call_observer(_observe_api_call)
+    
+    if not verbose:
+        sys.stdout = open(os.devnull, 'w')
+
+
+def _benchmark_single(row: dict) -> dict:
+    """Run one CSV row in a worker process and attach timing/cost figures."""
+    with _bench_lock:
+        _bench_counters.update(providers={}, hosts={}, cost_usd=0.0, input_tokens=0, output_tokens=0)
+    
+    start = time.perf_counter()
+    result = run_single_test(
+        test_id=int(row['Test_ID']),
+        input_type=row['Input_Type'],
+        input_text=row['Input'],
+        expected=row['Expected_CMS_Citation'],
+        source_type=row['Source_Type']
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    
+    with _bench_lock:
+        result.update(
+            wall_ms=round(wall_ms, 1),
+            cost_usd=round(_bench_counters['cost_usd'], 6),
+            ai_input_tokens=_bench_counters['input_tokens'],
+            ai_output_tokens=_bench_counters['output_tokens'],
+            api_calls=dict(_bench_counters['providers']),
+            http_calls=dict(_bench_counters['hosts']),
+        )
+    return result
+
+
+def _load_checkpoint(path: Optional[str]) -> Dict[int, dict]:
+    """Completed results from a JSONL checkpoint, keyed by test_id."""
+    done = {}
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from an interrupted run
+                if result.get('worker_error') or 'first_recommendation' not in result:
+                    continue  # worker crash (incl. older checkpoints): run it again
+                done[result['test_id']] = result
+    return done
+
+
+def run_benchmark(
+    csv_path: str,
+    workers: int = 4,
+    checkpoint_path: Optional[str] = None,
+    cassette_options: Optional[dict] = None,
+    verbose: bool = False
+) -> Tuple[List[dict], float, int]:
+    """
+    Run the stress corpus in parallel worker processes.
+    
+    Completed tests are appended to ``checkpoint_path`` (JSONL) as they
+    finish; rerunning with the same checkpoint skips them, so a long corpus
+    can be interrupted and resumed.
+    
+    Returns:
+        (all results ordered by test_id, wall time in seconds of this run,
+         number of tests executed in this run)
+    """
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    
+    done = _load_checkpoint(checkpoint_path)
+    pending = [row for row in rows if int(row['Test_ID']) not in done]
+    print(f"Benchmark: {len(rows)} tests, {len(done)} from checkpoint, "
+          f"{len(pending)} to run on {workers} workers")
+    
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_benchmark_worker_init,
+            initargs=(cassette_options, verbose)
+        ) as executor:
+            futures = {executor.submit(_benchmark_single, row): row for row in pending}
+            for i, future in enumerate(as_completed(futures), start=1):
+                row = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # Worker crash: report it as a miss, but keep it out of
+                    # the checkpoint so a resumed run retries the test
+                    result = _empty_result(
+                        int(row['Test_ID']), row['Input_Type'], row['Input'],
+                        row['Expected_CMS_Citation'], row['Source_Type']
+                    )
+                    result.update(
+                        notes=f"Worker error: {e}", worker_error=True, wall_ms=None,
+                        cost_usd=0.0, ai_input_tokens=0, ai_output_tokens=0,
+                        api_calls={}, http_calls={},
+                    )
+                done[result['test_id']] = result
+                if checkpoint and not result.get('worker_error'):
+                    checkpoint.write(json.dumps(result, default=str) + '\n')
+                    checkpoint.flush()
+                status = "FIRST" if result['first_match'] else ("ALT" if result['alt_match'] else "MISS")
+                print(f"[{i}/{len(pending)}] Test {result['test_id']}: {status} ({result.get('wall_ms')} ms)")
+    finally:
+        if checkpoint:
+            checkpoint.close()
+    elapsed = time.perf_counter() - start
+    
+    return [done[k] for k in sorted(done)], elapsed, len(pending)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return round(sorted_values[rank - 1], 1)
+
+
+def _latency_summary(results: List[dict]) -> dict:
+    walls = sorted(r['wall_ms'] for r in results if r.get('wall_ms') is not None)
+    return {
+        'count': len(walls),
+        'p50': _percentile(walls, 50),
+        'p95': _percentile(walls, 95),
+        'p99': _percentile(walls, 99),
+        'mean': round(sum(walls) / len(walls), 1) if walls else None,
+    }
+
+
+def summarize_benchmark(results: List[dict], elapsed_s: float, workers: int, tests_run: int) -> dict:
+    """
+    Machine-readable accuracy, latency, throughput and cost summary.
+    
+    Accuracy, latency and cost cover every result (including ones resumed
+    from a checkpoint); throughput covers only the tests run this time.
+    """
+    total = len(results)
+    first = sum(1 for r in results if r.get('first_match'))
+    alt = sum(1 for r in results if r.get('alt_match'))
+    
+    api_calls: Dict[str, int] = {}
+    http_calls: Dict[str, int] = {}
+    for r in results:
+        for provider, n in (r.get('api_calls') or {}).items():
+            api_calls[provider] = api_calls.get(provider, 0) + n
+        for host, n in (r.get('http_calls') or {}).items():
+            http_calls[host] = http_calls.get(host, 0) + n
+    
+    source_types = sorted({r.get('source_type') or '' for r in results})
+    
+    return {
+        'tests': total,
+        'workers': workers,
+        'accuracy': {
+            'first_match_rate': round(first / total, 4) if total else 0.0,
+            'any_match_rate': round((first + alt) / total, 4) if total else 0.0,
+            'first_matches': first,
+            'alt_matches': alt,
+        },
+        'latency_ms': _latency_summary(results),
+        'latency_ms_by_source_type': {
+            st: _latency_summary([r for r in results if (r.get('source_type') or '') == st])
+            for st in source_types
+        },
+        'throughput': {
+            'wall_time_s': round(elapsed_s, 2),
+            'tests_run': tests_run,
+            'tests_per_second': round(tests_run / elapsed_s, 3) if tests_run and elapsed_s > 0 else None,
+        },
+        'cost': {
+            'total_usd': round(sum(r.get('cost_usd') or 0.0 for r in results), 6),
+            'ai_input_tokens': sum(r.get('ai_input_tokens') or 0 for r in results),
+            'ai_output_tokens': sum(r.get('ai_output_tokens') or 0 for r in results),
+        },
+        'api_calls_by_provider': dict(sorted(api_calls.items())),
+        'http_calls_by_host': dict(sorted(http_calls.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def print_benchmark_summary(summary: dict):
+    """Print the throughput/latency/cost part of a benchmark summary."""
+    print("\n" + "="*70)
+    print("BENCHMARK SUMMARY")
+    print("="*70)
+    acc = summary['accuracy']
+    print(f"Tests: {summary['tests']}  first: {100*acc['first_match_rate']:.1f}%  "
+          f"any: {100*acc['any_match_rate']:.1f}%")
+    tp = summary['throughput']
+    print(f"Wall time: {tp['wall_time_s']}s for {tp['tests_run']} tests on {summary['workers']} workers "
+          f"({tp['tests_per_second']} tests/s)")
+    lat = summary['latency_ms']
+    print(f"Latency ms: p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}")
+    print("\n--- LATENCY BY SOURCE TYPE (ms) ---")
+    for st, lat in summary['latency_ms_by_source_type'].items():
+        print(f"  {st or '(none)':<14} n={lat['count']:<4} p50 {lat['p50']}  p95 {lat['p95']}  p99 {lat['p99']}")
+    cost = summary['cost']
+    print(f"\nAI cost: ${cost['total_usd']:.4f} "
+          f"({cost['ai_input_tokens']} in / {cost['ai_output_tokens']} out tokens)")
+    print(f"API calls: {summary['api_calls_by_provider']}")
+    top_hosts = list(summary['http_calls_by_host'].items())[:10]
+    print(f"HTTP calls (top hosts): {dict(top_hosts)}")
+
+
+def compare_benchmarks(old: dict, new: dict):
+    """Print the differences between two benchmark JSON summaries."""
+    print("\n" + "="*70)
+    print("BENCHMARK COMPARISON (new - old)")
+    print("="*70)
+    rows = [
+        ('first_match_rate', old['accuracy']['first_match_rate'], new['accuracy']['first_match_rate']),
+        ('any_match_rate', old['accuracy']['any_match_rate'], new['accuracy']['any_match_rate']),
+        ('tests_per_second', old['throughput']['tests_per_second'], new['throughput']['tests_per_second']),
+        ('cost_usd', old['cost']['total_usd'], new['cost']['total_usd']),
+    ]
+    for pct in ('p50', 'p95', 'p99'):
+        rows.append((f'latency_{pct}_ms', old['latency_ms'][pct], new['latency_ms'][pct]))
+    for name, before, after in rows:
+        if before is None or after is None:
+            print(f"  {name:<20} {before} -> {after}")
+        else:
+            print(f"  {name:<20} {before} -> {after} ({after - before:+.4g})")
+    for st in sorted(set(old['latency_ms_by_source_type']) | set(new['latency_ms_by_source_type'])):
+        before = old['latency_ms_by_source_type'].get(st, {}).get('p95')
+        after = new['latency_ms_by_source_type'].get(st, {}).get('p95')
+        print(f"  p95[{st or '(none)'}]".ljust(22) + f" {before} -> {after}")
+
+
 if __name__ == "__main__":
     # Default paths
     input_csv = "/mnt/user-data/outputs/stress_test_pilot_40.csv"
     output_csv = "/mnt/user-data/outputs/stress_test_results.csv"
     
-    if len(sys.argv) > 1:
-        input_csv = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_csv = sys.argv[2]
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    if len(args) > 0:
+        input_csv = args[0]
+    if len(args) > 1:
+        output_csv = args[1]
+    
+    if '--cache-hit-rate' in sys.argv:
+        measure_cache_hit_rate(input_csv)
+        sys.exit(0)
+    
+    # Offline runs: --cassettes=DIR [--cassette-mode=replay|record|auto]
+    #               [--latency=none|recorded|distribution]
+    options = dict(a[2:].split('=', 1) for a in sys.argv[1:] if a.startswith('--') and '=' in a)
+    cassette_options = None
+    if 'cassettes' in options:
+        cassette_options = {
+            'path': options['cassettes'],
+            'mode': options.get('cassette-mode', 'replay'),
+            'latency': options.get('latency', 'none'),
+        }
+    
+    # Benchmark mode: --benchmark [--workers=N] [--checkpoint=run.jsonl]
+    #                 [--json=summary.json] [--compare=previous.json] [--verbose]
+    if '--benchmark' in sys.argv:
+        workers = int(options.get('workers', 4))
+        results, elapsed, tests_run = run_benchmark(
+            input_csv,
+            workers=workers,
+            checkpoint_path=options.get('checkpoint'),
+            cassette_options=cassette_options,
+            verbose='--verbose' in sys.argv
+        )
+        print_summary(results)
+        summary = summarize_benchmark(results, elapsed, workers, tests_run)
+        print_benchmark_summary(summary)
+        save_results(results, output_csv)
+        
+        if 'json' in options:
+            with open(options['json'], 'w', encoding='utf-8') as f:
+                json.dump({
+                    'csv': input_csv,
+                    'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                    'cassettes': cassette_options,
+                    'summary': summary,
+                    'results': results,
+                }, f, indent=2, default=str)
+            print(f"Benchmark JSON saved to: {options['json']}")
+        if 'compare' in options:
+            with open(options['compare'], 'r', encoding='utf-8') as f:
+                compare_benchmarks(json.load(f)['summary'], summary)
+        sys.exit(0)
+    
+    from engines.cassette import install, install_from_env
+    cassette_stats = install_from_env()
+    if cassette_options:
+        cassette_stats = install(**cassette_options)
+        print(f"Cassettes: {cassette_options['path']} "
+              f"(mode={cassette_options['mode']}, latency={cassette_options['latency']})")
     
     print(f"Running stress test on: {input_csv}")
     print("="*70)
     
+    # Accuracy runs are verification work: yield to interactive and document
+    # traffic. Benchmark mode keeps the default class to measure full capacity.
+    import scheduler
+    scheduler.set_default_workload(scheduler.Priority.BACKGROUND, 'stress_test')
+    
     results = run_stress_test(input_csv)
     print_summary(results)
     save_results(results, output_csv)
+    
+    if cassette_stats is not None:
+        print(f"Cassette traffic: {cassette_stats}")
@@ -0,0 +1,66 @@
+"""
+Tests for audit_pipeline.LogSink hash chains across a fork.
+
+A sink created before gunicorn forks its workers must not let two workers
+extend the same chain, or verify_chain() rejects the interleaved log.
+"""
+
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audit_pipeline import LogSink, verify_chain
+
+
+def _sink(path):
+    logger = logging.getLogger(f'test_audit_pipeline.{path}')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    return LogSink(logger), handler
+
+
+def _lines(path):
+    with open(path, encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+def test_same_process_keeps_one_chain(tmp_path):
+    path = str(tmp_path / 'audit.log')
+    sink, handler = _sink(path)
+    sink.write_batch([{'event': 1}, {'event': 2}])
+    sink.write_batch([{'event': 3}])
+    handler.close()
+
+    result = verify_chain(_lines(path))
+    assert result['ok'] and result['chains'] == 1 and result['records'] == 3
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs os.fork')
+def test_forked_workers_get_their_own_chain(tmp_path):
+    path = str(tmp_path / 'audit.log')
+    sink, handler = _sink(path)  # built before the fork, like gunicorn --preload
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            sink.write_batch([{'event': 'child'}])
+            handler.flush()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    sink.write_batch([{'event': 'parent'}])
+    handler.close()
+
+    lines = _lines(path)
+    assert len({json.loads(line)['chain_id'] for line in lines}) == 2
+    result = verify_chain(lines)
+    assert result['ok'], result['first_error']
+    assert result['chains'] == 2
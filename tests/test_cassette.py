@@ -0,0 +1,76 @@
+"""
+Tests for engines/cassette.py credential redaction.
+
+A recorded cassette may be committed, so no credential sent as a query
+parameter may reach the store.
+"""
+
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engines.cassette import canonical_url, request_key, use_cassettes
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = b'{"data": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = HTTPServer(('127.0.0.1', 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _stored_text(path):
+    texts = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            with open(os.path.join(root, name), encoding='utf-8') as f:
+                texts.append(f.read())
+    return '\n'.join(texts)
+
+
+def test_canonical_url_drops_api_token():
+    url = 'https://api.thenewsapi.com/v1/news/all?search=x&api_token=SECRET123'
+    assert 'SECRET123' not in canonical_url(url)
+    assert 'api_token' not in canonical_url(url)
+    assert request_key('GET', url) == request_key(
+        'GET', 'https://api.thenewsapi.com/v1/news/all?api_token=OTHER&search=x')
+
+
+def test_recorded_cassette_has_no_api_token(tmp_path):
+    server = _serve()
+    try:
+        url = f'http://127.0.0.1:{server.server_port}/v1/news/all?search=x&api_token=SECRET123'
+        with use_cassettes(str(tmp_path), mode='record') as stats:
+            response = requests.get(url, timeout=5)
+        assert response.status_code == 200
+        assert stats['recorded'] == 1
+    finally:
+        server.shutdown()
+
+    stored = _stored_text(tmp_path)
+    assert '/v1/news/all' in stored
+    assert 'SECRET123' not in stored
+    assert 'api_token' not in stored
+
+    # Replays with a different token still find the recording
+    with use_cassettes(str(tmp_path), mode='replay') as stats:
+        replayed = requests.get(url.replace('SECRET123', 'ROTATED'), timeout=5)
+    assert replayed.json() == {'data': []}
+    assert stats['replayed'] == 1
@@ -0,0 +1,47 @@
+"""
+Tests for processors/document_components.py citation fingerprints.
+
+A pin-cite names a page within the same source, so citations that differ
+only in their pin-cite must share one SourceComponentsCache entry.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import CitationType, SourceComponents
+from processors.document_components import SourceComponentsCache, citation_fingerprint
+
+BASE = 'Smith, J. The History of Policy Reform, 2020'
+
+
+@pytest.mark.parametrize('pinned', [
+    BASE + ', p. 12',
+    BASE + ', pp. 12-14.',
+    BASE + ' (p. 12)',
+    BASE + ' (pp. 12–14).',
+    BASE + ' (at 5)',
+])
+def test_pin_cite_variants_share_fingerprint(pinned):
+    assert citation_fingerprint(pinned) == citation_fingerprint(BASE)
+
+
+def test_pin_cite_inside_parenthetical_citation():
+    assert citation_fingerprint('(Smith and Jones 2020, p. 4)') == \
+        citation_fingerprint('(Smith and Jones 2020)')
+
+
+def test_parenthesized_year_is_kept():
+    assert citation_fingerprint('Smith, J. Policy Reform (2020)') != \
+        citation_fingerprint('Smith, J. Policy Reform (2021)')
+
+
+def test_parenthesized_pin_cite_hits_cache():
+    cache = SourceComponentsCache()
+    cache.set(BASE, SourceComponents(citation_type=CitationType.BOOK, title='The History of Policy Reform'))
+    found = cache.get(BASE + ' (p. 12)')
+    assert found is not None
+    assert found.title == 'The History of Policy Reform'
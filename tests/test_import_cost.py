@@ -0,0 +1,31 @@
+"""
+Tests that importing the router does not import the engine modules.
+
+Lambda cold starts import unified_router; the academic, legal, book and
+famous-paper engines are loaded when a citation first needs them.
+"""
+
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = [
+    'engines.academic',
+    'engines.superlegal',
+    'engines.books',
+    'engines.famous_papers',
+]
+
+
+def test_unified_router_defers_engine_modules():
+    code = (
+        'import sys, unified_router\n'
+        f'print("loaded:", [m for m in {DEFERRED_MODULES!r} if m in sys.modules])\n'
+    )
+    proc = subprocess.run([sys.executable, '-c', code], cwd=REPO_DIR,
+                          capture_output=True, text=True)
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[-1] == 'loaded: []'
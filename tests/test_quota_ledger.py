@@ -0,0 +1,31 @@
+"""
+Tests for quota_ledger.MemoryQuotaBackend reservation expiry.
+
+Reservations abandoned by crashed callers must stop holding capacity and
+must not accumulate in the backend.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import quota_ledger
+from quota_ledger import MemoryQuotaBackend, RESERVATION_TTL_SECONDS
+
+
+def test_expired_holds_are_dropped(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(quota_ledger.time, 'time', lambda: now[0])
+    backend = MemoryQuotaBackend()
+
+    assert backend.reserve('news', '2026-10-18', 2, 1, 'abandoned')
+    assert backend.reserve('news', '2026-10-18', 2, 1, 'late')
+    assert not backend.reserve('news', '2026-10-18', 2, 1, 'refused')
+
+    now[0] += RESERVATION_TTL_SECONDS
+    assert backend.reserve('news', '2026-10-18', 2, 1, 'fresh')
+    backend.commit('late')
+
+    assert set(backend._held) == {'fresh'}
+    assert backend.usage('news', '2026-10-18') == {'used': 0, 'reserved': 1}
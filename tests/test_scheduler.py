@@ -0,0 +1,147 @@
+"""
+Tests for scheduler.CallScheduler and scheduler.JobAdmission.
+
+Interactive calls must be served before bulk work, bulk classes must stay
+inside their caps, and calls or runs that cannot get a slot are shed with
+Overloaded instead of queuing forever.
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler
+from scheduler import CallScheduler, JobAdmission, Overloaded, Priority
+
+
+@pytest.fixture
+def short_waits(monkeypatch):
+    for priority in Priority:
+        monkeypatch.setitem(scheduler.MAX_WAIT, priority, 0.05)
+
+
+def _wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'condition not reached'
+        time.sleep(0.005)
+
+
+def _queued(calls, name):
+    return calls.stats()['classes'][name]['queue_depth']
+
+
+def _acquire_in_thread(calls, priority, granted):
+    def run():
+        ticket = calls.acquire(priority, 'u')
+        granted.append(priority)
+        calls.release(ticket)
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def test_interactive_served_before_earlier_document_call():
+    calls = CallScheduler(max_concurrency=1)
+    held = calls.acquire(Priority.INTERACTIVE, 'u')
+    granted = []
+
+    document = _acquire_in_thread(calls, Priority.DOCUMENT, granted)
+    _wait_until(lambda: _queued(calls, 'document') == 1)
+    interactive = _acquire_in_thread(calls, Priority.INTERACTIVE, granted)
+    _wait_until(lambda: _queued(calls, 'interactive') == 1)
+
+    calls.release(held)
+    document.join(2)
+    interactive.join(2)
+
+    assert granted == [Priority.INTERACTIVE, Priority.DOCUMENT]
+
+
+def test_bulk_and_background_caps_leave_interactive_headroom(short_waits):
+    calls = CallScheduler(max_concurrency=4, bulk_share=0.5, background_share=0.25)
+    assert (calls.bulk_cap, calls.background_cap) == (2, 1)
+
+    calls.acquire(Priority.BACKGROUND, 'u')
+    with pytest.raises(Overloaded):
+        calls.acquire(Priority.BACKGROUND, 'u')
+
+    calls.acquire(Priority.DOCUMENT, 'u')
+    with pytest.raises(Overloaded):
+        calls.acquire(Priority.DOCUMENT, 'u')
+
+    assert calls.acquire(Priority.INTERACTIVE, 'u') == Priority.INTERACTIVE
+    assert calls.acquire(Priority.INTERACTIVE, 'u') == Priority.INTERACTIVE
+    assert calls.stats()['in_flight'] == 4
+
+
+def test_call_shed_when_class_queue_full(monkeypatch):
+    monkeypatch.setitem(scheduler.MAX_QUEUE, Priority.DOCUMENT, 0)
+    calls = CallScheduler(max_concurrency=1)
+    calls.acquire(Priority.INTERACTIVE, 'u')
+
+    with pytest.raises(Overloaded, match='queue full'):
+        calls.acquire(Priority.DOCUMENT, 'u')
+
+    document = calls.stats()['classes']['document']
+    assert (document['shed'], document['timed_out'], document['queue_depth']) == (1, 0, 0)
+
+
+def test_call_shed_after_max_wait(short_waits):
+    calls = CallScheduler(max_concurrency=1)
+    calls.acquire(Priority.INTERACTIVE, 'u')
+
+    with pytest.raises(Overloaded) as excinfo:
+        calls.acquire(Priority.INTERACTIVE, 'u')
+
+    assert excinfo.value.priority == Priority.INTERACTIVE
+    assert excinfo.value.retry_after == scheduler.MAX_WAIT[Priority.INTERACTIVE]
+    interactive = calls.stats()['classes']['interactive']
+    assert (interactive['shed'], interactive['timed_out'], interactive['queue_depth']) == (1, 1, 0)
+
+
+def test_job_deferred_until_slot_frees():
+    jobs = JobAdmission(max_jobs=1, max_per_user=1)
+    jobs.enter('a')
+    admitted = threading.Event()
+
+    def run():
+        jobs.enter('b', timeout=2)
+        admitted.set()
+    thread = threading.Thread(target=run)
+    thread.start()
+    _wait_until(lambda: jobs.stats()['waiting'] == 1)
+
+    jobs.exit('a')
+    thread.join(2)
+
+    assert admitted.is_set()
+    stats = jobs.stats()
+    assert (stats['running'], stats['deferred'], stats['rejected']) == (1, 1, 0)
+
+
+def test_job_refused_after_wait():
+    jobs = JobAdmission(max_jobs=4, max_per_user=1)
+    jobs.enter('a')
+
+    with pytest.raises(Overloaded) as excinfo:
+        jobs.enter('a', timeout=0.05)
+
+    assert excinfo.value.retry_after == 0.05
+    jobs.enter('b', timeout=0.05)
+    stats = jobs.stats()
+    assert (stats['running'], stats['deferred'], stats['rejected']) == (2, 1, 1)
+
+
+def test_anonymous_jobs_held_to_process_cap_only():
+    jobs = JobAdmission(max_jobs=2, max_per_user=1)
+    jobs.enter('')
+    jobs.enter('', timeout=0.05)
+
+    with pytest.raises(Overloaded):
+        jobs.enter('', timeout=0.05)
@@ -19,9 +19,8 @@ Version History:
 import re
 from collections import Counter
 from typing import List, Optional
-import zipfile
-from io import BytesIO
-import xml.etree.ElementTree as ET
+
+from processors.docx_text import parse_docx_body
 
 
 # Common English stop words to exclude
@@ -88,24 +87,12 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
         Plain text content of the document body
     """
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes), 'r') as zf:
-            # Read document.xml (main body)
-            if 'word/document.xml' not in zf.namelist():
-                return ""
-            
-            with zf.open('word/document.xml') as f:
-                tree = ET.parse(f)
-                root = tree.getroot()
-            
-            # Extract all text elements
-            ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-            text_parts = []
-            
-            for t in root.findall('.//w:t', ns):
-                if t.text:
-                    text_parts.append(t.text)
-            
-            return ' '.join(text_parts)
+        body = parse_docx_body(file_bytes)
+        if body is None:
+            return ""
+        
+        # All text elements, space-separated
+        return body.run_text(' ')
             
     except Exception as e:
         print(f"[TopicExtractor] Error extracting text: {e}")
@@ -0,0 +1,417 @@
+"""
+citeflex/tracing.py
+
+Low-overhead span tracing and leveled logging for the resolution pipeline.
+
+Tracing:
+    A trace is opened per document (or per stress-test item) with
+    start_trace(); everything underneath records spans with span() or the
+    @traced decorator. Outside an active, sampled trace a span costs one
+    ContextVar lookup, so instrumentation can stay in the hot path.
+
+        with start_trace('process_document', request_id=rid) as trace:
+            with span('detect'):
+                detection = detect_type(query)
+        summary = trace.summary() if trace else None
+
+    Work handed to a thread pool must be submitted with submit_traced() so
+    its spans attach to the submitting span (thread pools do not inherit
+    context variables). The whole context is copied, traced or not, so
+    other context state (the scheduler workload) follows the work too.
+
+    Finished traces can be exported as JSON lines (one record per span) or
+    as an OpenTelemetry OTLP/JSON ``resourceSpans`` document, and
+    summarized into a flame-style breakdown (collapsed stacks with total
+    and self time) that is returned with ProcessingResult.
+
+Logging:
+    get_logger(name) returns a ``citeflex.<name>`` logger writing bare
+    messages to stdout, matching the previous print() output. Per-citation
+    progress messages are DEBUG, problems are WARNING; the deployed stack
+    runs at LOG_LEVEL=INFO in production (see infrastructure/template.yaml),
+    so the per-citation chatter is not written there.
+
+Environment:
+    LOG_LEVEL                   DEBUG (default) | INFO | WARNING | ERROR
+    CITEFLEX_TRACE_SAMPLE_RATE  fraction of traces recorded, 0.0-1.0 (default 1.0)
+    CITEFLEX_TRACE_EXPORT       file to append finished traces to (default: off)
+    CITEFLEX_TRACE_FORMAT       jsonl (default) | otel
+
+Version History:
+    2026-10-18 V1.0: Initial implementation
+    2026-10-18 V1.1: submit_traced() always copies the context
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Optional, Dict, List, Any
+
+
+# =============================================================================
+# LOGGING
+# =============================================================================
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'DEBUG').upper()
+LOG_ROOT = 'citeflex'
+
+_logging_lock = threading.Lock()
+_logging_configured = False
+
+
+def _configure_logging() -> None:
+    global _logging_configured
+    with _logging_lock:
+        if _logging_configured:
+            return
+        root = logging.getLogger(LOG_ROOT)
+        if not root.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            root.addHandler(handler)
+            root.propagate = False
+        root.setLevel(getattr(logging, LOG_LEVEL, logging.DEBUG))
+        _logging_configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Leveled replacement for the pipeline's print() diagnostics."""
+    if not _logging_configured:
+        _configure_logging()
+    return logging.getLogger(f'{LOG_ROOT}.{name}')
+
+
+# =============================================================================
+# TRACING
+# =============================================================================
+
+TRACE_SAMPLE_RATE = float(os.environ.get('CITEFLEX_TRACE_SAMPLE_RATE', '1.0'))
+TRACE_EXPORT_PATH = os.environ.get('CITEFLEX_TRACE_EXPORT', '')
+TRACE_EXPORT_FORMAT = os.environ.get('CITEFLEX_TRACE_FORMAT', 'jsonl')
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar('citeflex_trace', default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar('citeflex_span', default=None)
+
+_export_lock = threading.Lock()
+
+
+class Span:
+    """One timed operation inside a trace."""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'start_ns', 'end_ns',
+                 'attributes', 'status', 'thread')
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.status = 'ok'
+        self.thread = threading.current_thread().name
+        self.start_ns = time.time_ns()
+        self.end_ns = self.start_ns
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    """Returned by span() when nothing is being recorded."""
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans recorded for one document / request."""
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.attributes = attributes or {}
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def add(self, finished: Span) -> None:
+        with self._lock:
+            self.spans.append(finished)
+
+    # -------------------------------------------------------------------------
+    # Summaries
+    # -------------------------------------------------------------------------
+
+    def _stacks(self) -> Dict[str, str]:
+        """span_id -> 'root;child;grandchild' name path."""
+        by_id = {s.span_id: s for s in self.spans}
+        paths: Dict[str, str] = {}
+
+        def path_of(s: Span) -> str:
+            cached = paths.get(s.span_id)
+            if cached is not None:
+                return cached
+            parent = by_id.get(s.parent_id)
+            result = f"{path_of(parent)};{s.name}" if parent else s.name
+            paths[s.span_id] = result
+            return result
+
+        for s in self.spans:
+            path_of(s)
+        return paths
+
+    def summary(self, top: int = 40) -> Dict[str, Any]:
+        """
+        Flame-style breakdown: time per collapsed stack and per span name.
+
+        Self time is a span's duration minus its children's; children that
+        ran in parallel can exceed the parent, so self time is clamped at 0.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        paths = self._stacks()
+
+        child_ms: Dict[str, float] = {}
+        for s in spans:
+            if s.parent_id:
+                child_ms[s.parent_id] = child_ms.get(s.parent_id, 0.0) + s.duration_ms
+
+        stacks: Dict[str, Dict[str, float]] = {}
+        by_name: Dict[str, Dict[str, float]] = {}
+        errors = 0
+        for s in spans:
+            duration = s.duration_ms
+            self_ms = max(duration - child_ms.get(s.span_id, 0.0), 0.0)
+            entry = stacks.setdefault(paths[s.span_id], {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += duration
+            entry['self_ms'] += self_ms
+            named = by_name.setdefault(s.name, {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0})
+            named['count'] += 1
+            named['total_ms'] += duration
+            named['self_ms'] += self_ms
+            if s.status != 'ok':
+                errors += 1
+
+        roots = [s for s in spans if s.parent_id is None]
+        ranked = sorted(stacks.items(), key=lambda kv: kv[1]['total_ms'], reverse=True)
+        return {
+            'trace_id': self.trace_id,
+            'name': self.name,
+            'total_ms': round(sum(s.duration_ms for s in roots), 2),
+            'span_count': len(spans),
+            'error_count': errors,
+            'stacks': [
+                {'stack': stack, 'count': int(v['count']),
+                 'total_ms': round(v['total_ms'], 2), 'self_ms': round(v['self_ms'], 2)}
+                for stack, v in ranked[:top]
+            ],
+            'by_name': {
+                name: {'count': int(v['count']), 'total_ms': round(v['total_ms'], 2),
+                       'self_ms': round(v['self_ms'], 2)}
+                for name, v in sorted(by_name.items(), key=lambda kv: kv[1]['total_ms'], reverse=True)
+            },
+        }
+
+    def folded(self) -> str:
+        """Collapsed-stack text ('a;b;c <self µs>' per line) for flame graph tools."""
+        summary = self.summary(top=len(self.spans) or 1)
+        return '\n'.join(f"{e['stack']} {int(e['self_ms'] * 1000)}" for e in summary['stacks'])
+
+    # -------------------------------------------------------------------------
+    # Export
+    # -------------------------------------------------------------------------
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One flat JSON-serializable record per span."""
+        with self._lock:
+            spans = list(self.spans)
+        return [
+            {
+                'trace_id': self.trace_id,
+                'span_id': s.span_id,
+                'parent_id': s.parent_id,
+                'name': s.name,
+                'start_ns': s.start_ns,
+                'end_ns': s.end_ns,
+                'duration_ms': round(s.duration_ms, 3),
+                'status': s.status,
+                'thread': s.thread,
+                'attributes': s.attributes,
+            }
+            for s in spans
+        ]
+
+    def to_otel(self, service_name: str = 'citeflex') -> Dict[str, Any]:
+        """OTLP/JSON ``resourceSpans`` document (importable by OTel collectors)."""
+        def attrs(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+            out = []
+            for key, value in values.items():
+                if isinstance(value, bool):
+                    out.append({'key': key, 'value': {'boolValue': value}})
+                elif isinstance(value, int):
+                    out.append({'key': key, 'value': {'intValue': str(value)}})
+                elif isinstance(value, float):
+                    out.append({'key': key, 'value': {'doubleValue': value}})
+                else:
+                    out.append({'key': key, 'value': {'stringValue': str(value)}})
+            return out
+
+        with self._lock:
+            spans = list(self.spans)
+        return {
+            'resourceSpans': [{
+                'resource': {'attributes': attrs({'service.name': service_name, **self.attributes})},
+                'scopeSpans': [{
+                    'scope': {'name': 'citeflex.tracing'},
+                    'spans': [
+                        {
+                            'traceId': self.trace_id,
+                            'spanId': s.span_id,
+                            'parentSpanId': s.parent_id or '',
+                            'name': s.name,
+                            'kind': 1,  # SPAN_KIND_INTERNAL
+                            'startTimeUnixNano': str(s.start_ns),
+                            'endTimeUnixNano': str(s.end_ns),
+                            'attributes': attrs({**s.attributes, 'thread.name': s.thread}),
+                            'status': {'code': 1 if s.status == 'ok' else 2},
+                        }
+                        for s in spans
+                    ],
+                }],
+            }],
+        }
+
+    def export(self, path: str, fmt: str = 'jsonl') -> None:
+        """Append this trace to ``path`` as JSON lines or one OTLP document per line."""
+        with _export_lock, open(path, 'a', encoding='utf-8') as f:
+            if fmt == 'otel':
+                f.write(json.dumps(self.to_otel(), default=str) + '\n')
+            else:
+                for record in self.to_records():
+                    f.write(json.dumps(record, default=str) + '\n')
+
+
+class start_trace:
+    """
+    Open a trace (and its root span) for the current context.
+
+    Yields the Trace, or None when this trace was not sampled - in which
+    case every span() underneath is a no-op.
+    """
+
+    __slots__ = ('name', 'attributes', 'sample_rate', 'trace', '_root', '_tokens')
+
+    def __init__(self, name: str, sample_rate: Optional[float] = None, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.sample_rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.trace = None
+        self._root = None
+        self._tokens = None
+
+    def __enter__(self) -> Optional[Trace]:
+        if self.sample_rate <= 0 or (self.sample_rate < 1 and random.random() >= self.sample_rate):
+            self._tokens = (_current_trace.set(None), _current_span.set(None))
+            return None
+        self.trace = Trace(self.name, dict(self.attributes))
+        self._root = Span(self.name, None, dict(self.attributes))
+        self._tokens = (_current_trace.set(self.trace), _current_span.set(self._root))
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        trace_token, span_token = self._tokens
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        if self.trace is not None:
+            self._root.end_ns = time.time_ns()
+            if exc_type is not None:
+                self._root.status = 'error'
+                self._root.attributes['error'] = exc_type.__name__
+            self.trace.add(self._root)
+            if TRACE_EXPORT_PATH:
+                try:
+                    self.trace.export(TRACE_EXPORT_PATH, TRACE_EXPORT_FORMAT)
+                except OSError as e:
+                    get_logger('tracing').warning(f"[Tracing] Could not export trace: {e}")
+        return False
+
+
+class span:
+    """
+    Time a block as a child of the current span.
+
+        with span('engine.crossref', query=query[:80]) as s:
+            result = ...
+            s.set_attribute('hit', bool(result))
+    """
+
+    __slots__ = ('name', 'attributes', '_span', '_trace', '_token')
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._span = None
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is None:
+            return _NOOP_SPAN
+        parent = _current_span.get()
+        self._trace = trace
+        self._span = Span(self.name, parent.span_id if parent else None, self.attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if self._span is None:
+            return False
+        self._span.end_ns = time.time_ns()
+        if exc_type is not None:
+            self._span.status = 'error'
+            self._span.attributes['error'] = exc_type.__name__
+        _current_span.reset(self._token)
+        self._trace.add(self._span)
+        return False
+
+
+def traced(name: Optional[str] = None):
+    """Decorator form of span(); defaults to the function's name."""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def submit_traced(executor, fn, *args, **kwargs):
+    """
+    executor.submit() that carries the caller's context variables (current
+    trace, scheduler workload) into the worker thread.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def current_trace() -> Optional[Trace]:
+    """The active, sampled trace (None when not tracing)."""
+    return _current_trace.get()
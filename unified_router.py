@@ -4,6 +4,8 @@ citeflex/unified_router.py
 Unified routing logic combining the best of CiteFlex Pro and Cite Fix Pro.
 
 Version History:
+    2026-10-18 V4.2: Academic engines and superlegal/books/famous_papers/scoring
+                     loaded on first use (LazyEngine/LazyModule)
     2025-12-21 V4.1: SMART URL ROUTING - SerpAPI for paywalled content only
                      - Uses SerpAPI ($0.005) only for paywalled sites (WaPo, NYT, etc.)
                      - Direct fetch (FREE) for open content (CDC, .gov, etc.)
@@ -45,12 +47,13 @@ from models import SourceComponents, CitationType, parse_author_name
 from config import NEWSPAPER_DOMAINS, GOV_AGENCY_MAP, ACADEMIC_AI_DOMAINS
 from detectors import detect_type, DetectionResult, is_url
 from extractors import extract_by_type
-from formatters.base import get_formatter
+from formatters.cache import get_cached_formatter
 
-# Import CiteFlex Pro engines
-from engines.academic import CrossrefEngine, OpenAlexEngine, SemanticScholarEngine, PubMedEngine
+# Import CiteFlex Pro engines (engine modules are imported on first use)
 from engines.doi import extract_doi_from_url, is_academic_publisher_url
-from engines.generic_url import GenericURLEngine
+from engines.base import LazyEngine, LazyModule
+
+scoring = LazyModule('engines.scoring')
 
 # Smart URL Router (uses SerpAPI only for paywalled content)
 try:
@@ -60,16 +63,19 @@ except ImportError:
     SMART_ROUTER_AVAILABLE = False
     SmartURLRouter = None
 
-# Import Cite Fix Pro modules (now in engines/)
-from engines import superlegal
-from engines import books
-from engines.famous_papers import find_famous_paper
+# Cite Fix Pro modules (now in engines/), imported on first use
+superlegal = LazyModule('engines.superlegal')
+books = LazyModule('engines.books')
+famous_papers = LazyModule('engines.famous_papers')
 
 # =============================================================================
 # AI LOOKUP (consolidated module - replaces routers/claude.py and routers/gemini.py)
 # =============================================================================
 
 import os
+from tracing import get_logger, span, traced, submit_traced
+
+logger = get_logger('unified_router')
 
 # Import from consolidated AI module
 try:
@@ -89,7 +95,7 @@ try:
     NEWSPAPER_AI_AVAILABLE = True
     ACADEMIC_AI_AVAILABLE = True
 except ImportError as e:
-    print(f"[UnifiedRouter] AI lookup not available: {e}")
+    logger.warning(f"[UnifiedRouter] AI lookup not available: {e}")
     AI_AVAILABLE = False
     AI_PROVIDERS = []
     NEWSPAPER_AI_AVAILABLE = False
@@ -106,6 +112,7 @@ except ImportError as e:
         return None
 
 
+@traced('ai.classify')
 def classify_with_ai(query: str, context: str = "") -> Tuple[CitationType, Optional[SourceComponents]]:
     """
     Classify citation using AI (provider chain configured via AI_PROVIDER_CHAIN env var).
@@ -125,9 +132,9 @@ def classify_with_ai(query: str, context: str = "") -> Tuple[CitationType, Optio
 
 
 if AI_AVAILABLE:
-    print(f"[UnifiedRouter] AI classification available via: {' → '.join(AI_PROVIDERS)}")
+    logger.info(f"[UnifiedRouter] AI classification available via: {' → '.join(AI_PROVIDERS)}")
 else:
-    print("[UnifiedRouter] No AI providers configured - UNKNOWN queries will use default routing")
+    logger.info("[UnifiedRouter] No AI providers configured - UNKNOWN queries will use default routing")
 
 
 # =============================================================================
@@ -145,10 +152,10 @@ MEDICAL_DOMAINS = ['pubmed', 'ncbi.nlm.nih.gov', 'nih.gov/health', 'medlineplus'
 # ENGINE INSTANCES (reused across requests)
 # =============================================================================
 
-_crossref = CrossrefEngine()
-_openalex = OpenAlexEngine()
-_semantic = SemanticScholarEngine()
-_pubmed = PubMedEngine()
+_crossref = LazyEngine('engines.academic', 'CrossrefEngine')
+_openalex = LazyEngine('engines.academic', 'OpenAlexEngine')
+_semantic = LazyEngine('engines.academic', 'SemanticScholarEngine')
+_pubmed = LazyEngine('engines.academic', 'PubMedEngine')
 
 # =============================================================================
 # SMART URL ROUTER (Updated 2025-12-21)
@@ -173,7 +180,8 @@ if SMART_ROUTER_AVAILABLE:
         
         def __init__(self):
             self.smart_router = SmartURLRouter(debug=True)  # Enable debug temporarily
-            self.fallback = GenericURLEngine()
+            # HTML scraping engine (pulls in BeautifulSoup); loaded on first URL
+            self.fallback = LazyEngine('engines.generic_url', 'GenericURLEngine')
         
         def fetch_by_url(self, url):
             """Smart routing based on domain type."""
@@ -182,7 +190,7 @@ if SMART_ROUTER_AVAILABLE:
                 metadata = self.smart_router.resolve(url)
                 
                 if metadata.is_complete():
-                    print(f"[SmartRouter] ✓ Resolved via {metadata.method_used}: {metadata.title[:50] if metadata.title else 'N/A'}")
+                    logger.debug(f"[SmartRouter] ✓ Resolved via {metadata.method_used}: {metadata.title[:50] if metadata.title else 'N/A'}")
                     
                     # Get authors_parsed if available
                     authors_parsed = getattr(metadata, 'authors_parsed', [])
@@ -205,7 +213,7 @@ if SMART_ROUTER_AVAILABLE:
                     
                     if has_institutional_author:
                         # We have authors but need title - use GenericURL for title only
-                        print(f"[SmartRouter] Institutional author detected: {metadata.authors}")
+                        logger.debug(f"[SmartRouter] Institutional author detected: {metadata.authors}")
                         fallback_result = self.fallback.fetch_by_url(url)
                         
                         # Merge: take title from fallback, keep institutional author
@@ -225,21 +233,21 @@ if SMART_ROUTER_AVAILABLE:
                         return self.fallback.fetch_by_url(url)
             
             except Exception as e:
-                print(f"[SmartRouter] Error, using GenericURL: {e}")
+                logger.warning(f"[SmartRouter] Error, using GenericURL: {e}")
                 return self.fallback.fetch_by_url(url)
     
     _generic_url = _SmartURLWrapper()
-    print("[UnifiedRouter] Smart URL Router enabled (SerpAPI for paywalled content)")
+    logger.info("[UnifiedRouter] Smart URL Router enabled (SerpAPI for paywalled content)")
 else:
-    _generic_url = GenericURLEngine()
-    print("[UnifiedRouter] Using GenericURLEngine (SmartRouter not available)")
+    _generic_url = LazyEngine('engines.generic_url', 'GenericURLEngine')
+    logger.warning("[UnifiedRouter] Using GenericURLEngine (SmartRouter not available)")
 
 # Google Scholar (paid via SerpAPI) - Layer 4.5
 try:
     from engines.google_scholar import GoogleScholarEngine
     _google_scholar = GoogleScholarEngine()
     GOOGLE_SCHOLAR_AVAILABLE = True
-    print("[UnifiedRouter] Google Scholar available (SerpAPI)")
+    logger.info("[UnifiedRouter] Google Scholar available (SerpAPI)")
 except ImportError:
     _google_scholar = None
     GOOGLE_SCHOLAR_AVAILABLE = False
@@ -251,6 +259,139 @@ except ImportError:
 # When query contains author surname + keywords, score results by author position.
 # Most users would cite sole/first authors, not 47th author on a consortium paper.
 
+# Common first names to skip when extracting author surname
+# Includes American/English, European, Asian, Middle Eastern, African, Latin names
+_QUERY_FIRST_NAMES = frozenset({
+    # American/English - Male
+    'james', 'john', 'robert', 'michael', 'william', 'david', 'richard', 'joseph',
+    'thomas', 'charles', 'christopher', 'daniel', 'matthew', 'anthony', 'mark',
+    'donald', 'steven', 'paul', 'andrew', 'joshua', 'kenneth', 'kevin', 'brian',
+    'george', 'edward', 'ronald', 'timothy', 'jason', 'jeffrey', 'ryan', 'jacob',
+    'benjamin', 'samuel', 'nicholas', 'jonathan', 'stephen', 'larry', 'justin',
+    'scott', 'brandon', 'raymond', 'gregory', 'frank', 'alexander', 'patrick',
+    'jack', 'dennis', 'jerry', 'tyler', 'aaron', 'jose', 'adam', 'nathan',
+    'henry', 'douglas', 'zachary', 'peter', 'kyle', 'noah', 'ethan', 'jeremy',
+    'walter', 'christian', 'keith', 'roger', 'terry', 'austin', 'sean', 'gerald',
+    'carl', 'harold', 'dylan', 'arthur', 'lawrence', 'jordan', 'jesse', 'bryan',
+    # American/English - Female
+    'mary', 'patricia', 'jennifer', 'linda', 'elizabeth', 'barbara', 'susan',
+    'jessica', 'sarah', 'karen', 'nancy', 'lisa', 'betty', 'margaret', 'sandra',
+    'ashley', 'dorothy', 'kimberly', 'emily', 'donna', 'michelle', 'carol', 'amanda',
+    'anna', 'ruth', 'helen', 'laura', 'marie', 'ann', 'jane', 'alice', 'grace',
+    'melissa', 'deborah', 'stephanie', 'rebecca', 'sharon', 'cynthia', 'kathleen',
+    'amy', 'angela', 'shirley', 'brenda', 'pamela', 'emma', 'nicole', 'helen',
+    'samantha', 'katherine', 'christine', 'debra', 'rachel', 'carolyn', 'janet',
+    'catherine', 'maria', 'heather', 'diane', 'olivia', 'julie', 'joyce', 'virginia',
+    # European - French
+    'jean', 'pierre', 'jacques', 'michel', 'philippe', 'alain', 'bernard', 'claude',
+    'francois', 'laurent', 'nicolas', 'christophe', 'antoine', 'olivier', 'pascal',
+    'marie', 'jeanne', 'marguerite', 'sophie', 'camille', 'charlotte', 'juliette',
+    # European - German
+    'hans', 'franz', 'karl', 'johann', 'friedrich', 'wilhelm', 'heinrich', 'werner',
+    'helmut', 'wolfgang', 'dieter', 'klaus', 'jurgen', 'gerhard', 'manfred', 'rolf',
+    'ursula', 'helga', 'ingrid', 'gisela', 'renate', 'monika', 'petra', 'sabine',
+    # European - Spanish/Portuguese
+    'jose', 'juan', 'carlos', 'miguel', 'antonio', 'francisco', 'luis', 'pedro',
+    'jorge', 'manuel', 'rafael', 'fernando', 'pablo', 'alberto', 'sergio', 'ricardo',
+    'maria', 'carmen', 'rosa', 'ana', 'isabel', 'lucia', 'elena', 'teresa', 'pilar',
+    'joao', 'paulo', 'andre', 'rodrigo', 'bruno', 'hugo', 'rui', 'nuno', 'tiago',
+    # European - Italian
+    'giuseppe', 'giovanni', 'antonio', 'mario', 'luigi', 'francesco', 'angelo',
+    'vincenzo', 'pietro', 'salvatore', 'carlo', 'franco', 'bruno', 'paolo', 'marco',
+    'giulia', 'francesca', 'chiara', 'sara', 'valentina', 'alessia', 'giorgia',
+    # European - Dutch/Scandinavian
+    'jan', 'pieter', 'willem', 'hendrik', 'cornelis', 'johannes', 'gerrit', 'dirk',
+    'erik', 'lars', 'anders', 'magnus', 'olaf', 'sven', 'bjorn', 'thor', 'leif',
+    'anna', 'ingrid', 'astrid', 'sigrid', 'freya', 'helga', 'karin', 'greta',
+    # European - Polish/Czech/Russian/Slavic
+    'jan', 'piotr', 'andrzej', 'krzysztof', 'stanislaw', 'tomasz', 'marek', 'michal',
+    'pavel', 'vaclav', 'jiri', 'josef', 'martin', 'petr', 'jaroslav', 'miroslav',
+    'ivan', 'dmitri', 'alexei', 'nikolai', 'sergei', 'vladimir', 'yuri', 'boris',
+    'mikhail', 'andrei', 'viktor', 'oleg', 'igor', 'pavel', 'konstantin', 'anatoly',
+    'anna', 'maria', 'elena', 'olga', 'natalia', 'tatiana', 'irina', 'svetlana',
+    # Chinese (pinyin romanization)
+    'wei', 'ming', 'jing', 'hong', 'hui', 'lei', 'yan', 'lin', 'fang', 'ying',
+    'xiao', 'ping', 'qiang', 'yong', 'jun', 'tao', 'hao', 'long', 'feng', 'cheng',
+    'xin', 'yu', 'jian', 'bo', 'gang', 'hai', 'peng', 'bin', 'nan', 'dong',
+    # Japanese
+    'takeshi', 'hiroshi', 'kenji', 'taro', 'ichiro', 'akira', 'yuki', 'haruki',
+    'kazuki', 'daisuke', 'shun', 'ryo', 'yusuke', 'ken', 'shin', 'makoto', 'satoshi',
+    'yoko', 'keiko', 'michiko', 'sachiko', 'tomoko', 'yumi', 'naomi', 'emi', 'mika',
+    # Korean
+    'joon', 'min', 'sung', 'young', 'hyun', 'jin', 'soo', 'hee', 'jung', 'eun',
+    'seung', 'dong', 'sang', 'woo', 'jun', 'ho', 'kyung', 'yeon', 'ji', 'sun',
+    # Indian/South Asian
+    'raj', 'amit', 'vikram', 'anil', 'sunil', 'sanjay', 'ravi', 'ashok', 'ramesh',
+    'deepak', 'rajesh', 'suresh', 'manoj', 'vijay', 'ajay', 'rakesh', 'pradeep',
+    'krishna', 'arjun', 'rahul', 'nikhil', 'arun', 'anand', 'kumar', 'mohan',
+    'priya', 'neha', 'pooja', 'sunita', 'anita', 'rekha', 'kavita', 'shalini',
+    'meena', 'geeta', 'rita', 'seema', 'shobha', 'usha', 'lata', 'nisha', 'swati',
+    # Middle Eastern/Arabic
+    'mohammed', 'muhammad', 'ahmed', 'ali', 'omar', 'hassan', 'hussein', 'khalid',
+    'abdullah', 'abdul', 'ibrahim', 'yusuf', 'mustafa', 'nasser', 'samir', 'tariq',
+    'karim', 'rashid', 'jamal', 'faisal', 'walid', 'adel', 'nabil', 'hani', 'ziad',
+    'fatima', 'aisha', 'maryam', 'layla', 'nadia', 'sara', 'hana', 'dina', 'rania',
+    # Hebrew/Israeli
+    'david', 'daniel', 'moshe', 'yosef', 'abraham', 'isaac', 'jacob', 'aaron',
+    'eli', 'avi', 'yossi', 'ilan', 'oren', 'eyal', 'gideon', 'noam', 'amit', 'oded',
+    'rachel', 'sarah', 'miriam', 'esther', 'ruth', 'leah', 'tamar', 'yael', 'maya',
+    'moishe', 'ilyon', 'emmanuel', 'leo', 'peggy',
+    # African
+    'kwame', 'kofi', 'ama', 'akua', 'yaw', 'abena', 'adjoa', 'adwoa', 'efua',
+    'chidi', 'chinedu', 'emeka', 'obinna', 'uchenna', 'ngozi', 'chioma', 'adaeze',
+    'oluwaseun', 'olumide', 'adebayo', 'olufemi', 'tunde', 'segun', 'yemi', 'bola',
+    # Latin American (additional to Spanish/Portuguese)
+    'guadalupe', 'esperanza', 'socorro', 'consuelo', 'dolores', 'luz', 'mercedes',
+    'raul', 'oscar', 'cesar', 'hector', 'victor', 'julio', 'armando', 'alfredo',
+    # Greek
+    'nikos', 'kostas', 'giorgos', 'dimitris', 'yannis', 'petros', 'thanasis',
+    'maria', 'eleni', 'katerina', 'sofia', 'anna', 'georgia', 'christina',
+    # Turkish
+    'mehmet', 'mustafa', 'ahmet', 'ali', 'hasan', 'huseyin', 'ibrahim', 'ismail',
+    'fatma', 'ayse', 'emine', 'hatice', 'zeynep', 'elif', 'merve', 'esra',
+    # Vietnamese
+    'nguyen', 'tran', 'anh', 'minh', 'duc', 'huy', 'nam', 'tuan', 'hung', 'long',
+    'linh', 'mai', 'lan', 'huong', 'nga', 'thao', 'trang', 'yen', 'hanh', 'phuong',
+})
+
+# Common non-name words that might appear capitalized at start of query
+# Includes words commonly found in book/article titles that aren't surnames
+_QUERY_SKIP_WORDS = frozenset({
+    # Question words
+    'how', 'what', 'when', 'where', 'why', 'who', 'which', 'whose',
+    # Articles and prepositions
+    'the', 'did', 'does', 'was', 'were', 'are', 'has', 'had', 'have',
+    'can', 'could', 'should', 'would', 'will', 'may', 'might', 'must',
+    'this', 'that', 'these', 'those', 'from', 'with', 'about', 'into',
+    # Common title/subject words
+    'history', 'origins', 'emergence', 'rise', 'fall', 'decline',
+    'introduction', 'review', 'analysis', 'study', 'case', 'cases',
+    # Relationship/social terms often in titles
+    'master', 'slave', 'husband', 'wife', 'father', 'mother', 'son', 'daughter',
+    'brother', 'sister', 'family', 'marriage', 'love', 'death', 'life', 'war',
+    'peace', 'power', 'mind', 'body', 'soul', 'spirit', 'heart', 'brain',
+    # Common adjectives in titles
+    'american', 'british', 'french', 'german', 'chinese', 'japanese', 'russian',
+    'modern', 'ancient', 'new', 'old', 'great', 'little', 'big', 'small',
+    'first', 'last', 'final', 'secret', 'hidden', 'lost', 'found',
+    # Academic/genre terms
+    'theory', 'practice', 'science', 'art', 'culture', 'society', 'nature',
+    'politics', 'economics', 'psychology', 'philosophy', 'religion', 'law',
+    'medicine', 'health', 'education', 'technology', 'digital', 'social',
+    # Action words often starting titles
+    'making', 'breaking', 'building', 'creating', 'finding', 'losing',
+    'becoming', 'being', 'thinking', 'feeling', 'living', 'dying',
+    # Common book title patterns
+    'games', 'rules', 'secrets', 'stories', 'tales', 'letters', 'notes',
+    'memoirs', 'confessions', 'adventures', 'journey', 'quest', 'search',
+})
+
+
+def _extract_query_author(query: str) -> Optional[str]:
+    """Likely author surname in a query (skips common first names and title words)."""
+    return scoring.extract_query_author(query, _QUERY_FIRST_NAMES, _QUERY_SKIP_WORDS)
+
+
 def _score_author_position(result: SourceComponents, query: str) -> float:
     """
     Score a result based on whether query author appears as sole/first author.
@@ -262,183 +403,20 @@ def _score_author_position(result: SourceComponents, query: str) -> float:
         0.3 = 4th+ author
         0.1 = author not found
     """
-    if not result or not result.authors:
-        return 0.1
-    
-    # Common first names to skip when extracting author surname
-    # Includes American/English, European, Asian, Middle Eastern, African, Latin names
-    COMMON_FIRST_NAMES = {
-        # American/English - Male
-        'james', 'john', 'robert', 'michael', 'william', 'david', 'richard', 'joseph',
-        'thomas', 'charles', 'christopher', 'daniel', 'matthew', 'anthony', 'mark',
-        'donald', 'steven', 'paul', 'andrew', 'joshua', 'kenneth', 'kevin', 'brian',
-        'george', 'edward', 'ronald', 'timothy', 'jason', 'jeffrey', 'ryan', 'jacob',
-        'benjamin', 'samuel', 'nicholas', 'jonathan', 'stephen', 'larry', 'justin',
-        'scott', 'brandon', 'raymond', 'gregory', 'frank', 'alexander', 'patrick',
-        'jack', 'dennis', 'jerry', 'tyler', 'aaron', 'jose', 'adam', 'nathan',
-        'henry', 'douglas', 'zachary', 'peter', 'kyle', 'noah', 'ethan', 'jeremy',
-        'walter', 'christian', 'keith', 'roger', 'terry', 'austin', 'sean', 'gerald',
-        'carl', 'harold', 'dylan', 'arthur', 'lawrence', 'jordan', 'jesse', 'bryan',
-        # American/English - Female
-        'mary', 'patricia', 'jennifer', 'linda', 'elizabeth', 'barbara', 'susan',
-        'jessica', 'sarah', 'karen', 'nancy', 'lisa', 'betty', 'margaret', 'sandra',
-        'ashley', 'dorothy', 'kimberly', 'emily', 'donna', 'michelle', 'carol', 'amanda',
-        'anna', 'ruth', 'helen', 'laura', 'marie', 'ann', 'jane', 'alice', 'grace',
-        'melissa', 'deborah', 'stephanie', 'rebecca', 'sharon', 'cynthia', 'kathleen',
-        'amy', 'angela', 'shirley', 'brenda', 'pamela', 'emma', 'nicole', 'helen',
-        'samantha', 'katherine', 'christine', 'debra', 'rachel', 'carolyn', 'janet',
-        'catherine', 'maria', 'heather', 'diane', 'olivia', 'julie', 'joyce', 'virginia',
-        # European - French
-        'jean', 'pierre', 'jacques', 'michel', 'philippe', 'alain', 'bernard', 'claude',
-        'francois', 'laurent', 'nicolas', 'christophe', 'antoine', 'olivier', 'pascal',
-        'marie', 'jeanne', 'marguerite', 'sophie', 'camille', 'charlotte', 'juliette',
-        # European - German
-        'hans', 'franz', 'karl', 'johann', 'friedrich', 'wilhelm', 'heinrich', 'werner',
-        'helmut', 'wolfgang', 'dieter', 'klaus', 'jurgen', 'gerhard', 'manfred', 'rolf',
-        'ursula', 'helga', 'ingrid', 'gisela', 'renate', 'monika', 'petra', 'sabine',
-        # European - Spanish/Portuguese
-        'jose', 'juan', 'carlos', 'miguel', 'antonio', 'francisco', 'luis', 'pedro',
-        'jorge', 'manuel', 'rafael', 'fernando', 'pablo', 'alberto', 'sergio', 'ricardo',
-        'maria', 'carmen', 'rosa', 'ana', 'isabel', 'lucia', 'elena', 'teresa', 'pilar',
-        'joao', 'paulo', 'andre', 'rodrigo', 'bruno', 'hugo', 'rui', 'nuno', 'tiago',
-        # European - Italian
-        'giuseppe', 'giovanni', 'antonio', 'mario', 'luigi', 'francesco', 'angelo',
-        'vincenzo', 'pietro', 'salvatore', 'carlo', 'franco', 'bruno', 'paolo', 'marco',
-        'giulia', 'francesca', 'chiara', 'sara', 'valentina', 'alessia', 'giorgia',
-        # European - Dutch/Scandinavian
-        'jan', 'pieter', 'willem', 'hendrik', 'cornelis', 'johannes', 'gerrit', 'dirk',
-        'erik', 'lars', 'anders', 'magnus', 'olaf', 'sven', 'bjorn', 'thor', 'leif',
-        'anna', 'ingrid', 'astrid', 'sigrid', 'freya', 'helga', 'karin', 'greta',
-        # European - Polish/Czech/Russian/Slavic
-        'jan', 'piotr', 'andrzej', 'krzysztof', 'stanislaw', 'tomasz', 'marek', 'michal',
-        'pavel', 'vaclav', 'jiri', 'josef', 'martin', 'petr', 'jaroslav', 'miroslav',
-        'ivan', 'dmitri', 'alexei', 'nikolai', 'sergei', 'vladimir', 'yuri', 'boris',
-        'mikhail', 'andrei', 'viktor', 'oleg', 'igor', 'pavel', 'konstantin', 'anatoly',
-        'anna', 'maria', 'elena', 'olga', 'natalia', 'tatiana', 'irina', 'svetlana',
-        # Chinese (pinyin romanization)
-        'wei', 'ming', 'jing', 'hong', 'hui', 'lei', 'yan', 'lin', 'fang', 'ying',
-        'xiao', 'ping', 'qiang', 'yong', 'jun', 'tao', 'hao', 'long', 'feng', 'cheng',
-        'xin', 'yu', 'jian', 'bo', 'gang', 'hai', 'peng', 'bin', 'nan', 'dong',
-        # Japanese
-        'takeshi', 'hiroshi', 'kenji', 'taro', 'ichiro', 'akira', 'yuki', 'haruki',
-        'kazuki', 'daisuke', 'shun', 'ryo', 'yusuke', 'ken', 'shin', 'makoto', 'satoshi',
-        'yoko', 'keiko', 'michiko', 'sachiko', 'tomoko', 'yumi', 'naomi', 'emi', 'mika',
-        # Korean
-        'joon', 'min', 'sung', 'young', 'hyun', 'jin', 'soo', 'hee', 'jung', 'eun',
-        'seung', 'dong', 'sang', 'woo', 'jun', 'ho', 'kyung', 'yeon', 'ji', 'sun',
-        # Indian/South Asian
-        'raj', 'amit', 'vikram', 'anil', 'sunil', 'sanjay', 'ravi', 'ashok', 'ramesh',
-        'deepak', 'rajesh', 'suresh', 'manoj', 'vijay', 'ajay', 'rakesh', 'pradeep',
-        'krishna', 'arjun', 'rahul', 'nikhil', 'arun', 'anand', 'kumar', 'mohan',
-        'priya', 'neha', 'pooja', 'sunita', 'anita', 'rekha', 'kavita', 'shalini',
-        'meena', 'geeta', 'rita', 'seema', 'shobha', 'usha', 'lata', 'nisha', 'swati',
-        # Middle Eastern/Arabic
-        'mohammed', 'muhammad', 'ahmed', 'ali', 'omar', 'hassan', 'hussein', 'khalid',
-        'abdullah', 'abdul', 'ibrahim', 'yusuf', 'mustafa', 'nasser', 'samir', 'tariq',
-        'karim', 'rashid', 'jamal', 'faisal', 'walid', 'adel', 'nabil', 'hani', 'ziad',
-        'fatima', 'aisha', 'maryam', 'layla', 'nadia', 'sara', 'hana', 'dina', 'rania',
-        # Hebrew/Israeli
-        'david', 'daniel', 'moshe', 'yosef', 'abraham', 'isaac', 'jacob', 'aaron',
-        'eli', 'avi', 'yossi', 'ilan', 'oren', 'eyal', 'gideon', 'noam', 'amit', 'oded',
-        'rachel', 'sarah', 'miriam', 'esther', 'ruth', 'leah', 'tamar', 'yael', 'maya',
-        'moishe', 'ilyon', 'emmanuel', 'leo', 'peggy',
-        # African
-        'kwame', 'kofi', 'ama', 'akua', 'yaw', 'abena', 'adjoa', 'adwoa', 'efua',
-        'chidi', 'chinedu', 'emeka', 'obinna', 'uchenna', 'ngozi', 'chioma', 'adaeze',
-        'oluwaseun', 'olumide', 'adebayo', 'olufemi', 'tunde', 'segun', 'yemi', 'bola',
-        # Latin American (additional to Spanish/Portuguese)
-        'guadalupe', 'esperanza', 'socorro', 'consuelo', 'dolores', 'luz', 'mercedes',
-        'raul', 'oscar', 'cesar', 'hector', 'victor', 'julio', 'armando', 'alfredo',
-        # Greek
-        'nikos', 'kostas', 'giorgos', 'dimitris', 'yannis', 'petros', 'thanasis',
-        'maria', 'eleni', 'katerina', 'sofia', 'anna', 'georgia', 'christina',
-        # Turkish
-        'mehmet', 'mustafa', 'ahmet', 'ali', 'hasan', 'huseyin', 'ibrahim', 'ismail',
-        'fatma', 'ayse', 'emine', 'hatice', 'zeynep', 'elif', 'merve', 'esra',
-        # Vietnamese
-        'nguyen', 'tran', 'anh', 'minh', 'duc', 'huy', 'nam', 'tuan', 'hung', 'long',
-        'linh', 'mai', 'lan', 'huong', 'nga', 'thao', 'trang', 'yen', 'hanh', 'phuong',
-    }
-    
-    # Common non-name words that might appear capitalized at start of query
-    # Includes words commonly found in book/article titles that aren't surnames
-    SKIP_WORDS = {
-        # Question words
-        'how', 'what', 'when', 'where', 'why', 'who', 'which', 'whose',
-        # Articles and prepositions
-        'the', 'did', 'does', 'was', 'were', 'are', 'has', 'had', 'have',
-        'can', 'could', 'should', 'would', 'will', 'may', 'might', 'must',
-        'this', 'that', 'these', 'those', 'from', 'with', 'about', 'into',
-        # Common title/subject words
-        'history', 'origins', 'emergence', 'rise', 'fall', 'decline',
-        'introduction', 'review', 'analysis', 'study', 'case', 'cases',
-        # Relationship/social terms often in titles
-        'master', 'slave', 'husband', 'wife', 'father', 'mother', 'son', 'daughter',
-        'brother', 'sister', 'family', 'marriage', 'love', 'death', 'life', 'war',
-        'peace', 'power', 'mind', 'body', 'soul', 'spirit', 'heart', 'brain',
-        # Common adjectives in titles
-        'american', 'british', 'french', 'german', 'chinese', 'japanese', 'russian',
-        'modern', 'ancient', 'new', 'old', 'great', 'little', 'big', 'small',
-        'first', 'last', 'final', 'secret', 'hidden', 'lost', 'found',
-        # Academic/genre terms
-        'theory', 'practice', 'science', 'art', 'culture', 'society', 'nature',
-        'politics', 'economics', 'psychology', 'philosophy', 'religion', 'law',
-        'medicine', 'health', 'education', 'technology', 'digital', 'social',
-        # Action words often starting titles
-        'making', 'breaking', 'building', 'creating', 'finding', 'losing',
-        'becoming', 'being', 'thinking', 'feeling', 'living', 'dying',
-        # Common book title patterns
-        'games', 'rules', 'secrets', 'stories', 'tales', 'letters', 'notes',
-        'memoirs', 'confessions', 'adventures', 'journey', 'quest', 'search',
-    }
-    
-    # Extract potential author surname from query
-    import re
-    words = query.split()
-    
-    # Strategy 1: "FirstName LastName keywords" pattern
+    return _score_author_positions([result], query)[0]
+
+
+def _score_author_positions(results: List[SourceComponents], query: str) -> List[float]:
+    """
+    _score_author_position() for every result, extracting the query author
+    once for the batch.
+    """
+    author_lists = [(result.authors if result else None) or [] for result in results]
     query_author = None
-    if len(words) >= 2:
-        first_word = words[0].strip().lower()
-        second_word = words[1].strip()
-        if first_word in COMMON_FIRST_NAMES:
-            if second_word and second_word[0].isupper() and len(second_word) >= 3:
-                query_author = second_word.lower()
-                print(f"[AuthorScore] Extracted surname '{query_author}' from '{query}' (skipped first name '{first_word}')")
-    
-    # Strategy 2: Find first capitalized word that's not a common first name or skip word
-    if not query_author:
-        for word in words:
-            clean = re.sub(r'[^\w]', '', word)
-            if clean and clean[0].isupper() and len(clean) >= 3:
-                clean_lower = clean.lower()
-                if clean_lower not in COMMON_FIRST_NAMES and clean_lower not in SKIP_WORDS:
-                    query_author = clean_lower
-                    print(f"[AuthorScore] Extracted surname '{query_author}' from '{query}'")
-                    break
-    
-    if not query_author:
-        print(f"[AuthorScore] No author found in '{query}' → score 0.5")
-        return 0.5  # No clear author in query
-    
-    # Check each author position
-    authors_lower = [a.lower() for a in result.authors]
-    
-    for i, author in enumerate(authors_lower):
-        if query_author in author:
-            if len(result.authors) == 1:
-                print(f"[AuthorScore] '{query_author}' is SOLE author of '{result.title[:30]}...' → score 1.0")
-                return 1.0  # Sole author
-            elif i == 0:
-                print(f"[AuthorScore] '{query_author}' is FIRST author → score 0.9")
-                return 0.9  # First author
-            elif i <= 2:
-                return 0.7  # 2nd-3rd author
-            else:
-                return 0.3  # 4th+ author (likely coincidental)
-    
-    print(f"[AuthorScore] '{query_author}' NOT FOUND in {result.authors} → score 0.1")
-    return 0.1  # Author not found in result
+    if any(author_lists):
+        query_author = _extract_query_author(query)
+        logger.debug(f"[AuthorScore] Query author for '{query}': {query_author!r}")
+    return scoring.score_author_positions(author_lists, query_author)
 
 
 # =============================================================================
@@ -512,13 +490,13 @@ def _enhance_author_names(result: SourceComponents) -> SourceComponents:
         if crossref_result and crossref_result.authors_parsed:
             # Check if Crossref has full names
             if not _has_initials_only_authors(crossref_result):
-                print(f"[AuthorEnhance] ✓ Enhanced authors from Crossref: {crossref_result.authors}")
+                logger.debug(f"[AuthorEnhance] ✓ Enhanced authors from Crossref: {crossref_result.authors}")
                 # Copy full author names to original result
                 result.authors = crossref_result.authors
                 result.authors_parsed = crossref_result.authors_parsed
                 return result
     except Exception as e:
-        print(f"[AuthorEnhance] Crossref lookup failed: {e}")
+        logger.warning(f"[AuthorEnhance] Crossref lookup failed: {e}")
     
     return result
 
@@ -666,6 +644,7 @@ def _book_dict_to_components(data: dict, raw_source: str) -> Optional[SourceComp
 # CITATION PARSER: Extract metadata from already-formatted citations
 # =============================================================================
 
+@traced('parse')
 def parse_existing_citation(query: str) -> Optional[SourceComponents]:
     """
     Parse an already-formatted citation to extract metadata.
@@ -1123,7 +1102,7 @@ def _split_compound_citation(query: str) -> List[str]:
             valid_parts.append(part)
         else:
             # Too short and no year - might be fragment, skip splitting
-            print(f"[UnifiedRouter] Compound split: rejecting part '{part}' (no year, too short)")
+            logger.debug(f"[UnifiedRouter] Compound split: rejecting part '{part}' (no year, too short)")
             return [query]  # Return original unsplit
     
     # Only return split parts if we got multiple valid ones
@@ -1168,6 +1147,7 @@ def _is_citation_complete(meta: SourceComponents) -> bool:
 # UNIFIED LEGAL SEARCH (uses superlegal.py)
 # =============================================================================
 
+@traced('route.legal')
 def _route_legal(query: str) -> Optional[SourceComponents]:
     """
     Route legal case queries using Cite Fix Pro's superlegal.py.
@@ -1183,7 +1163,7 @@ def _route_legal(query: str) -> Optional[SourceComponents]:
         if data and (data.get('case_name') or data.get('citation')):
             return _legal_dict_to_components(data, query)
     except Exception as e:
-        print(f"[UnifiedRouter] Legal search error: {e}")
+        logger.warning(f"[UnifiedRouter] Legal search error: {e}")
     
     return None
 
@@ -1192,6 +1172,7 @@ def _route_legal(query: str) -> Optional[SourceComponents]:
 # UNIFIED BOOK SEARCH (uses books.py)
 # =============================================================================
 
+@traced('route.book')
 def _route_book(query: str) -> Optional[SourceComponents]:
     """
     Route book queries using Cite Fix Pro's books.py.
@@ -1206,7 +1187,7 @@ def _route_book(query: str) -> Optional[SourceComponents]:
         if results and len(results) > 0:
             return _book_dict_to_components(results[0], query)
     except Exception as e:
-        print(f"[UnifiedRouter] Book search error: {e}")
+        logger.warning(f"[UnifiedRouter] Book search error: {e}")
     
     return None
 
@@ -1215,6 +1196,7 @@ def _route_book(query: str) -> Optional[SourceComponents]:
 # UNIFIED JOURNAL SEARCH (parallel execution)
 # =============================================================================
 
+@traced('route.journal')
 def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
     """
     Route journal/academic queries using parallel API execution.
@@ -1230,15 +1212,15 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
     the Eric Caplan paper (sole author) rather than Louis Caplan (neurologist).
     """
     # Layer 1: Check famous papers cache first (instant lookup for 10,000 most-cited)
-    famous = find_famous_paper(query)
+    famous = famous_papers.find_famous_paper(query)
     if famous:
-        print("[UnifiedRouter] Found via Famous Papers cache")
+        logger.debug("[UnifiedRouter] Found via Famous Papers cache")
         # Use the cached data directly - it has everything we need
         # Optionally try Crossref for richer metadata, but don't require it
         try:
             result = _crossref.get_by_id(famous["doi"])
             if result:
-                print("[UnifiedRouter] Enriched with Crossref metadata")
+                logger.debug("[UnifiedRouter] Enriched with Crossref metadata")
                 return result
         except Exception:
             pass
@@ -1252,7 +1234,7 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
         try:
             result = _crossref.get_by_id(doi)
             if result:
-                print("[UnifiedRouter] Found via direct DOI lookup")
+                logger.debug("[UnifiedRouter] Found via direct DOI lookup")
                 return result
         except Exception:
             pass
@@ -1262,10 +1244,10 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
     
     with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = {
-            executor.submit(_crossref.search, query): "Crossref",
-            executor.submit(_openalex.search, query): "OpenAlex",
-            executor.submit(_semantic.search, query): "Semantic Scholar",
-            executor.submit(_pubmed.search, query): "PubMed",
+            submit_traced(executor, _crossref.search, query): "Crossref",
+            submit_traced(executor, _openalex.search, query): "OpenAlex",
+            submit_traced(executor, _semantic.search, query): "Semantic Scholar",
+            submit_traced(executor, _pubmed.search, query): "PubMed",
         }
         
         for future in as_completed(futures, timeout=PARALLEL_TIMEOUT):
@@ -1274,12 +1256,14 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
                 result = future.result(timeout=2)
                 if result and result.has_minimum_data():
                     result.source_engine = engine_name
-                    # Score by author position
-                    result.confidence = _score_author_position(result, query)
                     results.append(result)
             except Exception:
                 pass
     
+    # Score by author position
+    for result, score in zip(results, _score_author_positions(results, query)):
+        result.confidence = score
+    
     # Sort by author-position score (highest first)
     if results:
         results.sort(key=lambda r: r.confidence, reverse=True)
@@ -1287,10 +1271,10 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
         
         # If we have any result with confidence >= 0.5, use it (don't pay for SerpAPI)
         if best.confidence >= 0.5:
-            print(f"[UnifiedRouter] Found via {best.source_engine} (author-score: {best.confidence})")
+            logger.debug(f"[UnifiedRouter] Found via {best.source_engine} (author-score: {best.confidence})")
             return best
         
-        print(f"[UnifiedRouter] Low author-score ({best.confidence}), but using free result anyway")
+        logger.debug(f"[UnifiedRouter] Low author-score ({best.confidence}), but using free result anyway")
         # Still return the best free result - don't escalate to paid API
         return best
     
@@ -1307,15 +1291,15 @@ def _route_journal(query: str, gist: str = "") -> Optional[SourceComponents]:
         try:
             ai_result = lookup_fragment(query, gist=gist, verify=True)
             if ai_result:
-                print(f"[UnifiedRouter] Found via AI lookup: {ai_result.title[:50]}...")
+                logger.debug(f"[UnifiedRouter] Found via AI lookup: {ai_result.title[:50]}...")
                 return ai_result
         except Exception as e:
-            print(f"[UnifiedRouter] AI lookup error: {e}")
+            logger.warning(f"[UnifiedRouter] AI lookup error: {e}")
     
     # Fallback: Return best available result even if low-confidence
     if results:
         results.sort(key=lambda r: (r.confidence, bool(r.doi)), reverse=True)
-        print(f"[UnifiedRouter] Returning best available (score: {results[0].confidence})")
+        logger.debug(f"[UnifiedRouter] Returning best available (score: {results[0].confidence})")
         return results[0]
     
     return None
@@ -1426,6 +1410,7 @@ def _log_url_failure(url: str, method: str, reason: str, start_time=None, used_a
         )
 
 
+@traced('route.url')
 def _route_url(url: str) -> Optional[SourceComponents]:
     """
     Route URL-based queries.
@@ -1456,11 +1441,11 @@ def _route_url(url: str) -> Optional[SourceComponents]:
     # Check cache first - avoid repeated lookups
     if url in _url_result_cache:
         cached = _url_result_cache[url]
-        print(f"[UnifiedRouter] URL cache hit: {url[:50]}... → {'found' if cached else 'empty'}")
+        logger.debug(f"[UnifiedRouter] URL cache hit: {url[:50]}... → {'found' if cached else 'empty'}")
         return cached
     
     if url in _url_failure_cache:
-        print(f"[UnifiedRouter] URL previously failed (cached): {url[:50]}...")
+        logger.warning(f"[UnifiedRouter] URL previously failed (cached): {url[:50]}...")
         return None
     
     # Check for DOI in URL
@@ -1484,7 +1469,7 @@ def _route_url(url: str) -> Optional[SourceComponents]:
             result = _crossref.get_by_id(doi)
             if result and result.has_minimum_data():
                 result.url = url
-                print("[UnifiedRouter] Found via DOI in URL path")
+                logger.debug("[UnifiedRouter] Found via DOI in URL path")
                 _log_url_success(url, 'doi_in_path', result, start_time)
                 return result
         except Exception:
@@ -1530,7 +1515,7 @@ def _route_url(url: str) -> Optional[SourceComponents]:
         is_valid_isbn = (len(isbn_raw) == 13 and isbn_raw.startswith(('978', '979'))) or len(isbn_raw) == 10
         
         if is_valid_isbn:
-            print(f"[UnifiedRouter] ISBN detected in URL: {isbn_raw}")
+            logger.debug(f"[UnifiedRouter] ISBN detected in URL: {isbn_raw}")
             
             try:
                 # Import Google Books search (returns list of dicts)
@@ -1543,11 +1528,11 @@ def _route_url(url: str) -> Optional[SourceComponents]:
                     book_dict['url'] = url
                     result = _book_dict_to_components(book_dict, url)
                     if result:
-                        print(f"[UnifiedRouter] ✓ Found book via ISBN: {result.title[:50] if result.title else 'Unknown'}...")
+                        logger.debug(f"[UnifiedRouter] ✓ Found book via ISBN: {result.title[:50] if result.title else 'Unknown'}...")
                         _log_url_success(url, 'isbn_lookup', result, start_time)
                         return result
             except Exception as e:
-                print(f"[UnifiedRouter] ISBN lookup failed: {e}")
+                logger.warning(f"[UnifiedRouter] ISBN lookup failed: {e}")
     
     # ==========================================================================
     # MAJOR PUBLISHER PII EXTRACTION (Added 2025-12-15)
@@ -1571,7 +1556,7 @@ def _route_url(url: str) -> Optional[SourceComponents]:
     is_pubmed_publisher = any(pub in url_lower for pub in PUBMED_INDEXED_PUBLISHERS)
     
     if is_pubmed_publisher:
-        print(f"[UnifiedRouter] Paywalled publisher detected, trying PII extraction: {url[:60]}...")
+        logger.debug(f"[UnifiedRouter] Paywalled publisher detected, trying PII extraction: {url[:60]}...")
         # Try to extract PII from URL
         # Format 1: PIIS0140-6736(51)91311-6 (Lancet - with PII prefix and parentheses)
         # Format 2: S0092-8674(25)01138-9 (Cell - no PII prefix, with parentheses)
@@ -1579,22 +1564,22 @@ def _route_url(url: str) -> Optional[SourceComponents]:
         pii_match = re.search(r'(?:PII)?(S[0-9]{4}-?[0-9]{4}(?:\([0-9]+\))?[0-9A-Z\-]+)', url, re.IGNORECASE)
         if pii_match:
             pii = pii_match.group(1)
-            print(f"[UnifiedRouter] Extracted PII: {pii}")
+            logger.debug(f"[UnifiedRouter] Extracted PII: {pii}")
             try:
                 # Search PubMed with the PII
                 result = _pubmed.search(pii)
                 if result and result.has_minimum_data():
                     result.url = url
-                    print(f"[UnifiedRouter] ✓ PubMed found via PII: '{result.title[:50] if result.title else 'N/A'}'")
+                    logger.debug(f"[UnifiedRouter] ✓ PubMed found via PII: '{result.title[:50] if result.title else 'N/A'}'")
                     _url_result_cache[url] = result
                     _log_url_success(url, 'pii_pubmed', result, start_time)
                     return result
                 else:
-                    print(f"[UnifiedRouter] PubMed PII search returned no results")
+                    logger.debug(f"[UnifiedRouter] PubMed PII search returned no results")
             except Exception as e:
-                print(f"[UnifiedRouter] PubMed PII search failed: {e}")
+                logger.warning(f"[UnifiedRouter] PubMed PII search failed: {e}")
         else:
-            print(f"[UnifiedRouter] No PII pattern found in URL")
+            logger.debug(f"[UnifiedRouter] No PII pattern found in URL")
     
     # ==========================================================================
     # FETCH-FIRST STRATEGY (Updated 2025-12-15)
@@ -1608,20 +1593,20 @@ def _route_url(url: str) -> Optional[SourceComponents]:
     html_result = None
     html_error = None
     try:
-        print(f"[UnifiedRouter] Fetching URL metadata: {url[:60]}...")
+        logger.debug(f"[UnifiedRouter] Fetching URL metadata: {url[:60]}...")
         html_result = _generic_url.fetch_by_url(url)
         if html_result and html_result.has_minimum_data():
             # Check if we have authors - if yes, this is good enough
             if html_result.authors:
                 html_result.url = url
-                print(f"[UnifiedRouter] ✓ HTML extracted: '{html_result.title[:50] if html_result.title else 'N/A'}' by {html_result.authors}")
+                logger.debug(f"[UnifiedRouter] ✓ HTML extracted: '{html_result.title[:50] if html_result.title else 'N/A'}' by {html_result.authors}")
                 _log_url_success(url, 'html_scrape', html_result, start_time)
                 return html_result
             else:
-                print(f"[UnifiedRouter] HTML got title but no authors, will try to enhance")
+                logger.debug(f"[UnifiedRouter] HTML got title but no authors, will try to enhance")
                 html_error = 'no_authors'
     except Exception as e:
-        print(f"[UnifiedRouter] GenericURL error: {e}")
+        logger.warning(f"[UnifiedRouter] GenericURL error: {e}")
         html_error = str(e)[:100]
     
     # ==========================================================================
@@ -1635,43 +1620,43 @@ def _route_url(url: str) -> Optional[SourceComponents]:
     # Try AI for academic URLs (law reviews, think tanks, etc.)
     if _is_academic_ai_url(url) and ACADEMIC_AI_AVAILABLE:
         try:
-            print(f"[UnifiedRouter] Trying AI lookup with verification: {url[:60]}...")
+            logger.debug(f"[UnifiedRouter] Trying AI lookup with verification: {url[:60]}...")
             result = lookup_academic_url(url, verify=True)
             if result and result.has_minimum_data():
                 result.url = url
-                print(f"[UnifiedRouter] ✓ AI+verified: '{result.title[:50] if result.title else 'N/A'}' by {result.authors}")
+                logger.debug(f"[UnifiedRouter] ✓ AI+verified: '{result.title[:50] if result.title else 'N/A'}' by {result.authors}")
                 _log_url_success(url, 'ai_academic', result, start_time, used_ai=True)
                 return result
             else:
-                print(f"[UnifiedRouter] AI lookup failed verification or returned incomplete data")
+                logger.warning(f"[UnifiedRouter] AI lookup failed verification or returned incomplete data")
         except Exception as e:
-            print(f"[UnifiedRouter] AI academic lookup failed: {e}")
+            logger.warning(f"[UnifiedRouter] AI academic lookup failed: {e}")
     
     # Try AI for newspaper URLs
     if _is_newspaper_url(url) and NEWSPAPER_AI_AVAILABLE:
         try:
-            print(f"[UnifiedRouter] Trying AI newspaper lookup with verification: {url[:60]}...")
+            logger.debug(f"[UnifiedRouter] Trying AI newspaper lookup with verification: {url[:60]}...")
             result = lookup_newspaper_url(url, verify=True)
             if result and result.has_minimum_data():
                 result.url = url
-                print(f"[UnifiedRouter] ✓ AI+verified newspaper: '{result.title[:50] if result.title else 'N/A'}'")
+                logger.debug(f"[UnifiedRouter] ✓ AI+verified newspaper: '{result.title[:50] if result.title else 'N/A'}'")
                 _url_result_cache[url] = result
                 _log_url_success(url, 'ai_newspaper', result, start_time, used_ai=True)
                 return result
             else:
-                print(f"[UnifiedRouter] AI newspaper lookup failed verification, trying without verification...")
+                logger.warning(f"[UnifiedRouter] AI newspaper lookup failed verification, trying without verification...")
                 # For newspapers, try again without strict verification
                 # Newspapers aren't in academic databases anyway, so verification is limited
                 result_unverified = lookup_newspaper_url(url, verify=False)
                 if result_unverified and result_unverified.title:
                     result_unverified.url = url
                     # Accept if we at least got a title (authors are often missing from paywalled sites)
-                    print(f"[UnifiedRouter] ✓ AI newspaper (unverified): '{result_unverified.title[:50] if result_unverified.title else 'N/A'}' by {result_unverified.authors}")
+                    logger.debug(f"[UnifiedRouter] ✓ AI newspaper (unverified): '{result_unverified.title[:50] if result_unverified.title else 'N/A'}' by {result_unverified.authors}")
                     _url_result_cache[url] = result_unverified
                     _log_url_success(url, 'ai_newspaper_unverified', result_unverified, start_time, used_ai=True)
                     return result_unverified
         except Exception as e:
-            print(f"[UnifiedRouter] AI newspaper lookup failed: {e}")
+            logger.warning(f"[UnifiedRouter] AI newspaper lookup failed: {e}")
     
     # ==========================================================================
     # FALLBACK: Return HTML result even if incomplete, or URL-only
@@ -1680,14 +1665,14 @@ def _route_url(url: str) -> Optional[SourceComponents]:
     if html_result:
         # Return whatever we got from HTML, even if incomplete
         html_result.url = url
-        print(f"[UnifiedRouter] Returning partial HTML data: title='{html_result.title[:50] if html_result.title else 'N/A'}'")
+        logger.debug(f"[UnifiedRouter] Returning partial HTML data: title='{html_result.title[:50] if html_result.title else 'N/A'}'")
         _url_result_cache[url] = html_result
         # Log as partial success (has some data but not complete)
         _log_url_failure(url, 'html_partial', html_error or 'incomplete_metadata', start_time)
         return html_result
     
     # Final fallback - mark as failed and return URL-only citation
-    print(f"[UnifiedRouter] URL fallback - no metadata extracted for: {url[:60]}...")
+    logger.debug(f"[UnifiedRouter] URL fallback - no metadata extracted for: {url[:60]}...")
     _url_failure_cache.add(url)  # Mark this URL as failed to prevent retries
     fallback = SourceComponents(
         citation_type=CitationType.URL,
@@ -1704,6 +1689,13 @@ def _route_url(url: str) -> Optional[SourceComponents]:
 # MAIN ROUTING FUNCTION
 # =============================================================================
 
+def _format_traced(formatter, components: SourceComponents) -> str:
+    """formatter.format() recorded as a 'format' span."""
+    with span('format', style=type(getattr(formatter, 'formatter', formatter)).__name__):
+        return formatter.format(components)
+
+
+@traced('route_citation')
 def route_citation(query: str, style: str = "chicago", context: str = "", components_cache=None) -> Tuple[Optional[SourceComponents], str]:
     """
     Main entry point: route query to appropriate engine and format result.
@@ -1734,16 +1726,18 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
     if not query:
         return None, ""
     
-    formatter = get_formatter(style)
+    formatter = get_cached_formatter(style)
     components = None
     
     # CHECK CACHE FIRST (new V4.1)
     # If we have cached metadata for this exact citation text, use it
     if components_cache is not None:
-        cached_components = components_cache.get(query)
+        with span('cache.lookup') as cache_span:
+            cached_components = components_cache.get(query)
+            cache_span.set_attribute('hit', bool(cached_components))
         if cached_components:
-            print(f"[UnifiedRouter] Using cached metadata for: {query[:40]}...")
-            return cached_components, formatter.format(cached_components)
+            logger.debug(f"[UnifiedRouter] Using cached metadata for: {query[:40]}...")
+            return cached_components, _format_traced(formatter, cached_components)
     
     # =========================================================================
     # RULE 1: URL-PRIORITY (V4.3)
@@ -1756,7 +1750,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
     url_match = re.search(r'https?://[^\s,\)]+', query)
     if url_match:
         url = url_match.group(0).rstrip('.,;:')
-        print(f"[UnifiedRouter] URL-priority rule: extracting URL only: {url[:60]}...")
+        logger.debug(f"[UnifiedRouter] URL-priority rule: extracting URL only: {url[:60]}...")
         components = _route_url(url)
         
         # Check if we got minimum required data
@@ -1783,10 +1777,10 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
             # Success - store in cache and return
             if components_cache is not None:
                 components_cache.set(query, components)
-            return components, formatter.format(components)
+            return components, _format_traced(formatter, components)
         
         # URL fetch failed to get minimum data - try AI fallback
-        print(f"[UnifiedRouter] URL fetch incomplete (title={components.title if components else 'None'}, authors={components.authors if components else 'None'}), trying AI fallback...")
+        logger.debug(f"[UnifiedRouter] URL fetch incomplete (title={components.title if components else 'None'}, authors={components.authors if components else 'None'}), trying AI fallback...")
         
         if AI_AVAILABLE:
             ai_result = None
@@ -1794,42 +1788,42 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
             # Try newspaper AI for newspaper URLs (more aggressive - accept unverified)
             if _is_newspaper_url(url) and NEWSPAPER_AI_AVAILABLE:
                 try:
-                    print(f"[UnifiedRouter] AI fallback (newspaper): {url[:60]}...")
+                    logger.debug(f"[UnifiedRouter] AI fallback (newspaper): {url[:60]}...")
                     # First try with verification
                     ai_result = lookup_newspaper_url(url, verify=True)
                     if not (ai_result and ai_result.has_minimum_data()):
                         # Try without verification - newspapers aren't in DBs anyway
-                        print(f"[UnifiedRouter] AI newspaper verification failed, trying unverified...")
+                        logger.warning(f"[UnifiedRouter] AI newspaper verification failed, trying unverified...")
                         ai_result = lookup_newspaper_url(url, verify=False)
                 except Exception as e:
-                    print(f"[UnifiedRouter] AI newspaper fallback failed: {e}")
+                    logger.warning(f"[UnifiedRouter] AI newspaper fallback failed: {e}")
             
             # Try academic AI for other URLs
             if not ai_result and ACADEMIC_AI_AVAILABLE:
                 try:
-                    print(f"[UnifiedRouter] AI fallback (academic): {url[:60]}...")
+                    logger.debug(f"[UnifiedRouter] AI fallback (academic): {url[:60]}...")
                     ai_result = lookup_academic_url(url)
                 except Exception as e:
-                    print(f"[UnifiedRouter] AI academic fallback failed: {e}")
+                    logger.warning(f"[UnifiedRouter] AI academic fallback failed: {e}")
             
             if ai_result and ai_result.has_minimum_data():
                 ai_result.url = url
-                print(f"[UnifiedRouter] ✓ AI fallback succeeded: '{ai_result.title[:50] if ai_result.title else 'N/A'}' by {ai_result.authors}")
+                logger.debug(f"[UnifiedRouter] ✓ AI fallback succeeded: '{ai_result.title[:50] if ai_result.title else 'N/A'}' by {ai_result.authors}")
                 if components_cache is not None:
                     components_cache.set(query, ai_result)
                 # Cache the AI result for this URL too
                 _url_result_cache[url] = ai_result
-                return ai_result, formatter.format(ai_result)
+                return ai_result, _format_traced(formatter, ai_result)
             else:
-                print(f"[UnifiedRouter] AI fallback returned insufficient data")
+                logger.debug(f"[UnifiedRouter] AI fallback returned insufficient data")
         
         # All attempts failed - return whatever we have (may be URL-only)
         if components:
             if components_cache is not None:
                 components_cache.set(query, components)
-            return components, formatter.format(components)
+            return components, _format_traced(formatter, components)
         
-        print(f"[UnifiedRouter] URL routing completely failed, falling through to text parsing")
+        logger.warning(f"[UnifiedRouter] URL routing completely failed, falling through to text parsing")
     
     # =========================================================================
     # RULE 2: COMPOUND CITATION SPLITTING (V4.3)
@@ -1842,7 +1836,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
         # Split on semicolons, but be smart about it
         parts = _split_compound_citation(query)
         if len(parts) > 1:
-            print(f"[UnifiedRouter] Compound citation: splitting into {len(parts)} parts")
+            logger.debug(f"[UnifiedRouter] Compound citation: splitting into {len(parts)} parts")
             formatted_parts = []
             all_components = []
             
@@ -1850,7 +1844,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
                 part = part.strip()
                 if not part:
                     continue
-                print(f"[UnifiedRouter]   Part {i+1}: {part[:50]}...")
+                logger.debug(f"[UnifiedRouter]   Part {i+1}: {part[:50]}...")
                 
                 # Recursively process each part (benefits from cache)
                 part_components, part_formatted = route_citation(
@@ -1871,18 +1865,18 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
                 # Return first component as representative (for metadata purposes)
                 # The formatted string contains all citations
                 representative = all_components[0] if all_components else None
-                print(f"[UnifiedRouter] Compound citation result: {combined_formatted[:80]}...")
+                logger.debug(f"[UnifiedRouter] Compound citation result: {combined_formatted[:80]}...")
                 return representative, combined_formatted
     
     # 0. TRY PARSING FIRST: If citation is already complete, just reformat
     # This preserves user's authoritative content while applying style
     parsed = parse_existing_citation(query)
     if parsed and _is_citation_complete(parsed):
-        print(f"[UnifiedRouter] Parsed complete citation: {parsed.citation_type.name}")
+        logger.debug(f"[UnifiedRouter] Parsed complete citation: {parsed.citation_type.name}")
         # Store in cache if available
         if components_cache is not None:
             components_cache.set(query, parsed)
-        return parsed, formatter.format(parsed)
+        return parsed, _format_traced(formatter, parsed)
     
     # 1. Check for legal citation FIRST (superlegal.py handles famous cases)
     if superlegal.is_legal_citation(query):
@@ -1891,7 +1885,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
             # Store in cache if available (V4.1)
             if components_cache is not None:
                 components_cache.set(query, components)
-            return components, formatter.format(components)
+            return components, _format_traced(formatter, components)
     
     # 2. Check for URL
     if is_url(query):
@@ -1900,10 +1894,12 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
             # Store in cache if available (V4.1)
             if components_cache is not None:
                 components_cache.set(query, components)
-            return components, formatter.format(components)
+            return components, _format_traced(formatter, components)
     
     # 3. Detect type using standard detectors
-    detection = detect_type(query)
+    with span('detect') as detect_span:
+        detection = detect_type(query)
+        detect_span.set_attribute('type', detection.citation_type.name)
     
     # 4. Route based on detection
     if detection.citation_type == CitationType.LEGAL:
@@ -1914,7 +1910,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
     
     elif detection.citation_type in [CitationType.JOURNAL, CitationType.MEDICAL]:
         # Check famous papers cache first
-        famous = find_famous_paper(query)
+        famous = famous_papers.find_famous_paper(query)
         if famous:
             components = _famous_paper_to_components(famous, query)
         else:
@@ -1934,7 +1930,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
         if AI_AVAILABLE:
             ai_type, ai_meta = classify_with_ai(query, context)
             if ai_type != CitationType.UNKNOWN:
-                print(f"[UnifiedRouter] AI classified as: {ai_type.name}")
+                logger.debug(f"[UnifiedRouter] AI classified as: {ai_type.name}")
                 
                 if ai_type == CitationType.BOOK:
                     components = _route_book(query)
@@ -1958,7 +1954,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
         # Store in cache if available (new V4.1)
         if components_cache is not None:
             components_cache.set(query, components)
-        return components, formatter.format(components)
+        return components, _format_traced(formatter, components)
     
     return None, ""
 
@@ -1967,6 +1963,7 @@ def route_citation(query: str, style: str = "chicago", context: str = "", compon
 # MULTIPLE RESULTS FUNCTION
 # =============================================================================
 
+@traced('get_multiple_citations')
 def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, components_cache=None) -> List[Tuple[SourceComponents, str, str]]:
     """
     Get multiple citation candidates for user selection.
@@ -1983,14 +1980,14 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
     if not query:
         return []
     
-    formatter = get_formatter(style)
+    formatter = get_cached_formatter(style)
     results = []
     
     # CHECK CACHE FIRST (new V4.2) - Skip all API calls if we have cached metadata
     if components_cache is not None:
         cached_components = components_cache.get(query)
         if cached_components:
-            print(f"[UnifiedRouter] get_multiple_citations: Cache HIT for: {query[:40]}...")
+            logger.debug(f"[UnifiedRouter] get_multiple_citations: Cache HIT for: {query[:40]}...")
             formatted = formatter.format(cached_components)
             return [(cached_components, formatted, "Cached")]
     
@@ -1999,7 +1996,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
     if parsed and _is_citation_complete(parsed):
         formatted = formatter.format(parsed)
         results.append((parsed, formatted, "Original (Reformatted)"))
-        print(f"[UnifiedRouter] Parsed complete citation, added as first option")
+        logger.debug(f"[UnifiedRouter] Parsed complete citation, added as first option")
         # Store in cache for future duplicate lookups
         if components_cache is not None:
             components_cache.set(query, parsed)
@@ -2047,7 +2044,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                 is_valid_isbn = (len(isbn_raw) == 13 and isbn_raw.startswith(('978', '979'))) or len(isbn_raw) == 10
                 
                 if is_valid_isbn:
-                    print(f"[UnifiedRouter] ISBN detected in URL: {isbn_raw}")
+                    logger.debug(f"[UnifiedRouter] ISBN detected in URL: {isbn_raw}")
                     try:
                         from engines.books import GoogleBooksAPI
                         book_results = GoogleBooksAPI.search(f"isbn:{isbn_raw}")
@@ -2060,48 +2057,48 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                             if result:
                                 formatted = formatter.format(result)
                                 results.append((result, formatted, "Google Books (ISBN)"))
-                                print(f"[UnifiedRouter] ✓ Found book via ISBN: {result.title[:50] if result.title else 'Unknown'}...")
+                                logger.debug(f"[UnifiedRouter] ✓ Found book via ISBN: {result.title[:50] if result.title else 'Unknown'}...")
                     except Exception as e:
-                        print(f"[UnifiedRouter] ISBN lookup failed: {e}")
+                        logger.warning(f"[UnifiedRouter] ISBN lookup failed: {e}")
         
         # =======================================================================
         # ChatGPT-first for academic AI URLs (law reviews, think tanks, etc.)
         # =======================================================================
         if _is_academic_ai_url(query) and ACADEMIC_AI_AVAILABLE:
             try:
-                print(f"[UnifiedRouter] Academic AI URL detected - trying ChatGPT first: {query[:60]}...")
+                logger.debug(f"[UnifiedRouter] Academic AI URL detected - trying ChatGPT first: {query[:60]}...")
                 url_result = lookup_academic_url(query)
                 if url_result and url_result.has_minimum_data():
                     url_result.url = query
                     formatted = formatter.format(url_result)
                     source_name = url_result.journal or "Academic"
                     results.append((url_result, formatted, f"ChatGPT ({source_name})"))
-                    print(f"[UnifiedRouter] ✓ ChatGPT extracted academic: {url_result.title[:50]}...")
+                    logger.debug(f"[UnifiedRouter] ✓ ChatGPT extracted academic: {url_result.title[:50]}...")
             except Exception as e:
-                print(f"[UnifiedRouter] ChatGPT academic lookup failed: {e}")
+                logger.warning(f"[UnifiedRouter] ChatGPT academic lookup failed: {e}")
         
         # =======================================================================
         # ChatGPT-first for newspaper/magazine URLs
         # =======================================================================
         if (not results or len(results) < limit) and _is_newspaper_url(query) and NEWSPAPER_AI_AVAILABLE:
             try:
-                print(f"[UnifiedRouter] Newspaper URL detected - trying ChatGPT first: {query[:60]}...")
+                logger.debug(f"[UnifiedRouter] Newspaper URL detected - trying ChatGPT first: {query[:60]}...")
                 url_result = lookup_newspaper_url(query)
                 if url_result and url_result.has_minimum_data():
                     url_result.url = query
                     formatted = formatter.format(url_result)
                     source_name = url_result.newspaper or "Newspaper"
                     results.append((url_result, formatted, f"ChatGPT ({source_name})"))
-                    print(f"[UnifiedRouter] ✓ ChatGPT extracted newspaper: {url_result.title[:50]}...")
+                    logger.debug(f"[UnifiedRouter] ✓ ChatGPT extracted newspaper: {url_result.title[:50]}...")
             except Exception as e:
-                print(f"[UnifiedRouter] ChatGPT newspaper lookup failed: {e}")
+                logger.warning(f"[UnifiedRouter] ChatGPT newspaper lookup failed: {e}")
         
         # =======================================================================
         # Fallback: Fetch URL metadata via GenericURLEngine (HTML scraping)
         # =======================================================================
         if not results or len(results) < limit:
             try:
-                print(f"[UnifiedRouter] Fetching URL metadata via HTML scraping: {query[:60]}...")
+                logger.debug(f"[UnifiedRouter] Fetching URL metadata via HTML scraping: {query[:60]}...")
                 url_result = _generic_url.fetch_by_url(query)
                 if url_result and url_result.title:  # Need at least a title
                     url_result.url = query
@@ -2110,9 +2107,9 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                     if url_result.citation_type == CitationType.NEWSPAPER:
                         source_name = url_result.newspaper or "Newspaper"
                     results.append((url_result, formatted, source_name))
-                    print(f"[UnifiedRouter] ✓ Added URL result: {url_result.title[:50]}...")
+                    logger.debug(f"[UnifiedRouter] ✓ Added URL result: {url_result.title[:50]}...")
             except Exception as e:
-                print(f"[UnifiedRouter] GenericURL error in get_multiple: {e}")
+                logger.warning(f"[UnifiedRouter] GenericURL error in get_multiple: {e}")
         
         # For URLs, return what we found (don't search academic databases)
         if results:
@@ -2129,7 +2126,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
     # For journals/academic
     if detection.citation_type in [CitationType.JOURNAL, CitationType.MEDICAL, CitationType.UNKNOWN]:
         # Check famous papers first
-        famous = find_famous_paper(query)
+        famous = famous_papers.find_famous_paper(query)
         if famous:
             meta = _famous_paper_to_components(famous, query)
             formatted = formatter.format(meta)
@@ -2147,7 +2144,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
             try:
                 from engines.triple_ai_consensus import triple_ai_lookup_sync, ConsensusStatus
                 
-                print(f"[UnifiedRouter] UNKNOWN query - using TRIPLE AI CONSENSUS: {query[:50]}...")
+                logger.debug(f"[UnifiedRouter] UNKNOWN query - using TRIPLE AI CONSENSUS: {query[:50]}...")
                 
                 ai_result = triple_ai_lookup_sync(query, context)
                 
@@ -2161,24 +2158,24 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                         source_name += f" ${ai_result.total_cost_usd:.4f}"
                     
                     results.append((meta, formatted, source_name))
-                    print(f"[UnifiedRouter] ✓ TripleAI result: {meta.title[:50]}... ({meta.citation_type.name})")
+                    logger.debug(f"[UnifiedRouter] ✓ TripleAI result: {meta.title[:50]}... ({meta.citation_type.name})")
                     
                     # If confidence is high, this might be all we need
                     if ai_result.confidence >= 0.8 and len(results) >= 1:
-                        print(f"[UnifiedRouter] High confidence ({ai_result.confidence:.0%}) - skipping database fallback")
+                        logger.debug(f"[UnifiedRouter] High confidence ({ai_result.confidence:.0%}) - skipping database fallback")
                 else:
-                    print(f"[UnifiedRouter] TripleAI: Low confidence ({ai_result.confidence:.0%}) or no result")
+                    logger.debug(f"[UnifiedRouter] TripleAI: Low confidence ({ai_result.confidence:.0%}) or no result")
                     
             except ImportError:
-                print(f"[UnifiedRouter] triple_ai_consensus module not available - falling back to databases")
+                logger.warning(f"[UnifiedRouter] triple_ai_consensus module not available - falling back to databases")
             except Exception as e:
-                print(f"[UnifiedRouter] TripleAI error: {e}")
+                logger.warning(f"[UnifiedRouter] TripleAI error: {e}")
             
             # ALSO search books (for comparison/verification)
             try:
-                print(f"[UnifiedRouter] Also searching books for comparison: {query[:50]}...")
+                logger.debug(f"[UnifiedRouter] Also searching books for comparison: {query[:50]}...")
                 book_results = books.search_all_engines(query)
-                print(f"[UnifiedRouter] Book engines returned {len(book_results)} results")
+                logger.debug(f"[UnifiedRouter] Book engines returned {len(book_results)} results")
                 for data in book_results:
                     if len(results) >= limit:
                         break
@@ -2194,9 +2191,9 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                             formatted = formatter.format(meta)
                             source = data.get('source_engine', 'Google Books')
                             results.append((meta, formatted, source))
-                            print(f"[UnifiedRouter] ✓ Added book: {meta.title[:50]}...")
+                            logger.debug(f"[UnifiedRouter] ✓ Added book: {meta.title[:50]}...")
             except Exception as e:
-                print(f"[UnifiedRouter] Book engines error: {e}")
+                logger.warning(f"[UnifiedRouter] Book engines error: {e}")
         
         # Query Crossref (academic articles)
         if len(results) < limit:
@@ -2241,30 +2238,30 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
             if pm_result:
                 title_preview = pm_result.title[:50] if pm_result.title else 'NO TITLE'
                 journal_preview = pm_result.journal[:30] if pm_result.journal else 'NO JOURNAL'
-                print(f"[UnifiedRouter] PubMed returned: '{title_preview}...'")
-                print(f"[UnifiedRouter] PubMed fields: authors={pm_result.authors}, year={pm_result.year}, journal={journal_preview}")
-                print(f"[UnifiedRouter] PubMed has_minimum_data={pm_result.has_minimum_data()}")
+                logger.debug(f"[UnifiedRouter] PubMed returned: '{title_preview}...'")
+                logger.debug(f"[UnifiedRouter] PubMed fields: authors={pm_result.authors}, year={pm_result.year}, journal={journal_preview}")
+                logger.debug(f"[UnifiedRouter] PubMed has_minimum_data={pm_result.has_minimum_data()}")
                 if pm_result.has_minimum_data():
                     is_duplicate = any(
                         pm_result.title and r[0].title and 
                         pm_result.title.lower()[:30] == r[0].title.lower()[:30]
                         for r in results
                     )
-                    print(f"[UnifiedRouter] PubMed duplicate check: {is_duplicate}")
+                    logger.debug(f"[UnifiedRouter] PubMed duplicate check: {is_duplicate}")
                     if not is_duplicate:
                         # Try to enhance initials-only author names from Crossref
                         pm_result = _enhance_author_names(pm_result)
                         formatted = formatter.format(pm_result)
                         results.append((pm_result, formatted, "PubMed"))
-                        print(f"[UnifiedRouter] ✓ Added PubMed result")
+                        logger.debug(f"[UnifiedRouter] ✓ Added PubMed result")
                     else:
-                        print(f"[UnifiedRouter] ✗ PubMed skipped (duplicate)")
+                        logger.warning(f"[UnifiedRouter] ✗ PubMed skipped (duplicate)")
                 else:
-                    print(f"[UnifiedRouter] ✗ PubMed failed has_minimum_data")
+                    logger.warning(f"[UnifiedRouter] ✗ PubMed failed has_minimum_data")
             else:
-                print(f"[UnifiedRouter] PubMed returned None")
+                logger.debug(f"[UnifiedRouter] PubMed returned None")
         except Exception as e:
-            print(f"[UnifiedRouter] PubMed error: {e}")
+            logger.warning(f"[UnifiedRouter] PubMed error: {e}")
         
         # DISABLED: Google Scholar via SerpAPI ($0.01/call) - replaced with AI fallback
         # GPT-5.1 at $0.002/call is 5x cheaper and often better quality
@@ -2275,7 +2272,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
         # For JOURNAL/MEDICAL types (not UNKNOWN), also search books as fallback
         if detection.citation_type != CitationType.UNKNOWN and len(results) < limit:
             try:
-                print(f"[UnifiedRouter] Searching book engines as fallback: {query[:50]}...")
+                logger.debug(f"[UnifiedRouter] Searching book engines as fallback: {query[:50]}...")
                 book_results = books.search_all_engines(query)
                 for data in book_results:
                     if len(results) >= limit:
@@ -2291,9 +2288,9 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                             formatted = formatter.format(meta)
                             source = data.get('source_engine', 'Google Books')
                             results.append((meta, formatted, source))
-                            print(f"[UnifiedRouter] ✓ Added book: {meta.title[:50]}...")
+                            logger.debug(f"[UnifiedRouter] ✓ Added book: {meta.title[:50]}...")
             except Exception as e:
-                print(f"[UnifiedRouter] Book engines error: {e}")
+                logger.warning(f"[UnifiedRouter] Book engines error: {e}")
     
     elif detection.citation_type == CitationType.BOOK:
         # Query ALL book engines (Google Books, Library of Congress, Open Library)
@@ -2315,7 +2312,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                         source = data.get('source_engine', 'Google Books')
                         results.append((meta, formatted, source))
         except Exception as e:
-            print(f"[UnifiedRouter] Book engines error: {e}")
+            logger.warning(f"[UnifiedRouter] Book engines error: {e}")
         
         # Also try Crossref (has book chapters)
         if len(results) < limit:
@@ -2349,7 +2346,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
         if AI_AVAILABLE:
             ai_type, ai_meta = classify_with_ai(query)
             if ai_type != CitationType.UNKNOWN:
-                print(f"[UnifiedRouter] AI classified as: {ai_type.name}")
+                logger.debug(f"[UnifiedRouter] AI classified as: {ai_type.name}")
                 
                 # Route based on AI's classification
                 if ai_type == CitationType.BOOK:
@@ -2370,7 +2367,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                                     source = data.get('source_engine', 'Google Books')
                                     results.append((meta, formatted, source))
                     except Exception as e:
-                        print(f"[UnifiedRouter] Book engines error: {e}")
+                        logger.warning(f"[UnifiedRouter] Book engines error: {e}")
                     # Also try Semantic Scholar
                     if len(results) < limit:
                         try:
@@ -2456,7 +2453,7 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
                         source = data.get('source_engine', 'Google Books')
                         results.append((meta, formatted, source))
         except Exception as e:
-            print(f"[UnifiedRouter] Book engines error: {e}")
+            logger.warning(f"[UnifiedRouter] Book engines error: {e}")
         
         # Then fill remaining with Crossref (journals, chapters)
         if len(results) < limit:
@@ -2488,28 +2485,28 @@ def get_multiple_citations(query: str, style: str = "chicago", limit: int = 6, c
     # SORT BY AUTHOR-POSITION SCORE before returning
     # This ensures sole/first author matches rank higher than 47th-author matches
     if results:
-        for i, (meta, formatted, source) in enumerate(results):
-            meta.confidence = _score_author_position(meta, query)
-            results[i] = (meta, formatted, source)
+        scores = _score_author_positions([meta for meta, _, _ in results], query)
+        for (meta, _, _), score in zip(results, scores):
+            meta.confidence = score
         
         # Log scores before sorting
-        print(f"[UnifiedRouter] Scores before sort:")
+        logger.debug(f"[UnifiedRouter] Scores before sort:")
         for meta, formatted, source in results:
             title_short = meta.title[:40] if meta.title else 'NO TITLE'
-            print(f"  {meta.confidence:.1f} | {source} | {title_short}...")
+            logger.debug(f"  {meta.confidence:.1f} | {source} | {title_short}...")
         
         # Sort by confidence (author position) descending, then by has DOI
         results.sort(key=lambda r: (r[0].confidence, bool(r[0].doi)), reverse=True)
-        print(f"[UnifiedRouter] Sorted {len(results)} results, returning top {limit}:")
+        logger.debug(f"[UnifiedRouter] Sorted {len(results)} results, returning top {limit}:")
         for i, (meta, formatted, source) in enumerate(results[:limit]):
             title_short = meta.title[:40] if meta.title else 'NO TITLE'
-            print(f"  #{i+1}: {meta.confidence:.1f} | {source} | {title_short}...")
+            logger.debug(f"  #{i+1}: {meta.confidence:.1f} | {source} | {title_short}...")
         
         # Store best result in cache for future duplicate lookups (V4.2)
         if components_cache is not None and results:
             best_meta = results[0][0]
             components_cache.set(query, best_meta)
-            print(f"[UnifiedRouter] Cached best result for: {query[:40]}...")
+            logger.debug(f"[UnifiedRouter] Cached best result for: {query[:40]}...")
     
     return results[:limit]
 
@@ -2586,11 +2583,11 @@ def get_parenthetical_options(
         metadata_list = lookup_parenthetical_citation_options(citation_text, limit=limit)
         
         if not metadata_list:
-            print(f"[UnifiedRouter] No options found for: {citation_text}")
+            logger.debug(f"[UnifiedRouter] No options found for: {citation_text}")
             return []
         
         # Format each option using the specified style
-        formatter = get_formatter(style)
+        formatter = get_cached_formatter(style)
         results = []
         
         for meta in metadata_list:
@@ -2598,19 +2595,19 @@ def get_parenthetical_options(
                 formatted = formatter.format(meta)
                 results.append((meta, formatted))
             except Exception as e:
-                print(f"[UnifiedRouter] Error formatting option: {e}")
+                logger.warning(f"[UnifiedRouter] Error formatting option: {e}")
                 # Still include with basic format
                 basic = f"{', '.join(meta.authors)} ({meta.year}). {meta.title}."
                 results.append((meta, basic))
         
-        print(f"[UnifiedRouter] Returning {len(results)} parenthetical options")
+        logger.debug(f"[UnifiedRouter] Returning {len(results)} parenthetical options")
         return results
         
     except ImportError:
-        print("[UnifiedRouter] ai_lookup module not available")
+        logger.warning("[UnifiedRouter] ai_lookup module not available")
         return []
     except Exception as e:
-        print(f"[UnifiedRouter] Error in get_parenthetical_options: {e}")
+        logger.warning(f"[UnifiedRouter] Error in get_parenthetical_options: {e}")
         return []
 
 
@@ -2639,17 +2636,17 @@ def get_parenthetical_components(
         metadata_list = lookup_parenthetical_citation_options(citation_text, context=context, limit=limit)
         
         if not metadata_list:
-            print(f"[UnifiedRouter] No metadata found for: {citation_text}")
+            logger.debug(f"[UnifiedRouter] No metadata found for: {citation_text}")
             return []
         
-        print(f"[UnifiedRouter] Returning {len(metadata_list)} metadata options")
+        logger.debug(f"[UnifiedRouter] Returning {len(metadata_list)} metadata options")
         return metadata_list
         
     except ImportError:
-        print("[UnifiedRouter] ai_lookup module not available")
+        logger.warning("[UnifiedRouter] ai_lookup module not available")
         return []
     except Exception as e:
-        print(f"[UnifiedRouter] Error in get_parenthetical_components: {e}")
+        logger.warning(f"[UnifiedRouter] Error in get_parenthetical_components: {e}")
         return []
 
 